@@ -9,12 +9,396 @@ Also supports direct audio file formats: MP3, WAV, M4A, FLAC, OGG, etc.
 import os
 import subprocess
 import tempfile
+import threading
 import logging
 from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from app.extraction_cache import PARTIAL_MARKER, ExtractionCache, extraction_cache_enabled
 from tools.resource_locator import get_ffmpeg_path, get_ffprobe_path
 
 logger = logging.getLogger(__name__)
 
+# Bytes read from the ffmpeg pipe per readinto() call (~8s of 16kHz float32 audio)
+PIPE_READ_BYTES = 512 * 1024
+
+
+def decode_to_array(
+    ffmpeg_path: str,
+    media_path: str,
+    sample_rate: int = 16000,
+    expected_duration: Optional[float] = None,
+    progress_callback: Optional[Callable[[float], None]] = None
+) -> np.ndarray:
+    """
+    Decode any media file to mono float32 PCM in memory.
+
+    ffmpeg writes raw little-endian float32 samples (-f f32le) to stdout, which
+    are read straight into a preallocated NumPy buffer - no intermediate file,
+    no re-encode, no second decode.
+
+    Args:
+        ffmpeg_path: ffmpeg executable
+        media_path: Input video or audio file
+        sample_rate: Output sample rate (16000 for Whisper)
+        expected_duration: Media duration in seconds, used to size the buffer
+                           (it grows if the estimate is short)
+        progress_callback: Optional callback(fraction_done), called as data arrives
+                           when expected_duration is known
+
+    Returns:
+        np.ndarray: 1-D float32 audio
+
+    Raises:
+        RuntimeError: If ffmpeg fails
+    """
+    cmd = [
+        ffmpeg_path, '-nostdin', '-v', 'error',
+        '-i', str(media_path),
+        '-vn',  # No video
+        '-f', 'f32le', '-acodec', 'pcm_f32le',
+        '-ac', '1',  # Mono
+        '-ar', str(sample_rate),
+        'pipe:1'
+    ]
+
+    expected_samples = int(expected_duration * sample_rate) if expected_duration else 0
+    # One second of slack so an accurate estimate never triggers a regrow
+    buffer = np.empty(max(expected_samples + sample_rate, sample_rate * 60), dtype=np.float32)
+    filled = 0  # bytes
+
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, bufsize=0)
+
+    # Drain stderr concurrently so a chatty ffmpeg can't block on a full pipe
+    stderr_chunks = []
+    stderr_thread = threading.Thread(target=lambda: stderr_chunks.append(process.stderr.read()), daemon=True)
+    stderr_thread.start()
+
+    try:
+        view = memoryview(buffer).cast('B')
+        last_report = 0
+        while True:
+            if filled == len(view):
+                # Estimate was short (or unknown) - grow by half
+                view.release()
+                grown = np.empty(len(buffer) + len(buffer) // 2, dtype=np.float32)
+                grown[:len(buffer)] = buffer
+                buffer = grown
+                view = memoryview(buffer).cast('B')
+            count = process.stdout.readinto(view[filled:filled + PIPE_READ_BYTES])
+            if not count:
+                break
+            filled += count
+            if progress_callback and expected_samples and filled - last_report >= 16 * PIPE_READ_BYTES:
+                last_report = filled
+                progress_callback(min(1.0, filled / 4 / expected_samples))
+        view.release()
+        returncode = process.wait()
+    except BaseException:
+        process.kill()
+        process.wait()
+        raise
+    finally:
+        process.stdout.close()
+        stderr_thread.join(timeout=5)
+        process.stderr.close()
+
+    if returncode != 0:
+        error_msg = b''.join(stderr_chunks).decode('utf-8', errors='ignore').strip()
+        raise RuntimeError(f"ffmpeg failed to decode {media_path}: {error_msg or f'exit code {returncode}'}")
+
+    samples = filled // 4
+    audio = buffer[:samples]
+    if len(buffer) - samples > sample_rate * 10:
+        # Don't keep a mostly-empty allocation alive behind the view
+        audio = audio.copy()
+    return audio
+
+
+def parse_progress_seconds(line: str) -> Optional[float]:
+    """
+    Parse the output position from one line of ffmpeg's -progress output.
+
+    Args:
+        line: A key=value line (e.g. 'out_time_us=12000000')
+
+    Returns:
+        float: Seconds of output written so far, or None if the line carries no position
+    """
+    key, _, value = line.strip().partition('=')
+    if not value or value == 'N/A':
+        return None
+    try:
+        # out_time_ms is also in microseconds (long-standing ffmpeg quirk)
+        if key in ('out_time_us', 'out_time_ms'):
+            return max(0.0, int(value) / 1_000_000)
+        if key == 'out_time':
+            hours, minutes, seconds = value.split(':')
+            return max(0.0, int(hours) * 3600 + int(minutes) * 60 + float(seconds))
+    except ValueError:
+        pass
+    return None
+
+
+def run_ffmpeg_with_progress(cmd, on_seconds: Optional[Callable[[float], None]] = None) -> Tuple[int, str]:
+    """
+    Run an ffmpeg command that writes a file, reporting progress from -progress pipe:1.
+
+    Args:
+        cmd: ffmpeg command (without -progress; it is inserted after the executable)
+        on_seconds: Optional callback(seconds_written), called from this thread as
+                    ffmpeg reports progress; exceptions (e.g. cancellation) stop ffmpeg
+                    and propagate
+
+    Returns:
+        Tuple of (return code, stderr text)
+    """
+    cmd = [cmd[0], '-nostats', '-progress', 'pipe:1'] + list(cmd[1:])
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+    stderr_chunks = []
+    stderr_thread = threading.Thread(target=lambda: stderr_chunks.append(process.stderr.read()), daemon=True)
+    stderr_thread.start()
+
+    try:
+        for raw_line in process.stdout:
+            seconds = parse_progress_seconds(raw_line.decode('utf-8', errors='ignore'))
+            if seconds is not None and on_seconds:
+                on_seconds(seconds)
+        returncode = process.wait()
+    except BaseException:
+        process.kill()
+        process.wait()
+        raise
+    finally:
+        process.stdout.close()
+        stderr_thread.join(timeout=5)
+        process.stderr.close()
+
+    return returncode, b''.join(stderr_chunks).decode('utf-8', errors='ignore')
+
+
+class SliceOverflowError(RuntimeError):
+    """The media is longer than SliceDecoder's buffer (duration estimate too short)."""
+
+
+class SliceDecoder:
+    """
+    Decode one media file with several ffmpeg processes in parallel.
+
+    The timeline is cut into disjoint sample ranges. Each range is decoded by its
+    own ffmpeg (input-side -ss/-t, so every process demuxes only its part of the
+    container) straight into its region of one shared memory-mapped float32 buffer.
+    Boundaries are sample-exact: a range is cut at integer sample indices, every
+    process decodes a short pre-roll before its range (discarded, so the resampler
+    has settled) and exactly the range's sample count is kept - no gaps, no
+    duplicated samples. Progress comes from each process's -progress output.
+    """
+
+    # Decoded before each range and discarded
+    PREROLL_SECONDS = 0.5
+    # Extra input decoded past each range, in case the seek lands short
+    TAIL_SECONDS = 1.0
+
+    def __init__(self, ffmpeg_path: str, media_path: str, duration: float, num_slices: int,
+                 sample_rate: int = 16000):
+        """
+        Plan the slices.
+
+        Args:
+            ffmpeg_path: ffmpeg executable
+            media_path: Input media file
+            duration: Media duration in seconds (from ffprobe)
+            num_slices: Number of ffmpeg processes
+            sample_rate: Output sample rate
+        """
+        self.ffmpeg_path = ffmpeg_path
+        self.media_path = str(media_path)
+        self.sample_rate = sample_rate
+        self.total_samples = int(round(duration * sample_rate))
+        num_slices = max(1, min(num_slices, self.total_samples // sample_rate or 1))
+        self.boundaries = [self.total_samples * i // num_slices for i in range(num_slices + 1)]
+        self.preroll_samples = int(self.PREROLL_SECONDS * sample_rate)
+        # The last slice reads to end of stream; allow for a short duration estimate
+        self.capacity = self.total_samples + 10 * sample_rate
+
+        self._lock = threading.Lock()
+        self._processes = []
+        self._slice_seconds = [0.0] * num_slices
+        self._last_slice_samples = 0
+
+    @property
+    def num_slices(self) -> int:
+        return len(self.boundaries) - 1
+
+    def _slice_command(self, index: int) -> Tuple[list, int]:
+        """Build the ffmpeg command for a slice; returns (cmd, pre-roll samples to discard)."""
+        start = self.boundaries[index]
+        preroll = min(self.preroll_samples, start)
+        cmd = [self.ffmpeg_path, '-nostdin', '-v', 'error', '-nostats', '-progress', 'pipe:2']
+        if start - preroll > 0:
+            # Integer sample offsets at the output rate are exact in decimal seconds
+            cmd += ['-ss', f"{(start - preroll) / self.sample_rate:.6f}"]
+        if index < self.num_slices - 1:
+            length = preroll + self.boundaries[index + 1] - start
+            cmd += ['-t', f"{length / self.sample_rate + self.TAIL_SECONDS:.6f}"]
+        cmd += [
+            '-i', self.media_path, '-vn',
+            '-f', 'f32le', '-acodec', 'pcm_f32le',
+            '-ac', '1', '-ar', str(self.sample_rate),
+            'pipe:1'
+        ]
+        return cmd, preroll
+
+    def _decode_slice(self, index: int, buffer: np.ndarray) -> int:
+        """Decode one slice into buffer; returns the number of samples written."""
+        cmd, preroll = self._slice_command(index)
+        start = self.boundaries[index]
+        is_last = index == self.num_slices - 1
+        wanted = (self.capacity if is_last else self.boundaries[index + 1]) - start
+
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, bufsize=0)
+        with self._lock:
+            self._processes.append(process)
+
+        errors = []
+        preroll_seconds = preroll / self.sample_rate
+
+        def read_progress():
+            for raw_line in process.stderr:
+                line = raw_line.decode('utf-8', errors='ignore')
+                seconds = parse_progress_seconds(line)
+                if seconds is not None:
+                    self._slice_seconds[index] = max(0.0, seconds - preroll_seconds)
+                elif '=' not in line:
+                    errors.append(line.strip())
+
+        progress_thread = threading.Thread(target=read_progress, daemon=True)
+        progress_thread.start()
+
+        written = 0
+        try:
+            # Discard the pre-roll
+            scratch = bytearray(preroll * 4)
+            got = 0
+            while got < len(scratch):
+                count = process.stdout.readinto(memoryview(scratch)[got:])
+                if not count:
+                    break
+                got += count
+
+            region = memoryview(buffer[start:start + wanted]).cast('B')
+            filled = 0
+            while filled < len(region):
+                count = process.stdout.readinto(region[filled:filled + PIPE_READ_BYTES])
+                if not count:
+                    break
+                filled += count
+            region.release()
+            written = filled // 4
+            # A full last region with audio still coming means the media runs past
+            # the buffer; the rest would be lost
+            overflow = is_last and filled == wanted * 4 and bool(process.stdout.read(4))
+        finally:
+            if process.poll() is None:
+                # Got everything this slice needs; the tail is not wanted
+                process.kill()
+            returncode = process.wait()
+            process.stdout.close()
+            progress_thread.join(timeout=5)
+            process.stderr.close()
+
+        if written < wanted and not is_last:
+            if returncode != 0 and written == 0:
+                raise RuntimeError(f"ffmpeg failed on slice {index + 1}/{self.num_slices}: "
+                                   f"{' '.join(errors) or f'exit code {returncode}'}")
+            # Media ended early (duration estimate too long) - keep the timeline intact
+            logger.warning(f"Slice {index + 1}/{self.num_slices} decoded {written} of {wanted} samples; "
+                           f"padding with silence")
+            buffer[start + written:start + wanted] = 0.0
+            written = wanted
+        elif is_last and returncode != 0 and written == 0 and self.total_samples > start:
+            raise RuntimeError(f"ffmpeg failed on slice {index + 1}/{self.num_slices}: "
+                               f"{' '.join(errors) or f'exit code {returncode}'}")
+        if overflow:
+            raise SliceOverflowError(
+                f"{self.media_path} runs past {self.capacity / self.sample_rate:.1f}s "
+                f"(ffprobe reported {self.total_samples / self.sample_rate:.1f}s); "
+                f"slice {index + 1}/{self.num_slices} would be truncated"
+            )
+
+        self._slice_seconds[index] = written / self.sample_rate
+        if is_last:
+            self._last_slice_samples = written
+        return written
+
+    def decoded_fraction(self) -> float:
+        """Fraction of the timeline decoded so far (from ffmpeg's progress reports)."""
+        total = self.total_samples / self.sample_rate
+        return min(1.0, sum(self._slice_seconds) / total) if total > 0 else 0.0
+
+    def decode(self, progress_callback: Optional[Callable[[float], None]] = None) -> np.ndarray:
+        """
+        Decode all slices in parallel.
+
+        Args:
+            progress_callback: Optional callback(fraction_done), called from the calling
+                               thread; an exception from it (e.g. cancellation) stops
+                               every ffmpeg process and propagates
+
+        Returns:
+            np.ndarray: 1-D float32 audio backed by a temporary memory-mapped file
+
+        Raises:
+            SliceOverflowError: If the media is longer than the duration estimate
+                                plus the last slice's 10s margin
+            RuntimeError: If ffmpeg fails on a slice
+        """
+        from concurrent.futures import ThreadPoolExecutor, wait, FIRST_EXCEPTION
+
+        fd, path = tempfile.mkstemp(suffix='.f32', prefix='fonixflow_pcm_')
+        os.close(fd)
+        buffer = np.memmap(path, dtype=np.float32, mode='w+', shape=(max(self.capacity, 1),))
+        try:
+            # POSIX keeps the mapping alive after unlink; elsewhere remove it at exit
+            os.unlink(path)
+        except OSError:
+            import atexit
+            atexit.register(lambda: os.path.exists(path) and os.unlink(path))
+
+        logger.info(f"Decoding {self.media_path} in {self.num_slices} parallel slices "
+                    f"({self.total_samples / self.sample_rate / 60:.1f} min)")
+        executor = ThreadPoolExecutor(max_workers=self.num_slices, thread_name_prefix='ffmpeg-slice')
+        try:
+            futures = [executor.submit(self._decode_slice, i, buffer) for i in range(self.num_slices)]
+            pending = set(futures)
+            last_reported = -1.0
+            while pending:
+                done, pending = wait(pending, timeout=0.25, return_when=FIRST_EXCEPTION)
+                for future in done:
+                    future.result()  # Re-raise slice errors
+                fraction = self.decoded_fraction()
+                if progress_callback and fraction - last_reported >= 0.01:
+                    last_reported = fraction
+                    progress_callback(fraction)
+        except BaseException:
+            self.kill()
+            raise
+        finally:
+            executor.shutdown(wait=True)
+
+        length = self.boundaries[-2] + self._last_slice_samples
+        return buffer[:length]
+
+    def kill(self):
+        """Stop every running ffmpeg process."""
+        with self._lock:
+            for process in self._processes:
+                if process.poll() is None:
+                    process.kill()
+
 
 class AudioExtractor:
     """Extracts audio from video files or prepares audio files for transcription using ffmpeg."""
@@ -28,6 +412,12 @@ class AudioExtractor:
     # All supported formats
     SUPPORTED_FORMATS = SUPPORTED_VIDEO_FORMATS | SUPPORTED_AUDIO_FORMATS
 
+    # Parallel (time-sliced) decoding: videos at least this long, one slice per
+    # SECONDS_PER_SLICE, at most MAX_SLICES processes
+    PARALLEL_MIN_SECONDS = 30 * 60
+    SECONDS_PER_SLICE = 10 * 60
+    MAX_SLICES = 8
+
     @staticmethod
     def configure_ffmpeg_converter():
         """
@@ -110,10 +500,17 @@ class AudioExtractor:
                 except Exception:
                     pass
 
-    def __init__(self):
-        """Initialize the AudioExtractor."""
+    def __init__(self, use_cache=True):
+        """
+        Initialize the AudioExtractor.
+
+        Args:
+            use_cache: Reuse audio extracted from the same source earlier (see
+                       ExtractionCache; also disabled by FONIXFLOW_EXTRACT_CACHE=0)
+        """
         self.ffmpeg_path = None
         self.ffprobe_path = None
+        self.cache = ExtractionCache() if use_cache and extraction_cache_enabled() else None
         self._check_ffmpeg()
     
     def _check_ffmpeg(self):
@@ -250,6 +647,156 @@ class AudioExtractor:
         """
         return self.get_media_duration(video_path)
     
+    def plan_slices(self, media_path, duration):
+        """
+        Decide how many ffmpeg processes decode a file in extract_audio_array().
+
+        Override with FONIXFLOW_EXTRACT_SLICES (1 = always serial). Otherwise only long
+        video files are sliced - demuxing a big container is where a single ffmpeg
+        spends its time, and audio-only formats don't always seek sample-accurately.
+
+        Args:
+            media_path: Path to the media file
+            duration: Media duration in seconds (None if unknown)
+
+        Returns:
+            int: Number of slices (1 = single ffmpeg process)
+        """
+        if not duration or duration <= 0:
+            return 1
+
+        override = os.environ.get('FONIXFLOW_EXTRACT_SLICES', '').strip()
+        if override:
+            try:
+                return max(1, min(int(override), self.MAX_SLICES))
+            except ValueError:
+                logger.warning(f"Ignoring invalid FONIXFLOW_EXTRACT_SLICES={override!r}")
+
+        if not self.is_video_file(media_path) or duration < self.PARALLEL_MIN_SECONDS:
+            return 1
+        cpu_budget = max(1, (os.cpu_count() or 2) // 2)
+        return max(1, min(self.MAX_SLICES, cpu_budget, int(duration // self.SECONDS_PER_SLICE)))
+
+    def _check_media(self, media_path):
+        """Raise if media_path is missing or has an unsupported extension."""
+        if not media_path.exists():
+            raise FileNotFoundError(f"Media file not found: {media_path}")
+
+        if not self.is_supported_format(media_path):
+            raise ValueError(
+                f"Unsupported media format: {media_path.suffix}. "
+                f"Supported video formats: {', '.join(sorted(self.SUPPORTED_VIDEO_FORMATS))}. "
+                f"Supported audio formats: {', '.join(sorted(self.SUPPORTED_AUDIO_FORMATS))}"
+            )
+
+    def extract_audio_array(self, media_path, sample_rate=16000,
+                            progress_callback=None) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """
+        Decode audio from a media file (video or audio) straight into memory.
+
+        OPTIMIZED: ffmpeg's raw float32 output is piped into a NumPy buffer, so the
+        audio is decoded exactly once. Unlike extract_audio() there is no Opus encode,
+        no validation read-back and no later decode by librosa or Whisper - hand the
+        array to Transcriber.transcribe() or EnhancedTranscriber.transcribe_multilang().
+        Long videos are decoded by several ffmpeg processes at once (see plan_slices()
+        and SliceDecoder); the array is then backed by a temporary memory-mapped file.
+        Decoded audio is kept in the extraction cache, so running the same file again
+        maps the cached samples without starting ffmpeg.
+
+        Args:
+            media_path: Path to the input media file (video or audio)
+            sample_rate: Output sample rate (default: 16000 for Whisper)
+            progress_callback: Optional callback function(message, percentage) for progress updates
+
+        Returns:
+            Tuple of (1-D float32 mono audio, info dict with 'source', 'sample_rate',
+            'channels', 'samples', 'duration', 'slices' and 'cached')
+
+        Raises:
+            ValueError: If media format is not supported
+            RuntimeError: If decoding fails or yields no audio
+        """
+        media_path = Path(media_path)
+        self._check_media(media_path)
+
+        action_present = "Converting" if self.is_audio_file(media_path) else "Extracting"
+        logger.info(f"{action_present} audio from {media_path} to memory (float32 @ {sample_rate}Hz)")
+        if progress_callback:
+            progress_callback(f"{action_present} audio...", 5)
+
+        cache_key = self._cache_key(media_path, f"f32le-{sample_rate}")
+        cached_path = self.cache.get(cache_key, '.f32') if cache_key else None
+        if cached_path:
+            # Copy-on-write mapping: callers may filter the array in place without
+            # touching the cached entry
+            audio = np.memmap(cached_path, dtype=np.float32, mode='c')
+            num_slices = 0
+        else:
+            expected_duration = self.get_media_duration(media_path)
+            num_slices = self.plan_slices(media_path, expected_duration)
+
+            def on_progress(fraction):
+                if progress_callback:
+                    progress_callback(f"{action_present} audio... {int(fraction * 100)}%", 5 + int(fraction * 20))
+
+            audio = None
+            if num_slices > 1:
+                try:
+                    audio = SliceDecoder(
+                        self.ffmpeg_path, str(media_path), expected_duration, num_slices, sample_rate
+                    ).decode(progress_callback=on_progress)
+                except SliceOverflowError as e:
+                    # The single-process decoder grows its buffer as needed
+                    logger.warning(f"{e}; decoding again in one process")
+                    num_slices = 1
+            if audio is None:
+                audio = decode_to_array(
+                    self.ffmpeg_path, str(media_path), sample_rate,
+                    expected_duration=expected_duration, progress_callback=on_progress
+                )
+            if cache_key and len(audio):
+                self._cache_array(audio, cache_key)
+        if len(audio) == 0:
+            raise RuntimeError("Decoded audio contains no samples. The source file may be corrupted or have no audio track.")
+
+        duration = len(audio) / sample_rate
+        logger.info(f"Audio decoded to memory: {len(audio):,} samples ({duration:.1f}s, {audio.nbytes / 1024 / 1024:.1f} MB)")
+        if progress_callback:
+            progress_callback("Audio extracted successfully", 30)
+
+        info = {
+            'source': str(media_path),
+            'sample_rate': sample_rate,
+            'channels': 1,
+            'samples': len(audio),
+            'duration': duration,
+            'slices': num_slices,
+            'cached': bool(cached_path)
+        }
+        return audio, info
+
+    def _cache_key(self, media_path, target):
+        """Extraction cache key for media_path and target, or None if caching is off/unavailable."""
+        if self.cache is None:
+            return None
+        try:
+            return self.cache.make_key(media_path, target)
+        except OSError as e:
+            logger.warning(f"Extraction cache unavailable for {media_path}: {e}")
+            return None
+
+    def _cache_array(self, audio, cache_key):
+        """Store decoded float32 samples as a cache entry (best effort)."""
+        temp_path = None
+        try:
+            temp_path = self.cache.temp_path('.f32')
+            np.ascontiguousarray(audio, dtype=np.float32).tofile(temp_path)
+            self.cache.commit(temp_path, cache_key, '.f32')
+        except OSError as e:
+            logger.warning(f"Could not cache extracted audio: {e}")
+            if temp_path:
+                self.cache.discard(temp_path)
+
     def extract_audio(self, media_path, output_path=None, audio_format='ogg', progress_callback=None):
         """
         Extract or prepare audio from a media file (video or audio).
@@ -273,16 +820,7 @@ class AudioExtractor:
             RuntimeError: If extraction/conversion fails
         """
         media_path = Path(media_path)
-
-        if not media_path.exists():
-            raise FileNotFoundError(f"Media file not found: {media_path}")
-
-        if not self.is_supported_format(media_path):
-            raise ValueError(
-                f"Unsupported media format: {media_path.suffix}. "
-                f"Supported video formats: {', '.join(sorted(self.SUPPORTED_VIDEO_FORMATS))}. "
-                f"Supported audio formats: {', '.join(sorted(self.SUPPORTED_AUDIO_FORMATS))}"
-            )
+        self._check_media(media_path)
 
         # Check if source is already optimal Opus/OGG format (16kHz mono)
         # Opus files are already optimal for Whisper, so we can use them directly
@@ -309,13 +847,24 @@ class AudioExtractor:
             except Exception as e:
                 logger.debug(f"Could not verify WAV format, will convert: {e}")
 
-        # Generate output path if not provided
+        # Generate output path if not provided: a new extraction cache entry (or the
+        # existing one - then ffmpeg and the validation read are skipped entirely)
+        cache_key = None
         if output_path is None:
-            temp_dir = tempfile.gettempdir()
-            output_path = os.path.join(
-                temp_dir,
-                f"{media_path.stem}_audio.{audio_format}"
-            )
+            cache_key = self._cache_key(media_path, audio_format)
+            if cache_key:
+                cached_path = self.cache.get(cache_key, f".{audio_format}")
+                if cached_path:
+                    if progress_callback:
+                        progress_callback("Reusing previously extracted audio", 30)
+                    return cached_path
+                output_path = self.cache.temp_path(f".{audio_format}")
+            else:
+                temp_dir = tempfile.gettempdir()
+                output_path = os.path.join(
+                    temp_dir,
+                    f"{media_path.stem}_audio.{audio_format}"
+                )
         else:
             output_path = Path(output_path)
             output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -381,17 +930,18 @@ class AudioExtractor:
                     output_path
                 ])
 
-            # OPTIMIZED: Show progress during extraction (though ffmpeg progress parsing
-            # would require async processing, so we'll just show intermediate updates)
-            if progress_callback:
-                progress_callback(f"{action_present} audio... Processing", 15)
+            # OPTIMIZED: Real progress from ffmpeg's -progress output (position written
+            # so far against the probed duration)
+            expected_duration = self.get_media_duration(media_path) if progress_callback else None
 
-            result = subprocess.run(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                check=True
-            )
+            def on_seconds(seconds):
+                if progress_callback and expected_duration:
+                    fraction = min(1.0, seconds / expected_duration)
+                    progress_callback(f"{action_present} audio... {int(fraction * 100)}%", 5 + int(fraction * 20))
+
+            returncode, stderr_text = run_ffmpeg_with_progress(cmd, on_seconds)
+            if returncode != 0:
+                raise subprocess.CalledProcessError(returncode, cmd, stderr=stderr_text.encode('utf-8'))
 
             if progress_callback:
                 progress_callback(f"{action_present} audio... Finalizing", 25)
@@ -420,6 +970,9 @@ class AudioExtractor:
             except Exception as e:
                 logger.warning(f"Audio validation failed: {e}, but continuing anyway")
 
+            if cache_key:
+                output_path = self.cache.commit(output_path, cache_key, f".{audio_format}")
+
             logger.info(f"Audio {action_past} successfully to {output_path} (size: {file_size} bytes)")
 
             if progress_callback:
@@ -432,6 +985,10 @@ class AudioExtractor:
             logger.error(f"ffmpeg error: {error_msg}")
             action = "convert" if self.is_audio_file(media_path) else "extract"
             raise RuntimeError(f"Failed to {action} audio: {error_msg}")
+        finally:
+            if cache_key and PARTIAL_MARKER in os.path.basename(output_path):
+                # Failed before commit() - don't leave the unfinished entry behind
+                self.cache.discard(output_path)
     
     def cleanup_temp_file(self, file_path):
         """
@@ -440,6 +997,9 @@ class AudioExtractor:
         Args:
             file_path: Path to the file to delete
         """
+        if self.cache is not None and self.cache.contains(file_path):
+            # Extraction cache entries outlive the job; eviction removes them
+            return
         try:
             if os.path.exists(file_path):
                 os.remove(file_path)
@@ -0,0 +1,253 @@
+"""
+Extraction Cache Module
+
+Persistent cache of extracted audio, so transcribing the same media file again
+(another model size, Deep Scan on/off, a re-export of the transcript) skips
+ffmpeg entirely. Entries are keyed by the source's path, size, mtime and a
+partial content hash plus the target format, written atomically (safe to share
+between concurrent GUI and web jobs) and evicted least-recently-used once the
+cache exceeds its disk quota.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bump when the key composition or the stored audio changes
+CACHE_FORMAT_VERSION = 1
+# Bytes hashed at the start, middle and end of the source
+PARTIAL_HASH_BLOCK = 1024 * 1024
+# Temporary files being written carry this marker before the final suffix
+PARTIAL_MARKER = '.partial'
+
+
+def extraction_cache_enabled() -> bool:
+    """The extraction cache is on unless FONIXFLOW_EXTRACT_CACHE=0."""
+    return os.environ.get('FONIXFLOW_EXTRACT_CACHE', '1').strip() != '0'
+
+
+def partial_content_hash(media_path: str, block_size: int = PARTIAL_HASH_BLOCK) -> str:
+    """
+    Hash the first, middle and last block of a file (plus its size).
+
+    Much cheaper than hashing a multi-GB video, and together with size and mtime
+    enough to tell a re-exported or replaced file from the one that was cached.
+
+    Args:
+        media_path: Path to the source file
+        block_size: Bytes read at each of the three positions
+
+    Returns:
+        str: Hex digest
+    """
+    size = os.path.getsize(media_path)
+    digest = hashlib.sha1(str(size).encode('ascii'))
+    with open(media_path, 'rb') as f:
+        for offset in sorted({0, max(0, size // 2 - block_size // 2), max(0, size - block_size)}):
+            f.seek(offset)
+            digest.update(f.read(block_size))
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """Disk-quota'd, LRU-evicted store of extracted audio files keyed by source fingerprint."""
+
+    DEFAULT_MAX_MB = 2048
+    # Entries used this recently are never evicted - another job may be reading them
+    IN_USE_GRACE_SECONDS = 15 * 60
+
+    def __init__(self, cache_dir: Optional[str] = None, max_mb: Optional[float] = None):
+        """
+        Initialize the extraction cache.
+
+        Args:
+            cache_dir: Directory for entries (None = FONIXFLOW_EXTRACT_CACHE_DIR or
+                       ~/.cache/fonixflow/audio)
+            max_mb: Disk quota (None = FONIXFLOW_EXTRACT_CACHE_MB or DEFAULT_MAX_MB)
+        """
+        self.cache_dir = cache_dir or os.environ.get(
+            'FONIXFLOW_EXTRACT_CACHE_DIR',
+            os.path.join(os.path.expanduser("~"), ".cache", "fonixflow", "audio")
+        )
+        if max_mb is None:
+            try:
+                max_mb = float(os.environ.get('FONIXFLOW_EXTRACT_CACHE_MB', self.DEFAULT_MAX_MB))
+            except ValueError:
+                max_mb = self.DEFAULT_MAX_MB
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(media_path, target: str) -> str:
+        """
+        Build the cache key for a source file and an extraction target.
+
+        Args:
+            media_path: Path to the source media file
+            target: Output description, e.g. 'ogg' or 'f32le-16000'
+
+        Returns:
+            str: Hex digest key
+        """
+        st = os.stat(media_path)
+        fields = {
+            'path': os.path.abspath(str(media_path)),
+            'size': st.st_size,
+            'mtime_ns': st.st_mtime_ns,
+            'partial_hash': partial_content_hash(str(media_path)),
+            'target': target,
+            'format': CACHE_FORMAT_VERSION
+        }
+        payload = json.dumps(fields, sort_keys=True)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    def path_for(self, key: str, suffix: str) -> str:
+        """Final location of an entry (suffix includes the dot, e.g. '.ogg')."""
+        return os.path.join(self.cache_dir, key + suffix)
+
+    def contains(self, path) -> bool:
+        """True if path lives inside the cache directory (callers must not delete it)."""
+        try:
+            return Path(path).resolve().parent == Path(self.cache_dir).resolve()
+        except OSError:
+            return False
+
+    def get(self, key: str, suffix: str) -> Optional[str]:
+        """
+        Return the path of a cached entry, or None on a miss.
+
+        A hit refreshes the entry's access time for LRU eviction.
+        """
+        path = self.path_for(key, suffix)
+        try:
+            if os.path.getsize(path) == 0:
+                self._remove(path)
+                return None
+            os.utime(path, None)
+        except OSError:
+            return None
+        logger.info(f"Extraction cache hit: {os.path.basename(path)}")
+        return path
+
+    def temp_path(self, suffix: str) -> str:
+        """
+        Reserve a temporary file in the cache directory to write an entry into.
+
+        Keeping it on the same filesystem makes commit() an atomic rename. The name
+        keeps the real suffix last, so tools that infer the format (ffmpeg) still can.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, path = tempfile.mkstemp(suffix=PARTIAL_MARKER + suffix, dir=self.cache_dir)
+        os.close(fd)
+        return path
+
+    def commit(self, temp_path: str, key: str, suffix: str) -> str:
+        """
+        Atomically publish a finished temporary file as an entry, then enforce the quota.
+
+        If another job committed the same key first, its file is simply replaced with
+        identical content; readers of the old file keep their open handle.
+
+        Returns:
+            str: Final path of the entry
+        """
+        final_path = self.path_for(key, suffix)
+        try:
+            os.replace(temp_path, final_path)
+        except OSError:
+            # Windows refuses to replace a file another job has open - keep theirs
+            self.discard(temp_path)
+            if not os.path.exists(final_path):
+                raise
+            return final_path
+        logger.info(f"Extracted audio cached: {os.path.basename(final_path)} "
+                    f"({os.path.getsize(final_path) / 1024 / 1024:.1f}MB)")
+        self.evict()
+        return final_path
+
+    def discard(self, temp_path: str):
+        """Remove an unfinished temporary file."""
+        self._remove(temp_path)
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """List committed entries (path, size, last access), most recently used first."""
+        found = []
+        try:
+            names = os.listdir(self.cache_dir)
+        except FileNotFoundError:
+            return []
+        for name in names:
+            if PARTIAL_MARKER in name:
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            found.append({'path': path, 'bytes': st.st_size, 'accessed': st.st_mtime})
+        found.sort(key=lambda e: e['accessed'], reverse=True)
+        return found
+
+    def evict(self) -> int:
+        """Delete least-recently-used entries until the cache fits its quota. Returns count."""
+        with self._lock:
+            self._remove_stale_partials()
+            entries = self.entries()
+            total = sum(e['bytes'] for e in entries)
+            cutoff = time.time() - self.IN_USE_GRACE_SECONDS
+            removed = 0
+            while entries and total > self.max_bytes:
+                oldest = entries.pop()
+                if oldest['accessed'] >= cutoff:
+                    # Everything left was used recently; stay over quota for now
+                    break
+                if self._remove(oldest['path']):
+                    total -= oldest['bytes']
+                    removed += 1
+            if removed:
+                logger.info(f"Extraction cache: evicted {removed} entries (now {total / 1024 / 1024:.1f}MB)")
+            return removed
+
+    def _remove_stale_partials(self, max_age_seconds: float = 24 * 3600):
+        """Delete temporary files left behind by crashed jobs."""
+        try:
+            names = os.listdir(self.cache_dir)
+        except FileNotFoundError:
+            return
+        cutoff = time.time() - max_age_seconds
+        for name in names:
+            if PARTIAL_MARKER not in name:
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    self._remove(path)
+            except OSError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry count and size against the quota."""
+        entries = self.entries()
+        total = sum(e['bytes'] for e in entries)
+        return {
+            'cache_dir': self.cache_dir,
+            'entries': len(entries),
+            'size_mb': round(total / 1024 / 1024, 2),
+            'max_mb': round(self.max_bytes / 1024 / 1024, 2)
+        }
+
+    @staticmethod
+    def _remove(path: str) -> bool:
+        try:
+            os.unlink(path)
+            return True
+        except OSError:
+            return False
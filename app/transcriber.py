@@ -15,6 +15,8 @@ import shutil
 import subprocess
 import platform
 from io import StringIO
+from collections import OrderedDict
+import numpy as np
 
 # Ensure sys.stderr is always a valid stream (prevents NoneType errors in frozen apps)
 if sys.stderr is None:
@@ -57,10 +59,183 @@ _patch_whisper_ffmpeg()
 # This module just uses the logger - no need to configure here
 logger = logging.getLogger(__name__)
 
+
+
+def get_available_memory_mb():
+    """
+    Return the amount of system memory currently available, in MB.
+
+    Uses psutil when installed, otherwise sysconf (Linux/macOS).
+
+    Returns:
+        float: Available memory in MB, or None if it cannot be determined
+    """
+    try:
+        import psutil
+        return psutil.virtual_memory().available / (1024 * 1024)
+    except ImportError:
+        pass
+    except Exception as e:
+        logger.debug(f"psutil memory query failed: {e}")
+
+    try:
+        page_size = os.sysconf('SC_PAGE_SIZE')
+        avail_pages = os.sysconf('SC_AVPHYS_PAGES')
+        return page_size * avail_pages / (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+class ModelCache:
+    """
+    Size-accounted LRU cache of loaded Whisper models shared by all Transcribers.
+
+    Each entry tracks how many Transcribers currently hold the model (references)
+    and an explicit pin count; only entries with neither are evicted, least
+    recently used first, when the total size exceeds the budget. The most recently
+    used model is never evicted, so releasing the only model doesn't drop it. The
+    budget comes from FONIXFLOW_MODEL_CACHE_MB (0 = unbounded), defaulting to half
+    the memory available when the cache is first used.
+    """
+
+    def __init__(self, budget_mb=None):
+        self._entries = OrderedDict()  # model_size -> {'model', 'bytes', 'refs', 'pins'}
+        self._budget_mb = budget_mb
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def budget_bytes(self):
+        """Cache budget in bytes (None = unbounded)."""
+        if self._budget_mb is None:
+            env_budget = os.environ.get('FONIXFLOW_MODEL_CACHE_MB', '').strip()
+            if env_budget:
+                try:
+                    self._budget_mb = float(env_budget)
+                except ValueError:
+                    logger.warning(f"Ignoring invalid FONIXFLOW_MODEL_CACHE_MB={env_budget!r}")
+            if self._budget_mb is None:
+                available_mb = get_available_memory_mb()
+                self._budget_mb = available_mb / 2 if available_mb else 0
+        return int(self._budget_mb * 1024 * 1024) if self._budget_mb > 0 else None
+
+    @staticmethod
+    def _model_bytes(model):
+        """Bytes held by a model's parameters and buffers."""
+        tensors = list(model.parameters()) + list(model.buffers())
+        return sum(t.numel() * t.element_size() for t in tensors)
+
+    def __contains__(self, model_size):
+        return model_size in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def acquire(self, model_size):
+        """Return the cached model (taking a reference), or None on a miss."""
+        entry = self._entries.get(model_size)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        entry['refs'] += 1
+        self._entries.move_to_end(model_size)
+        return entry['model']
+
+    def add(self, model_size, model):
+        """
+        Insert a freshly loaded model (taking a reference) and evict to fit the budget.
+
+        Returns:
+            The cached model - an existing entry wins if another thread loaded it first
+        """
+        entry = self._entries.get(model_size)
+        if entry is not None:
+            entry['refs'] += 1
+            self._entries.move_to_end(model_size)
+            return entry['model']
+        self._entries[model_size] = {'model': model, 'bytes': self._model_bytes(model), 'refs': 1, 'pins': 0}
+        self._evict(keep=model_size)
+        return model
+
+    def release(self, model_size, model):
+        """Drop a reference taken by acquire()/add() for this exact model object."""
+        entry = self._entries.get(model_size)
+        if entry is not None and entry['model'] is model and entry['refs'] > 0:
+            entry['refs'] -= 1
+            self._evict()
+
+    def pin(self, model_size):
+        """Protect a cached model from eviction. Returns False if it isn't cached."""
+        entry = self._entries.get(model_size)
+        if entry is None:
+            return False
+        entry['pins'] += 1
+        return True
+
+    def unpin(self, model_size):
+        """Undo one pin() call."""
+        entry = self._entries.get(model_size)
+        if entry is not None and entry['pins'] > 0:
+            entry['pins'] -= 1
+            self._evict()
+
+    def discard(self, model_size):
+        """Remove an entry regardless of references (e.g. a model with a corrupted kv-cache)."""
+        self._entries.pop(model_size, None)
+
+    def total_bytes(self):
+        return sum(entry['bytes'] for entry in self._entries.values())
+
+    def _evict(self, keep=None):
+        """Evict unreferenced, unpinned entries (LRU first, never the MRU one) until within budget."""
+        budget = self.budget_bytes
+        if budget is None or not self._entries:
+            return
+        most_recent = next(reversed(self._entries))
+        total = self.total_bytes()
+        for model_size in list(self._entries):
+            if total <= budget:
+                break
+            entry = self._entries[model_size]
+            if model_size in (keep, most_recent) or entry['refs'] > 0 or entry['pins'] > 0:
+                continue
+            del self._entries[model_size]
+            total -= entry['bytes']
+            self.evictions += 1
+            logger.info(
+                f"Evicted cached Whisper model '{model_size}' ({entry['bytes'] / 1024 / 1024:.0f}MB) "
+                f"to stay within {budget / 1024 / 1024:.0f}MB cache budget"
+            )
+        if total > budget:
+            logger.debug(f"Model cache over budget ({total / 1024 / 1024:.0f}MB): remaining models are in use or most recent")
+
+    def stats(self):
+        """Hit/miss/eviction counters and per-model accounting."""
+        budget = self.budget_bytes
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size_mb': round(self.total_bytes() / 1024 / 1024, 1),
+            'budget_mb': round(budget / 1024 / 1024, 1) if budget else None,
+            'models': {
+                model_size: {
+                    'size_mb': round(entry['bytes'] / 1024 / 1024, 1),
+                    'refs': entry['refs'],
+                    'pins': entry['pins']
+                }
+                for model_size, entry in self._entries.items()
+            }
+        }
+
+
 # Global cache for loaded Whisper models to prevent reloading
-# Key: model_size (str), Value: whisper.model object
-_GLOBAL_MODEL_CACHE = {}
-_GLOBAL_CACHE_LOCK = threading.Lock()
+# Key: model_size (str); guarded by _GLOBAL_CACHE_LOCK (reentrant: Transcriber.__del__
+# may release a reference while the lock is already held by the same thread)
+_GLOBAL_MODEL_CACHE = ModelCache()
+_GLOBAL_CACHE_LOCK = threading.RLock()
 
 
 class ProgressInterceptor:
@@ -137,6 +312,24 @@ class Transcriber:
         'large': {'cpu': 0.8, 'cuda': 5.5}        # CPU: ~0.8x real-time, GPU: ~5.5x real-time
     }
     
+    # Approximate resident memory of a loaded model incl. inference buffers (MB)
+    # Used to budget how many model copies can run concurrently
+    MODEL_MEMORY_MB = {
+        'tiny': 250,
+        'base': 400,
+        'small': 1100,
+        'medium': 2800,
+        'large': 5500
+    }
+
+    # Sample rate Whisper expects for in-memory audio arrays
+    SAMPLE_RATE = 16000
+
+    # Voice-activity skipping: only for inputs at least this long (seconds), and only
+    # when at least this share of the audio would be skipped
+    VAD_MIN_DURATION = 60.0
+    VAD_MIN_SKIP_RATIO = 0.05
+
     # Model loading time estimates (seconds)
     MODEL_LOAD_TIMES = {
         'tiny': {'cpu': 2, 'cuda': 3},
@@ -146,15 +339,28 @@ class Transcriber:
         'large': {'cpu': 15, 'cuda': 20}
     }
     
-    def __init__(self, model_size='base'):
+    def __init__(self, model_size='base', shared_model=True, use_result_cache=False):
         """
         Initialize the Transcriber.
 
         Args:
             model_size: Size of the Whisper model to use
+            shared_model: If True (default), reuse the process-wide cached model.
+                          If False, load a private copy - needed when several threads
+                          decode concurrently, since Whisper's kv-cache hooks are
+                          installed on the model object itself.
+            use_result_cache: If True, transcribe() returns results from the on-disk
+                              result cache (transcription.result_cache) when the same
+                              audio was transcribed with the same settings before, and
+                              stores new results there. Off for internal helper
+                              instances that transcribe short windows.
         """
         self.model_size = model_size
+        self.shared_model = shared_model
+        self.use_result_cache = use_result_cache
+        self._result_cache_bypass = False  # set while a cached outer call is running
         self.model = None
+        self._cache_ref = None  # model whose cache reference this instance holds
         self.device = self._get_device()
         logger.info(f"Initialized Transcriber with model '{model_size}' using OpenAI Whisper on device '{self.device}'")
     
@@ -261,9 +467,11 @@ class Transcriber:
         try:
             # Check global cache first
             with _GLOBAL_CACHE_LOCK:
-                if self.model_size in _GLOBAL_MODEL_CACHE:
+                cached = _GLOBAL_MODEL_CACHE.acquire(self.model_size) if self.shared_model else None
+                if cached is not None:
                     logger.info(f"Reusing cached Whisper model: {self.model_size}")
-                    self.model = _GLOBAL_MODEL_CACHE[self.model_size]
+                    self.model = cached
+                    self._cache_ref = cached
                     logger.info(f"OpenAI Whisper model '{self.model_size}' loaded successfully (from cache)")
                     if progress_callback:
                         progress_callback("Model loaded successfully")
@@ -301,7 +509,9 @@ class Transcriber:
             
             # Store in cache
             with _GLOBAL_CACHE_LOCK:
-                _GLOBAL_MODEL_CACHE[self.model_size] = model
+                if self.shared_model:
+                    model = _GLOBAL_MODEL_CACHE.add(self.model_size, model)
+                    self._cache_ref = model
                 self.model = model
                 
             logger.info(f"OpenAI Whisper model '{self.model_size}' loaded successfully on {self.device}")
@@ -318,9 +528,14 @@ class Transcriber:
     def transcribe(self, audio_path, language=None, initial_prompt=None, progress_callback=None, word_timestamps=False):
         """
         Transcribe audio file to text.
+
+        With use_result_cache, a cached result for the same audio content and
+        settings is returned before any model load.
         
         Args:
-            audio_path: Path to the audio file
+            audio_path: Path to the audio file, or a 1-D float32 numpy array of
+                        16kHz mono samples (e.g. a view into an in-memory recording).
+                        Arrays are passed to Whisper directly, skipping the ffmpeg decode.
             language: Language code (e.g., 'en', 'es', 'fr'). If None, auto-detect.
             initial_prompt: Optional initial prompt/instructions to guide transcription.
                            Useful for speaker recognition, context, or specific terminology.
@@ -330,9 +545,62 @@ class Transcriber:
         Returns:
             dict: Transcription result with keys: 'text', 'segments', 'language'
         """
-        if not os.path.exists(audio_path):
+        if isinstance(audio_path, np.ndarray):
+            audio_path = self._prepare_audio_array(audio_path)
+        elif not os.path.exists(audio_path):
             raise FileNotFoundError(f"Audio file not found: {audio_path}")
-        
+
+        cache, cache_key = self._result_cache_key(
+            audio_path, mode='transcribe', language=language, initial_prompt=initial_prompt,
+            word_timestamps=word_timestamps
+        )
+        if cache is not None:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                if progress_callback:
+                    try:
+                        progress_callback("Loaded cached transcription", 95)
+                    except TypeError:
+                        progress_callback("Loaded cached transcription")
+                return cached
+
+        result = self._transcribe_uncached(audio_path, language, initial_prompt, progress_callback, word_timestamps)
+
+        if cache is not None:
+            cache.put(
+                cache_key, result,
+                source=audio_path if isinstance(audio_path, str) else f"<array {len(audio_path)} samples>",
+                settings={'model_size': self.model_size, 'language': language, 'word_timestamps': word_timestamps}
+            )
+        return result
+
+    def _result_cache_key(self, audio, **settings):
+        """
+        Resolve the result cache and key for a top-level transcription call.
+
+        Args:
+            audio: Audio path or prepared array
+            **settings: Output-affecting options of the call
+
+        Returns:
+            Tuple of (ResultCache, key), or (None, None) if caching doesn't apply
+        """
+        if not self.use_result_cache or self._result_cache_bypass:
+            return None, None
+        try:
+            from transcription.result_cache import ResultCache, result_cache_enabled
+            from transcription.vad import vad_enabled
+            if not result_cache_enabled():
+                return None, None
+            cache = ResultCache()
+            key = cache.make_key(audio, model_size=self.model_size, vad=vad_enabled(), **settings)
+            return cache, key
+        except Exception as e:
+            logger.warning(f"Result cache unavailable: {e}")
+            return None, None
+
+    def _transcribe_uncached(self, audio_path, language=None, initial_prompt=None, progress_callback=None, word_timestamps=False):
+        """Run Whisper on validated input (see transcribe())."""
         if self.model is None:
             self.load_model(progress_callback)
         
@@ -344,7 +612,10 @@ class Transcriber:
                 # Callback doesn't accept arguments, skip
                 pass
 
-        logger.info(f"Transcribing audio: {audio_path}")
+        if isinstance(audio_path, np.ndarray):
+            logger.info(f"Transcribing in-memory audio: {len(audio_path)} samples ({len(audio_path) / self.SAMPLE_RATE:.1f}s)")
+        else:
+            logger.info(f"Transcribing audio: {audio_path}")
         if initial_prompt:
             logger.info(f"Using initial prompt: {initial_prompt[:100]}...")
 
@@ -368,9 +639,9 @@ class Transcriber:
                 transcribe_kwargs['initial_prompt'] = initial_prompt
 
             # For MPS device, pre-load audio as float32 to avoid float64 conversion errors
-            import numpy as np
+            # (in-memory arrays are already float32 via _prepare_audio_array)
             audio_input = audio_path
-            if self.device == 'mps':
+            if self.device == 'mps' and isinstance(audio_path, str):
                 try:
                     import librosa
                     logger.info("Pre-loading audio as float32 for MPS compatibility...")
@@ -391,6 +662,10 @@ class Transcriber:
                     logger.error(f"Failed to pre-load audio: {e}")
                     raise RuntimeError(f"Failed to load audio file: {e}")
 
+            # Skip silence/music: hand Whisper only the speech regions (long inputs only;
+            # short windows come from callers that already cut around speech)
+            audio_input = self._apply_speech_clips(audio_input, transcribe_kwargs)
+
             # Intercept stderr to capture tqdm progress if callback provided
             if progress_callback:
                 sys.stderr = ProgressInterceptor(original_stderr, progress_callback, base_percent=50, range_percent=45)
@@ -429,6 +704,8 @@ class Transcriber:
                     }
                     # Explicitly disable word_timestamps
                     retry_kwargs['word_timestamps'] = False
+                    if 'clip_timestamps' in transcribe_kwargs:
+                        retry_kwargs['clip_timestamps'] = transcribe_kwargs['clip_timestamps']
                     
                     try:
                         logger.info("Attempting transcription retry with minimal options (no word_timestamps)...")
@@ -442,8 +719,9 @@ class Transcriber:
                             logger.info("Attempting to reload model to clear kv_cache...")
                             # Clear the model cache and reload
                             with _GLOBAL_CACHE_LOCK:
-                                if self.model_size in _GLOBAL_MODEL_CACHE:
-                                    del _GLOBAL_MODEL_CACHE[self.model_size]
+                                if self.shared_model:
+                                    _GLOBAL_MODEL_CACHE.discard(self.model_size)
+                            self._cache_ref = None
                             self.model = None
                             self.load_model(progress_callback=None)
                             
@@ -462,7 +740,9 @@ class Transcriber:
                                     original_device = self.device
                                     self.device = 'cpu'
                                     # Reload model on CPU
-                                    self.model = None
+                                    self.unload_model()
+                                    with _GLOBAL_CACHE_LOCK:
+                                        _GLOBAL_MODEL_CACHE.discard(self.model_size)
                                     self.load_model(progress_callback=None)
                                     
                                     # Try transcription on CPU
@@ -532,6 +812,77 @@ class Transcriber:
                 sys.stderr = original_stderr
             raise RuntimeError(f"Transcription failed: {e}")
     
+    def _apply_speech_clips(self, audio_input, transcribe_kwargs):
+        """
+        Restrict decoding to voice-activity regions via Whisper's clip_timestamps.
+
+        Timestamps stay relative to the full file. Skipped when FONIXFLOW_VAD=0, for
+        inputs shorter than VAD_MIN_DURATION, or when too little would be skipped.
+
+        Args:
+            audio_input: File path or float32 array that will be passed to Whisper
+            transcribe_kwargs: Whisper transcribe kwargs (clip_timestamps is added here)
+
+        Returns:
+            The audio input to use (paths are decoded to an array once, here)
+        """
+        try:
+            from transcription import vad
+        except ImportError:
+            return audio_input
+        if not vad.vad_enabled():
+            return audio_input
+
+        audio = audio_input
+        if isinstance(audio_input, str):
+            try:
+                audio = whisper.load_audio(audio_input)
+            except Exception as e:
+                logger.debug(f"VAD skipped, could not decode audio: {e}")
+                return audio_input
+
+        duration = len(audio) / self.SAMPLE_RATE
+        if duration < self.VAD_MIN_DURATION:
+            return audio
+
+        regions = vad.detect_speech_regions(audio, sample_rate=self.SAMPLE_RATE)
+        stats = vad.speech_stats(regions, duration)
+        if not regions or stats['skipped_ratio'] < self.VAD_MIN_SKIP_RATIO:
+            return audio
+
+        # Bridge short pauses so Whisper keeps its context across sentences
+        regions = vad.merge_close_regions(regions, max_gap=2.0)
+        transcribe_kwargs['clip_timestamps'] = [t for region in regions for t in region]
+        logger.info(
+            f"VAD: decoding {len(regions)} speech regions, skipping {stats['skipped_seconds']:.1f}s "
+            f"of {duration:.1f}s ({stats['skipped_ratio'] * 100:.0f}%)"
+        )
+        return audio
+
+    def _prepare_audio_array(self, audio):
+        """
+        Validate an in-memory audio array and coerce it to what Whisper expects.
+
+        Whisper's log-mel front end requires 1-D float32 samples at 16kHz; float64
+        input breaks on MPS. Contiguous float32 views are returned as-is (no copy).
+
+        Args:
+            audio: numpy array of mono samples
+
+        Returns:
+            np.ndarray: 1-D contiguous float32 array
+
+        Raises:
+            ValueError: If the array is empty or not mono
+        """
+        if audio.ndim == 2 and 1 in audio.shape:
+            audio = audio.reshape(-1)
+        if audio.ndim != 1:
+            raise ValueError(f"Audio array must be mono (1-D), got shape {audio.shape}")
+        if audio.size == 0:
+            raise ValueError("Audio data array is empty")
+        return np.ascontiguousarray(audio, dtype=np.float32)
+
     def format_as_srt(self, transcription_result):
         """
         Format transcription result as SRT subtitle file.
@@ -582,8 +933,51 @@ class Transcriber:
             'model_size': self.model_size,
             'device': self.device,
             'is_loaded': self.model is not None,
-            'cuda_available': torch.cuda.is_available()
+            'cuda_available': torch.cuda.is_available(),
+            'cache': self.get_cache_stats()
         }
+
+    @staticmethod
+    def get_cache_stats():
+        """
+        Get statistics of the process-wide model cache.
+
+        Returns:
+            dict: hits, misses, evictions, size_mb, budget_mb and per-model refs/pins
+        """
+        with _GLOBAL_CACHE_LOCK:
+            return _GLOBAL_MODEL_CACHE.stats()
+
+    @staticmethod
+    def pin_model(model_size):
+        """
+        Keep a cached model resident regardless of the cache budget.
+
+        Returns:
+            bool: True if the model was cached and is now pinned
+        """
+        with _GLOBAL_CACHE_LOCK:
+            return _GLOBAL_MODEL_CACHE.pin(model_size)
+
+    @staticmethod
+    def unpin_model(model_size):
+        """Undo one pin_model() call, making the model evictable again."""
+        with _GLOBAL_CACHE_LOCK:
+            _GLOBAL_MODEL_CACHE.unpin(model_size)
+
+    def unload_model(self):
+        """Drop this instance's model, releasing its reference in the shared cache."""
+        if self._cache_ref is not None:
+            with _GLOBAL_CACHE_LOCK:
+                _GLOBAL_MODEL_CACHE.release(self.model_size, self._cache_ref)
+            self._cache_ref = None
+        self.model = None
+
+    def __del__(self):
+        try:
+            self.unload_model()
+        except Exception:
+            pass
     
     @staticmethod
     def estimate_transcription_time(video_duration_seconds, model_size, device='cpu', model_already_loaded=False):
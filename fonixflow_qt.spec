@@ -80,7 +80,7 @@ hiddenimports = [
     # macOS-specific frameworks (optional, for native system audio)
     'objc', 'Foundation', 'Cocoa', 'AVFoundation', 'ScreenCaptureKit',
     # Application modules
-    'app', 'app.fonixflow_qt', 'app.transcriber', 'app.audio_extractor', 'app.macos_permissions',
+    'app', 'app.fonixflow_qt', 'app.transcriber', 'app.audio_extractor', 'app.audio_filters', 'app.macos_permissions',
     # GUI modules
     'gui', 'gui.main_window', 'gui.theme', 'gui.widgets', 'gui.workers',
     'gui.dialogs', 'gui.utils', 'gui.icons', 'gui.audio_filters', 'gui.vu_meter',
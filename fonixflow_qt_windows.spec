@@ -88,7 +88,7 @@ hiddenimports = [
     'PySide6', 'PySide6.QtCore', 'PySide6.QtGui', 'PySide6.QtWidgets',
     'PySide6.QtSvg', 'PySide6.QtMultimedia',
     # Application modules
-    'app', 'app.fonixflow_qt', 'app.transcriber', 'app.audio_extractor',
+    'app', 'app.fonixflow_qt', 'app.transcriber', 'app.audio_extractor', 'app.audio_filters',
     # GUI modules
     'gui', 'gui.main_window', 'gui.theme', 'gui.widgets', 'gui.workers',
     'gui.dialogs', 'gui.utils', 'gui.icons', 'gui.audio_filters', 'gui.vu_meter',
@@ -99,7 +99,7 @@ hiddenimports = [
     'PySide6', 'PySide6.QtCore', 'PySide6.QtGui', 'PySide6.QtWidgets',
     'PySide6.QtSvg', 'PySide6.QtMultimedia',
     # Application modules
-    'app', 'app.fonixflow_qt', 'app.transcriber', 'app.audio_extractor',
+    'app', 'app.fonixflow_qt', 'app.transcriber', 'app.audio_extractor', 'app.audio_filters',
     # GUI modules
     'gui', 'gui.main_window', 'gui.theme', 'gui.widgets', 'gui.workers',
     'gui.dialogs', 'gui.utils', 'gui.icons', 'gui.audio_filters', 'gui.vu_meter',
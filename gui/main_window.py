@@ -19,11 +19,11 @@ from PySide6.QtWidgets import (  # type: ignore
     QComboBox, QCheckBox, QGroupBox, QSystemTrayIcon, QSizePolicy
 )
 from PySide6.QtCore import Qt, QTimer, QEvent, QCoreApplication, QThread, Signal  # type: ignore
-from PySide6.QtGui import QPalette, QIcon, QAction  # type: ignore
+from PySide6.QtGui import QPalette, QIcon, QAction, QTextCursor  # type: ignore
 
 from gui.theme import Theme
 from gui.widgets import ModernButton, Card, DropZone, VUMeter, ModernTabBar, CollapsibleSidebar
-from gui.workers import RecordingWorker, TranscriptionWorker, AudioPreviewWorker
+from gui.workers import RecordingWorker, TranscriptionWorker, AudioPreviewWorker, LiveTranscriptionWorker
 from gui.dialogs import MultiLanguageChoiceDialog, RecordingDialog, LogsDialog, LicenseLimitationsDialog
 from gui.utils import check_audio_input_devices, get_platform, get_platform_audio_setup_help, has_gpu_available
 from gui.managers import SettingsManager, ThemeManager, FileManager
@@ -112,6 +112,10 @@ class FonixFlowQt(QMainWindow):
 
         # Transcription settings
         self.enable_deep_scan = self.settings_manager.get("enable_deep_scan", False)
+        self.enable_live_transcription = self.settings_manager.get("enable_live_transcription", False)
+        self.enable_parallel_transcription = self.settings_manager.get("enable_parallel_transcription", False)
+        self.live_transcription_worker = None
+        self.live_committed_text = ""
 
         # State
         self.video_path = None
@@ -154,6 +158,14 @@ class FonixFlowQt(QMainWindow):
         )
         deep_scan_btn.setToolTip("Segments audio into chunks for accurate multi-language detection (slower but more accurate)")
         transcription_options_layout.addWidget(deep_scan_btn)
+        live_transcription_btn = self.create_toggle_option_btn(
+            "mic", "Live Transcript",
+            self.enable_live_transcription,
+            self.toggle_live_transcription,
+            indent=32
+        )
+        live_transcription_btn.setToolTip("Transcribes while recording, so the transcript is ready moments after you stop")
+        transcription_options_layout.addWidget(live_transcription_btn)
 
         logger.info("Calling setup_ui() in FonixFlowQt __init__")
         self.setup_ui()
@@ -511,7 +523,8 @@ class FonixFlowQt(QMainWindow):
         self.settings_manager.save_settings(
             theme_mode=self.theme_mode,
             enable_audio_filters=self.enable_audio_filters,
-            enable_deep_scan=self.enable_deep_scan
+            enable_deep_scan=self.enable_deep_scan,
+            enable_live_transcription=self.enable_live_transcription
         )
 
     def check_runtime_compat(self):
@@ -898,6 +911,16 @@ class FonixFlowQt(QMainWindow):
             checkmark_icon = "check-circle" if self.enable_deep_scan else "square"
             self.deep_scan_btn.setIcon(get_icon(checkmark_icon))
             settings_buttons_row.addWidget(self.deep_scan_btn)
+        if len(transcription_buttons) > 1:
+            self.live_transcription_btn = transcription_buttons[1]  # Store reference for icon updates
+            style_settings_btn(self.live_transcription_btn)
+            # Set consistent sizing - must be after stylesheet to override any CSS
+            self.live_transcription_btn.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
+            self.live_transcription_btn.setFixedSize(180, 50)
+            # Ensure icon shows correct initial state
+            checkmark_icon = "check-circle" if self.enable_live_transcription else "square"
+            self.live_transcription_btn.setIcon(get_icon(checkmark_icon))
+            settings_buttons_row.addWidget(self.live_transcription_btn)
         
         # Add Activation button
         self.activate_btn = ModernButton(self.tr("Activate"))
@@ -1066,6 +1089,14 @@ class FonixFlowQt(QMainWindow):
         )
         deep_scan_btn.setToolTip("Segments audio into chunks for accurate multi-language detection (slower but more accurate)")
         transcription_options_layout.addWidget(deep_scan_btn)
+        live_transcription_btn = self.create_toggle_option_btn(
+            "mic", "Live Transcript",
+            self.enable_live_transcription,
+            self.toggle_live_transcription,
+            indent=32
+        )
+        live_transcription_btn.setToolTip("Transcribes while recording, so the transcript is ready moments after you stop")
+        transcription_options_layout.addWidget(live_transcription_btn)
 
         settings_content_layout.addWidget(self.transcription_options_widget)
 
@@ -1243,6 +1274,28 @@ class FonixFlowQt(QMainWindow):
 
         logger.info(f"Deep scan {'enabled' if self.enable_deep_scan else 'disabled'}")
 
+    def toggle_live_transcription(self):
+        """Toggle live transcription during recording on/off."""
+        self.enable_live_transcription = not self.enable_live_transcription
+        self.save_settings()
+
+        # Update button visual - use stored reference if available
+        checkmark_icon = "check-circle" if self.enable_live_transcription else "square"
+        if hasattr(self, 'live_transcription_btn') and self.live_transcription_btn:
+            label = self.live_transcription_btn.property("label") or "Live Transcript"
+            self.live_transcription_btn.setText(f"  {self.tr(label)}")
+            self.live_transcription_btn.setIcon(get_icon(checkmark_icon))
+        else:
+            # Fallback to widget search if button not stored
+            for child in self.transcription_options_widget.findChildren(QPushButton):
+                if "Live Transcript" in child.text():
+                    label = child.property("label") or "Live Transcript"
+                    child.setText(f"  {self.tr(label)}")
+                    child.setIcon(get_icon(checkmark_icon))
+                    break
+
+        logger.info(f"Live transcription {'enabled' if self.enable_live_transcription else 'disabled'}")
+
     def create_sidebar(self):
         """Create sidebar navigation widget."""
         sidebar = QListWidget()
@@ -1650,6 +1703,11 @@ class FonixFlowQt(QMainWindow):
         # Stop audio preview worker to avoid conflicts
         self.stop_audio_preview()
 
+        # Transcribe while recording, if enabled
+        block_listener = None
+        if self.enable_live_transcription:
+            block_listener = self.start_live_transcription()
+
         # Start actual recording in QThread worker with default devices
         self.recording_worker = RecordingWorker(
             output_dir=self.settings["recordings_dir"],
@@ -1657,6 +1715,7 @@ class FonixFlowQt(QMainWindow):
             speaker_device=None,  # Use default
             enable_filters=self.enable_audio_filters,  # Audio filters setting
             time_limit=self.recording_time_limit,
+            block_listener=block_listener,
             parent=self
         )
         self.recording_worker.recording_complete.connect(self.on_recording_complete)
@@ -1665,6 +1724,81 @@ class FonixFlowQt(QMainWindow):
         self.recording_worker.status_update.connect(self.on_recording_status_update)
         self.recording_worker.start()
 
+    def start_live_transcription(self):
+        """
+        Start transcribing the recording as it is captured.
+
+        Returns:
+            Callable the recorder hands each saved block to, or None if live mode can't start
+        """
+        if self.live_transcription_worker and self.live_transcription_worker.isRunning():
+            self.live_transcription_worker.cancel()
+        # Live mode has no language dialog; English recordings get the faster .en model
+        if getattr(self, 'single_language_type', None) == 'english':
+            model_size, language = "small.en", "en"
+        else:
+            model_size, language = "base", None
+
+        self.live_committed_text = ""
+        self.basic_result_text.clear()
+        self.basic_save_btn.setEnabled(False)
+        self.transcription_start_time = None
+
+        self.live_transcription_worker = LiveTranscriptionWorker(
+            model_size=model_size,
+            language=language,
+            parent=self
+        )
+        self.live_transcription_worker.segments_committed.connect(self.on_live_segments_committed)
+        self.live_transcription_worker.tail_updated.connect(self.on_live_tail_updated)
+        self.live_transcription_worker.transcription_complete.connect(self.on_live_transcription_complete)
+        self.live_transcription_worker.transcription_error.connect(self.on_live_transcription_error)
+        self.live_transcription_worker.start()
+        logger.info(f"Started live transcription: model={model_size}, language={language}")
+        return self.live_transcription_worker.feed
+
+    def on_live_segments_committed(self, segments: list):
+        """Append newly committed live segments to the transcript (worker signal)."""
+        text = ' '.join(seg.get('text', '') for seg in segments).strip()
+        if text:
+            self.live_committed_text = f"{self.live_committed_text} {text}".strip()
+        self.on_live_tail_updated("")
+
+    def on_live_tail_updated(self, tail: str):
+        """Show committed live text plus the still-changing tail (worker signal)."""
+        if not hasattr(self, 'basic_result_text'):
+            return
+        display_text = self.live_committed_text
+        if tail:
+            display_text = f"{display_text} {tail}".strip()
+        # Word limit for unlicensed users (500 words), as for finished transcriptions
+        if not self.license_valid:
+            words = display_text.split()
+            if len(words) > 500:
+                display_text = " ".join(words[:500]) + "\n\n" + self.tr(
+                    "[TRUNCATED: Free version limit is 500 words. Activate a license for unlimited transcription.]"
+                )
+        self.basic_result_text.setPlainText(display_text)
+        self.basic_result_text.moveCursor(QTextCursor.End)
+
+    def on_live_transcription_complete(self, result: dict):
+        """The recording's transcript is complete; show it like a regular transcription."""
+        self.live_transcription_worker = None
+        if hasattr(self, 'transcribe_recording_btn'):
+            self.transcribe_recording_btn.hide()
+        self.basic_record_progress_bar.hide()
+        self.basic_record_progress_label.setText(self.tr("Live transcription complete."))
+        self.basic_record_progress_label.setStyleSheet(f"font-size: 13px; color: {Theme.get('success', self.is_dark_mode)};")
+        self.on_transcription_complete(result)
+
+    def on_live_transcription_error(self, error_message: str):
+        """Live mode failed; the recording can still be transcribed manually."""
+        logger.warning(error_message)
+        self.live_transcription_worker = None
+        self.statusBar().showMessage(error_message)
+        if hasattr(self, 'transcribe_recording_btn') and not self.is_recording and self.video_path:
+            self.transcribe_recording_btn.show()
+
     def stop_basic_recording(self):
         """Stop recording in Basic Mode."""
         self.is_recording = False
@@ -1729,6 +1863,11 @@ class FonixFlowQt(QMainWindow):
                     checkmark_icon = "check-circle" if self.enable_deep_scan else "square"
                     child.setText(f"  {label}")
                     child.setIcon(get_icon(checkmark_icon))
+                elif "Live Transcript" in child.text():
+                    label = self.tr("Live Transcript")
+                    checkmark_icon = "check-circle" if self.enable_live_transcription else "square"
+                    child.setText(f"  {label}")
+                    child.setIcon(get_icon(checkmark_icon))
         # Update info label in record tab
         if hasattr(self, 'info_label'):
             self.info_label.setText(self.tr("Recording will use the system's default microphone and audio output."))
@@ -1850,8 +1989,13 @@ class FonixFlowQt(QMainWindow):
         self.basic_record_progress_label.setText(f"Recording complete ({duration:.1f}s). Ready for manual transcription.")
         self.basic_record_progress_label.setStyleSheet(f"font-size: 13px; color: {Theme.get('success', self.is_dark_mode)};")
 
-        # Show manual transcribe button
-        if hasattr(self, 'transcribe_recording_btn'):
+        if self.live_transcription_worker:
+            # Everything but the last window is already transcribed
+            self.live_transcription_worker.finish_stream()
+            self.basic_record_progress_label.setText(
+                f"Recording complete ({duration:.1f}s). Finishing live transcription...")
+        elif hasattr(self, 'transcribe_recording_btn'):
+            # Show manual transcribe button
             self.transcribe_recording_btn.show()
 
         # Restart audio preview worker for VU meters
@@ -1888,6 +2032,10 @@ class FonixFlowQt(QMainWindow):
         self.basic_record_progress_label.setText(f"Error: {error_message}")
         self.basic_record_progress_label.setStyleSheet(f"font-size: 13px; color: {Theme.get('error', self.is_dark_mode)};")
 
+        if self.live_transcription_worker:
+            self.live_transcription_worker.cancel()
+            self.live_transcription_worker = None
+
         # Reset recording state
         self.is_recording = False
         self.recording_timer.stop()
@@ -2061,6 +2209,7 @@ class FonixFlowQt(QMainWindow):
             detect_language_changes=detect_language_changes,
             use_deep_scan=use_deep_scan,
             enable_filters=self.enable_audio_filters,
+            use_parallel=self.enable_parallel_transcription,
             parent=self
         )
         # Pass allowed languages to worker if multi-language
@@ -31,6 +31,8 @@ class SettingsManager:
             "theme_mode": "dark",  # auto, light, dark (default: dark)
             "enable_audio_filters": True,  # Audio processing filters (default ON)
             "enable_deep_scan": False,  # Deep scan for transcription (default OFF)
+            "enable_live_transcription": False,  # Transcribe while recording (default OFF)
+            "enable_parallel_transcription": False,  # Shard long files across CPU worker processes (default OFF)
             "license_key": None  # LemonSqueezy license key (default: None)
         }
         self.settings = self.load_settings()
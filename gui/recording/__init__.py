@@ -7,7 +7,9 @@ Supports:
 """
 
 from .base import RecordingBackend, RecordingResult
-from .audio_processor import AudioProcessor
+from .audio_processor import AudioProcessor, StreamResampler, StreamMixer
+from .ring_buffer import AudioRingBuffer
+from .streaming_recorder import StreamingRecorder, recover_partial_recordings
 from .sounddevice_backend import SoundDeviceBackend
 
 # Try to import ScreenCaptureKit backend (macOS only)
@@ -22,6 +24,11 @@ __all__ = [
     'RecordingBackend',
     'RecordingResult',
     'AudioProcessor',
+    'StreamResampler',
+    'StreamMixer',
+    'AudioRingBuffer',
+    'StreamingRecorder',
+    'recover_partial_recordings',
     'SoundDeviceBackend',
     'ScreenCaptureKitBackend',
     'HAS_SCREENCAPTUREKIT',
@@ -2,6 +2,7 @@
 Audio processing utilities for normalization, resampling, and mixing.
 """
 
+import math
 import logging
 import numpy as np
 from typing import Optional
@@ -109,13 +110,17 @@ class AudioProcessor:
         """
         Resample audio from one sample rate to another.
 
+        Thin wrapper around StreamResampler: the input is fed in blocks and the
+        output written into one preallocated array, so no full-length temporaries
+        are created. The result matches scipy.signal.resample_poly.
+
         Args:
             audio_data: Input audio data
             from_rate: Source sample rate
             to_rate: Target sample rate
 
         Returns:
-            Resampled audio data
+            Resampled audio data, shape (n, 1)
 
         Raises:
             ValueError: If resampling fails
@@ -126,31 +131,32 @@ class AudioProcessor:
         if not from_rate or not to_rate or int(from_rate) == int(to_rate):
             return audio_data
 
-        try:
-            from scipy.signal import resample_poly
-            import math
-
-            fr = int(from_rate)
-            tr = int(to_rate)
-            g = math.gcd(fr, tr)
-            up = tr // g
-            down = fr // g
-            mono = audio_data.squeeze()
+        mono = audio_data.reshape(len(audio_data), -1)
+        if mono.shape[1] > 1:
+            mono = mono.mean(axis=1)
+        mono = mono.reshape(-1)
 
-            logger.debug(f"Resampling: {fr}Hz -> {tr}Hz (up={up}, down={down}), "
-                        f"input shape: {audio_data.shape}")
-
-            y = resample_poly(mono, up, down)
-            result = y.reshape(-1, 1)
+        try:
+            resampler = StreamResampler(from_rate, to_rate)
+            logger.debug(f"Resampling: {resampler.from_rate}Hz -> {resampler.to_rate}Hz "
+                         f"(up={resampler.up}, down={resampler.down}), input shape: {audio_data.shape}")
+
+            result = np.empty((resampler.output_length(len(mono)), 1), dtype=np.float32)
+            pos = 0
+            for start in range(0, len(mono), StreamResampler.MAX_BLOCK_FRAMES):
+                y = resampler.process(mono[start:start + StreamResampler.MAX_BLOCK_FRAMES])
+                result[pos:pos + len(y), 0] = y
+                pos += len(y)
+            y = resampler.flush()
+            result[pos:pos + len(y), 0] = y
 
             logger.debug(f"Resample result shape: {result.shape}")
             return result
 
         except Exception as e:
-            logger.warning(f"resample_poly failed ({e}), falling back to linear interpolation")
+            logger.warning(f"Polyphase resampling failed ({e}), falling back to linear interpolation")
 
             try:
-                mono = audio_data.squeeze()
                 new_len = int(round(len(mono) * float(to_rate) / float(from_rate)))
                 x_old = np.linspace(0, 1, len(mono), endpoint=False)
                 x_new = np.linspace(0, 1, new_len, endpoint=False)
@@ -171,6 +177,10 @@ class AudioProcessor:
         """
         Mix microphone and speaker audio into a single stream.
 
+        Thin wrapper around StreamMixer: both streams are fed side by side in
+        blocks and the mixed blocks written into one preallocated array, so the
+        shorter stream is never padded to full length in memory.
+
         Args:
             mic_data: Microphone audio data
             speaker_data: Speaker audio data (can be None)
@@ -179,44 +189,51 @@ class AudioProcessor:
             target_rate: Target sample rate for output
 
         Returns:
-            Mixed audio at target sample rate
+            Mixed audio at target sample rate, shape (n, 1)
         """
         logger.info(f"Mixing audio - Mic: {mic_data.shape if mic_data is not None else 'None'}, "
                    f"Speaker: {speaker_data.shape if speaker_data is not None else 'None'}")
 
-        # Resample mic to final rate if needed
-        if mic_rate and mic_rate != target_rate:
-            logger.info(f"Resampling mic from {mic_rate}Hz to {target_rate}Hz")
-            mic_data = AudioProcessor.resample(mic_data, mic_rate, target_rate)
-
-        # If no speaker data, return mic only
-        if speaker_data is None or speaker_data.size == 0:
+        mic_rate = mic_rate or target_rate
+        speaker_rate = speaker_rate or target_rate
+        streams = [('mic', mic_data, mic_rate)]
+        if speaker_data is not None and speaker_data.size > 0:
+            streams.append(('speaker', speaker_data, speaker_rate))
+        else:
             logger.info("No speaker data, using mic-only")
-            return mic_data
-
-        # Resample speaker to final rate if needed
-        if speaker_rate and speaker_rate != target_rate:
-            logger.info(f"Resampling speaker from {speaker_rate}Hz to {target_rate}Hz")
-            speaker_data = AudioProcessor.resample(speaker_data, speaker_rate, target_rate)
-            logger.info(f"Speaker data shape after resample: {speaker_data.shape}")
-
-        # Align lengths before mixing
-        logger.info(f"Aligning audio lengths - Mic: {len(mic_data)}, Speaker: {len(speaker_data)}")
-        max_len = max(len(mic_data), len(speaker_data))
-
-        if len(mic_data) < max_len:
-            mic_data = np.pad(mic_data, ((0, max_len - len(mic_data)), (0, 0)))
-
-        if len(speaker_data) < max_len:
-            speaker_data = np.pad(speaker_data, ((0, max_len - len(speaker_data)), (0, 0)))
-
-        logger.info(f"Mixing audio - Mic shape: {mic_data.shape}, Speaker shape: {speaker_data.shape}")
 
-        # Mix by averaging to prevent clipping before normalization
-        final_data = (mic_data + speaker_data) / 2.0
-
-        logger.info(f"Mixed audio shape: {final_data.shape}")
-        return final_data
+        mixer = StreamMixer(target_rate)
+        total = 0
+        for _, data, rate in streams:
+            if data is not None:
+                total = max(total, StreamResampler(rate, target_rate).output_length(len(data)))
+        result = np.empty((total, 1), dtype=np.float32)
+
+        # Feed equal durations of each stream per step so pending audio stays small
+        step_seconds = StreamResampler.MAX_BLOCK_FRAMES / max(rate for _, _, rate in streams)
+        longest = max((len(data) / rate for _, data, rate in streams if data is not None), default=0.0)
+        pos = 0
+        t = 0.0
+        while True:
+            for stream, data, rate in streams:
+                if data is None:
+                    continue
+                first, last = int(round(t * rate)), int(round((t + step_seconds) * rate))
+                if first < len(data):
+                    mixer.add(stream, data[first:last], rate)
+                    if last >= len(data):
+                        # Queue the filter tail before the other stream's audio is mixed past it
+                        mixer.flush(stream)
+            t += step_seconds
+            final = t >= longest
+            for block in mixer.blocks(final=final):
+                result[pos:pos + len(block), 0] = block
+                pos += len(block)
+            if final:
+                break
+
+        logger.info(f"Mixed audio shape: {result[:pos].shape}")
+        return result[:pos]
 
     @staticmethod
     def apply_safety_limiting(audio_data: np.ndarray, max_level: float = 0.98) -> np.ndarray:
@@ -238,3 +255,224 @@ class AudioProcessor:
             audio_data = audio_data / max_val * max_level
 
         return audio_data
+
+
+def _kaiser_lowpass(numtaps: int, cutoff: float, beta: float = 5.0) -> np.ndarray:
+    """
+    Windowed-sinc lowpass FIR, identical to scipy.signal.firwin(numtaps, cutoff,
+    window=('kaiser', beta)) with cutoff relative to Nyquist and unity DC gain.
+    """
+    m = np.arange(numtaps) - 0.5 * (numtaps - 1)
+    h = cutoff * np.sinc(cutoff * m) * np.kaiser(numtaps, beta)
+    return h / h.sum()
+
+
+class StreamResampler:
+    """
+    Stateful polyphase resampler for audio arriving in blocks.
+
+    Uses the same anti-aliasing filter and alignment as scipy.signal.resample_poly,
+    so concatenating the outputs of process() and flush() matches resampling the
+    whole signal at once, while only the filter's history (tens of samples) is kept
+    between blocks.
+    """
+
+    # Longer blocks are processed in pieces of this size to bound the working memory
+    MAX_BLOCK_FRAMES = 1 << 16
+
+    def __init__(self, from_rate: int, to_rate: int):
+        """
+        Initialize the resampler.
+
+        Args:
+            from_rate: Input sample rate
+            to_rate: Output sample rate
+        """
+        self.from_rate = int(from_rate)
+        self.to_rate = int(to_rate)
+        g = math.gcd(self.from_rate, self.to_rate)
+        self.up = self.to_rate // g
+        self.down = self.from_rate // g
+        self.passthrough = self.up == self.down
+
+        max_rate = max(self.up, self.down)
+        half_len = 10 * max_rate
+        h = _kaiser_lowpass(2 * half_len + 1, 1.0 / max_rate) * self.up
+        # Pad the front so the filter delay is a whole number of output samples
+        n_pre_pad = self.down - half_len % self.down
+        self._pre_remove = (half_len + n_pre_pad) // self.down
+        h = np.concatenate((np.zeros(n_pre_pad), h))
+
+        # Polyphase bank: row p holds the taps applied for output phase p, reversed
+        # so they line up with an ascending window of input samples
+        self.taps = -(-len(h) // self.up)
+        bank = np.zeros(self.taps * self.up)
+        bank[:len(h)] = h
+        self._bank = bank.reshape(self.taps, self.up).T[:, ::-1].copy()
+
+        self._history = np.zeros(self.taps - 1)
+        self._n_in = 0  # Input samples received
+        self._n_out = 0  # Output samples produced
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """
+        Resample the next block of mono audio.
+
+        Args:
+            block: (n,) or (n, 1) samples
+
+        Returns:
+            1-D float32 output samples that became computable with this block
+        """
+        block = np.asarray(block, dtype=np.float64).reshape(-1)
+        if self.passthrough:
+            return block.astype(np.float32)
+        if len(block) == 0:
+            return np.zeros(0, dtype=np.float32)
+        if len(block) > self.MAX_BLOCK_FRAMES:
+            return np.concatenate([self.process(block[i:i + self.MAX_BLOCK_FRAMES])
+                                   for i in range(0, len(block), self.MAX_BLOCK_FRAMES)])
+        start = self._n_in
+        self._n_in += len(block)
+        # Outputs whose taps only reach inputs received so far
+        end = (self._n_in * self.up - 1) // self.down - self._pre_remove + 1
+        return self._run(block, start, end)
+
+    def output_length(self, n_in: int) -> int:
+        """Total output samples for n_in input samples (same as resample_poly)."""
+        return -(-n_in * self.up // self.down)
+
+    def flush(self) -> np.ndarray:
+        """
+        Return the remaining output (the filter's tail) once the input has ended.
+        """
+        if self.passthrough:
+            return np.zeros(0, dtype=np.float32)
+        return self._run(np.zeros(self.taps + 1), self._n_in, self.output_length(self._n_in))
+
+    def _run(self, block: np.ndarray, start: int, end: int) -> np.ndarray:
+        """Compute outputs up to end from the kept history plus block (input index start onwards)."""
+        buf = np.concatenate((self._history, block))
+        buf_start = start - len(self._history)  # Input index of buf[0]; negative indices are silence
+
+        out = np.zeros(0, dtype=np.float32)
+        if end > self._n_out:
+            u = (np.arange(self._n_out, end) + self._pre_remove) * self.down
+            windows = np.lib.stride_tricks.sliding_window_view(buf, self.taps)
+            rows = windows[u // self.up - (self.taps - 1) - buf_start]
+            out = np.einsum('mk,mk->m', rows, self._bank[u % self.up]).astype(np.float32)
+            self._n_out = end
+
+        self._history = buf[len(buf) - (self.taps - 1):]
+        return out
+
+
+class StreamMixer:
+    """
+    Resamples microphone and speaker audio arriving in blocks and mixes them into
+    fixed-size mono blocks at the target rate.
+
+    Only audio one stream has received ahead of the other is kept between calls.
+    Streams are aligned at their start; a stream that stalls for longer than
+    max_lag_seconds (or never starts) is treated as silence.
+    """
+
+    def __init__(self, target_rate: int = 16000, block_seconds: float = 0.5,
+                 max_lag_seconds: float = 3.0):
+        """
+        Initialize the mixer.
+
+        Args:
+            target_rate: Output sample rate
+            block_seconds: Length of the mixed blocks
+            max_lag_seconds: How far one stream may run ahead before the other is
+                             treated as silent
+        """
+        self.target_rate = target_rate
+        self.block_frames = int(block_seconds * target_rate)
+        self.max_lag_frames = int(max_lag_seconds * target_rate)
+        self._resamplers = {'mic': None, 'speaker': None}
+        self._pending = {'mic': np.zeros(0, dtype=np.float32), 'speaker': np.zeros(0, dtype=np.float32)}
+        self.speaker_active = False
+        self.mixed_frames = 0
+
+    def add(self, stream: str, audio: np.ndarray, rate: int):
+        """
+        Resample and queue a block of one stream.
+
+        Args:
+            stream: 'mic' or 'speaker'
+            audio: (n,) or (n, channels) samples; channels are averaged
+            rate: Sample rate of audio (fixed per stream)
+        """
+        if audio.ndim == 2 and audio.shape[1] > 1:
+            audio = audio.mean(axis=1)
+        resampler = self._resamplers[stream]
+        if resampler is None:
+            resampler = self._resamplers[stream] = StreamResampler(rate, self.target_rate)
+            logger.info(f"Streaming {stream} audio: {rate}Hz -> {self.target_rate}Hz")
+        self._append(stream, resampler.process(audio))
+
+    def flush(self, stream: Optional[str] = None):
+        """
+        Queue a resampler's tail once its input has ended.
+
+        Args:
+            stream: 'mic' or 'speaker' (None = both)
+        """
+        for name, resampler in self._resamplers.items():
+            if resampler is not None and stream in (None, name):
+                self._append(name, resampler.flush())
+                self._resamplers[name] = None
+
+    def _append(self, stream: str, samples: np.ndarray):
+        if len(samples) == 0:
+            return
+        if stream == 'speaker':
+            self.speaker_active = True
+        self._pending[stream] = np.concatenate((self._pending[stream], samples))
+
+    def _take(self, stream: str, frames: int) -> np.ndarray:
+        """Pop frames from a stream's pending audio, padding with silence if it has fewer."""
+        pending = self._pending[stream]
+        taken = pending[:frames]
+        self._pending[stream] = pending[frames:]
+        if len(taken) < frames:
+            taken = np.pad(taken, (0, frames - len(taken)))
+        return taken
+
+    def blocks(self, final: bool = False):
+        """
+        Yield every complete mixed block (everything, with a shorter last block, if final).
+
+        Args:
+            final: Both inputs have ended (call flush() first)
+        """
+        while True:
+            mic = len(self._pending['mic'])
+            speaker = len(self._pending['speaker'])
+            if final:
+                frames = min(self.block_frames, max(mic, speaker))
+                if frames == 0:
+                    return
+            elif not self.speaker_active:
+                # Give the system audio stream time to start before going mic-only
+                lag = 0 if self.mixed_frames else self.max_lag_frames
+                if mic < self.block_frames + lag:
+                    return
+                frames = self.block_frames
+            elif min(mic, speaker) >= self.block_frames:
+                frames = self.block_frames
+            elif max(mic, speaker) >= self.block_frames + self.max_lag_frames:
+                # One stream stalled; keep going and treat its gap as silence
+                frames = self.block_frames
+            else:
+                return
+
+            if self.speaker_active:
+                # Mix by averaging to prevent clipping before normalization
+                block = (self._take('mic', frames) + self._take('speaker', frames)) / 2.0
+            else:
+                block = self._take('mic', frames)
+            self.mixed_frames += frames
+            yield block
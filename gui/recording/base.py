@@ -10,7 +10,13 @@ import numpy as np
 
 @dataclass
 class RecordingResult:
-    """Result of a recording session."""
+    """
+    Result of a recording session.
+
+    mic_data/speaker_data hold the audio still in the backend's ring buffers when
+    capture stopped; frames a consumer already read (e.g. StreamingRecorder) are
+    not repeated. Chunk counts always cover the whole session.
+    """
     mic_data: np.ndarray  # Audio data from microphone
     speaker_data: Optional[np.ndarray]  # Audio data from system/speaker (if available)
     mic_sample_rate: int  # Sample rate of mic recording
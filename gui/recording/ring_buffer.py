@@ -0,0 +1,228 @@
+"""
+Single-producer/single-consumer float32 ring buffer for captured audio.
+
+Audio callbacks (PortAudio, WASAPI, ScreenCaptureKit) write into preallocated
+fixed-size blocks instead of appending a fresh copy of every chunk to a list.
+The buffer grows by adding blocks, so growing never moves samples already
+written, and blocks a consumer has finished with are recycled for new writes.
+
+Threading model: exactly one thread writes (the audio callback) and exactly one
+thread reads (a worker or the thread that stops the recording). No locks are
+taken; the producer publishes a frame only after its samples are written, and
+the consumer only touches frames below the published write position. Dict and
+deque operations used for block bookkeeping are atomic under the GIL.
+"""
+
+import logging
+from collections import deque
+from typing import List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# One minute at 48kHz; recordings shorter than this need no copy at all on stop
+DEFAULT_BLOCK_FRAMES = 48000 * 60
+
+
+class AudioRingBuffer:
+    """Growable block ring of float32 frames with zero-copy reads."""
+
+    def __init__(self, channels: int = 1, block_frames: int = DEFAULT_BLOCK_FRAMES,
+                 spare_blocks: int = 1):
+        """
+        Initialize the buffer and preallocate its first block.
+
+        Args:
+            channels: Channels per frame; multi-channel writes into a mono buffer
+                      are downmixed by averaging
+            block_frames: Frames per storage block
+            spare_blocks: Consumed blocks kept for reuse instead of being freed
+        """
+        self.channels = channels
+        self.block_frames = int(block_frames)
+        self.spare_blocks = spare_blocks
+        self._blocks = {0: self._new_block()}
+        self._spare = deque()
+        self._write_pos = 0
+        self._read_pos = 0
+        self._last_write = 0
+        self.writes = 0  # Number of write() calls, i.e. callback chunks received
+
+    def _new_block(self) -> np.ndarray:
+        return np.empty((self.block_frames, self.channels), dtype=np.float32)
+
+    def _block(self, block_no: int) -> np.ndarray:
+        """Producer side: the block for block_no, reusing a spare one if available."""
+        block = self._blocks.get(block_no)
+        if block is None:
+            block = self._spare.popleft() if self._spare else self._new_block()
+            self._blocks[block_no] = block
+        return block
+
+    def reserve(self, blocks: int = 1):
+        """
+        Preallocate spare blocks so the producer doesn't allocate when it grows.
+
+        Call from the consumer thread (e.g. a polling loop), never from the callback.
+        """
+        while len(self._spare) < blocks:
+            self._spare.append(self._new_block())
+
+    def write(self, frames: np.ndarray, scale: Optional[float] = None) -> int:
+        """
+        Copy frames into the buffer (producer thread only).
+
+        Samples are converted, scaled and downmixed directly into the block memory,
+        so a callback can hand over its device buffer without copying it first.
+
+        Args:
+            frames: (n,) or (n, channels) samples of any numeric dtype
+            scale: Optional factor applied while copying (e.g. 1/32768 for int16)
+
+        Returns:
+            int: Number of frames written
+        """
+        if frames.ndim == 1:
+            frames = frames.reshape(-1, 1)
+        n = len(frames)
+        if n == 0:
+            return 0
+
+        pos = self._write_pos
+        done = 0
+        while done < n:
+            block_no, offset = divmod(pos + done, self.block_frames)
+            count = min(n - done, self.block_frames - offset)
+            self._copy_into(self._block(block_no)[offset:offset + count], frames[done:done + count], scale)
+            done += count
+
+        self._last_write = n
+        self.writes += 1
+        self._write_pos = pos + n  # Publish only after the samples are in place
+        return n
+
+    def _copy_into(self, dest: np.ndarray, src: np.ndarray, scale: Optional[float]):
+        if src.shape[1] == self.channels:
+            if scale is None:
+                np.copyto(dest, src, casting='unsafe')
+            else:
+                np.multiply(src, np.float32(scale), out=dest, casting='unsafe')
+        elif self.channels == 1:
+            np.mean(src, axis=1, keepdims=True, dtype=np.float32, out=dest)
+            if scale is not None:
+                dest *= np.float32(scale)
+        else:
+            raise ValueError(f"Cannot write {src.shape[1]}-channel audio into a {self.channels}-channel buffer")
+
+    @property
+    def available(self) -> int:
+        """Frames written but not yet consumed."""
+        return self._write_pos - self._read_pos
+
+    @property
+    def frames_written(self) -> int:
+        """Total frames written since the buffer was created."""
+        return self._write_pos
+
+    def peek(self, max_frames: Optional[int] = None) -> List[np.ndarray]:
+        """
+        Return zero-copy views of unconsumed frames, oldest first (consumer thread only).
+
+        A view per block touched; views stay valid until the frames are consume()d.
+
+        Args:
+            max_frames: Limit on frames returned (None = everything available)
+        """
+        start = self._read_pos
+        end = self._write_pos
+        if max_frames is not None:
+            end = min(end, start + max_frames)
+
+        views = []
+        pos = start
+        while pos < end:
+            block_no, offset = divmod(pos, self.block_frames)
+            count = min(end - pos, self.block_frames - offset)
+            views.append(self._blocks[block_no][offset:offset + count])
+            pos += count
+        return views
+
+    def consume(self, frames: int):
+        """
+        Mark frames as read (consumer thread only); fully read blocks are recycled.
+
+        Args:
+            frames: Frames to advance past (clamped to what is available)
+        """
+        self._read_pos += min(frames, self.available)
+        # Index by block number rather than iterating the dict the producer inserts into
+        for block_no in range(self._read_pos // self.block_frames - 1, -1, -1):
+            block = self._blocks.pop(block_no, None)
+            if block is None:
+                break
+            if len(self._spare) < self.spare_blocks:
+                self._spare.append(block)
+
+    def latest(self, frames: Optional[int] = None) -> np.ndarray:
+        """
+        Zero-copy view of the most recently written frames (for level meters).
+
+        Args:
+            frames: Frames wanted (None = the size of the last write); limited to
+                    the current block, so the view may be shorter
+
+        Returns:
+            (n, channels) view, empty if nothing was written yet
+        """
+        end = self._write_pos
+        if end == 0:
+            return np.zeros((0, self.channels), dtype=np.float32)
+        block_no, offset = divmod(end - 1, self.block_frames)
+        count = min(frames or self._last_write, offset + 1)
+        block = self._blocks.get(block_no)
+        if block is None:
+            return np.zeros((0, self.channels), dtype=np.float32)
+        return block[offset + 1 - count:offset + 1]
+
+    def peak(self, frames: Optional[int] = None) -> float:
+        """Peak absolute level (0..1) of the latest frames."""
+        recent = self.latest(frames)
+        if recent.size == 0:
+            return 0.0
+        return float(min(max(recent.max(), -recent.min()), 1.0))
+
+    def to_array(self) -> np.ndarray:
+        """
+        Return all unconsumed frames as one (n, channels) array and drain the buffer.
+
+        Call after the producer has stopped. If the frames sit in a single block the
+        result is a view of it (no copy); otherwise one array of the exact size is
+        filled block by block, freeing each block as it's copied, so peak memory stays
+        near the size of the audio instead of doubling like a concatenate of chunks.
+        """
+        views = self.peek()
+        total = sum(len(v) for v in views)
+        if len(views) <= 1:
+            result = views[0] if views else np.zeros((0, self.channels), dtype=np.float32)
+            # The block now backs the result; never hand it back to the producer
+            self._blocks.clear()
+            self._read_pos = self._write_pos
+            return result
+
+        result = np.empty((total, self.channels), dtype=np.float32)
+        first_block = self._read_pos // self.block_frames
+        block_count = len(views)
+        pos = 0
+        for i in range(block_count):
+            count = len(views[i])
+            result[pos:pos + count] = views[i]
+            pos += count
+            # Drop both references so the block is freed before the next one is copied
+            views[i] = None
+            self._blocks.pop(first_block + i, None)
+        self._blocks.clear()
+        self._spare.clear()
+        self._read_pos = self._write_pos
+        logger.debug(f"Assembled {total} frames from {block_count} blocks")
+        return result
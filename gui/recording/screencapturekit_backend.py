@@ -12,6 +12,7 @@ import time
 import numpy as np
 from typing import Optional
 from .base import RecordingBackend, RecordingResult
+from .ring_buffer import AudioRingBuffer
 
 logger = logging.getLogger(__name__)
 
@@ -38,8 +39,7 @@ try:
             self = objc.super(AudioCaptureDelegate, self).init()
             if self is None:
                 return None
-            self.audio_chunks = []
-            self.speaker_chunks = []  # For compatibility with main backend
+            self.audio_buffer = AudioRingBuffer(channels=1)
             self.is_recording = True
             self.sample_rate = 48000  # Default, will be updated from actual stream
             self.channels = 2
@@ -237,11 +237,9 @@ try:
 
                 # Store as column vector for consistency
                 if len(audio_data) > 0:
-                    chunk = audio_data.reshape(-1, 1)
-                    self.audio_chunks.append(chunk)
-                    self.speaker_chunks.append(chunk)  # For compatibility with main backend
-                    if len(self.audio_chunks) <= 5:
-                        logger.info(f"Stored audio chunk #{len(self.audio_chunks)}, size: {len(audio_data)}")
+                    self.audio_buffer.write(audio_data)
+                    if self.audio_buffer.writes <= 5:
+                        logger.info(f"Stored audio chunk #{self.audio_buffer.writes}, size: {len(audio_data)}")
 
             except Exception as e:
                 logger.error(f"Error processing ScreenCaptureKit audio: {e}", exc_info=True)
@@ -269,11 +267,18 @@ try:
 
     class ScreenCaptureKitBackend(RecordingBackend):
         @property
-        def speaker_chunks(self):
-            # Return system audio chunks from delegate if available
-            if self.delegate and hasattr(self.delegate, 'speaker_chunks'):
-                return self.delegate.speaker_chunks
-            return []
+        def speaker_buffer(self):
+            # Return system audio buffer from delegate if available
+            if self.delegate and hasattr(self.delegate, 'audio_buffer'):
+                return self.delegate.audio_buffer
+            return None
+
+        @property
+        def speaker_sample_rate(self):
+            # Known once the delegate has seen the stream's format
+            if self.delegate and self.delegate.format_detected:
+                return self.delegate.sample_rate
+            return None
         """
         Recording backend using macOS ScreenCaptureKit for native system audio.
 
@@ -300,7 +305,7 @@ try:
 
             self.mic_stream = None
             self.screen_stream = None
-            self.mic_chunks = []
+            self.mic_buffer = AudioRingBuffer(channels=1)
             self.mic_callback_count = 0
             self.mic_sample_rate = None
             self.delegate = None
@@ -355,7 +360,7 @@ try:
                 if status:
                     logger.warning(f"Mic callback status: {status}")
                 if self.is_recording:
-                    self.mic_chunks.append(indata.copy())
+                    self.mic_buffer.write(indata)
                     self.mic_callback_count += 1
 
             # Try to open mic stream
@@ -538,11 +543,11 @@ try:
                 self.mic_stream.stop()
                 self.mic_stream.close()
 
-            logger.info(f"Mic chunks collected: {len(self.mic_chunks)}")
+            logger.info(f"Mic chunks collected: {self.mic_buffer.writes}")
             if self.delegate:
                 logger.info(f"🔢 System audio callbacks received: {self.delegate.callback_count}")
-                logger.info(f"📦 System audio chunks collected: {len(self.delegate.audio_chunks)}")
-                if self.delegate.callback_count == 0 and len(self.delegate.audio_chunks) == 0:
+                logger.info(f"📦 System audio chunks collected: {self.delegate.audio_buffer.writes}")
+                if self.delegate.callback_count == 0 and self.delegate.audio_buffer.writes == 0:
                     logger.warning("⚠️  No system audio captured!")
                     if self._system_audio_error:
                         logger.error(f"   Error: {self._system_audio_error}")
@@ -551,7 +556,7 @@ try:
                     logger.warning("   2. No audio playing during recording")
                     logger.warning("   3. Stream failed to start")
                     logger.warning("   Check: System Settings → Privacy & Security → Screen Recording")
-                elif self.delegate.callback_count > 0 and len(self.delegate.audio_chunks) == 0:
+                elif self.delegate.callback_count > 0 and self.delegate.audio_buffer.writes == 0:
                     logger.error("PROBLEM: Callbacks were received but NO chunks were stored!")
                     logger.error("   This indicates audio data extraction is failing")
             else:
@@ -560,10 +565,12 @@ try:
                     logger.error(f"   Error: {self._system_audio_error}")
 
             # Process microphone data
-            if not self.mic_chunks:
+            if self.mic_buffer.frames_written == 0:
                 raise RuntimeError("No audio samples captured from microphone")
 
-            mic_data = np.concatenate(self.mic_chunks, axis=0)
+            # OPTIMIZED: Assemble straight from the ring buffers (no list of chunk copies to concatenate)
+            mic_chunks_count = self.mic_buffer.writes
+            mic_data = self.mic_buffer.to_array()
             logger.info(f"Mic data: {mic_data.shape}, {mic_data.size} samples")
 
             # Process system audio data
@@ -571,10 +578,10 @@ try:
             speaker_sample_rate = None
             speaker_chunks_count = 0
 
-            if self.delegate and self.delegate.audio_chunks:
-                speaker_data = np.concatenate(self.delegate.audio_chunks, axis=0)
+            if self.delegate and self.delegate.audio_buffer.frames_written > 0:
+                speaker_chunks_count = self.delegate.audio_buffer.writes
+                speaker_data = self.delegate.audio_buffer.to_array()
                 speaker_sample_rate = self.delegate.sample_rate
-                speaker_chunks_count = len(self.delegate.audio_chunks)
                 logger.info(f"System audio data: {speaker_data.shape}, {speaker_data.size} samples")
 
             return RecordingResult(
@@ -583,7 +590,7 @@ try:
                 mic_sample_rate=self.mic_sample_rate,
                 speaker_sample_rate=speaker_sample_rate,
                 duration=duration,
-                mic_chunks_count=len(self.mic_chunks),
+                mic_chunks_count=mic_chunks_count,
                 speaker_chunks_count=speaker_chunks_count
             )
 
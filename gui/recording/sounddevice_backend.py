@@ -9,9 +9,9 @@ Supports:
 
 import logging
 import time
-import numpy as np
 from typing import Optional
 from .base import RecordingBackend, RecordingResult
+from .ring_buffer import AudioRingBuffer
 
 logger = logging.getLogger(__name__)
 
@@ -43,8 +43,8 @@ class SoundDeviceBackend(RecordingBackend):
 
         self.mic_stream = None
         self.speaker_stream = None
-        self.mic_chunks = []
-        self.speaker_chunks = []
+        self.mic_buffer = AudioRingBuffer(channels=1)
+        self.speaker_buffer = AudioRingBuffer(channels=1)
         self.mic_callback_count = 0
         self.mic_sample_rate = None
         self.speaker_sample_rate = None
@@ -154,7 +154,7 @@ class SoundDeviceBackend(RecordingBackend):
             if status:
                 logger.warning(f"Mic callback status: {status}")
             if self.is_recording:
-                self.mic_chunks.append(indata.copy())
+                self.mic_buffer.write(indata)
                 self.mic_callback_count += 1
 
         # Get device info and try sample rates
@@ -308,14 +308,11 @@ class SoundDeviceBackend(RecordingBackend):
             if status:
                 logger.warning(f"Speaker callback status: {status}")
             if self.is_recording:
-                # Downmix to mono if stereo
-                if indata.shape[1] > 1:
-                    mono_data = np.mean(indata, axis=1, keepdims=True)
-                else:
-                    mono_data = indata
-                self.speaker_chunks.append(mono_data.copy())
-                if len(self.speaker_chunks) <= 3:
-                    logger.info(f"Speaker chunk #{len(self.speaker_chunks)} captured: {mono_data.shape}, "
+                # Downmixed to mono while copying into the buffer
+                self.speaker_buffer.write(indata)
+                if self.speaker_buffer.writes <= 3:
+                    mono_data = self.speaker_buffer.latest()
+                    logger.info(f"Speaker chunk #{self.speaker_buffer.writes} captured: {mono_data.shape}, "
                               f"min={mono_data.min():.6f}, max={mono_data.max():.6f}")
 
         try:
@@ -435,16 +432,12 @@ class SoundDeviceBackend(RecordingBackend):
             if status:
                 logger.warning(f"WASAPI callback status: {status}")
             if self.is_recording and indata is not None:
-                # Downmix to mono if stereo
-                if len(indata.shape) > 1 and indata.shape[1] > 1:
-                    mono_data = np.mean(indata, axis=1, keepdims=True)
-                else:
-                    mono_data = indata.reshape(-1, 1)
-
-                self.speaker_chunks.append(mono_data.copy())
+                # Downmixed to mono while copying into the buffer
+                self.speaker_buffer.write(indata)
 
-                if len(self.speaker_chunks) <= 3:
-                    logger.info(f"WASAPI chunk #{len(self.speaker_chunks)} captured: "
+                if self.speaker_buffer.writes <= 3:
+                    mono_data = self.speaker_buffer.latest()
+                    logger.info(f"WASAPI chunk #{self.speaker_buffer.writes} captured: "
                               f"{mono_data.shape}, "
                               f"min={mono_data.min():.6f}, max={mono_data.max():.6f}")
 
@@ -467,8 +460,8 @@ class SoundDeviceBackend(RecordingBackend):
 
         logger.info(f" Recording stopped. Duration: {duration:.1f}s")
         logger.info(f"Mic callbacks fired: {self.mic_callback_count}")
-        logger.info(f"Mic chunks collected: {len(self.mic_chunks)}")
-        logger.info(f"Speaker chunks collected: {len(self.speaker_chunks)}")
+        logger.info(f"Mic chunks collected: {self.mic_buffer.writes}")
+        logger.info(f"Speaker chunks collected: {self.speaker_buffer.writes}")
 
         # Stop streams
         if self.mic_stream:
@@ -482,15 +475,15 @@ class SoundDeviceBackend(RecordingBackend):
         # Stop WASAPI capture if running
         if self.wasapi_capture:
             try:
-                wasapi_data = self.wasapi_capture.stop()
-                # WASAPI capture handles its own chunks via callback,
-                # so we don't need to process wasapi_data here
-                logger.info(f"WASAPI capture stopped, data shape: {wasapi_data.shape if wasapi_data.size > 0 else 'empty'}")
+                self.wasapi_capture.stop()
+                # WASAPI capture hands every chunk to wasapi_callback, which already
+                # wrote it into speaker_buffer, so there is nothing left to collect here
+                logger.info("WASAPI capture stopped")
             except Exception as e:
                 logger.error(f"Error stopping WASAPI capture: {e}", exc_info=True)
 
         # Process microphone data
-        if not self.mic_chunks:
+        if self.mic_buffer.frames_written == 0:
             raise RuntimeError(
                 f"No audio samples captured!\n\n"
                 f"Debug info:\n"
@@ -503,31 +496,28 @@ class SoundDeviceBackend(RecordingBackend):
                 f"3. Run: python diagnose_audio.py"
             )
 
-        mic_data = np.concatenate(self.mic_chunks, axis=0)
+        # OPTIMIZED: Assemble straight from the ring buffer (no list of chunk copies to concatenate)
+        mic_chunks_count = self.mic_buffer.writes
+        mic_data = self.mic_buffer.to_array()
         logger.info(f"Mic data shape: {mic_data.shape}, size: {mic_data.size}")
 
-        if mic_data.size == 0:
-            raise RuntimeError("Mic data is empty after concatenation!")
-
         # Process speaker data
         speaker_data = None
-        if self.speaker_chunks:
-            logger.info(f"Processing speaker chunks: {len(self.speaker_chunks)} chunks")
-            speaker_data = np.concatenate(self.speaker_chunks, axis=0)
-            logger.info(f"Speaker data shape after concatenate: {speaker_data.shape}, "
+        speaker_chunks_count = self.speaker_buffer.writes
+        if self.speaker_buffer.frames_written > 0:
+            logger.info(f"Processing speaker chunks: {speaker_chunks_count} chunks")
+            speaker_data = self.speaker_buffer.to_array()
+            logger.info(f"Speaker data shape: {speaker_data.shape}, "
                        f"size: {speaker_data.size}")
 
-            if speaker_data.size == 0:
-                speaker_data = None
-
         return RecordingResult(
             mic_data=mic_data,
             speaker_data=speaker_data,
             mic_sample_rate=self.mic_sample_rate,
             speaker_sample_rate=self.speaker_sample_rate,
             duration=duration,
-            mic_chunks_count=len(self.mic_chunks),
-            speaker_chunks_count=len(self.speaker_chunks)
+            mic_chunks_count=mic_chunks_count,
+            speaker_chunks_count=speaker_chunks_count
         )
 
     def get_backend_name(self) -> str:
@@ -0,0 +1,330 @@
+"""
+Streaming recording pipeline.
+
+Moves captured audio from the backends' ring buffers to disk while recording is
+still running: incremental resample to 16kHz -> mix -> normalize -> filter ->
+write in fixed-size blocks. Memory stays bounded however long the session is,
+and stopping only has to process the last fraction of a second.
+
+Every block is written to a WAV file whose header is kept valid after each
+write, and streamed into an ffmpeg Opus encoder at the same time. Both carry a
+'.partial' marker until the recording is finished, so a killed app leaves a
+playable file behind that recover_partial_recordings() picks up next time.
+"""
+
+import os
+import wave
+import logging
+import tempfile
+import subprocess
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+from .audio_processor import StreamMixer
+from .base import RecordingResult
+
+logger = logging.getLogger(__name__)
+
+# Files of a recording in progress carry this marker before the suffix
+PARTIAL_MARKER = '.partial'
+
+
+def recover_partial_recordings(output_dir) -> List[str]:
+    """
+    Finalize recordings left behind by a crashed or killed session.
+
+    The partial WAV is complete up to its last written block; it is renamed to
+    recording_<timestamp>_recovered.wav and its unfinished Opus twin is removed.
+
+    Args:
+        output_dir: Recordings directory
+
+    Returns:
+        List of recovered file paths
+    """
+    recovered = []
+    output_dir = Path(output_dir)
+    if not output_dir.is_dir():
+        return recovered
+
+    for partial in sorted(output_dir.glob(f"recording_*{PARTIAL_MARKER}.wav")):
+        stem = partial.name[:-len(f"{PARTIAL_MARKER}.wav")]
+        opus_partial = partial.with_name(f"{stem}{PARTIAL_MARKER}.ogg")
+        try:
+            if opus_partial.exists():
+                opus_partial.unlink()
+            with wave.open(str(partial), 'rb') as wf:
+                frames = wf.getnframes()
+            if frames == 0:
+                partial.unlink()
+                continue
+            target = partial.with_name(f"{stem}_recovered.wav")
+            os.replace(partial, target)
+            recovered.append(str(target))
+            logger.info(f"Recovered interrupted recording: {target} ({frames / 16000:.1f}s)")
+        except (OSError, EOFError, wave.Error) as e:
+            logger.warning(f"Could not recover partial recording {partial}: {e}")
+    return recovered
+
+
+class StreamingRecorder:
+    """Resamples, mixes, filters and writes captured audio block by block while recording."""
+
+    # Mixed audio is processed and written in blocks of this length
+    BLOCK_SECONDS = 0.5
+    # How far one stream may run ahead before the other is treated as silent
+    MAX_LAG_SECONDS = 3.0
+
+    def __init__(self, output_dir, filters: Optional[list] = None, target_rate: int = 16000,
+                 target_rms: float = 0.12, max_level: float = 0.98,
+                 block_listener: Optional[Callable[[np.ndarray], None]] = None):
+        """
+        Create the partial output files and start the Opus encoder.
+
+        Args:
+            output_dir: Directory to save recordings
+            filters: Stateful filters applied in order to each block (objects with
+                     process(audio) -> audio, e.g. NoiseGate, EnhancedCompressor)
+            target_rate: Output sample rate
+            target_rms: Level the running normalizer steers towards
+            max_level: Safety limit applied after normalization
+            block_listener: Called with every float32 block as it is written (e.g. to
+                            feed live transcription); must not block the recording loop
+        """
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.filters = list(filters or [])
+        self.target_rate = target_rate
+        self.target_rms = target_rms
+        self.max_level = max_level
+        self.block_listener = block_listener
+
+        self.base_name = f"recording_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        self.wav_path = self.output_dir / f"{self.base_name}{PARTIAL_MARKER}.wav"
+        self.opus_path = self.output_dir / f"{self.base_name}{PARTIAL_MARKER}.ogg"
+
+        self.mixer = StreamMixer(target_rate, self.BLOCK_SECONDS, self.MAX_LAG_SECONDS)
+
+        # Running normalizer state (sum of squares of everything mixed so far)
+        self._energy = 0.0
+        self._energy_frames = 0
+        self._gain = None
+
+        self.frames_written = 0
+        self.finished = False
+
+        self._wav_file = open(self.wav_path, 'wb')
+        self._wav = wave.open(self._wav_file, 'wb')
+        self._wav.setnchannels(1)
+        self._wav.setsampwidth(2)
+        self._wav.setframerate(target_rate)
+
+        self._encoder = None
+        self._encoder_log = None
+        self._start_encoder()
+        logger.info(f"Streaming recording to {self.wav_path.name}"
+                    f"{' + Opus' if self._encoder else ''}")
+
+    def _start_encoder(self):
+        """Start ffmpeg encoding raw PCM from stdin to Opus (the WAV alone is kept if this fails)."""
+        try:
+            from tools.resource_locator import get_ffmpeg_path
+            self._encoder_log = tempfile.TemporaryFile()
+            cmd = [
+                get_ffmpeg_path(),
+                '-hide_banner', '-loglevel', 'error',
+                '-f', 's16le', '-ar', str(self.target_rate), '-ac', '1', '-i', 'pipe:0',
+                '-c:a', 'libopus',  # Opus codec
+                '-b:a', '18k',  # 18 kbps bitrate (optimal for voice, between 12-24k)
+                '-application', 'voip',  # Optimize for voice/speech
+                '-y', str(self.opus_path)
+            ]
+            self._encoder = subprocess.Popen(
+                cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=self._encoder_log
+            )
+        except Exception as e:
+            logger.warning(f"Opus encoder unavailable ({e}); recording will be saved as WAV")
+            self._encoder = None
+
+    def pump(self, backend) -> int:
+        """
+        Move everything captured so far from the backend's ring buffers to disk.
+
+        Call periodically from the recording loop.
+
+        Args:
+            backend: Recording backend exposing mic_buffer / speaker_buffer and
+                     mic_sample_rate / speaker_sample_rate
+
+        Returns:
+            int: Frames written by this call
+        """
+        before = self.frames_written
+        self._drain('mic', backend.mic_buffer, backend.mic_sample_rate)
+        speaker_buffer = getattr(backend, 'speaker_buffer', None)
+        if speaker_buffer is not None:
+            self._drain('speaker', speaker_buffer, getattr(backend, 'speaker_sample_rate', None))
+        self._mix_blocks(final=False)
+        return self.frames_written - before
+
+    def _drain(self, stream: str, buffer, rate: Optional[int]):
+        """Resample all unread frames of a ring buffer and release them."""
+        # Keep a spare block ready so the audio callback never allocates when the buffer grows
+        buffer.reserve()
+        if not rate or buffer.available == 0:
+            return
+        views = buffer.peek()
+        for view in views:
+            self.mixer.add(stream, view, rate)
+        buffer.consume(sum(len(view) for view in views))
+
+    def _mix_blocks(self, final: bool):
+        """Mix and write every complete block (everything, on the final call)."""
+        for block in self.mixer.blocks(final=final):
+            self._write_block(block)
+
+    @property
+    def speaker_active(self) -> bool:
+        """True once any system audio has been received."""
+        return self.mixer.speaker_active
+
+    def _normalize(self, block: np.ndarray) -> np.ndarray:
+        """
+        Streaming counterpart of AudioProcessor.normalize_audio + apply_safety_limiting.
+
+        The gain tracks the RMS of everything recorded so far (capped at 10x) and is
+        ramped across each block, so it settles like the whole-file gain would.
+        """
+        self._energy += float(np.dot(block, block))
+        self._energy_frames += len(block)
+        rms = np.sqrt(self._energy / self._energy_frames)
+        target_gain = min(self.target_rms / rms, 10.0) if rms >= 0.0001 else 1.0
+        start_gain = target_gain if self._gain is None else self._gain
+        gain = np.linspace(start_gain, target_gain, len(block), endpoint=False, dtype=np.float32)
+        self._gain = target_gain
+        # Soft clipping to prevent hard clipping artifacts, then the safety limit
+        return np.clip(np.tanh(block * gain), -self.max_level, self.max_level)
+
+    def _write_block(self, block: np.ndarray):
+        block = self._normalize(block.astype(np.float32))
+        for audio_filter in list(self.filters):
+            try:
+                block = audio_filter.process(block)
+            except Exception as e:
+                logger.warning(f"Audio filter {type(audio_filter).__name__} failed ({e}); disabling it")
+                self.filters.remove(audio_filter)
+
+        if self.block_listener is not None:
+            try:
+                self.block_listener(block)
+            except Exception as e:
+                logger.warning(f"Recording block listener failed ({e}); detaching it")
+                self.block_listener = None
+
+        pcm = (block * 32767).astype(np.int16).tobytes()
+        self._wav.writeframes(pcm)  # Also rewrites the header, so the file is always valid
+        self._wav_file.flush()
+        if self._encoder is not None:
+            try:
+                self._encoder.stdin.write(pcm)
+            except (BrokenPipeError, OSError) as e:
+                logger.warning(f"Opus encoder stopped ({e}); recording continues as WAV only")
+                self._stop_encoder()
+        self.frames_written += len(block)
+
+    def finish(self, result: Optional[RecordingResult] = None) -> Optional[Tuple[str, float]]:
+        """
+        Write the remaining audio and publish the recording.
+
+        Args:
+            result: What the backend's stop_recording() returned, i.e. the audio that
+                    was still in the ring buffers when capture stopped
+
+        Returns:
+            (path, duration) of the saved recording, or None if nothing was captured
+        """
+        if result is not None:
+            if result.mic_data is not None and result.mic_data.size and result.mic_sample_rate:
+                self.mixer.add('mic', result.mic_data, result.mic_sample_rate)
+            if result.speaker_data is not None and result.speaker_data.size and result.speaker_sample_rate:
+                self.mixer.add('speaker', result.speaker_data, result.speaker_sample_rate)
+        self.mixer.flush()
+        self._mix_blocks(final=True)
+
+        self._wav.close()
+        self._wav_file.close()
+        encoder_ok = self._stop_encoder()
+        self.finished = True
+
+        if self.frames_written == 0:
+            self._remove(self.wav_path)
+            self._remove(self.opus_path)
+            return None
+
+        duration = self.frames_written / self.target_rate
+        if encoder_ok:
+            final_path = self.output_dir / f"{self.base_name}.ogg"
+            os.replace(self.opus_path, final_path)
+            self._remove(self.wav_path)
+            logger.info(f"Recording saved as Opus/OGG: {final_path}")
+        else:
+            final_path = self.output_dir / f"{self.base_name}.wav"
+            os.replace(self.wav_path, final_path)
+            self._remove(self.opus_path)
+            logger.info(f"Recording saved as WAV: {final_path}")
+        return str(final_path), duration
+
+    def _stop_encoder(self) -> bool:
+        """Close the encoder's input and wait for it. Returns True if it finished cleanly."""
+        encoder, self._encoder = self._encoder, None
+        if encoder is None:
+            return False
+        try:
+            encoder.stdin.close()
+        except OSError:
+            pass
+        try:
+            returncode = encoder.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            encoder.kill()
+            returncode = encoder.wait()
+        if returncode != 0 and self._encoder_log is not None:
+            self._encoder_log.seek(0)
+            message = self._encoder_log.read().decode('utf-8', errors='replace').strip()
+            logger.warning(f"Opus encoder exited with code {returncode}: {message[-500:]}")
+        if self._encoder_log is not None:
+            self._encoder_log.close()
+            self._encoder_log = None
+        return returncode == 0
+
+    def close(self):
+        """
+        Release files without finishing (e.g. after an error).
+
+        The partial WAV stays valid on disk and is picked up by
+        recover_partial_recordings(); an empty one is removed.
+        """
+        if self.finished:
+            return
+        self.finished = True
+        try:
+            self._wav.close()
+            self._wav_file.close()
+        except Exception as e:
+            logger.debug(f"Error closing partial recording: {e}")
+        self._stop_encoder()
+        if self.frames_written == 0:
+            self._remove(self.wav_path)
+            self._remove(self.opus_path)
+        else:
+            logger.warning(f"Recording interrupted; partial audio kept in {self.wav_path}")
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
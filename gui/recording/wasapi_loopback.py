@@ -20,6 +20,8 @@ from ctypes import (
 import comtypes
 from comtypes import GUID, COMMETHOD, IUnknown, HRESULT
 
+from .ring_buffer import AudioRingBuffer
+
 logger = logging.getLogger(__name__)
 
 
@@ -147,12 +149,13 @@ class WASAPILoopbackCapture:
         Initialize WASAPI loopback capture.
 
         Args:
-            callback: Function to call with captured audio data (numpy array)
+            callback: Function to call with captured audio data (numpy array).
+                      Audio handed to the callback is not kept for stop().
         """
         self.callback = callback
         self.is_capturing = False
         self.capture_thread = None
-        self.audio_chunks = []
+        self.buffer = None  # AudioRingBuffer, created once the mix format is known
         self.sample_rate = None
         self.channels = None
 
@@ -218,6 +221,13 @@ class WASAPILoopbackCapture:
 
             logger.info(f"Audio format: {self.sample_rate}Hz, {self.channels}ch, {bits_per_sample}bit")
 
+            # With a callback the buffer only stages each packet until it's handed
+            # over, so one-second blocks are recycled; otherwise it keeps everything
+            if self.callback:
+                self.buffer = AudioRingBuffer(channels=self.channels, block_frames=self.sample_rate)
+            else:
+                self.buffer = AudioRingBuffer(channels=self.channels)
+
             # Initialize audio client in loopback mode
             buffer_duration = 10000000  # 1 second in 100-nanosecond units
 
@@ -274,17 +284,19 @@ class WASAPILoopbackCapture:
                             self.capture_client.GetBuffer()
 
                         if num_frames > 0:
-                            # Convert pointer to numpy array based on format
+                            # View the device buffer as numpy (no copy) based on format
                             total_samples = num_frames * self.channels
+                            scale = None
 
                             if self.wave_format.contents.wBitsPerSample == 32:
                                 # Float32 format - most common for WASAPI
                                 buffer = (c_float * total_samples).from_address(data_pointer)
-                                audio_data = np.frombuffer(buffer, dtype=np.float32).copy()
+                                audio_data = np.frombuffer(buffer, dtype=np.float32)
                             elif self.wave_format.contents.wBitsPerSample == 16:
-                                # Int16 format - convert to float32
+                                # Int16 format - converted to float32 while copying into the ring buffer
                                 buffer = (c_int16 * total_samples).from_address(data_pointer)
-                                audio_data = np.frombuffer(buffer, dtype=np.int16).astype(np.float32) / 32768.0
+                                audio_data = np.frombuffer(buffer, dtype=np.int16)
+                                scale = 1.0 / 32768.0
                             else:
                                 # Unsupported format - log and skip
                                 logger.warning(f"Unsupported bit depth: {self.wave_format.contents.wBitsPerSample}")
@@ -303,19 +315,24 @@ class WASAPILoopbackCapture:
                                 packet_length = self.capture_client.GetNextPacketSize()
                                 continue
 
-                            # Store chunk
-                            self.audio_chunks.append(audio_data.copy())
-
-                            # Call callback if provided
-                            if self.callback:
-                                self.callback(audio_data, num_frames, None, None)
+                            # OPTIMIZED: Single copy out of the device buffer, into preallocated storage
+                            self.buffer.write(audio_data, scale=scale)
 
                             # Log first few chunks for debugging
-                            if len(self.audio_chunks) <= 3:
-                                logger.info(f"WASAPI chunk #{len(self.audio_chunks)}: "
+                            if self.buffer.writes <= 3:
+                                latest = self.buffer.latest()
+                                logger.info(f"WASAPI chunk #{self.buffer.writes}: "
                                           f"{audio_data.shape}, "
-                                          f"min={audio_data.min():.6f}, "
-                                          f"max={audio_data.max():.6f}")
+                                          f"min={latest.min():.6f}, "
+                                          f"max={latest.max():.6f}")
+
+                            # Hand the packet to the callback as zero-copy views, then
+                            # release it so its block can be reused
+                            if self.callback:
+                                views = self.buffer.peek()
+                                for view in views:
+                                    self.callback(view, len(view), None, None)
+                                self.buffer.consume(sum(len(view) for view in views))
 
                         # Release the buffer
                         # comtypes raises exception on error
@@ -337,7 +354,7 @@ class WASAPILoopbackCapture:
 
     def stop(self) -> np.ndarray:
         """
-        Stop capturing and return all captured audio.
+        Stop capturing and return all captured audio not handed to the callback.
 
         Returns:
             numpy array of captured audio data, shape (samples, channels)
@@ -360,12 +377,16 @@ class WASAPILoopbackCapture:
         # Cleanup COM interfaces
         self.cleanup()
 
-        # Concatenate all chunks
-        if self.audio_chunks:
-            audio_data = np.concatenate(self.audio_chunks, axis=0)
-            logger.info(f"WASAPI capture stopped. Captured {len(self.audio_chunks)} chunks, "
+        # Assemble the buffered audio (no chunk list to concatenate)
+        if self.buffer is not None and self.buffer.available > 0:
+            chunk_count = self.buffer.writes
+            audio_data = self.buffer.to_array()
+            logger.info(f"WASAPI capture stopped. Captured {chunk_count} chunks, "
                        f"total shape: {audio_data.shape}")
             return audio_data
+        elif self.callback and self.buffer is not None and self.buffer.writes:
+            logger.info(f"WASAPI capture stopped. Delivered {self.buffer.writes} chunks to callback")
+            return np.array([])
         else:
             logger.warning("No audio chunks captured")
             return np.array([])
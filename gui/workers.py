@@ -1,6 +1,8 @@
 from PySide6.QtCore import QThread, Signal
 import logging
 
+from gui.audio_filters import NOISE_GATE_SETTINGS, COMPRESSOR_SETTINGS
+
 logger = logging.getLogger(__name__)
 
 class AudioPreviewWorker(QThread):
@@ -29,7 +31,6 @@ class AudioPreviewWorker(QThread):
             from gui.utils import get_platform
             from gui.recording import SoundDeviceBackend, ScreenCaptureKitBackend, HAS_SCREENCAPTUREKIT
             import sounddevice as sd
-            import numpy as np
             platform = get_platform()
             if platform == 'macos':
                 if HAS_SCREENCAPTUREKIT:
@@ -51,14 +52,16 @@ class AudioPreviewWorker(QThread):
             last_mic_level = 0.0
             last_speaker_level = 0.0
             while self.is_running:
-                mic_level = 0.0
-                if self.backend.mic_chunks:
-                    mic_chunk = self.backend.mic_chunks[-1]
-                    mic_level = float(np.clip(np.abs(mic_chunk).max(), 0.0, 1.0))
-                speaker_level = 0.0
-                if self.backend.speaker_chunks:
-                    speaker_chunk = self.backend.speaker_chunks[-1]
-                    speaker_level = float(np.clip(np.abs(speaker_chunk).max(), 0.0, 1.0))
+                # Peak of the latest callback chunk, read zero-copy from the ring buffers
+                mic_buffer = self.backend.mic_buffer
+                speaker_buffer = self.backend.speaker_buffer
+                mic_level = mic_buffer.peak()
+                speaker_level = speaker_buffer.peak() if speaker_buffer is not None else 0.0
+                # Nothing keeps preview audio; release it so the buffers recycle their
+                # blocks instead of growing (latest() only needs the current block)
+                mic_buffer.consume(mic_buffer.available)
+                if speaker_buffer is not None:
+                    speaker_buffer.consume(speaker_buffer.available)
                 if abs(mic_level - last_mic_level) > 0.01 or abs(speaker_level - last_speaker_level) > 0.01:
                     self.audio_levels_update.emit(mic_level, speaker_level)
                     last_mic_level = mic_level
@@ -80,10 +83,11 @@ class AudioPreviewWorker(QThread):
 Qt worker threads for background processing - Refactored with modular backends.
 """
 
+import queue
 import logging
+import threading
 from pathlib import Path
-from typing import Optional, List
-from datetime import datetime
+from typing import Callable, Optional, List
 
 import numpy as np
 from PySide6.QtCore import QThread, Signal
@@ -91,10 +95,11 @@ from pydub import AudioSegment
 
 from gui.utils import get_platform
 from gui.recording import (
-    AudioProcessor,
     SoundDeviceBackend,
     ScreenCaptureKitBackend,
-    HAS_SCREENCAPTUREKIT
+    HAS_SCREENCAPTUREKIT,
+    StreamingRecorder,
+    recover_partial_recordings
 )
 
 logger = logging.getLogger(__name__)
@@ -121,6 +126,7 @@ class RecordingWorker(QThread):
                  backend: Optional[str] = None,
                  enable_filters: bool = True,
                  time_limit: Optional[float] = None,
+                 block_listener: Optional[Callable[[np.ndarray], None]] = None,
                  parent=None):
         """
         Initialize recording worker.
@@ -133,6 +139,8 @@ class RecordingWorker(QThread):
                     or None for auto-select
             enable_filters: Enable audio filters (noise gate, compressor)
             time_limit: Maximum recording duration in seconds (None = no limit)
+            block_listener: Receives each 16kHz block as it is saved
+                            (e.g. LiveTranscriptionWorker.feed)
             parent: Parent QObject
         """
         super().__init__(parent)
@@ -142,6 +150,7 @@ class RecordingWorker(QThread):
         self.backend_name = backend
         self.enable_filters = enable_filters
         self.time_limit = time_limit
+        self.block_listener = block_listener
         self.backend = None
         self.is_recording = True
 
@@ -203,9 +212,33 @@ class RecordingWorker(QThread):
         logger.info(f"Using SoundDevice backend for {platform}")
         return SoundDeviceBackend(self.mic_device, self.speaker_device)
 
+    def _create_filters(self) -> list:
+        """Build the stateful filter chain applied to the recording as it streams to disk."""
+        if not self.enable_filters:
+            return []
+        try:
+            from gui.audio_filters import NoiseGate, EnhancedCompressor
+            logger.info("Applying audio filters (NoiseGate + Compressor) while recording")
+            return [
+                # Noise gate to remove background noise
+                NoiseGate(**NOISE_GATE_SETTINGS, sample_rate=16000),
+                # Compressor for consistent volume
+                EnhancedCompressor(**COMPRESSOR_SETTINGS, sample_rate=16000)
+            ]
+        except Exception as e:
+            logger.warning(f"Could not set up audio filters: {e}. Saving unfiltered audio.")
+            self.status_update.emit(f"Filter warning: {e}")
+            return []
+
     def run(self):
         """Execute recording in background thread."""
+        recorder = None
         try:
+            # Finalize recordings a crashed session left behind
+            recovered = recover_partial_recordings(self.output_dir)
+            if recovered:
+                self.status_update.emit(f"Recovered {len(recovered)} interrupted recording(s)")
+
             # Select and initialize backend
             self.backend = self._select_backend()
             backend_name = self.backend.get_backend_name()
@@ -215,23 +248,25 @@ class RecordingWorker(QThread):
             # Start recording
             self.backend.start_recording()
 
+            # OPTIMIZED: Resample, mix, filter and encode while recording, so memory stays
+            # bounded and stopping only processes the last block
+            recorder = StreamingRecorder(self.output_dir, filters=self._create_filters(), target_rate=16000,
+                                         block_listener=self.block_listener)
+
             # Record while active, emit audio levels
             import sounddevice as sd
             last_mic_level = 0.0
             last_speaker_level = 0.0
             while self.is_recording:
                 # Calculate mic level
-                mic_level = 0.0
-                if self.backend.mic_chunks:
-                    mic_chunk = self.backend.mic_chunks[-1]
-                    mic_level = float(np.clip(np.abs(mic_chunk).max(), 0.0, 1.0))
+                mic_buffer = self.backend.mic_buffer
+                mic_level = mic_buffer.peak()
                 # Calculate speaker level
-                speaker_level = 0.0
-                if self.backend.speaker_chunks:
-                    speaker_chunk = self.backend.speaker_chunks[-1]
-                    speaker_level = float(np.clip(np.abs(speaker_chunk).max(), 0.0, 1.0))
-                # Debug logging for chunk sizes and levels
-                logger.debug(f"VU DEBUG: mic_chunks={len(self.backend.mic_chunks)}, speaker_chunks={len(self.backend.speaker_chunks)}, mic_level={mic_level:.3f}, speaker_level={speaker_level:.3f}")
+                speaker_buffer = self.backend.speaker_buffer
+                speaker_level = speaker_buffer.peak() if speaker_buffer is not None else 0.0
+                # Debug logging for chunk counts and levels
+                speaker_chunks = speaker_buffer.writes if speaker_buffer is not None else 0
+                logger.debug(f"VU DEBUG: mic_chunks={mic_buffer.writes}, speaker_chunks={speaker_chunks}, mic_level={mic_level:.3f}, speaker_level={speaker_level:.3f}")
                 # Only emit if changed
                 if abs(mic_level - last_mic_level) > 0.01 or abs(speaker_level - last_speaker_level) > 0.01:
                     logger.debug(f"VU DEBUG: Emitting levels mic={mic_level:.3f}, speaker={speaker_level:.3f}")
@@ -252,13 +287,17 @@ class RecordingWorker(QThread):
                         self.is_recording = False
                         break
 
+                # Move captured audio from the ring buffers to disk
+                recorder.pump(self.backend)
+
                 sd.sleep(50)
 
-            # Stop and collect results
+            # Stop and collect what is still buffered
             result = self.backend.stop_recording()
 
             # Check if system audio was captured
-            system_audio_available = result.speaker_data is not None and result.speaker_data.size > 0
+            speaker_buffer = self.backend.speaker_buffer
+            system_audio_available = speaker_buffer is not None and speaker_buffer.frames_written > 0
             if not system_audio_available:
                 logger.warning("⚠️  System audio was not captured during recording")
                 if hasattr(self.backend, '_system_audio_error') and self.backend._system_audio_error:
@@ -267,31 +306,14 @@ class RecordingWorker(QThread):
                 # Emit warning about system audio
                 self.status_update.emit("Warning: System audio not captured - microphone only")
 
-            # Process audio using AudioProcessor
-            logger.info("Processing recorded audio...")
-            final_data = AudioProcessor.mix_audio(
-                mic_data=result.mic_data,
-                speaker_data=result.speaker_data,
-                mic_rate=result.mic_sample_rate,
-                speaker_rate=result.speaker_sample_rate,
-                target_rate=16000
-            )
-
-            if final_data is None or final_data.size == 0:
+            # Only the tail is left to process
+            logger.info("Finalizing recording...")
+            saved = recorder.finish(result)
+            if saved is None:
                 logger.error("Final data is empty after processing!")
                 self.recording_error.emit("Recording error: no audio samples captured")
                 return
-
-            # Normalize the final mixed audio
-            logger.info(f"Normalizing audio (current shape: {final_data.shape})")
-            final_data = AudioProcessor.normalize_audio(final_data, target_rms=0.12)
-
-            # Final safety limiting to prevent clipping
-            final_data = AudioProcessor.apply_safety_limiting(final_data, max_level=0.98)
-
-            # Save recording
-            recorded_path = self._save_recording(final_data, sample_rate=16000)
-            duration = len(final_data) / 16000
+            recorded_path, duration = saved
 
             logger.info(f"Recording saved: {recorded_path} ({duration:.1f}s)")
 
@@ -303,132 +325,11 @@ class RecordingWorker(QThread):
             self.recording_error.emit(f"Recording error: {str(e)}")
 
         finally:
+            if recorder:
+                recorder.close()
             if self.backend:
                 self.backend.cleanup()
 
-    def _save_recording(self, audio_data: np.ndarray, sample_rate: int) -> str:
-        """
-        Save audio data to file.
-
-        Args:
-            audio_data: Normalized audio data
-            sample_rate: Sample rate (Hz)
-
-        Returns:
-            Path to saved file
-
-        Raises:
-            RuntimeError: If save fails
-        """
-        # Create output directory if it doesn't exist
-        self.output_dir.mkdir(parents=True, exist_ok=True)
-
-        # Generate filename with timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"recording_{timestamp}.ogg"
-        recorded_path = str(self.output_dir / filename)
-
-        logger.info(f"Saving recording to: {recorded_path}")
-
-        # Apply audio filters if enabled
-        if self.enable_filters:
-            try:
-                from gui.audio_filters import NoiseGate, EnhancedCompressor
-                logger.info("Applying audio filters (NoiseGate + Compressor)")
-                self.status_update.emit("Applying noise gate filter...")
-
-                # Apply noise gate to remove background noise
-                noise_gate = NoiseGate(
-                    threshold_db=-32.0,  # Open gate above -32dB
-                    attack_ms=25.0,
-                    release_ms=150.0,
-                    hold_ms=200.0,
-                    sample_rate=sample_rate
-                )
-                audio_data = noise_gate.process(audio_data)
-                logger.info("Noise gate applied")
-
-                self.status_update.emit("Applying compression filter...")
-                # Apply compressor for consistent volume
-                compressor = EnhancedCompressor(
-                    threshold_db=-18.0,  # Compress above -18dB
-                    ratio=3.0,  # 3:1 ratio
-                    attack_ms=6.0,
-                    release_ms=60.0,
-                    output_gain_db=0.0,
-                    sample_rate=sample_rate
-                )
-                audio_data = compressor.process(audio_data)
-
-                logger.info("Audio filters applied successfully")
-                self.status_update.emit("Audio filters applied")
-            except Exception as e:
-                logger.warning(f"Could not apply audio filters: {e}. Saving unfiltered audio.")
-                self.status_update.emit(f"Filter warning: {e}")
-
-        # Save as Opus/OGG using ffmpeg for optimal compression
-        # Opus is the most efficient codec for speech transcription with Whisper
-        try:
-            import subprocess
-            import tempfile
-            import os
-            from tools.resource_locator import get_ffmpeg_path
-            
-            # First, save audio to a temporary WAV file
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_wav:
-                temp_wav_path = temp_wav.name
-                import wave
-                # Convert to int16 for WAV
-                audio_data_int16 = (audio_data * 32767).astype(np.int16)
-                with wave.open(temp_wav_path, 'wb') as wf:
-                    wf.setnchannels(1)  # Mono
-                    wf.setsampwidth(2)  # 16-bit
-                    wf.setframerate(sample_rate)
-                    wf.writeframes(audio_data_int16.tobytes())
-            
-            # Convert WAV to Opus/OGG using ffmpeg with optimized settings
-            ffmpeg_path = get_ffmpeg_path()
-            cmd = [
-                ffmpeg_path,
-                '-i', temp_wav_path,
-                '-c:a', 'libopus',  # Opus codec
-                '-b:a', '18k',  # 18 kbps bitrate (optimal for voice, between 12-24k)
-                '-ar', '16000',  # 16 kHz sample rate (Whisper's optimal)
-                '-ac', '1',  # Mono channel
-                '-application', 'voip',  # Optimize for voice/speech
-                '-y',  # Overwrite output
-                recorded_path
-            ]
-            
-            result = subprocess.run(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                check=True
-            )
-            
-            # Clean up temp file
-            try:
-                os.unlink(temp_wav_path)
-            except Exception:
-                pass
-            
-            logger.info(f"Recording saved as Opus/OGG: {recorded_path}")
-            
-        except Exception as export_err:
-            logger.warning(f"Opus export failed ({export_err}); falling back to WAV")
-            import wave
-            wav_path = str(self.output_dir / f"recording_{timestamp}.wav")
-            audio_data_int16 = (audio_data * 32767).astype(np.int16)
-            with wave.open(wav_path, 'wb') as wf:
-                wf.setnchannels(1)
-                wf.setsampwidth(2)
-                wf.setframerate(sample_rate)
-                wf.writeframes(audio_data_int16.tobytes())
-            recorded_path = wav_path
-
-        return recorded_path
-
 
 class TranscriptionWorker(QThread):
     """Qt worker thread for transcription with proper signal handling."""
@@ -440,7 +341,7 @@ class TranscriptionWorker(QThread):
 
     def __init__(self, video_path, model_size='tiny', language=None,
                  detect_language_changes=False, use_deep_scan=False,
-                 enable_filters=True, parent=None):
+                 enable_filters=True, use_parallel=False, parent=None):
         super().__init__(parent)
         self.video_path = video_path
         self.model_size = model_size
@@ -448,6 +349,8 @@ class TranscriptionWorker(QThread):
         self.detect_language_changes = detect_language_changes
         self.use_deep_scan = use_deep_scan
         self.enable_filters = enable_filters
+        # Shard long single-language files across CPU worker processes
+        self.use_parallel = use_parallel
         self._transcriber = None
         self.cancel_requested = False
         self.allowed_languages: List[str] = []
@@ -458,6 +361,17 @@ class TranscriptionWorker(QThread):
             from app.audio_extractor import AudioExtractor
             from app.transcriber import Transcriber
             from transcription.enhanced import EnhancedTranscriber
+            from transcription.parallel import ParallelTranscriber
+
+            # Stage 0: Same source file and settings as an earlier run - skip extraction,
+            # filtering and Whisper entirely
+            result_cache, cache_key = self._result_cache_key()
+            if result_cache is not None:
+                cached = result_cache.get(cache_key)
+                if cached is not None:
+                    self.progress_update.emit(self.tr("Loaded cached transcription"), 100)
+                    self.transcription_complete.emit(cached)
+                    return
 
             # Stage 1: Audio extraction (1-2%)
             self.progress_update.emit(self.tr("Extracting audio..."), 1)
@@ -474,28 +388,15 @@ class TranscriptionWorker(QThread):
                 if self.cancel_requested:
                     raise Exception("Transcription cancelled.")
 
-            audio_path = extractor.extract_audio(self.video_path,
-                                                progress_callback=audio_progress_callback)
+            # Decode straight to 16kHz mono float32 in memory - no intermediate audio
+            # file, and Whisper gets the array instead of decoding the media again
+            audio_data, audio_info = extractor.extract_audio_array(
+                self.video_path, progress_callback=audio_progress_callback
+            )
             if self.cancel_requested:
                 self.transcription_error.emit("Transcription cancelled.")
                 return
 
-            if not audio_path or not Path(audio_path).exists():
-                self.transcription_error.emit("Failed to extract audio from video")
-                return
-            
-            # Validate extracted audio file is not empty
-            try:
-                file_size = Path(audio_path).stat().st_size
-                if file_size == 0:
-                    self.transcription_error.emit("Extracted audio file is empty. The source file may be corrupted.")
-                    logger.error(f"Extracted audio file is empty: {audio_path}")
-                    return
-                if file_size < 1024:  # Less than 1KB is suspicious
-                    logger.warning(f"Extracted audio file is very small ({file_size} bytes): {audio_path}")
-            except Exception as e:
-                logger.warning(f"Could not validate audio file size: {e}")
-
             self.progress_update.emit(f"Audio extracted successfully", 2)
             if self.cancel_requested:
                 self.transcription_error.emit("Transcription cancelled.")
@@ -504,14 +405,14 @@ class TranscriptionWorker(QThread):
             # Step 1.5: Apply audio filters if enabled
             # Skip filters for recorded files (they already have filters applied when saved)
             # Check for both .ogg (Opus) and .wav (fallback) recorded files
-            audio_filename = Path(audio_path).name
-            is_recorded_file = audio_filename.startswith("recording_") and (
-                audio_filename.endswith(".ogg") or audio_filename.endswith(".wav")
+            source_filename = Path(self.video_path).name
+            is_recorded_file = source_filename.startswith("recording_") and (
+                source_filename.endswith(".ogg") or source_filename.endswith(".wav")
             )
             if self.enable_filters and not is_recorded_file:
                 try:
                     self.progress_update.emit("Applying audio filters...", 3)
-                    audio_path = self._apply_audio_filters(audio_path)
+                    audio_data = self._apply_audio_filters(audio_data, audio_info['sample_rate'])
                     logger.info("Audio filters applied to uploaded file")
                 except Exception as e:
                     logger.warning(f"Could not apply audio filters to upload: {e}")
@@ -529,6 +430,9 @@ class TranscriptionWorker(QThread):
             # Use EnhancedTranscriber if language change detection is enabled
             if self.detect_language_changes:
                 transcriber = EnhancedTranscriber(model_size=self.model_size)
+            elif self.use_parallel:
+                # Falls back to a single process for short files and GPUs
+                transcriber = ParallelTranscriber(model_size=self.model_size)
             else:
                 transcriber = Transcriber(model_size=self.model_size)
 
@@ -615,7 +519,7 @@ class TranscriptionWorker(QThread):
                           f"allowed_languages={self.allowed_languages}")
 
                 result = transcriber.transcribe_multilang(
-                    audio_path,
+                    str(self.video_path),
                     detect_language_changes=True,
                     use_segment_retranscription=True,
                     progress_callback=progress_callback,
@@ -624,22 +528,42 @@ class TranscriptionWorker(QThread):
                     skip_fast_single=True,
                     skip_sampling=True,
                     fast_text_language=not self.use_deep_scan,
-                    allowed_languages=self.allowed_languages if self.allowed_languages else None
+                    allowed_languages=self.allowed_languages if self.allowed_languages else None,
+                    audio_data=audio_data
                 )
                 logger.info(f"transcribe_multilang returned. Result type: {type(result)}, "
                           f"has 'text': {'text' in result if result else 'None'}")
             else:
                 logger.info("Starting regular transcribe")
-                result = transcriber.transcribe(
-                    audio_path,
-                    language=self.language if self.language and self.language != "Auto-detect" else None,
-                    progress_callback=progress_callback
-                )
+                callback = progress_callback
+                if isinstance(transcriber, ParallelTranscriber):
+                    # Shard progress comes as (message, percent)
+                    def callback(message, percent=None):
+                        progress_callback(message if percent is None else f"PROGRESS:{percent}:{message}")
+                try:
+                    result = transcriber.transcribe(
+                        audio_data,
+                        language=self.language if self.language and self.language != "Auto-detect" else None,
+                        progress_callback=callback
+                    )
+                finally:
+                    if isinstance(transcriber, ParallelTranscriber):
+                        transcriber.shutdown()  # Stop the shard worker processes
                 logger.info(f"transcribe returned. Result type: {type(result)}")
 
             # Stop auto-progress thread
             auto_progress_active = False
 
+            if result_cache is not None and result and not self.cancel_requested:
+                result_cache.put(
+                    cache_key, result, source=str(self.video_path),
+                    settings={
+                        'model_size': self.model_size, 'language': self.language,
+                        'multilang': self.detect_language_changes, 'deep_scan': self.use_deep_scan,
+                        'filters': self.enable_filters, 'parallel': self.use_parallel
+                    }
+                )
+
             # Stage 4: Finishing up (98-99%)
             self.progress_update.emit(self.tr("Finishing up..."), 98)
             time.sleep(0.2)  # Brief pause for visual feedback
@@ -665,193 +589,184 @@ class TranscriptionWorker(QThread):
             logger.error(f"Full traceback: {traceback.format_exc()}")
             self.transcription_error.emit(f"Transcription failed: {str(e)}")
 
-    def _apply_audio_filters(self, audio_path: str) -> str:
-        """Apply audio filters to extracted audio file using streaming for memory efficiency."""
-        import soundfile as sf
-        from gui.audio_filters import NoiseGate, EnhancedCompressor
+    def _result_cache_key(self):
+        """Return (ResultCache, key) for this job's source file and settings, or (None, None)."""
+        try:
+            from app.extraction_cache import partial_content_hash
+            from transcription.result_cache import ResultCache, result_cache_enabled
+            from transcription.vad import vad_enabled
+            if not result_cache_enabled() or not Path(self.video_path).is_file():
+                return None, None
+            cache = ResultCache()
+            # Sampled hash plus size and mtime (as the extraction cache keys sources):
+            # hashing a whole multi-GB video would cost more than a short transcription
+            st = Path(self.video_path).stat()
+            source_hash = f"{partial_content_hash(str(self.video_path))}-{st.st_size}-{st.st_mtime_ns}"
+            key = cache.key_for_hash(
+                source_hash,
+                mode='gui',
+                model_size=self.model_size,
+                language=self.language if self.language and self.language != "Auto-detect" else None,
+                multilang=self.detect_language_changes,
+                deep_scan=self.use_deep_scan,
+                # Stitched shards can split segments differently from one pass
+                parallel=self.use_parallel and not self.detect_language_changes,
+                allowed_languages=sorted(self.allowed_languages) if self.detect_language_changes else None,
+                filters={
+                    'noise_gate': NOISE_GATE_SETTINGS,
+                    'compressor': COMPRESSOR_SETTINGS
+                } if self.enable_filters else None,
+                vad=vad_enabled()
+            )
+            return cache, key
+        except Exception as e:
+            logger.warning(f"Result cache unavailable: {e}")
+            return None, None
 
-        logger.info(f"Applying audio filters to: {audio_path}")
-
-        # Get file info without loading entire file
-        info = sf.info(audio_path)
-        sample_rate = info.samplerate
-        total_frames = info.frames
-        duration_seconds = total_frames / sample_rate
-        duration_minutes = duration_seconds / 60.0
-
-        logger.info(f"File info: {total_frames:,} frames ({duration_minutes:.1f} minutes) at {sample_rate}Hz")
-
-        # Use streaming processing for files longer than 3 minutes
-        # This works for files of ANY length while using minimal memory
-        if duration_minutes > 3.0:
-            logger.info(f"Using streaming processing for {duration_minutes:.1f} minute file")
-            return self._apply_filters_streaming(audio_path, info)
-
-        # For short files (< 3 minutes), load entirely into memory for speed
-        logger.info("Loading short file into memory for fast processing")
-        audio_data, sample_rate = sf.read(audio_path)
-
-        # Convert to mono if stereo
-        if len(audio_data.shape) > 1:
-            audio_data = audio_data.mean(axis=1)
-
-        self.progress_update.emit("Applying noise gate...", 3)
-
-        # Apply noise gate
-        noise_gate = NoiseGate(
-            threshold_db=-32.0,
-            attack_ms=25.0,
-            release_ms=150.0,
-            hold_ms=200.0,
-            sample_rate=sample_rate
-        )
-        audio_data = noise_gate.process(audio_data)
-
-        self.progress_update.emit("Applying compressor...", 4)
-
-        # Apply compressor
-        compressor = EnhancedCompressor(
-            threshold_db=-18.0,
-            ratio=3.0,
-            attack_ms=6.0,
-            release_ms=60.0,
-            output_gain_db=0.0,
-            sample_rate=sample_rate
-        )
-        audio_data = compressor.process(audio_data)
-
-        # Save filtered audio back to file
-        sf.write(audio_path, audio_data, sample_rate)
-        logger.info(f"Filtered audio saved to: {audio_path}")
-
-        return audio_path
-
-    def _apply_filters_streaming(self, audio_path: str, file_info) -> str:
+    def _apply_audio_filters(self, audio_data: np.ndarray, sample_rate: int) -> np.ndarray:
         """
-        Apply filters using streaming processing for memory efficiency.
-
-        This method can process files of ANY length (even hours-long) while using
-        minimal memory by reading/processing/writing in chunks.
+        Apply the noise gate and compressor to in-memory audio, in place.
 
-        Filter state is maintained between chunks for seamless transitions.
+        Audio is processed in 60-second chunks so long files report progress; filter
+        state is carried between chunks, so the result is identical to filtering the
+        whole array at once.
         """
-        import soundfile as sf
-        import tempfile
-        import os
         from gui.audio_filters import NoiseGate, EnhancedCompressor
 
-        sample_rate = file_info.samplerate
-        total_frames = file_info.frames
-        channels = file_info.channels
+        total_frames = len(audio_data)
         duration_minutes = total_frames / sample_rate / 60.0
+        chunk_frames = 60 * sample_rate
+        num_chunks = max(1, int(np.ceil(total_frames / chunk_frames)))
+        logger.info(f"Filtering {total_frames:,} frames ({duration_minutes:.1f} minutes) at {sample_rate}Hz "
+                    f"in {num_chunks} chunks")
 
-        # Process in 60-second chunks (good balance between memory and performance)
-        chunk_duration = 60  # seconds
-        chunk_frames = chunk_duration * sample_rate
-        num_chunks = int(np.ceil(total_frames / chunk_frames))
-
-        logger.info(f"Streaming processing: {num_chunks} chunks of {chunk_duration}s each")
-        logger.info(f"Memory usage: ~{chunk_frames * 4 / 1024 / 1024:.1f} MB per chunk (vs {total_frames * 4 / 1024 / 1024:.1f} MB for full file)")
-
-        # Initialize filters (they maintain state between chunks)
-        noise_gate = NoiseGate(
-            threshold_db=-32.0,
-            attack_ms=25.0,
-            release_ms=150.0,
-            hold_ms=200.0,
-            sample_rate=sample_rate
-        )
-
-        compressor = EnhancedCompressor(
-            threshold_db=-18.0,
-            ratio=3.0,
-            attack_ms=6.0,
-            release_ms=60.0,
-            output_gain_db=0.0,
-            sample_rate=sample_rate
-        )
-
-        # Always use WAV for streaming to avoid OGG/VORBIS encoding issues
-        # (OGG encoding can cause bus errors on some systems during streaming writes)
-        temp_suffix = '.wav'
-        out_format = 'WAV'
-        out_subtype = 'FLOAT'
-
-        temp_fd, temp_path = tempfile.mkstemp(suffix=temp_suffix, prefix='filtered_')
-        os.close(temp_fd)
-
-        logger.info(f"Streaming output format: WAV (original was {file_info.format})")
-        logger.info(f"Note: WAV is used for streaming to ensure stability")
+        noise_gate = NoiseGate(**NOISE_GATE_SETTINGS, sample_rate=sample_rate)
+        compressor = EnhancedCompressor(**COMPRESSOR_SETTINGS, sample_rate=sample_rate)
 
-        try:
-            # Open input file for streaming reading
-            with sf.SoundFile(audio_path, 'r') as infile:
-                # Open output file for streaming writing (preserves original compression)
-                with sf.SoundFile(temp_path, 'w', samplerate=sample_rate,
-                                 channels=1, format=out_format, subtype=out_subtype) as outfile:
+        for chunk_idx in range(num_chunks):
+            if self.cancel_requested:
+                raise Exception("Transcription cancelled.")
+            start = chunk_idx * chunk_frames
+            end = min(start + chunk_frames, total_frames)
+            audio_data[start:end] = compressor.process(noise_gate.process(audio_data[start:end]))
+
+            if num_chunks > 1:
+                progress_pct = 3 + int((chunk_idx + 1) / num_chunks * 2)  # 3-5%
+                self.progress_update.emit(
+                    f"Filtering: {end / sample_rate / 60.0:.1f}/{duration_minutes:.1f} min",
+                    progress_pct
+                )
 
-                    frames_processed = 0
+        return audio_data
 
-                    # Process file in chunks
-                    for chunk_idx in range(num_chunks):
-                        # Read next chunk
-                        frames_to_read = min(chunk_frames, total_frames - frames_processed)
-                        chunk = infile.read(frames_to_read)
+    def cancel(self):
+        """Request cancellation of current transcription (chunk-level for multi-language)."""
+        self.cancel_requested = True
+        if self._transcriber and hasattr(self._transcriber, 'request_cancel'):
+            self._transcriber.request_cancel()
+        self.progress_update.emit("Cancellation requested...", 95)
+        logger.info("Cancellation requested by user")
+
+
+class LiveTranscriptionWorker(QThread):
+    """
+    Qt worker thread that transcribes a recording while it is still running.
 
-                        if chunk.size == 0:
-                            break
+    The recorder hands every written block to feed() (from the recording thread);
+    this thread decodes rolling windows with LiveTranscriber and pushes committed
+    segments and the revised tail to the UI. After finish_stream() only the last
+    unfinished window is transcribed before transcription_complete is emitted.
+    """
 
-                        # Convert to mono if stereo
-                        if len(chunk.shape) > 1 and chunk.shape[1] > 1:
-                            chunk = chunk.mean(axis=1)
+    # Signals for thread-safe communication
+    segments_committed = Signal(list)  # newly committed segments (recording-relative times)
+    tail_updated = Signal(str)  # current uncommitted text, revised by every window
+    transcription_complete = Signal(dict)  # result dictionary for the whole recording
+    transcription_error = Signal(str)  # error message
 
-                        # Ensure 1D array
-                        chunk = chunk.flatten()
+    # Audio queued while a window decodes; more means the model can't keep up with
+    # the recording, and live mode stops (the recording can be transcribed afterwards)
+    MAX_QUEUED_SECONDS = 60.0
 
-                        # Apply filters (state is preserved between chunks)
-                        chunk = noise_gate.process(chunk)
-                        chunk = compressor.process(chunk)
+    def __init__(self, model_size='base', language=None, parent=None):
+        super().__init__(parent)
+        self.model_size = model_size
+        self.language = language
+        self._blocks = queue.Queue()
+        self._queued_frames = 0
+        self._queue_lock = threading.Lock()
+        self._fell_behind = False
+        self._stream_finished = False
+        self.cancel_requested = False
 
-                        # Write processed chunk to output
-                        outfile.write(chunk)
+    def feed(self, block: np.ndarray):
+        """Queue a 16kHz float32 block (called from the recording thread; never blocks)."""
+        if self.cancel_requested or self._fell_behind:
+            return
+        with self._queue_lock:
+            if self._queued_frames + len(block) > self.MAX_QUEUED_SECONDS * 16000:
+                self._fell_behind = True
+                return
+            self._queued_frames += len(block)
+        self._blocks.put(block.copy())
 
-                        frames_processed += len(chunk)
+    def finish_stream(self):
+        """The recording has stopped; transcribe what is left and emit the result."""
+        self._stream_finished = True
 
-                        # Update progress
-                        progress_pct = 3 + int((chunk_idx + 1) / num_chunks * 2)  # 3-5%
-                        elapsed_min = frames_processed / sample_rate / 60.0
-                        self.progress_update.emit(
-                            f"Filtering: {elapsed_min:.1f}/{duration_minutes:.1f} min",
-                            progress_pct
-                        )
+    def cancel(self):
+        """Stop without producing a result (e.g. the recording failed)."""
+        self.cancel_requested = True
 
-                        logger.debug(f"Processed chunk {chunk_idx + 1}/{num_chunks} "
-                                   f"({frames_processed:,}/{total_frames:,} frames)")
+    def _drain_into(self, live) -> int:
+        drained = 0
+        while True:
+            try:
+                block = self._blocks.get_nowait()
+            except queue.Empty:
+                return drained
+            with self._queue_lock:
+                self._queued_frames -= len(block)
+            live.add_audio(block)
+            drained += 1
 
-            # Replace original file with filtered version
-            logger.info("Finalizing filtered audio...")
-            self.progress_update.emit("Saving filtered audio...", 5)
+    def run(self):
+        """Decode windows as audio arrives until the stream is finished or cancelled."""
+        try:
+            from app.transcriber import Transcriber
+            from transcription.live import LiveBacklogError, LiveTranscriber
+
+            transcriber = Transcriber(model_size=self.model_size)
+            transcriber.load_model()
+            live = LiveTranscriber(transcriber, language=self.language)
+            logger.info(f"Live transcription started (model={self.model_size}, language={self.language})")
+
+            while not self.cancel_requested:
+                # Read the flag before draining, so no block queued before it was set is missed
+                stream_finished = self._stream_finished
+                self._drain_into(live)
+                if self._fell_behind:
+                    raise LiveBacklogError(f"Decoding fell more than {self.MAX_QUEUED_SECONDS:.0f}s "
+                                           f"behind the recording")
+                if stream_finished:
+                    break
+                if live.ready():
+                    committed = live.process()
+                    if committed:
+                        self.segments_committed.emit(committed)
+                    self.tail_updated.emit(live.tail_text)
+                else:
+                    self.msleep(200)
 
-            # Simply replace the original file (format preserved)
-            # This keeps streaming benefits - no need to load entire file into memory
-            os.replace(temp_path, audio_path)
+            if self.cancel_requested:
+                logger.info("Live transcription cancelled")
+                return
 
-            logger.info(f"Streaming filter processing complete: {frames_processed:,} frames processed")
-            logger.info(f"Filtered audio saved (format: {out_format})")
-            return audio_path
+            # Only the last, uncommitted window is left
+            self.tail_updated.emit("")
+            result = live.finish()
+            self.transcription_complete.emit(result)
 
         except Exception as e:
-            # Clean up temp file on error
-            try:
-                os.unlink(temp_path)
-            except:
-                pass
-            raise e
-
-    def cancel(self):
-        """Request cancellation of current transcription (chunk-level for multi-language)."""
-        self.cancel_requested = True
-        if self._transcriber and hasattr(self._transcriber, 'request_cancel'):
-            self._transcriber.request_cancel()
-        self.progress_update.emit("Cancellation requested...", 95)
-        logger.info("Cancellation requested by user")
+            logger.error(f"Live transcription error: {e}", exc_info=True)
+            self.transcription_error.emit(f"Live transcription error: {str(e)}")
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Parity tests and benchmark for the vectorized audio filters.
+
+Compares app.audio_filters against straightforward per-sample reference
+implementations (the original loops), both for whole signals and when the
+signal is streamed in chunks the way TranscriptionWorker._apply_audio_filters
+does. Run directly for a samples/sec benchmark.
+
+Usage:
+    python -m pytest test/test_audio_filters.py
+    python test/test_audio_filters.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.audio_filters import NoiseGate, EnhancedCompressor  # noqa: E402
+
+
+SAMPLE_RATE = 16000
+
+
+class ReferenceNoiseGate:
+    """Per-sample noise gate (the original NoiseGate.process loop)."""
+
+    def __init__(self, gate):
+        self.threshold = gate.threshold
+        self.attack_frames = gate.attack_frames
+        self.release_frames = gate.release_frames
+        self.hold_frames = gate.hold_frames
+        self.envelope = 0.0
+        self.hold_counter = 0
+        self.is_open = False
+
+    def process(self, audio_data):
+        output = np.zeros_like(audio_data)
+        attack_coeff = 1.0 / max(1, self.attack_frames)
+        release_coeff = 1.0 / max(1, self.release_frames)
+        for i in range(len(audio_data)):
+            should_open = abs(audio_data[i]) > self.threshold
+            if should_open:
+                self.hold_counter = self.hold_frames
+                self.is_open = True
+            if self.hold_counter > 0:
+                self.hold_counter -= 1
+                should_open = True
+            elif self.is_open and not should_open:
+                self.is_open = False
+            target = 1.0 if should_open else 0.0
+            if self.envelope < target:
+                self.envelope = min(self.envelope + attack_coeff, 1.0)
+            elif self.envelope > target:
+                self.envelope = max(self.envelope - release_coeff, 0.0)
+            output[i] = audio_data[i] * self.envelope
+        return output
+
+
+class ReferenceCompressor:
+    """Per-sample compressor (the original EnhancedCompressor.process loop)."""
+
+    def __init__(self, compressor):
+        self.threshold_db = compressor.threshold_db
+        self.threshold = compressor.threshold
+        self.ratio = compressor.ratio
+        self.output_gain = compressor.output_gain
+        self.attack_coeff = compressor.attack_coeff
+        self.release_coeff = compressor.release_coeff
+        self.envelope = 0.0
+
+    def process(self, audio_data):
+        output = np.zeros_like(audio_data)
+        for i in range(len(audio_data)):
+            frame_rms = abs(audio_data[i])
+            if frame_rms > self.envelope:
+                self.envelope = self.attack_coeff * self.envelope + (1.0 - self.attack_coeff) * frame_rms
+            else:
+                self.envelope = self.release_coeff * self.envelope + (1.0 - self.release_coeff) * frame_rms
+            if self.envelope > self.threshold:
+                envelope_db = 20.0 * np.log10(max(1e-10, self.envelope))
+                gain_reduction_db = (envelope_db - self.threshold_db) * (1.0 - 1.0 / self.ratio)
+                gain = 10.0 ** (-gain_reduction_db / 20.0)
+            else:
+                gain = 1.0
+            output[i] = audio_data[i] * gain * self.output_gain
+        return output
+
+
+def make_test_signal(seconds=4.0, seed=0):
+    """Speech-like bursts over a low noise floor, with near-threshold chatter."""
+    rng = np.random.default_rng(seed)
+    n = int(seconds * SAMPLE_RATE)
+    t = np.arange(n) / SAMPLE_RATE
+    signal = 0.005 * rng.standard_normal(n)
+    for start in np.arange(0.2, seconds, 0.7):
+        length = rng.uniform(0.05, 0.4)
+        i0, i1 = int(start * SAMPLE_RATE), min(n, int((start + length) * SAMPLE_RATE))
+        signal[i0:i1] += rng.uniform(0.01, 0.5) * np.sin(2 * np.pi * rng.uniform(100, 800) * t[i0:i1])
+    return signal.astype(np.float32)
+
+
+def gate_pair(**kwargs):
+    gate = NoiseGate(sample_rate=SAMPLE_RATE, **kwargs)
+    return gate, ReferenceNoiseGate(gate)
+
+
+def test_noise_gate_matches_reference():
+    signal = make_test_signal()
+    gate, reference = gate_pair()
+    np.testing.assert_allclose(gate.process(signal), reference.process(signal), atol=1e-6)
+    assert gate.hold_counter == reference.hold_counter
+    assert gate.is_open == reference.is_open
+    assert abs(gate.envelope - reference.envelope) < 1e-9
+
+
+def test_noise_gate_matches_reference_edge_settings():
+    signal = make_test_signal(seconds=1.5, seed=3)
+    for kwargs in ({'hold_ms': 0.0}, {'attack_ms': 0.0, 'release_ms': 0.0}, {'threshold_db': -60.0},
+                   {'threshold_db': 0.0}):
+        gate, reference = gate_pair(**kwargs)
+        np.testing.assert_allclose(gate.process(signal), reference.process(signal), atol=1e-6, err_msg=str(kwargs))
+
+
+def test_noise_gate_streaming_matches_whole_signal():
+    signal = make_test_signal(seconds=6.0, seed=1)
+    whole_gate, _ = gate_pair()
+    whole = whole_gate.process(signal)
+
+    chunked_gate, reference = gate_pair()
+    rng = np.random.default_rng(2)
+    boundaries = np.sort(rng.choice(np.arange(1, len(signal)), size=12, replace=False))
+    chunks = np.split(signal, boundaries)
+    streamed = np.concatenate([chunked_gate.process(chunk) for chunk in chunks])
+    referenced = np.concatenate([reference.process(chunk) for chunk in chunks])
+
+    np.testing.assert_allclose(streamed, whole, atol=1e-6)
+    np.testing.assert_allclose(streamed, referenced, atol=1e-6)
+
+
+def test_noise_gate_stereo():
+    left, right = make_test_signal(seed=4), make_test_signal(seed=5)
+    stereo = np.column_stack([left, right])
+    gate = NoiseGate(sample_rate=SAMPLE_RATE)
+    output = gate.process(stereo)
+    assert output.shape == stereo.shape
+
+
+def compressor_pair(**kwargs):
+    compressor = EnhancedCompressor(sample_rate=SAMPLE_RATE, **kwargs)
+    return compressor, ReferenceCompressor(compressor)
+
+
+def test_compressor_matches_reference():
+    signal = make_test_signal()
+    compressor, reference = compressor_pair(threshold_db=-30.0, ratio=4.0, output_gain_db=3.0)
+    np.testing.assert_allclose(compressor.process(signal), reference.process(signal), atol=1e-6)
+    assert abs(compressor.envelope - reference.envelope) < 1e-9
+
+
+def test_compressor_matches_reference_edge_settings():
+    signal = make_test_signal(seconds=1.5, seed=6)
+    for kwargs in ({'attack_ms': 0.0}, {'release_ms': 0.0}, {'attack_ms': 0.0, 'release_ms': 0.0},
+                   {'ratio': 1.0}, {'threshold_db': -80.0, 'ratio': 20.0}, {'attack_ms': 200.0, 'release_ms': 2000.0}):
+        compressor, reference = compressor_pair(**kwargs)
+        np.testing.assert_allclose(compressor.process(signal), reference.process(signal), atol=1e-6,
+                                   err_msg=str(kwargs))
+
+
+def test_compressor_streaming_matches_whole_signal():
+    signal = make_test_signal(seconds=6.0, seed=7)
+    whole_compressor, _ = compressor_pair()
+    whole = whole_compressor.process(signal)
+
+    chunked_compressor, reference = compressor_pair()
+    rng = np.random.default_rng(8)
+    boundaries = np.sort(rng.choice(np.arange(1, len(signal)), size=12, replace=False))
+    chunks = np.split(signal, boundaries)
+    streamed = np.concatenate([chunked_compressor.process(chunk) for chunk in chunks])
+    referenced = np.concatenate([reference.process(chunk) for chunk in chunks])
+
+    np.testing.assert_allclose(streamed, whole, atol=1e-6)
+    np.testing.assert_allclose(streamed, referenced, atol=1e-6)
+
+
+def _throughput(name, vectorized_filter, reference_filter, signal):
+    start = time.perf_counter()
+    vectorized_filter.process(signal)
+    vectorized = time.perf_counter() - start
+
+    # The reference is slow; time a slice and extrapolate
+    ref_slice = signal[:min(len(signal), 10 * SAMPLE_RATE)]
+    start = time.perf_counter()
+    reference_filter.process(ref_slice)
+    per_sample = (time.perf_counter() - start) / len(ref_slice)
+
+    seconds = len(signal) / SAMPLE_RATE
+    print(f"{name} ({seconds:.0f}s @ {SAMPLE_RATE}Hz):")
+    print(f"  vectorized: {len(signal) / vectorized:>14,.0f} samples/sec ({seconds / vectorized:,.0f}x real time)")
+    print(f"  reference:  {1.0 / per_sample:>14,.0f} samples/sec ({1.0 / (per_sample * SAMPLE_RATE):,.1f}x real time)")
+    print(f"  speedup:    {per_sample * len(signal) / vectorized:>14.1f}x")
+
+
+def benchmark(seconds=60.0):
+    """Print samples/sec for the vectorized filters vs the per-sample references."""
+    signal = make_test_signal(seconds=seconds)
+    _throughput("NoiseGate", *gate_pair(), signal)
+    _throughput("EnhancedCompressor", *compressor_pair(), signal)
+
+
+if __name__ == "__main__":
+    benchmark()
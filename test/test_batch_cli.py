@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Tests for the batch transcription command line tool.
+
+Runs BatchTranscriber's pipeline with a fake extraction stage and a fake
+in-process model (the model stage runs on threads instead of worker
+processes). Checks input discovery, SRT/VTT/JSON outputs, the run manifest,
+resuming after an interrupted run, and that failures are recorded and retried.
+
+Usage:
+    python -m pytest test/test_batch_cli.py
+    python test/test_batch_cli.py
+"""
+
+import sys
+import json
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from transcription import cli  # noqa: E402
+from transcription.cli import BatchManifest, BatchTranscriber, collect_inputs  # noqa: E402
+
+
+class FakeEngine:
+    def __init__(self):
+        self.calls = 0
+
+    def transcribe(self, audio, language=None, **kwargs):
+        self.calls += 1
+        duration = len(audio) / cli.SAMPLE_RATE
+        return {
+            'text': ' Hello there.',
+            'language': language or 'en',
+            'segments': [{'id': 0, 'start': np.float64(0.0), 'end': np.float64(duration), 'text': ' Hello there.'}]
+        }
+
+
+class FakeBatch(BatchTranscriber):
+    """Threads for the model stage; media is 'decoded' to silence of the length in the file."""
+
+    fail = ()
+
+    def _model_executor(self):
+        return ThreadPoolExecutor(max_workers=self.model_workers)
+
+    def _extract(self, path):
+        if path.name in self.fail:
+            raise RuntimeError("ffmpeg failed")
+        seconds = float(path.read_text() or 1)
+        return np.zeros(int(seconds * cli.SAMPLE_RATE), dtype=np.float32), {'duration': seconds}, 0.01
+
+
+def make_archive(root: Path, names):
+    for name in names:
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("2.5")
+
+
+def run_batch(root: Path, out: Path, **kwargs):
+    fail = kwargs.pop('fail', ())
+    batch = FakeBatch(out, extract_workers=2, model_workers=2, **kwargs)
+    batch.fail = fail
+    return batch.run(collect_inputs([str(root)], out))
+
+
+def setup_function(_=None):
+    cli._WORKER_ENGINE = FakeEngine()
+
+
+def test_collect_inputs_keeps_relative_paths():
+    with tempfile.TemporaryDirectory() as tmp:
+        root, out = Path(tmp) / 'archive', Path(tmp) / 'out'
+        make_archive(root, ['a.mp3', 'sub/b.mp4', 'sub/b.wav', 'notes.txt'])
+        items = collect_inputs([str(root)], out)
+        bases = sorted(str(item.output_base.relative_to(out)) for item in items)
+        assert bases == ['a', 'sub/b', 'sub/b.wav']
+
+
+def test_collect_inputs_reads_list_files():
+    with tempfile.TemporaryDirectory() as tmp:
+        root, out = Path(tmp), Path(tmp) / 'out'
+        make_archive(root, ['one.mp3', 'two.flac'])
+        (root / 'list.txt').write_text("# archive\none.mp3\n\n" + str(root / 'two.flac') + "\none.mp3\n")
+        items = collect_inputs([str(root / 'list.txt')], out)
+        assert [item.path.name for item in items] == ['one.mp3', 'two.flac']
+
+
+def test_batch_writes_outputs_and_manifest():
+    setup_function()
+    with tempfile.TemporaryDirectory() as tmp:
+        root, out = Path(tmp) / 'archive', Path(tmp) / 'out'
+        make_archive(root, ['a.mp3', 'b.mp3', 'sub/c.wav'])
+        summary = run_batch(root, out)
+        assert summary['done'] == 3 and summary['failed'] == 0
+        assert abs(summary['audio_seconds'] - 7.5) < 1e-6
+        assert summary['throughput'] > 0
+
+        srt = (out / 'sub' / 'c.srt').read_text()
+        assert srt.startswith("1\n00:00:00,000 --> 00:00:02,500\nHello there.")
+        assert (out / 'a.vtt').read_text().startswith("WEBVTT")
+        data = json.loads((out / 'b.json').read_text())
+        assert data['language'] == 'en' and data['segments'][0]['end'] == 2.5
+
+        records = BatchManifest(out / cli.MANIFEST_NAME).load()
+        assert len(records) == 3 and all(record['status'] == 'done' for record in records.values())
+
+
+def test_rerun_skips_finished_files():
+    setup_function()
+    with tempfile.TemporaryDirectory() as tmp:
+        root, out = Path(tmp) / 'archive', Path(tmp) / 'out'
+        make_archive(root, ['a.mp3', 'b.mp3'])
+        run_batch(root, out)
+        calls = cli._WORKER_ENGINE.calls
+
+        summary = run_batch(root, out)
+        assert summary['skipped'] == 2 and summary['done'] == 0
+        assert cli._WORKER_ENGINE.calls == calls
+
+        # A deleted output (or a torn manifest line) makes the file run again
+        (out / 'b.srt').unlink()
+        with open(out / cli.MANIFEST_NAME, 'a') as f:
+            f.write('{"path": "trunc')
+        summary = run_batch(root, out)
+        assert summary['done'] == 1 and summary['skipped'] == 1
+
+
+def test_failures_are_recorded_and_retried():
+    setup_function()
+    with tempfile.TemporaryDirectory() as tmp:
+        root, out = Path(tmp) / 'archive', Path(tmp) / 'out'
+        make_archive(root, ['a.mp3', 'b.mp3', 'c.mp3'])
+        summary = run_batch(root, out, fail=('b.mp3',))
+        assert summary['done'] == 2 and summary['failed'] == 1
+        record = BatchManifest(out / cli.MANIFEST_NAME).load()[str((root / 'b.mp3').resolve())]
+        assert record['status'] == 'failed' and record['stage'] == 'extract'
+
+        summary = run_batch(root, out)
+        assert summary['done'] == 1 and summary['skipped'] == 2
+
+
+def test_resume_from_manifest_keeps_nested_outputs():
+    setup_function()
+    with tempfile.TemporaryDirectory() as tmp:
+        root, out = Path(tmp) / 'archive', Path(tmp) / 'out'
+        make_archive(root, ['top.mp3', 'sub/a.wav', 'sub/deeper/b.mp3'])
+        summary = run_batch(root, out, fail=('b.mp3',))
+        assert summary['done'] == 2 and summary['failed'] == 1
+
+        manifest = out / cli.MANIFEST_NAME
+        items = collect_inputs([str(manifest)], out)
+        assert sorted(str(item.output_base.relative_to(out)) for item in items) == [
+            'sub/a', 'sub/deeper/b', 'top'
+        ]
+
+        batch = FakeBatch(out, extract_workers=2, model_workers=2)
+        summary = batch.run(items)
+        assert summary['skipped'] == 2 and summary['done'] == 1
+        assert (out / 'sub' / 'deeper' / 'b.srt').exists()
+        assert not (out / 'b.srt').exists()
+
+
+if __name__ == "__main__":
+    for name, test in sorted(globals().items()):
+        if name.startswith("test_") and callable(test):
+            setup_function()
+            test()
+            print(f"{name}: OK")
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Tests for the extracted-audio cache.
+
+Every test uses a fresh temporary cache directory with a quota of a few
+kilobytes; entry ages are set with os.utime() instead of waiting. Checks
+that an entry only appears once commit() renames its temporary file, that
+the quota evicts least recently used entries but spares recently used ones,
+that partial files left by crashed jobs are cleaned up once stale, and
+which bytes partial_content_hash() reads.
+
+Usage:
+    python -m pytest test/test_extraction_cache.py
+    python test/test_extraction_cache.py
+"""
+
+import os
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.extraction_cache import PARTIAL_MARKER, ExtractionCache, partial_content_hash  # noqa: E402
+
+ENTRY_BYTES = 1000
+# Room for two entries, not three
+QUOTA_MB = 2.5 * ENTRY_BYTES / 1024 / 1024
+HOUR = 3600
+
+
+def setup_function(_=None):
+    global _CACHE_DIR
+    _CACHE_DIR = tempfile.TemporaryDirectory()
+
+
+def teardown_function(_=None):
+    _CACHE_DIR.cleanup()
+
+
+def make_cache():
+    return ExtractionCache(cache_dir=os.path.join(_CACHE_DIR.name, 'audio'), max_mb=QUOTA_MB)
+
+
+def set_age(path, seconds):
+    stamp = time.time() - seconds
+    os.utime(path, (stamp, stamp))
+
+
+def store(cache, key, fill=b'a', suffix='.ogg'):
+    """Write and commit an entry as the extractor does."""
+    temp = cache.temp_path(suffix)
+    Path(temp).write_bytes(fill * ENTRY_BYTES)
+    return cache.commit(temp, key, suffix)
+
+
+def test_commit_publishes_the_temporary_file():
+    cache = make_cache()
+    temp = cache.temp_path('.ogg')
+    name = os.path.basename(temp)
+    assert os.path.dirname(temp) == cache.cache_dir
+    # The real suffix stays last so ffmpeg can infer the format
+    assert PARTIAL_MARKER in name and name.endswith('.ogg')
+
+    Path(temp).write_bytes(b'half written')
+    assert cache.get('k1', '.ogg') is None and cache.entries() == []
+
+    Path(temp).write_bytes(b'x' * ENTRY_BYTES)
+    final = cache.commit(temp, 'k1', '.ogg')
+    assert final == cache.path_for('k1', '.ogg') and not os.path.exists(temp)
+    assert cache.get('k1', '.ogg') == final and cache.contains(final)
+    assert Path(final).read_bytes() == b'x' * ENTRY_BYTES
+    assert not cache.contains(os.path.join(_CACHE_DIR.name, 'elsewhere.ogg'))
+
+    # Another job committing the same key replaces the entry with its own copy
+    assert store(cache, 'k1', fill=b'y') == final
+    assert Path(final).read_bytes() == b'y' * ENTRY_BYTES
+    assert [e['path'] for e in cache.entries()] == [final]
+
+
+def test_discarded_and_empty_entries_are_misses():
+    cache = make_cache()
+    temp = cache.temp_path('.f32')
+    cache.discard(temp)
+    assert os.listdir(cache.cache_dir) == []
+
+    # An empty entry (a failed extraction) is dropped on lookup
+    Path(cache.path_for('empty', '.f32')).write_bytes(b'')
+    assert cache.get('empty', '.f32') is None
+    assert os.listdir(cache.cache_dir) == []
+
+
+def test_quota_evicts_least_recently_used():
+    cache = make_cache()
+    first = store(cache, 'first')
+    set_age(first, 3 * HOUR)
+    second = store(cache, 'second')
+    set_age(second, 2 * HOUR)
+
+    # Reading 'first' makes 'second' the least recently used
+    assert cache.get('first', '.ogg') == first
+    third = store(cache, 'third')
+    assert sorted(e['path'] for e in cache.entries()) == sorted([first, third])
+    assert cache.get('second', '.ogg') is None
+    assert cache.stats()['entries'] == 2
+
+
+def test_recently_used_entries_are_not_evicted():
+    cache = make_cache()
+    old = store(cache, 'old')
+    set_age(old, 2 * HOUR)
+    recent = store(cache, 'recent')
+    set_age(recent, 60)
+    store(cache, 'new')
+
+    # Only the old entry may go; the cache stays over quota rather than
+    # deleting audio another job may still be reading
+    assert not os.path.exists(old) and os.path.exists(recent)
+    store(cache, 'newer')
+    assert cache.stats()['entries'] == 3
+    assert cache.evict() == 0
+
+
+def test_stale_partial_files_are_cleaned_up():
+    cache = make_cache()
+    crashed = cache.temp_path('.ogg')
+    Path(crashed).write_bytes(b'x' * 10 * ENTRY_BYTES)
+    set_age(crashed, 25 * HOUR)
+    writing = cache.temp_path('.ogg')
+    Path(writing).write_bytes(b'x' * 10 * ENTRY_BYTES)
+    set_age(writing, HOUR)
+
+    # Partial files are neither entries nor counted against the quota
+    assert cache.entries() == []
+    assert cache.evict() == 0
+    assert not os.path.exists(crashed)
+    assert os.path.exists(writing)
+
+
+def test_partial_hash_samples_start_middle_and_end():
+    path = Path(_CACHE_DIR.name) / 'media.bin'
+    data = bytearray(range(100))
+    path.write_bytes(bytes(data))
+    # 4-byte blocks at offsets 0, 48 and 96
+    digest = partial_content_hash(str(path), block_size=4)
+    assert partial_content_hash(str(path), block_size=4) == digest
+
+    for offset in (1, 49, 98):
+        changed = bytearray(data)
+        changed[offset] ^= 0xFF
+        path.write_bytes(bytes(changed))
+        assert partial_content_hash(str(path), block_size=4) != digest
+
+    # Bytes between the sampled blocks aren't read (size and mtime cover those in keys)
+    changed = bytearray(data)
+    changed[20] ^= 0xFF
+    path.write_bytes(bytes(changed))
+    assert partial_content_hash(str(path), block_size=4) == digest
+
+    # Files smaller than a block are hashed whole
+    path.write_bytes(b'short')
+    digest = partial_content_hash(str(path))
+    path.write_bytes(b'shxrt')
+    assert partial_content_hash(str(path)) != digest
+
+
+def test_key_follows_the_source_and_target():
+    source = Path(_CACHE_DIR.name) / 'talk.mp4'
+    source.write_bytes(b'video' * 100)
+    key = ExtractionCache.make_key(source, 'ogg')
+    assert ExtractionCache.make_key(str(source), 'ogg') == key
+    assert ExtractionCache.make_key(source, 'f32le-16000') != key
+
+    stamp = time.time() - HOUR
+    os.utime(source, (stamp, stamp))
+    assert ExtractionCache.make_key(source, 'ogg') != key
+
+
+if __name__ == "__main__":
+    for name, test in sorted(globals().items()):
+        if name.startswith("test_") and callable(test):
+            setup_function()
+            try:
+                test()
+            finally:
+                teardown_function()
+            print(f"{name}: OK")
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Tests for batched spoken-language identification.
+
+A fake Whisper model records the mel batches passed to embed_audio() and
+answers logits() with planned scores per chunk, so the masking and argmax
+run without loading a model. Checks batching and order, that only language
+tokens (and only the allowed ones) can win, that probabilities are
+renormalised over the allowed languages, and that English-only models
+answer ('en', 1.0) without running the model.
+
+Usage:
+    python -m pytest test/test_language_identifier.py
+    python test/test_language_identifier.py
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import torch
+from whisper.tokenizer import get_tokenizer
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from transcription.processors import LanguageIdentifier  # noqa: E402
+
+SAMPLE_RATE = 16000
+TOKENIZER = get_tokenizer(True, num_languages=99)
+LANGUAGE_TOKENS = dict(zip(TOKENIZER.all_language_codes, TOKENIZER.all_language_tokens))
+# A non-language token (the timestamp token <|0.00|>) that must never win
+OTHER_TOKEN = TOKENIZER.timestamp_begin
+
+
+class FakeModel:
+    """Whisper model stand-in; plan holds one {token: logit} dict per expected chunk."""
+
+    def __init__(self, plan=(), multilingual=True):
+        self.is_multilingual = multilingual
+        self.num_languages = 99
+        self.dims = SimpleNamespace(n_vocab=TOKENIZER.encoding.n_vocab, n_mels=80)
+        self.device = torch.device('cpu')
+        self.plan = list(plan)
+        self.batches = []  # mel batch shapes passed to embed_audio()
+
+    def embed_audio(self, mel):
+        self.batches.append(tuple(mel.shape))
+        return torch.zeros(mel.shape[0], 1, 4)
+
+    def logits(self, tokens, audio_features):
+        assert tokens.tolist() == [[TOKENIZER.sot]] * len(tokens)
+        logits = torch.zeros(len(tokens), 1, self.dims.n_vocab)
+        for row in range(len(tokens)):
+            for token, value in self.plan.pop(0).items():
+                logits[row, 0, token] = value
+        return logits
+
+
+class FakeTranscriber:
+    def __init__(self, model):
+        self.model = model
+
+    def load_model(self):
+        return self.model
+
+
+def favour(*codes, other=None):
+    """Logits ranking codes first to last (and OTHER_TOKEN above all if other is set)."""
+    scores = {LANGUAGE_TOKENS[code]: 10.0 - i for i, code in enumerate(codes)}
+    if other is not None:
+        scores[OTHER_TOKEN] = other
+    return scores
+
+
+def chunks(count, seconds=2.0):
+    return [np.zeros(int(seconds * SAMPLE_RATE), dtype=np.float32) for _ in range(count)]
+
+
+def test_chunks_are_identified_in_batches_in_order():
+    plan = [favour('de'), favour('fr'), favour('en'), favour('es'), favour('ja')]
+    model = FakeModel(plan)
+    identifier = LanguageIdentifier(FakeTranscriber(model), batch_size=2)
+    results = identifier.identify(chunks(5))
+    assert [code for code, _ in results] == ['de', 'fr', 'en', 'es', 'ja']
+    assert model.batches == [(2, 80, 3000), (2, 80, 3000), (1, 80, 3000)]
+    assert identifier.identify([]) == []
+
+
+def test_only_language_tokens_can_win():
+    model = FakeModel([favour('de', 'fr', other=50.0)])
+    identifier = LanguageIdentifier(FakeTranscriber(model))
+    (code, probability), = identifier.identify(chunks(1))
+    assert code == 'de'
+    # Every language but de and fr has logit 0
+    expected = np.exp(10.0) / (np.exp(10.0) + np.exp(9.0) + 97)
+    assert abs(probability - expected) < 1e-5
+
+
+def test_logits_are_masked_to_allowed_languages():
+    plan = [favour('de', 'fr', 'en', other=50.0), favour('ja', 'en', 'fr')]
+    model = FakeModel(plan)
+    identifier = LanguageIdentifier(FakeTranscriber(model), allowed_languages=['en', 'fr'])
+    (first, p_first), (second, p_second) = identifier.identify(chunks(2))
+    assert (first, second) == ('fr', 'en')
+    # Renormalised over the two allowed languages only
+    assert abs(p_first - np.exp(9.0) / (np.exp(9.0) + np.exp(8.0))) < 1e-5
+    assert abs(p_second - np.exp(9.0) / (np.exp(9.0) + np.exp(8.0))) < 1e-5
+
+
+def test_unknown_allowed_languages_do_not_mask():
+    model = FakeModel([favour('de')])
+    identifier = LanguageIdentifier(FakeTranscriber(model), allowed_languages=['klingon'])
+    assert identifier.identify(chunks(1))[0][0] == 'de'
+
+
+def test_english_only_model_answers_without_running():
+    model = FakeModel(multilingual=False)
+    store = SimpleNamespace(window=lambda start, end: torch.zeros(80, 3000))
+    identifier = LanguageIdentifier(FakeTranscriber(model), allowed_languages=['fr'], mel_store=store)
+    assert identifier.identify(chunks(3)) == [('en', 1.0)] * 3
+    assert identifier.identify_windows([(0.0, 2.0), (2.0, 4.0)]) == [('en', 1.0)] * 2
+    assert model.batches == []
+
+
+def test_windows_are_sliced_from_the_mel_store():
+    requested = []
+
+    def window(start, end):
+        requested.append((start, end))
+        return torch.zeros(80, 3000)
+
+    model = FakeModel([favour('it'), favour('pl'), favour('nl')])
+    identifier = LanguageIdentifier(FakeTranscriber(model), batch_size=2, mel_store=SimpleNamespace(window=window))
+    windows = [(0.0, 3.0), (3.0, 6.5), (6.5, 9.0)]
+    assert [code for code, _ in identifier.identify_windows(windows)] == ['it', 'pl', 'nl']
+    assert requested == windows and model.batches == [(2, 80, 3000), (1, 80, 3000)]
+
+    try:
+        LanguageIdentifier(FakeTranscriber(FakeModel())).identify_windows(windows)
+        assert False, "identify_windows() needs a mel store"
+    except ValueError:
+        pass
+
+
+if __name__ == "__main__":
+    for name, test in sorted(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"{name}: OK")
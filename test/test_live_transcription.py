@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Tests for rolling-window live transcription.
+
+A fake transcriber "hears" a fixed script of timed sentences in whatever window
+it is given (sentences cut off by the window end come back truncated, like
+Whisper guessing at a cut word). Checks that LiveTranscriber commits each
+sentence exactly once, with recording-relative times, while audio is still
+arriving, and leaves at most one window for finish(). Also checks that the
+window buffer keeps its samples as it grows and is compacted, and that a
+backlog beyond MAX_BACKLOG_SECONDS raises LiveBacklogError.
+
+Usage:
+    python -m pytest test/test_live_transcription.py
+    python test/test_live_transcription.py
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from transcription.live import LiveBacklogError, LiveTranscriber, SAMPLE_RATE  # noqa: E402
+
+# Each sample carries its own recording time, so the fake can locate any window
+TIME_SCALE = 1e-4
+
+
+def make_script(seconds, sentence_seconds=4.0, gap_seconds=0.6):
+    script, t, n = [], 1.0, 0
+    while t + sentence_seconds < seconds - 1:
+        script.append((t, t + sentence_seconds, f"Sentence number {n} is spoken here."))
+        t += sentence_seconds + gap_seconds
+        n += 1
+    return script
+
+
+class FakeTranscriber:
+    def __init__(self, script):
+        self.script = script
+        self.calls = []
+
+    def transcribe(self, audio, language=None, initial_prompt=None, progress_callback=None, word_timestamps=False):
+        start = float(audio[0]) / TIME_SCALE
+        end = start + len(audio) / SAMPLE_RATE
+        self.calls.append((start, end, initial_prompt))
+        segments = []
+        for seg_start, seg_end, text in self.script:
+            if seg_end <= start + 0.01 or seg_start >= end:
+                continue
+            if seg_end > end:
+                # Cut off by the window: only the words heard so far
+                words = text.split()
+                heard = max(1, int(len(words) * (end - seg_start) / (seg_end - seg_start)))
+                text, seg_end = ' '.join(words[:heard]), end
+            segments.append({'start': max(seg_start, start) - start, 'end': seg_end - start, 'text': ' ' + text})
+        return {'text': ''.join(s['text'] for s in segments), 'segments': segments, 'language': 'en'}
+
+
+def stream(live, seconds, block_seconds=0.5):
+    """Feed recorder-sized blocks, processing after each like the worker thread does."""
+    block = int(block_seconds * SAMPLE_RATE)
+    committed = []
+    for first in range(0, int(seconds * SAMPLE_RATE), block):
+        samples = (np.arange(first, first + block) / SAMPLE_RATE * TIME_SCALE).astype(np.float32)
+        live.add_audio(samples)
+        committed.extend(live.process())
+    return committed
+
+
+def test_commits_every_sentence_once():
+    script = make_script(120)
+    transcriber = FakeTranscriber(script)
+    live = LiveTranscriber(transcriber)
+    committed_live = stream(live, 120)
+
+    # Most of the recording is transcribed before it stops
+    assert committed_live and committed_live[-1]['end'] > 120 - LiveTranscriber.MAX_WINDOW_SECONDS
+    assert live.buffered_seconds <= LiveTranscriber.MAX_WINDOW_SECONDS
+    calls_before_finish = len(transcriber.calls)
+
+    result = live.finish()
+    assert len(transcriber.calls) == calls_before_finish + 1
+    assert result['language'] == 'en'
+    assert [seg['text'] for seg in result['segments']] == [text for _, _, text in script]
+    for seg, (start, end, _) in zip(result['segments'], script):
+        assert abs(seg['start'] - start) < 0.01 and abs(seg['end'] - end) < 0.01
+    assert result['text'] == ' '.join(text for _, _, text in script)
+
+
+def test_prompt_carries_committed_text():
+    transcriber = FakeTranscriber(make_script(60))
+    live = LiveTranscriber(transcriber)
+    stream(live, 60)
+    prompts = [prompt for _, _, prompt in transcriber.calls if prompt]
+    assert prompts and prompts[-1].endswith("is spoken here.")
+    assert all(len(prompt) <= LiveTranscriber.PROMPT_CHARS for prompt in prompts)
+
+
+def test_silence_does_not_grow_the_window():
+    live = LiveTranscriber(FakeTranscriber([]))
+    assert stream(live, 90) == []
+    assert live.buffered_seconds < LiveTranscriber.MIN_WINDOW_SECONDS + LiveTranscriber.STEP_SECONDS
+    assert live.finish()['segments'] == []
+
+
+def test_one_long_segment_is_forced_out():
+    # Nothing ever ends inside the window, so nothing can agree; a full window must still commit
+    script = [(0.5, 100.0, "one very long run on sentence without any pause at all")]
+    live = LiveTranscriber(FakeTranscriber(script))
+    stream(live, 100)
+    assert live.buffered_seconds <= LiveTranscriber.MAX_WINDOW_SECONDS + 1
+
+
+
+def test_window_survives_growth_and_compaction():
+    live = LiveTranscriber(FakeTranscriber([]))
+    capacity = len(live._buffer)
+    block = SAMPLE_RATE // 2
+    for first in range(0, 100 * SAMPLE_RATE, block):
+        live.add_audio(np.arange(first, first + block, dtype=np.float32))
+        if first % (20 * SAMPLE_RATE) == 0:
+            live._advance(5.0)  # As committing does
+    assert len(live._buffer) > capacity
+    dropped = int(live._offset * SAMPLE_RATE)
+    np.testing.assert_array_equal(live._window, np.arange(dropped, 100 * SAMPLE_RATE, dtype=np.float32))
+    assert len(live._buffer) <= 4 * len(live._window)
+
+
+def test_backlog_beyond_the_cap_raises():
+    live = LiveTranscriber(FakeTranscriber([]))
+    block = np.zeros(SAMPLE_RATE, dtype=np.float32)
+    for _ in range(int(LiveTranscriber.MAX_BACKLOG_SECONDS)):
+        live.add_audio(block)
+    try:
+        live.add_audio(block)
+        assert False, "the backlog is capped"
+    except LiveBacklogError as e:
+        assert 'behind the recording' in str(e)
+    assert live.buffered_seconds == LiveTranscriber.MAX_BACKLOG_SECONDS
+
+
+if __name__ == "__main__":
+    for name, test in sorted(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"{name}: OK")
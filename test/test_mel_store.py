@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Tests for the on-disk log-mel feature cache.
+
+Builds feature stores for a few seconds of noise into a temporary cache
+directory and checks that cached features are reused and that the cache is
+evicted least-recently-used once it exceeds its quota.
+
+Usage:
+    python -m pytest test/test_mel_store.py
+    python test/test_mel_store.py
+"""
+
+import os
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from transcription.processors.mel_store import MelFeatureStore, array_fingerprint  # noqa: E402
+
+N_MELS = 80
+
+
+def noise(seconds, seed):
+    return np.random.default_rng(seed).standard_normal(int(seconds * 16000)).astype(np.float32) * 0.1
+
+
+def age(path, hours):
+    then = time.time() - hours * 3600
+    os.utime(path, (then, then))
+
+
+def test_cached_features_are_reused():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        audio = noise(3, 0)
+        audio_hash = array_fingerprint(audio)
+        built = MelFeatureStore.build(audio, N_MELS, audio_hash=audio_hash, cache_dir=cache_dir)
+        cached = MelFeatureStore.open_cached(audio_hash, N_MELS, cache_dir=cache_dir)
+        assert cached is not None and cached.path == built.path
+        assert np.array_equal(np.asarray(cached.features), np.asarray(built.features))
+        built.close()
+        cached.close()
+        assert os.path.exists(MelFeatureStore.cache_path(audio_hash, N_MELS, cache_dir))
+
+
+def test_cache_evicts_least_recently_used():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        hashes = []
+        for seed in range(3):
+            audio = noise(3, seed)
+            hashes.append(array_fingerprint(audio))
+            MelFeatureStore.build(audio, N_MELS, audio_hash=hashes[-1], cache_dir=cache_dir).close()
+        paths = [MelFeatureStore.cache_path(h, N_MELS, cache_dir) for h in hashes]
+        entry_bytes = os.path.getsize(paths[0])
+        for hours, path in zip((3, 2, 1), paths):
+            age(path, hours)
+
+        # Opening the oldest entry makes it the most recently used
+        MelFeatureStore.open_cached(hashes[0], N_MELS, cache_dir=cache_dir).close()
+        removed = MelFeatureStore.evict_cache(cache_dir, max_bytes=2 * entry_bytes)
+        assert removed == 1
+        assert [os.path.exists(path) for path in paths] == [True, False, True]
+
+
+def test_recently_used_entries_are_not_evicted():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for seed in range(2):
+            audio = noise(3, seed)
+            MelFeatureStore.build(audio, N_MELS, audio_hash=array_fingerprint(audio), cache_dir=cache_dir).close()
+        assert MelFeatureStore.evict_cache(cache_dir, max_bytes=0) == 0
+        assert len(os.listdir(cache_dir)) == 2
+
+
+def test_quota_from_environment():
+    os.environ['FONIXFLOW_MEL_CACHE_MB'] = '64'
+    try:
+        assert MelFeatureStore.default_cache_max_bytes() == 64 * 1024 * 1024
+    finally:
+        del os.environ['FONIXFLOW_MEL_CACHE_MB']
+    assert MelFeatureStore.default_cache_max_bytes() == MelFeatureStore.DEFAULT_CACHE_MAX_MB * 1024 * 1024
+
+
+if __name__ == "__main__":
+    for name, test in sorted(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"{name}: OK")
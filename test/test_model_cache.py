@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared Whisper model cache.
+
+Small torch modules stand in for Whisper models. Checks that the budget
+defaults to half the available memory (FONIXFLOW_MODEL_CACHE_MB overrides it,
+0 = unbounded), that released models are evicted least recently used first,
+and that referenced, pinned and most recently used models are kept.
+
+Usage:
+    python -m pytest test/test_model_cache.py
+    python test/test_model_cache.py
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import torch
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import transcriber  # noqa: E402
+from app.transcriber import ModelCache  # noqa: E402
+
+
+def fake_model(megabytes):
+    """A module whose parameters take about this many MB."""
+    return torch.nn.Linear(int(megabytes * 1024 * 1024 / 4), 1, bias=False)
+
+
+def load(cache, model_size, megabytes=1):
+    model = fake_model(megabytes)
+    cache.add(model_size, model)
+    cache.release(model_size, model)
+    return model
+
+
+def with_available_memory(megabytes, test):
+    """Run test with get_available_memory_mb() reporting megabytes."""
+    original = transcriber.get_available_memory_mb
+    transcriber.get_available_memory_mb = lambda: megabytes
+    try:
+        test()
+    finally:
+        transcriber.get_available_memory_mb = original
+
+
+def check_unbounded(cache):
+    for model_size in ('tiny', 'base', 'small'):
+        load(cache, model_size)
+    assert cache.budget_bytes is None
+    assert len(cache) == 3 and cache.evictions == 0
+
+
+def test_default_budget_is_half_the_available_memory():
+    os.environ.pop('FONIXFLOW_MODEL_CACHE_MB', None)
+
+    def check():
+        cache = ModelCache()
+        assert cache.budget_bytes == 2 * 1024 * 1024
+        for model_size in ('tiny', 'base', 'small'):
+            load(cache, model_size)
+        # A session switching models keeps only what fits, newest included
+        assert list(cache._entries) == ['base', 'small'] and cache.evictions == 1
+
+    with_available_memory(4, check)
+
+
+def test_unbounded_without_memory_information_or_with_zero_budget():
+    os.environ.pop('FONIXFLOW_MODEL_CACHE_MB', None)
+    with_available_memory(None, lambda: check_unbounded(ModelCache()))
+    with_available_memory(4, lambda: check_unbounded(ModelCache(budget_mb=0)))
+
+
+def test_budget_from_environment():
+    os.environ['FONIXFLOW_MODEL_CACHE_MB'] = '1.5'
+    try:
+        assert ModelCache().budget_bytes == int(1.5 * 1024 * 1024)
+    finally:
+        del os.environ['FONIXFLOW_MODEL_CACHE_MB']
+
+
+def test_released_model_larger_than_budget_stays_cached():
+    cache = ModelCache(budget_mb=1)
+    model = load(cache, 'large', megabytes=2)
+    assert 'large' in cache
+    assert cache.acquire('large') is model and cache.hits == 1
+
+
+def test_evicts_least_recently_used_first():
+    cache = ModelCache(budget_mb=2.5)
+    load(cache, 'tiny')
+    load(cache, 'base')
+    cache.acquire('tiny')
+    cache.release('tiny', cache._entries['tiny']['model'])
+    load(cache, 'small')
+    assert 'base' not in cache and 'tiny' in cache and 'small' in cache
+    assert cache.evictions == 1
+
+
+def test_referenced_and_pinned_models_are_kept():
+    cache = ModelCache(budget_mb=1.5)
+    held = fake_model(1)
+    cache.add('base', held)
+    load(cache, 'tiny')
+    cache.pin('tiny')
+    load(cache, 'small')
+    assert 'base' in cache and 'tiny' in cache and 'small' in cache
+
+    cache.release('base', held)
+    cache.unpin('tiny')
+    assert list(cache._entries) == ['small']
+
+
+if __name__ == "__main__":
+    for name, test in sorted(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"{name}: OK")
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Tests for sharded transcription's boundary search and stitching.
+
+No model is loaded: shard results are hand-written Whisper-style dicts with
+timestamps relative to their shard's audio, as the worker processes return
+them. Checks that cuts land in silence and cover the whole file, that shard
+offsets are applied to segments, words and seek, that a segment transcribed
+by both shards at a cut is kept once, and that stitched results format as
+SRT and VTT.
+
+Usage:
+    python -m pytest test/test_parallel.py
+    python test/test_parallel.py
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from transcription.formatters import format_as_srt  # noqa: E402
+from transcription.parallel import OVERLAP_SECONDS, find_shard_boundaries, stitch_shards  # noqa: E402
+from transcription.processors import FormatConverter  # noqa: E402
+
+SAMPLE_RATE = 16000
+
+
+def segment(start, end, text, **extra):
+    return dict({'start': start, 'end': end, 'text': text}, **extra)
+
+
+def shard_result(*segments):
+    return {'text': ''.join(seg['text'] for seg in segments), 'segments': list(segments), 'language': 'en'}
+
+
+def speech_with_pauses(seconds, pauses):
+    """Loud noise with 1s near-silent gaps starting at each time in pauses."""
+    rng = np.random.default_rng(0)
+    audio = (0.2 * rng.standard_normal(int(seconds * SAMPLE_RATE))).astype(np.float32)
+    for start in pauses:
+        audio[int(start * SAMPLE_RATE):int((start + 1) * SAMPLE_RATE)] *= 0.001
+    return audio
+
+
+def test_boundaries_fall_in_silence():
+    audio = speech_with_pauses(90, pauses=[26.0, 63.0])
+    shards = find_shard_boundaries(audio, 3)
+    assert len(shards) == 3
+    assert 26.0 <= shards[0][1] <= 27.0
+    assert 63.0 <= shards[1][1] <= 64.0
+
+
+def test_boundaries_cover_the_file_without_gaps():
+    audio = speech_with_pauses(125, pauses=[40.0, 85.0])
+    shards = find_shard_boundaries(audio, 4)
+    assert shards[0][0] == 0.0 and shards[-1][1] == 125.0
+    for (_, end), (start, _) in zip(shards, shards[1:]):
+        assert end == start
+    assert all(end > start for start, end in shards)
+
+    assert find_shard_boundaries(audio, 1) == [(0.0, 125.0)]
+
+
+def test_offsets_are_applied_to_segments():
+    shards = [(0.0, 30.0), (30.0, 60.0)]
+    offset = 30.0 - OVERLAP_SECONDS
+    words = [{'word': ' Second', 'start': 2.0, 'end': 2.5}, {'word': ' part.', 'start': 2.5, 'end': 3.0}]
+    results = [
+        (0.0, shard_result(segment(1.0, 4.0, ' First part.', seek=0))),
+        (offset, shard_result(segment(2.0, 3.0, ' Second part.', seek=0, words=words))),
+    ]
+
+    result = stitch_shards(shards, results, 'en')
+    first, second = result['segments']
+    assert (first['start'], first['end']) == (1.0, 4.0)
+    assert (second['start'], second['end']) == (offset + 2.0, offset + 3.0)
+    assert [(w['start'], w['end']) for w in second['words']] == [(offset + 2.0, offset + 2.5), (offset + 2.5, offset + 3.0)]
+    assert second['seek'] == int(offset * 100)
+    assert [seg['id'] for seg in result['segments']] == [0, 1]
+    assert result['text'] == ' First part. Second part.' and result['language'] == 'en'
+
+    # The shard results themselves are left as they were
+    assert results[1][1]['segments'][0]['start'] == 2.0 and words[0]['start'] == 2.0
+
+
+def test_overlap_segments_are_kept_by_one_shard():
+    shards = [(0.0, 30.0), (30.0, 60.0)]
+    offset = 30.0 - OVERLAP_SECONDS
+    results = [
+        # Heard at the end of shard 0's padded audio (midpoint 30.4: shard 1's)
+        (0.0, shard_result(segment(25.0, 29.0, ' Before the cut.'), segment(29.8, 31.0, ' Shard one owns this.'))),
+        # Heard again by shard 1 (midpoint 29.5: shard 0's)
+        (offset, shard_result(segment(0.0, 1.0, ' Before the cut.'), segment(0.8, 2.0, ' Shard one owns this.'),
+                              segment(5.0, 8.0, ' After the cut.'))),
+    ]
+
+    result = stitch_shards(shards, results, 'en')
+    assert [seg['text'] for seg in result['segments']] == [' Before the cut.', ' Shard one owns this.', ' After the cut.']
+    assert result['segments'][1]['start'] == offset + 0.8
+
+
+def test_duplicate_at_the_cut_is_dropped():
+    shards = [(0.0, 30.0), (30.0, 60.0)]
+    offset = 30.0 - OVERLAP_SECONDS
+    results = [
+        # Midpoint 29.75, inside shard 0's range
+        (0.0, shard_result(segment(28.5, 31.0, ' So, as I was saying'))),
+        # The same words, cut differently (midpoint 30.25, inside shard 1's range)
+        (offset, shard_result(segment(0.5, 2.5, ' so as I was saying...'), segment(2.5, 5.0, ' we start now.'))),
+    ]
+
+    result = stitch_shards(shards, results, 'en')
+    assert [seg['text'] for seg in result['segments']] == [' So, as I was saying', ' we start now.']
+    assert [seg['id'] for seg in result['segments']] == [0, 1]
+
+
+def test_repeated_text_apart_in_time_is_kept():
+    shards = [(0.0, 30.0), (30.0, 60.0)]
+    offset = 30.0 - OVERLAP_SECONDS
+    results = [
+        (0.0, shard_result(segment(26.0, 28.0, ' Thank you.'))),
+        (offset, shard_result(segment(3.0, 5.0, ' Thank you.'))),
+    ]
+
+    result = stitch_shards(shards, results, 'en')
+    assert [(seg['start'], seg['text']) for seg in result['segments']] == [(26.0, ' Thank you.'), (offset + 3.0, ' Thank you.')]
+
+
+def test_stitched_result_formats_as_subtitles():
+    shards = [(0.0, 3600.0), (3600.0, 7200.0)]
+    offset = 3600.0 - OVERLAP_SECONDS
+    results = [
+        (0.0, shard_result(segment(1.5, 3.25, ' Hello.'))),
+        (offset, shard_result(segment(2.0, 4.5, ' An hour later.'))),
+    ]
+    result = stitch_shards(shards, results, 'en')
+
+    srt = format_as_srt(result)
+    assert srt == (
+        "1\n00:00:01,500 --> 00:00:03,250\nHello.\n\n"
+        "2\n01:00:01,000 --> 01:00:03,500\nAn hour later.\n"
+    )
+
+    vtt = FormatConverter.format_as_vtt(result)
+    assert vtt.startswith("WEBVTT\n")
+    assert "00:00:01.500 --> 00:00:03.250\nHello.\n" in vtt
+    assert "01:00:01.000 --> 01:00:03.500\nAn hour later.\n" in vtt
+
+
+if __name__ == "__main__":
+    for name, test in sorted(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"{name}: OK")
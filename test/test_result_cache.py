@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Tests for the on-disk transcription result cache.
+
+Every test uses a fresh temporary cache directory; entry ages are set with
+os.utime() instead of waiting. Checks that each setting the GUI and web
+jobs put in a key changes it (as do the Whisper version and cache format),
+that results, language segments and numpy values survive the gzip round
+trip, that the size cap evicts the least recently used entries, and that
+purge and the stats/list/purge CLI act on the cache directory.
+
+Usage:
+    python -m pytest test/test_result_cache.py
+    python test/test_result_cache.py
+"""
+
+import io
+import os
+import sys
+import gzip
+import time
+import tempfile
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from transcription import result_cache  # noqa: E402
+from transcription.result_cache import ENTRY_SUFFIX, ResultCache, main  # noqa: E402
+
+_WHISPER_VERSION = result_cache._whisper_version
+_FORMAT_VERSION = result_cache.CACHE_FORMAT_VERSION
+
+# The settings the GUI worker keys its results by
+SETTINGS = {
+    'mode': 'gui',
+    'model_size': 'base',
+    'language': None,
+    'multilang': True,
+    'deep_scan': False,
+    'parallel': False,
+    'allowed_languages': ['en', 'fr'],
+    'filters': {'noise_gate': {'threshold_db': -40}, 'compressor': {'ratio': 4}},
+    'vad': True,
+}
+# A different value for every setting above
+CHANGED = {
+    'mode': 'web_upload',
+    'model_size': 'small',
+    'language': 'en',
+    'multilang': False,
+    'deep_scan': True,
+    'parallel': True,
+    'allowed_languages': ['en', 'de'],
+    'filters': {'noise_gate': {'threshold_db': -30}, 'compressor': {'ratio': 4}},
+    'vad': False,
+}
+
+
+def setup_function(_=None):
+    global _CACHE_DIR
+    _CACHE_DIR = tempfile.TemporaryDirectory()
+
+
+def teardown_function(_=None):
+    result_cache._whisper_version = _WHISPER_VERSION
+    result_cache.CACHE_FORMAT_VERSION = _FORMAT_VERSION
+    _CACHE_DIR.cleanup()
+
+
+def result(text, segments=1):
+    return {
+        'text': text,
+        'language': 'en',
+        'segments': [{'id': i, 'start': float(i), 'end': i + 1.0, 'text': text} for i in range(segments)],
+    }
+
+
+def noise_text(seed, length=20000):
+    """Text that barely compresses, so entry sizes are predictable."""
+    rng = np.random.default_rng(seed)
+    return ''.join(chr(c) for c in rng.integers(33, 127, length))
+
+
+def age(cache, key, seconds):
+    """Make an entry look last used the given number of seconds ago."""
+    stamp = time.time() - seconds
+    os.utime(cache._path(key), (stamp, stamp))
+
+
+def run_cli(*argv):
+    out = io.StringIO()
+    with redirect_stdout(out):
+        assert main(['--dir', _CACHE_DIR.name, *argv]) == 0
+    return out.getvalue()
+
+
+def test_every_setting_changes_the_key():
+    base = ResultCache.key_for_hash('abc', **SETTINGS)
+    assert ResultCache.key_for_hash('abc', **dict(SETTINGS)) == base
+    # Keyword order doesn't matter
+    assert ResultCache.key_for_hash('abc', **dict(reversed(list(SETTINGS.items())))) == base
+
+    keys = {base, ResultCache.key_for_hash('abd', **SETTINGS)}
+    for name, value in CHANGED.items():
+        keys.add(ResultCache.key_for_hash('abc', **dict(SETTINGS, **{name: value})))
+    # Leaving a setting out is a different request too
+    keys.add(ResultCache.key_for_hash('abc', **{k: v for k, v in SETTINGS.items() if k != 'filters'}))
+    assert len(keys) == len(CHANGED) + 3
+
+    result_cache._whisper_version = lambda: '0.0.0-test'
+    assert ResultCache.key_for_hash('abc', **SETTINGS) != base
+    result_cache._whisper_version = _WHISPER_VERSION
+    result_cache.CACHE_FORMAT_VERSION = _FORMAT_VERSION + 1
+    assert ResultCache.key_for_hash('abc', **SETTINGS) != base
+
+
+def test_make_key_hashes_the_audio():
+    audio = np.linspace(-1, 1, 16000, dtype=np.float32)
+    key = ResultCache.make_key(audio, model_size='base')
+    assert ResultCache.make_key(audio.copy(), model_size='base') == key
+    assert ResultCache.make_key(audio[::-1].copy(), model_size='base') != key
+    assert ResultCache.make_key(audio, model_size='small') != key
+
+    path = Path(_CACHE_DIR.name) / 'clip.raw'
+    path.write_bytes(audio.tobytes())
+    file_key = ResultCache.make_key(str(path), model_size='base')
+    assert ResultCache.make_key(str(path), model_size='base') == file_key
+    path.write_bytes(audio[::-1].tobytes())
+    os.utime(path, (time.time() + 10, time.time() + 10))
+    assert ResultCache.make_key(str(path), model_size='base') != file_key
+
+
+def test_round_trip_keeps_language_segments():
+    cache = ResultCache(cache_dir=_CACHE_DIR.name)
+    stored = result(' Bonjour. Hello.', segments=2)
+    stored['language_segments'] = [
+        {'language': 'fr', 'start': 0.0, 'end': 1.0, 'text': ' Bonjour.', 'confidence': np.float32(0.75)},
+        {'language': 'en', 'start': 1.0, 'end': 2.0, 'text': ' Hello.', 'tokens': np.array([50364, 2425])},
+    ]
+    assert cache.get('k1') is None
+
+    cache.put('k1', stored, source='/media/talk.mp4', settings=SETTINGS)
+    path = Path(_CACHE_DIR.name) / ('k1' + ENTRY_SUFFIX)
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        assert '"language_segments"' in f.read()
+    assert not [name for name in os.listdir(_CACHE_DIR.name) if name.endswith('.tmp')]
+
+    loaded = cache.get('k1')
+    assert loaded['text'] == stored['text'] and loaded['segments'] == stored['segments']
+    assert [seg['language'] for seg in loaded['language_segments']] == ['fr', 'en']
+    assert loaded['language_segments'][0]['confidence'] == 0.75
+    assert loaded['language_segments'][1]['tokens'] == [50364, 2425]
+
+    info = cache.describe('k1')
+    assert info['source'] == '/media/talk.mp4' and info['settings'] == SETTINGS
+    assert (info['language'], info['segments'], info['language_segments']) == ('en', 2, 2)
+
+
+def test_unreadable_entry_is_discarded():
+    cache = ResultCache(cache_dir=_CACHE_DIR.name)
+    path = Path(_CACHE_DIR.name) / ('broken' + ENTRY_SUFFIX)
+    path.write_bytes(b'not gzip')
+    assert cache.get('broken') is None
+    assert not path.exists()
+
+
+def test_size_cap_evicts_least_recently_used():
+    probe = ResultCache(cache_dir=_CACHE_DIR.name)
+    probe.put('probe', result(noise_text(0)))
+    entry_bytes = probe.entries()[0]['bytes']
+    probe.purge()
+
+    # Room for two entries, not three
+    cache = ResultCache(cache_dir=_CACHE_DIR.name, max_mb=2.5 * entry_bytes / 1024 / 1024)
+    cache.put('a', result(noise_text(1)))
+    age(cache, 'a', 300)
+    cache.put('b', result(noise_text(2)))
+    age(cache, 'b', 200)
+
+    # Reading 'a' makes 'b' the least recently used
+    assert cache.get('a')['text'] == noise_text(1)
+    cache.put('c', result(noise_text(3)))
+    assert sorted(e['key'] for e in cache.entries()) == ['a', 'c']
+    assert cache.get('b') is None
+
+    assert cache.evict() == 0
+    assert cache.stats()['entries'] == 2
+
+
+def test_purge_all_or_unused():
+    cache = ResultCache(cache_dir=_CACHE_DIR.name)
+    for key in ('fresh', 'week', 'month'):
+        cache.put(key, result(key))
+    age(cache, 'week', 7 * 86400)
+    age(cache, 'month', 30 * 86400)
+
+    assert cache.purge(older_than_days=10) == 1
+    assert [e['key'] for e in cache.entries()] == ['fresh', 'week']
+    assert cache.purge() == 2
+    assert cache.entries() == [] and cache.purge() == 0
+
+    # A cache directory that was never created is simply empty
+    assert ResultCache(cache_dir=os.path.join(_CACHE_DIR.name, 'missing')).purge() == 0
+
+
+def test_cli_inspects_and_purges():
+    cache = ResultCache(cache_dir=_CACHE_DIR.name, max_mb=64)
+    cache.put('0123456789abcdef', result(' Hi.'), source='/media/a.wav', settings={'model_size': 'base'})
+    cache.put('fedcba9876543210', result(' Old.'), source='/media/b.wav')
+    age(cache, 'fedcba9876543210', 3 * 86400)
+
+    stats = run_cli('stats')
+    assert f"Cache dir: {_CACHE_DIR.name}" in stats and "Entries:   2" in stats
+    assert "of 256 MB" in stats  # The CLI applies the default cap
+
+    lines = run_cli('list').splitlines()
+    assert [line[:12] for line in lines] == ['0123456789ab', 'fedcba987654']
+    verbose = run_cli('list', '-v')
+    assert "/media/a.wav  lang=en  segments=1  {'model_size': 'base'}" in verbose
+
+    assert run_cli('purge', '--older-than', '1') == "Removed 1 entries\n"
+    assert [e['key'] for e in cache.entries()] == ['0123456789abcdef']
+    assert run_cli('purge') == "Removed 1 entries\n"
+    assert "Entries:   0" in run_cli('stats')
+
+
+if __name__ == "__main__":
+    for name, test in sorted(globals().items()):
+        if name.startswith("test_") and callable(test):
+            setup_function()
+            try:
+                test()
+            finally:
+                teardown_function()
+            print(f"{name}: OK")
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Tests for the capture ring buffer used by the recording backends.
+
+Checks that what audio callbacks write comes back unchanged from to_array() and
+from streamed peek()/consume() reads, including downmixing, int16 scaling,
+block recycling, level-meter reads, reserved growth and a real producer
+thread racing a consumer.
+
+Usage:
+    python -m pytest test/test_ring_buffer.py
+    python test/test_ring_buffer.py
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from gui.recording.ring_buffer import AudioRingBuffer  # noqa: E402
+
+
+def make_chunks(count=60, channels=1, seed=0):
+    """Callback-sized chunks of varying length, like PortAudio delivers them."""
+    rng = np.random.default_rng(seed)
+    return [rng.standard_normal((int(rng.integers(1, 900)), channels)).astype(np.float32)
+            for _ in range(count)]
+
+
+def test_to_array_matches_concatenate():
+    chunks = make_chunks()
+    buffer = AudioRingBuffer(channels=1, block_frames=1000)
+    for chunk in chunks:
+        buffer.write(chunk)
+    assert buffer.writes == len(chunks)
+    np.testing.assert_array_equal(buffer.to_array(), np.concatenate(chunks))
+    assert buffer.available == 0
+
+
+def test_single_block_result_is_a_view():
+    buffer = AudioRingBuffer(channels=1, block_frames=1000)
+    buffer.write(np.ones(10, dtype=np.float32))
+    result = buffer.to_array()
+    assert result.shape == (10, 1)
+    assert result.base is not None
+    # The block backing the result must not be reused by later writes
+    buffer.write(np.zeros(10, dtype=np.float32))
+    np.testing.assert_array_equal(result, 1.0)
+
+
+def test_downmix_and_int16_scale():
+    rng = np.random.default_rng(1)
+    stereo = rng.integers(-32768, 32767, size=(1500, 2)).astype(np.int16)
+    buffer = AudioRingBuffer(channels=1, block_frames=400)
+    buffer.write(stereo[:700], scale=1.0 / 32768.0)
+    buffer.write(stereo[700:], scale=1.0 / 32768.0)
+    expected = stereo.astype(np.float32).mean(axis=1, keepdims=True) / 32768.0
+    np.testing.assert_allclose(buffer.to_array(), expected, atol=1e-6)
+
+
+def test_latest_and_peak():
+    buffer = AudioRingBuffer(channels=1, block_frames=1000)
+    assert buffer.peak() == 0.0
+    buffer.write(np.full(50, 0.9, dtype=np.float32))
+    buffer.write(np.full(20, -0.25, dtype=np.float32))
+    assert buffer.latest().shape == (20, 1)
+    assert abs(buffer.peak() - 0.25) < 1e-6
+    assert abs(buffer.peak(frames=70) - 0.9) < 1e-6
+
+
+def test_streamed_reads_recycle_blocks():
+    chunks = make_chunks(count=200, channels=2, seed=2)
+    buffer = AudioRingBuffer(channels=2, block_frames=512)
+    received = []
+    for chunk in chunks:
+        buffer.write(chunk)
+        views = buffer.peek()
+        received.extend(view.copy() for view in views)
+        buffer.consume(sum(len(view) for view in views))
+        # Only the block being written (plus spares) stays allocated
+        assert len(buffer._blocks) <= 2
+    np.testing.assert_array_equal(np.concatenate(received), np.concatenate(chunks))
+
+
+def test_level_meter_reads_stay_bounded():
+    # The preview worker only wants levels: it consumes everything on each tick
+    buffer = AudioRingBuffer(channels=1, block_frames=1000)
+    for i in range(200):
+        level = (i % 10 + 1) / 10
+        buffer.write(np.full(64, level, dtype=np.float32))
+        assert abs(buffer.peak() - level) < 1e-6
+        buffer.consume(buffer.available)
+        assert len(buffer._blocks) <= 1
+    assert buffer.frames_written == 200 * 64 and buffer.available == 0
+
+
+def test_reserve_preallocates_growth():
+    buffer = AudioRingBuffer(channels=1, block_frames=100)
+    buffer.reserve()
+    spare = buffer._spare[0]
+    buffer.write(np.ones(150, dtype=np.float32))
+    assert buffer._blocks[1] is spare and not buffer._spare
+
+
+def test_concurrent_producer_and_consumer():
+    chunks = make_chunks(count=400, seed=3)
+    buffer = AudioRingBuffer(channels=1, block_frames=700)
+    received = []
+    done = threading.Event()
+
+    def producer():
+        for chunk in chunks:
+            buffer.write(chunk)
+        done.set()
+
+    thread = threading.Thread(target=producer)
+    thread.start()
+    while not done.is_set() or buffer.available:
+        views = buffer.peek(max_frames=1500)
+        received.extend(view.copy() for view in views)
+        buffer.consume(sum(len(view) for view in views))
+    thread.join()
+    np.testing.assert_array_equal(np.concatenate(received), np.concatenate(chunks))
+
+
+if __name__ == "__main__":
+    for name, test in sorted(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"{name}: OK")
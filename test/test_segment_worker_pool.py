@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Tests for the Pass 2 segment worker pool.
+
+A fake Transcriber stands in for Whisper (no model is loaded), and process
+mode runs its pool on threads. Segments are held back by per-segment gates
+and released in reverse order. Checks that results still come back in
+submission order in both modes, that a failing segment is skipped without
+blocking the others, and that a worker failure (a model that can't load, a
+pool that won't accept work) reaches the caller through pool.error, first
+error first.
+
+Usage:
+    python -m pytest test/test_segment_worker_pool.py
+    python test/test_segment_worker_pool.py
+"""
+
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import torch
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from transcription.processors import segment_worker_pool  # noqa: E402
+from transcription.processors.segment_worker_pool import SegmentWorkerPool  # noqa: E402
+
+SAMPLE_RATE = 16000
+# Every sample holds its own index, so a slice tells the fake where it starts
+AUDIO = np.arange(60 * SAMPLE_RATE, dtype=np.float32)
+_TRANSCRIBER = segment_worker_pool.Transcriber
+_PROCESS_POOL = segment_worker_pool.ProcessPoolExecutor
+_TORCH_THREADS = torch.get_num_threads()
+
+# Segment start time -> Event the fake transcriber waits for before answering
+GATES = {}
+
+
+class FakeTranscriber:
+    """Answers with the segment's start time once its gate opens."""
+
+    MODEL_MEMORY_MB = {}
+    fail_to_load = False
+
+    def __init__(self, model_size='base', shared_model=False):
+        self.device = 'cpu'
+
+    def load_model(self):
+        if FakeTranscriber.fail_to_load:
+            raise RuntimeError("model file is corrupt")
+
+    def transcribe(self, audio, language=None, progress_callback=None):
+        start = round(float(audio[0]) / SAMPLE_RATE, 1)
+        GATES[start].wait(5)
+        return {'text': f"segment at {start}", 'language': language}
+
+
+class FixedSizePool(SegmentWorkerPool):
+    """Exactly the requested number of workers, whatever this machine's CPU count."""
+
+    @classmethod
+    def plan_workers(cls, model_size, device, requested=None, mode='thread'):
+        return requested or 1, 1
+
+
+def thread_executor(max_workers, mp_context=None, initializer=None, initargs=()):
+    """Stands in for the worker processes."""
+    return ThreadPoolExecutor(max_workers=max_workers, initializer=initializer, initargs=initargs)
+
+
+def setup_function(_=None):
+    segment_worker_pool.Transcriber = FakeTranscriber
+    segment_worker_pool.ProcessPoolExecutor = thread_executor
+    FakeTranscriber.fail_to_load = False
+    GATES.clear()
+
+
+def teardown_function(_=None):
+    segment_worker_pool.Transcriber = _TRANSCRIBER
+    segment_worker_pool.ProcessPoolExecutor = _PROCESS_POOL
+    os.environ.pop('FONIXFLOW_DEVICE', None)
+    torch.set_num_threads(_TORCH_THREADS)
+
+
+def transcribe_segment(engine, segment):
+    """Thread mode: slice the segment out of the audio, as EnhancedTranscriber does."""
+    return engine.transcribe(AUDIO[int(segment['start'] * SAMPLE_RATE):], language=segment['language'])
+
+
+def finish_segment(segment, result):
+    if 'fail' in segment:
+        raise ValueError("bad segment")
+    return dict(segment, text=result['text'])
+
+
+def make_pool(mode, workers=4, **kwargs):
+    return FixedSizePool(
+        'base', transcribe_segment, finish_segment, num_workers=workers, mode=mode,
+        audio_data=AUDIO, sample_rate=SAMPLE_RATE, **kwargs
+    )
+
+
+def segments(count):
+    segs = [{'start': 5.0 * i, 'end': 5.0 * i + 4.0, 'language': 'en'} for i in range(count)]
+    for seg in segs:
+        GATES[seg['start']] = threading.Event()
+    return segs
+
+
+def run_released_in_reverse(pool, segs):
+    pool.start()
+    for seg in segs:
+        pool.submit(seg)
+    pool.close()
+
+    # Everything but the first segment finishes; nothing may be released before it
+    for seg in reversed(segs[1:]):
+        GATES[seg['start']].set()
+    deadline = time.monotonic() + 5
+    while pool.completed_count < len(segs) - 1:
+        assert time.monotonic() < deadline, "workers never finished"
+        time.sleep(0.01)
+    assert pool.results == [] and not pool.wait(0)
+
+    GATES[segs[0]['start']].set()
+    assert pool.wait(5)
+    return pool.join()
+
+
+def test_thread_mode_returns_results_in_submission_order():
+    segs = segments(4)
+    results = run_released_in_reverse(make_pool('thread'), segs)
+    assert [seg['start'] for seg in results] == [seg['start'] for seg in segs]
+    assert [seg['text'] for seg in results] == [f"segment at {seg['start']}" for seg in segs]
+
+
+def test_process_mode_returns_results_in_submission_order():
+    segs = segments(4)
+    pool = make_pool('process')
+    assert pool.mode == 'process'
+    results = run_released_in_reverse(pool, segs)
+    assert [seg['start'] for seg in results] == [seg['start'] for seg in segs]
+    assert pool.error is None
+
+
+def test_failing_segment_is_skipped_in_order():
+    segs = segments(4)
+    segs[1]['fail'] = True
+    pool = make_pool('thread')
+    results = run_released_in_reverse(pool, segs)
+    assert [seg['start'] for seg in results] == [0.0, 10.0, 15.0]
+    assert pool.error is None and pool.completed_count == 4
+
+
+def test_model_load_failure_reaches_the_caller():
+    FakeTranscriber.fail_to_load = True
+    segs = segments(3)
+    pool = make_pool('thread', workers=1)
+    pool.start()
+    for seg in segs:
+        pool.submit(seg)
+    pool.close()
+    assert pool.wait(5), "a worker without a model must still drain the queue"
+    assert pool.join() == []
+    assert isinstance(pool.error, RuntimeError) and 'corrupt' in str(pool.error)
+
+
+def test_first_submit_failure_is_kept():
+    class RefusingExecutor:
+        submitted = 0
+
+        def submit(self, *args):
+            RefusingExecutor.submitted += 1
+            raise RuntimeError(f"pool is broken ({RefusingExecutor.submitted})")
+
+        def shutdown(self, wait=True):
+            pass
+
+    segment_worker_pool.ProcessPoolExecutor = lambda *args, **kwargs: RefusingExecutor()
+    segs = segments(3)
+    pool = make_pool('process')
+    pool.start()
+    for seg in segs:
+        pool.submit(seg)
+    pool.close()
+    assert pool.wait(5)
+    assert pool.join() == []
+    assert str(pool.error) == "pool is broken (1)"
+
+
+if __name__ == "__main__":
+    for name, test in sorted(globals().items()):
+        if name.startswith("test_") and callable(test):
+            setup_function()
+            try:
+                test()
+            finally:
+                teardown_function()
+            print(f"{name}: OK")
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Tests for the parallel (time-sliced) ffmpeg decoder.
+
+A generated WAV file is decoded by SliceDecoder with several slices and by a
+single ffmpeg process (decode_to_array); the two must match sample for
+sample. Also checks that media longer than the duration estimate plus the
+last slice's margin raises SliceOverflowError instead of being truncated.
+Skipped when ffmpeg is not installed.
+
+Usage:
+    python -m pytest test/test_slice_decoder.py
+    python test/test_slice_decoder.py
+"""
+
+import sys
+import wave
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.audio_extractor import SliceDecoder, SliceOverflowError, decode_to_array  # noqa: E402
+
+FFMPEG = shutil.which('ffmpeg')
+SAMPLE_RATE = 16000
+
+pytestmark = pytest.mark.skipif(FFMPEG is None, reason="ffmpeg not installed")
+
+
+def write_wav(path, seconds):
+    """A 16 kHz mono 16-bit WAV: a sweep plus noise, so misplaced samples show."""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    rng = np.random.default_rng(0)
+    signal = 0.5 * np.sin(2 * np.pi * (200 + 40 * t) * t) + 0.05 * rng.standard_normal(len(t))
+    with wave.open(str(path), 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes((np.clip(signal, -1, 1) * 32767).astype('<i2').tobytes())
+
+
+def test_sliced_decode_matches_single_process():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'sweep.wav'
+        write_wav(path, 12.3)
+        expected = decode_to_array(FFMPEG, str(path), SAMPLE_RATE)
+
+        for num_slices in (2, 3, 5):
+            decoder = SliceDecoder(FFMPEG, str(path), 12.3, num_slices, SAMPLE_RATE)
+            audio = decoder.decode()
+            assert decoder.num_slices == num_slices
+            assert len(audio) == len(expected)
+            np.testing.assert_array_equal(np.asarray(audio), expected)
+
+
+def test_media_past_the_margin_raises():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'long.wav'
+        write_wav(path, 30)
+        try:
+            SliceDecoder(FFMPEG, str(path), 12.0, 2, SAMPLE_RATE).decode()
+            assert False, "30s of media does not fit 12s + 10s"
+        except SliceOverflowError as e:
+            assert 'truncated' in str(e)
+
+        # Within the margin the whole file is kept
+        audio = SliceDecoder(FFMPEG, str(path), 25.0, 2, SAMPLE_RATE).decode()
+        assert len(audio) == 30 * SAMPLE_RATE
+
+
+if __name__ == "__main__":
+    if FFMPEG is None:
+        print("ffmpeg not installed; skipped")
+        sys.exit(0)
+    for name, test in sorted(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"{name}: OK")
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming recording pipeline.
+
+Checks that StreamResampler matches one-shot polyphase resampling when fed in
+arbitrary blocks (and that the static AudioProcessor wrappers built on it and
+StreamMixer still resample and mix whole arrays correctly), that StreamingRecorder writes the whole session to disk while
+"recording" from ring buffers without accumulating audio in memory, and that a
+partial file left by a killed session is recovered.
+
+Usage:
+    python -m pytest test/test_streaming_recorder.py
+    python test/test_streaming_recorder.py
+"""
+
+import sys
+import wave
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from gui.recording.audio_processor import AudioProcessor, StreamResampler, _kaiser_lowpass  # noqa: E402
+from gui.recording.base import RecordingResult  # noqa: E402
+from gui.recording.ring_buffer import AudioRingBuffer  # noqa: E402
+from gui.recording.streaming_recorder import (  # noqa: E402
+    PARTIAL_MARKER, StreamingRecorder, recover_partial_recordings
+)
+
+
+def reference_resample(x, up, down):
+    """Direct upsample-filter-downsample with resample_poly's filter and alignment."""
+    max_rate = max(up, down)
+    half_len = 10 * max_rate
+    h = _kaiser_lowpass(2 * half_len + 1, 1.0 / max_rate) * up
+    n_pre_pad = down - half_len % down
+    h = np.concatenate((np.zeros(n_pre_pad), h))
+    upsampled = np.zeros(len(x) * up)
+    upsampled[::up] = x
+    y = np.convolve(upsampled, h)[::down]
+    start = (half_len + n_pre_pad) // down
+    return y[start:start + -(-len(x) * up // down)]
+
+
+def test_stream_resampler_matches_one_shot():
+    rng = np.random.default_rng(0)
+    for from_rate in (48000, 44100, 32000, 22050, 8000):
+        x = rng.standard_normal(int(from_rate * 0.5))
+        resampler = StreamResampler(from_rate, 16000)
+        outputs, pos = [], 0
+        while pos < len(x):
+            size = int(rng.integers(1, 3000))
+            outputs.append(resampler.process(x[pos:pos + size]))
+            pos += size
+        outputs.append(resampler.flush())
+        g = np.gcd(from_rate, 16000)
+        expected = reference_resample(x, 16000 // g, from_rate // g)
+        np.testing.assert_allclose(np.concatenate(outputs), expected, atol=1e-5, err_msg=str(from_rate))
+
+
+def test_stream_resampler_short_input():
+    x = np.random.default_rng(1).standard_normal(7)
+    resampler = StreamResampler(44100, 16000)
+    y = np.concatenate([resampler.process(x), resampler.flush()])
+    np.testing.assert_allclose(y, reference_resample(x, 160, 441), atol=1e-5)
+
+
+def test_static_resample_wrapper():
+    x = np.random.default_rng(3).standard_normal((200000, 1)).astype(np.float32)
+    y = AudioProcessor.resample(x, 48000, 16000)
+    assert y.shape == (-(-200000 // 3), 1)
+    np.testing.assert_allclose(y[:, 0], reference_resample(x[:, 0].astype(np.float64), 1, 3), atol=1e-5)
+
+
+def test_static_mix_wrapper():
+    rng = np.random.default_rng(4)
+    mic = rng.standard_normal((48000 * 5, 1)).astype(np.float32)
+    speaker = rng.standard_normal((32000 * 3, 1)).astype(np.float32)
+    mixed = AudioProcessor.mix_audio(mic, speaker, 48000, 32000)
+    mic_16k = reference_resample(mic[:, 0].astype(np.float64), 1, 3)
+    speaker_16k = reference_resample(speaker[:, 0].astype(np.float64), 1, 2)
+    expected = mic_16k.copy()
+    expected[:len(speaker_16k)] += speaker_16k
+    expected /= 2.0
+    assert mixed.shape == (len(mic_16k), 1)
+    np.testing.assert_allclose(mixed[:, 0], expected, atol=1e-5)
+    # Mic only: resampled, not attenuated
+    np.testing.assert_allclose(AudioProcessor.mix_audio(mic, None, 48000, None)[:, 0], mic_16k, atol=1e-5)
+
+
+class FakeBackend:
+    """Stands in for a recording backend: ring buffers plus their sample rates."""
+
+    def __init__(self, mic_rate=48000, speaker_rate=44100):
+        self.mic_buffer = AudioRingBuffer(channels=1, block_frames=mic_rate)
+        self.speaker_buffer = AudioRingBuffer(channels=1, block_frames=speaker_rate)
+        self.mic_sample_rate = mic_rate
+        self.speaker_sample_rate = speaker_rate
+
+
+def record(output_dir, seconds, with_speaker=True, block_listener=None):
+    backend = FakeBackend()
+    recorder = StreamingRecorder(output_dir, block_listener=block_listener)
+    rng = np.random.default_rng(2)
+    for _ in range(int(seconds * 20)):  # 50ms callbacks
+        backend.mic_buffer.write(0.1 * rng.standard_normal(2400).astype(np.float32))
+        if with_speaker:
+            backend.speaker_buffer.write(0.05 * rng.standard_normal((2205, 2)).astype(np.float32))
+        recorder.pump(backend)
+        # Consumed blocks are recycled, so capture memory doesn't grow
+        assert len(backend.mic_buffer._blocks) <= 2
+    return backend, recorder
+
+
+def test_recorder_writes_whole_session():
+    with tempfile.TemporaryDirectory() as output_dir:
+        backend, recorder = record(output_dir, seconds=20)
+        result = RecordingResult(
+            mic_data=backend.mic_buffer.to_array(), speaker_data=backend.speaker_buffer.to_array(),
+            mic_sample_rate=48000, speaker_sample_rate=44100, duration=20.0,
+            mic_chunks_count=backend.mic_buffer.writes, speaker_chunks_count=backend.speaker_buffer.writes
+        )
+        path, duration = recorder.finish(result)
+        assert abs(duration - 20.0) < 0.01
+        assert PARTIAL_MARKER not in Path(path).name
+        assert not list(Path(output_dir).glob(f"*{PARTIAL_MARKER}*"))
+        if path.endswith('.wav'):
+            with wave.open(path, 'rb') as wf:
+                assert wf.getframerate() == 16000
+                assert wf.getnframes() == int(duration * 16000)
+
+
+def test_recorder_mic_only():
+    with tempfile.TemporaryDirectory() as output_dir:
+        _, recorder = record(output_dir, seconds=5, with_speaker=False)
+        path, duration = recorder.finish()
+        assert abs(duration - 5.0) < 0.01
+        assert not recorder.speaker_active
+
+
+def test_block_listener_sees_saved_audio():
+    blocks = []
+    with tempfile.TemporaryDirectory() as output_dir:
+        _, recorder = record(output_dir, seconds=5, block_listener=blocks.append)
+        recorder.finish()
+        assert sum(len(block) for block in blocks) == recorder.frames_written
+        assert all(block.dtype == np.float32 for block in blocks)
+
+
+def test_interrupted_recording_is_recovered():
+    with tempfile.TemporaryDirectory() as output_dir:
+        _, recorder = record(output_dir, seconds=6)
+        written = recorder.frames_written
+        assert written > 0
+        recorder.close()
+        recovered = recover_partial_recordings(output_dir)
+        assert len(recovered) == 1 and recovered[0].endswith('_recovered.wav')
+        with wave.open(recovered[0], 'rb') as wf:
+            assert wf.getnframes() == written
+        assert not list(Path(output_dir).glob(f"*{PARTIAL_MARKER}*"))
+
+
+if __name__ == "__main__":
+    for name, test in sorted(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"{name}: OK")
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Tests for the NumPy voice-activity detector.
+
+Synthetic signals stand in for real recordings: "speech" is a harmonic voice
+whose pitch and formants change every syllable (with fricative bursts and
+pauses between phrases); "music" is tones, sustained chords and note
+sequences. Music surrounded by silence must not come out as speech, and speech
+must, also when it follows music.
+
+Usage:
+    python -m pytest test/test_vad.py
+    python test/test_vad.py
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from transcription.vad import detect_speech_regions  # noqa: E402
+
+SAMPLE_RATE = 16000
+
+
+def times(seconds):
+    return np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+
+
+def silence(seconds, rng):
+    return 0.0003 * rng.standard_normal(int(seconds * SAMPLE_RATE))
+
+
+def harmonics(frequency, t, count=6, vibrato=0.0):
+    signal = np.zeros_like(t)
+    for h in range(1, count + 1):
+        phase = 2 * np.pi * frequency * h * t + vibrato * frequency * h / 5 * np.sin(2 * np.pi * 5 * t)
+        signal += np.sin(phase) / h
+    return signal
+
+
+def tone(seconds, frequency=440.0):
+    return 0.3 * np.sin(2 * np.pi * frequency * times(seconds))
+
+
+def chords(seconds, rng):
+    notes = [220, 247, 262, 294, 330, 349, 392, 440]
+    out = []
+    for _ in range(int(seconds)):
+        t = times(1.0)
+        chord = sum(harmonics(f, t, vibrato=0.003) for f in rng.choice(notes, 3, replace=False))
+        out.append(0.1 * chord * np.minimum(1, t / 0.05) * np.exp(-0.5 * t))
+    return np.concatenate(out)
+
+
+def melody(seconds, rng, note_seconds=0.25):
+    out = []
+    for _ in range(int(seconds / note_seconds)):
+        t = times(note_seconds)
+        note = harmonics(rng.choice([262, 294, 330, 349, 392, 440, 494, 523]), t, count=7)
+        out.append(0.1 * note * np.minimum(1, t / 0.01) * np.exp(-3 * t))
+    return np.concatenate(out)
+
+
+def speech(seconds, rng):
+    out, total = [], 0.0
+    while total < seconds:
+        for _ in range(rng.integers(3, 8)):
+            duration = rng.uniform(0.12, 0.3)
+            t = times(duration)
+            f0 = rng.uniform(100, 220) * (1 + 0.2 * t / duration * rng.choice([-1, 1]))
+            phase = 2 * np.pi * np.cumsum(f0) / SAMPLE_RATE
+            formants = rng.uniform([300, 900, 2200], [900, 2200, 3200])
+            syllable = np.zeros_like(t)
+            for h in range(1, 30):
+                gain = sum(np.exp(-((f0 * h - formant) / 120) ** 2) for formant in formants) + 0.02
+                syllable += gain * np.sin(h * phase)
+            syllable *= np.hanning(len(t))
+            if rng.random() < 0.3:
+                syllable = np.concatenate([0.3 * rng.standard_normal(int(0.06 * SAMPLE_RATE)), syllable])
+            out.append(0.05 * syllable)
+            total += len(syllable) / SAMPLE_RATE
+        pause = rng.uniform(0.2, 0.8)
+        out.append(silence(pause, rng))
+        total += pause
+    return np.concatenate(out)
+
+
+def detect(*parts):
+    return detect_speech_regions(np.concatenate(parts).astype(np.float32), sample_rate=SAMPLE_RATE)
+
+
+def speech_seconds(regions):
+    return sum(end - start for start, end in regions)
+
+
+def test_tone_is_not_speech():
+    rng = np.random.default_rng(0)
+    assert detect(silence(3, rng), tone(5), silence(3, rng)) == []
+    assert detect(tone(10)) == []
+
+
+def test_music_is_not_speech():
+    rng = np.random.default_rng(1)
+    assert detect(silence(3, rng), chords(10, rng), silence(3, rng)) == []
+    assert detect(silence(3, rng), melody(10, rng), silence(3, rng)) == []
+    assert detect(silence(3, rng), melody(10, rng, note_seconds=0.5), silence(3, rng)) == []
+
+
+def test_speech_is_found():
+    rng = np.random.default_rng(2)
+    audio = speech(20, rng)
+    regions = detect(audio)
+    assert speech_seconds(regions) > 0.8 * len(audio) / SAMPLE_RATE
+
+
+def test_speech_after_music_is_found_and_music_skipped():
+    rng = np.random.default_rng(3)
+    music = chords(10, rng)
+    regions = detect(music, silence(1, rng), speech(10, rng))
+    music_end = len(music) / SAMPLE_RATE
+    assert regions and speech_seconds(regions) > 8.0
+    assert all(end > music_end for _, end in regions)
+    assert regions[0][0] > music_end - 0.5
+
+
+if __name__ == "__main__":
+    for name, test in sorted(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"{name}: OK")
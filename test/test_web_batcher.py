@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Tests for the web backend's dynamic batcher.
+
+Batched decodes run on small random-weight Whisper models, so they exercise
+the real whisper.decode path (including English-only vocabularies) without
+downloading a checkpoint. Batch assembly (flush on size and on timeout, one
+batch per model size and language, errors fanned out to every clip) runs on a
+fake pool with a fake work function.
+
+Usage:
+    python -m pytest test/test_web_batcher.py
+    python test/test_web_batcher.py
+"""
+
+import sys
+from concurrent.futures import Future
+from pathlib import Path
+
+import numpy as np
+import torch
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'web' / 'backend'))
+
+from whisper.model import ModelDimensions, Whisper  # noqa: E402
+
+import model_pool  # noqa: E402
+from batcher import SAMPLE_RATE, DynamicBatcher, _transcribe_batch  # noqa: E402
+
+# Vocabulary sizes of the English-only and multilingual checkpoints
+ENGLISH_VOCAB = 51864
+MULTILINGUAL_VOCAB = 51865
+
+
+def tiny_model(n_vocab):
+    torch.manual_seed(0)
+    dims = ModelDimensions(
+        n_mels=80, n_audio_ctx=1500, n_audio_state=64, n_audio_head=2, n_audio_layer=1,
+        n_vocab=n_vocab, n_text_ctx=448, n_text_state=64, n_text_head=2, n_text_layer=1
+    )
+    return Whisper(dims).eval()
+
+
+class FakeEngine:
+    """Stands in for a pool instance's Transcriber around a given model."""
+
+    device = 'cpu'
+
+    def __init__(self, model):
+        self.model = model
+        self.fallbacks = []
+
+    def transcribe(self, audio, language=None, **kwargs):
+        self.fallbacks.append(language)
+        return {'text': '', 'language': language or 'en', 'segments': []}
+
+
+def clips(*seconds):
+    rng = np.random.default_rng(0)
+    return [(0.01 * rng.standard_normal(int(s * SAMPLE_RATE))).astype(np.float32) for s in seconds]
+
+
+def test_english_only_model_without_language():
+    model_pool._INSTANCE_ENGINE = FakeEngine(tiny_model(ENGLISH_VOCAB))
+    results = _transcribe_batch(clips(2, 3), None)
+    assert [result['language'] for result in results] == ['en', 'en']
+    assert all(language == 'en' for language in model_pool._INSTANCE_ENGINE.fallbacks)
+
+
+def test_multilingual_model_without_language():
+    model_pool._INSTANCE_ENGINE = FakeEngine(tiny_model(MULTILINGUAL_VOCAB))
+    results = _transcribe_batch(clips(2, 3), None)
+    assert len(results) == 2
+    assert all(isinstance(result['language'], str) for result in results)
+    assert [result['duration'] for result in results] == [2.0, 3.0]
+
+
+class FakePool:
+    """Runs each batch through a fake work function on the calling thread."""
+
+    def __init__(self, error=None):
+        self.error = error
+        self.batches = []  # (model_size, number of clips, language)
+
+    def submit(self, model_size, fn, clips, language):
+        self.batches.append((model_size, len(clips), language))
+        future = Future()
+        if self.error is not None:
+            future.set_exception(self.error)
+        else:
+            future.set_result([
+                {'text': f' {len(clip)} samples', 'language': language or 'en', 'segments': [],
+                 'duration': len(clip) / SAMPLE_RATE}
+                for clip in clips
+            ])
+        return future
+
+
+def test_batch_flushes_when_full():
+    pool = FakePool()
+    batcher = DynamicBatcher(pool, max_batch=3, max_wait_ms=60000)
+    futures = [batcher.submit('base', 'en', clip) for clip in clips(1, 2, 3, 4)]
+    assert pool.batches == [('base', 3, 'en')]
+    assert [future.result(timeout=1)['duration'] for future in futures[:3]] == [1.0, 2.0, 3.0]
+    assert not futures[3].done()
+    assert batcher.stats()['pending'] == 1
+
+
+def test_batch_flushes_after_wait():
+    pool = FakePool()
+    batcher = DynamicBatcher(pool, max_batch=8, max_wait_ms=20)
+    futures = [batcher.submit('base', None, clip) for clip in clips(1, 2)]
+    futures.append(batcher.submit('small', None, clips(3)[0]))
+    results = [future.result(timeout=2) for future in futures]
+    assert [result['text'] for result in results] == [' 16000 samples', ' 32000 samples', ' 48000 samples']
+    assert sorted(pool.batches) == [('base', 2, None), ('small', 1, None)]
+    stats = batcher.stats()
+    assert stats['batches'] == 2 and stats['clips'] == 3 and stats['pending'] == 0
+
+
+def test_batch_error_reaches_every_clip():
+    pool = FakePool(error=RuntimeError("decode failed"))
+    batcher = DynamicBatcher(pool, max_batch=2, max_wait_ms=60000)
+    futures = [batcher.submit('base', 'de', clip) for clip in clips(1, 2)]
+    for future in futures:
+        assert isinstance(future.exception(timeout=1), RuntimeError)
+        assert str(future.exception()) == "decode failed"
+    assert batcher.stats()['recent'][0]['failed'] is True
+
+
+if __name__ == "__main__":
+    for name, test in sorted(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"{name}: OK")
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Tests for the web backend's coordinator mode.
+
+Shards are "posted" to fake worker nodes (no HTTP) that return one segment
+per shard or fail. Checks that a failed shard is retried on a different node,
+that the stitched result covers every shard, that progress is reported as
+the share of shards done, and that a shard failing on every attempt fails
+the job with ShardFailedError.
+
+Usage:
+    python -m pytest test/test_web_coordinator.py
+    python test/test_web_coordinator.py
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'web' / 'backend'))
+
+from coordinator import SAMPLE_RATE, Coordinator, ShardFailedError  # noqa: E402
+
+
+class FakeCoordinator(Coordinator):
+    """Posts shards to in-process fake nodes; nodes listed in failing always fail."""
+
+    def __init__(self, nodes, failing=(), **kwargs):
+        super().__init__(nodes=nodes, shards_per_node=1, **kwargs)
+        self.failing = set(failing)
+        self.posts = []  # (node url, shard seconds, succeeded)
+        self._posts_lock = threading.Lock()
+
+    def _post_shard(self, node, pcm, model_size, language):
+        seconds = len(pcm) / SAMPLE_RATE
+        ok = node.url not in self.failing
+        with self._posts_lock:
+            self.posts.append((node.url, round(seconds, 1), ok))
+            text = f' {node.url} #{sum(1 for post in self.posts if post[2])}'
+        if not ok:
+            raise RuntimeError(f"{node.url} returned 503")
+        return {
+            'text': text,
+            'language': 'en',
+            'segments': [{'start': 0.5, 'end': seconds - 0.5, 'text': text}]
+        }
+
+
+def speech(seconds):
+    rng = np.random.default_rng(0)
+    return (0.1 * rng.standard_normal(int(seconds * SAMPLE_RATE))).astype(np.float32)
+
+
+def test_failed_shard_is_retried_on_another_node():
+    coordinator = FakeCoordinator(['http://a', 'http://b'], failing={'http://a'}, shard_seconds=10, max_attempts=3)
+    try:
+        result = coordinator.transcribe(speech(20), 'base')
+        failed = [url for url, _, ok in coordinator.posts if not ok]
+        succeeded = [url for url, _, ok in coordinator.posts if ok]
+        assert failed == ['http://a'] and succeeded == ['http://b', 'http://b']
+        assert result['nodes'] == {'http://b': 2}
+        assert result['language'] == 'en'
+        assert sorted(segment['text'] for segment in result['segments']) == [' http://b #1', ' http://b #2']
+        assert result['segments'][0]['start'] == 0.5 and result['segments'][1]['end'] > 19
+
+        stats = {node['url']: node for node in coordinator.stats()['nodes']}
+        assert stats['http://a']['failures'] == 1 and stats['http://a']['shards'] == 0
+        assert stats['http://b']['shards'] == 2 and stats['http://b']['busy'] == 0
+    finally:
+        coordinator.shutdown()
+
+
+def test_progress_is_share_of_shards_done():
+    coordinator = FakeCoordinator(['http://a', 'http://b'], shard_seconds=10)
+    try:
+        percents = []
+        coordinator.transcribe(speech(20), 'base', progress_callback=lambda message, percent: percents.append(percent))
+        assert percents == [50, 100]
+    finally:
+        coordinator.shutdown()
+
+
+def test_shard_failing_every_attempt_raises():
+    coordinator = FakeCoordinator(
+        ['http://a', 'http://b'], failing={'http://a', 'http://b'}, shard_seconds=10, max_attempts=2
+    )
+    try:
+        try:
+            coordinator.transcribe(speech(20), 'base')
+            assert False, "every node fails"
+        except ShardFailedError as e:
+            assert 'failed 2 times' in str(e)
+        shard_attempts = [url for url, _, _ in coordinator.posts]
+        assert 'http://a' in shard_attempts and 'http://b' in shard_attempts
+    finally:
+        coordinator.shutdown()
+
+
+if __name__ == "__main__":
+    for name, test in sorted(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"{name}: OK")
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Tests for the web backend's streaming upload spool.
+
+Uploads are fed to spool_stream() as async chunk streams (or through a fake
+UploadFile), with the spool directory in a temporary directory. Checks that
+the spooled bytes and their sha1 match the upload (and the hash
+audio_fingerprint() computes for the file), that only the extension of the
+client's file name is kept, and that the spool file is removed when the
+stream fails or the upload is aborted.
+
+Usage:
+    python -m pytest test/test_web_ingest.py
+    python test/test_web_ingest.py
+"""
+
+import os
+import sys
+import asyncio
+import hashlib
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'web' / 'backend'))
+
+from ingest import UploadSpool, iter_upload, spool_stream  # noqa: E402
+from transcription.processors.mel_store import audio_fingerprint  # noqa: E402
+
+BODY = os.urandom(3 * 1024 * 1024 + 123)
+
+
+class FakeUpload:
+    """The read() side of FastAPI's UploadFile."""
+
+    def __init__(self, data):
+        self.data = data
+        self.position = 0
+
+    async def read(self, size):
+        chunk = self.data[self.position:self.position + size]
+        self.position += len(chunk)
+        return chunk
+
+
+async def stream(data, chunk_size=256 * 1024, fail_after=None):
+    for offset in range(0, len(data), chunk_size):
+        if fail_after is not None and offset >= fail_after:
+            raise ConnectionResetError("client went away")
+        yield data[offset:offset + chunk_size]
+        yield b''  # Empty chunks (as servers sometimes deliver) are skipped
+
+
+def setup_function(_=None):
+    global _SPOOL_DIR
+    _SPOOL_DIR = tempfile.TemporaryDirectory()
+    os.environ['FONIXFLOW_WEB_SPOOL_DIR'] = _SPOOL_DIR.name
+
+
+def teardown_function(_=None):
+    os.environ.pop('FONIXFLOW_WEB_SPOOL_DIR', None)
+    _SPOOL_DIR.cleanup()
+
+
+def spooled_files():
+    return sorted(os.listdir(_SPOOL_DIR.name))
+
+
+def test_spooled_file_matches_the_upload():
+    spool = asyncio.run(spool_stream(stream(BODY), '../../talk.final.mp4'))
+    assert spool.path.parent == Path(_SPOOL_DIR.name)
+    assert spool.path.name.startswith('upload-') and spool.path.suffix == '.mp4'
+    assert spool.path.read_bytes() == BODY and spool.size == len(BODY)
+    assert spool.content_hash == hashlib.sha1(BODY).hexdigest()
+    assert spool.content_hash == audio_fingerprint(str(spool.path))
+    assert spool.seconds >= 0
+
+
+def test_same_name_uploads_do_not_collide():
+    first = asyncio.run(spool_stream(stream(b'first'), 'clip.wav'))
+    second = asyncio.run(spool_stream(stream(b'second'), 'clip.wav'))
+    assert first.path != second.path
+    assert (first.path.read_bytes(), second.path.read_bytes()) == (b'first', b'second')
+    assert len(spooled_files()) == 2
+
+    empty = asyncio.run(spool_stream(stream(b''), None))
+    assert empty.path.suffix == '' and empty.size == 0
+    assert empty.content_hash == hashlib.sha1(b'').hexdigest()
+
+
+def test_upload_file_is_read_in_chunks():
+    async def chunk_sizes():
+        return [len(chunk) async for chunk in iter_upload(FakeUpload(BODY), chunk_size=1024 * 1024)]
+
+    assert asyncio.run(chunk_sizes()) == [1024 * 1024] * 3 + [123]
+    spool = asyncio.run(spool_stream(iter_upload(FakeUpload(BODY)), 'clip.wav'))
+    assert spool.content_hash == hashlib.sha1(BODY).hexdigest()
+
+
+def test_spool_is_removed_when_the_stream_fails():
+    try:
+        asyncio.run(spool_stream(stream(BODY, fail_after=1024 * 1024), 'clip.wav'))
+        assert False, "the stream error must reach the caller"
+    except ConnectionResetError:
+        pass
+    assert spooled_files() == []
+
+
+def test_spool_is_removed_when_the_upload_is_aborted():
+    started = None
+
+    async def stalled():
+        yield BODY[:1024]
+        started.set()
+        await asyncio.sleep(60)
+        yield BODY[1024:]
+
+    async def abort():
+        nonlocal started
+        started = asyncio.Event()
+        task = asyncio.ensure_future(spool_stream(stalled(), 'clip.wav'))
+        await asyncio.wait_for(started.wait(), 5)
+        assert len(spooled_files()) == 1
+        task.cancel()
+        try:
+            await task
+            assert False, "the upload must be cancelled"
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(abort())
+    assert spooled_files() == []
+
+
+def test_discard_after_close_removes_the_file():
+    spool = UploadSpool('clip.wav')
+    spool.write(b'abc')
+    assert spool.close() == hashlib.sha1(b'abc').hexdigest()
+    spool.discard()
+    spool.discard()
+    assert spooled_files() == []
+
+
+if __name__ == "__main__":
+    for name, test in sorted(globals().items()):
+        if name.startswith("test_") and callable(test):
+            setup_function()
+            try:
+                test()
+            finally:
+                teardown_function()
+            print(f"{name}: OK")
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Tests for the web backend's job manager.
+
+Jobs are dispatched to a fake model pool whose futures the tests resolve by
+hand, with batching and coordinator mode off and the result cache in a
+temporary directory. Checks the queue limit (answered with 429 by the API),
+that identical uploads join one job, that finished jobs expire after their
+TTL and that a cached result is served without running the model.
+
+Usage:
+    python -m pytest test/test_web_jobs.py
+    python test/test_web_jobs.py
+"""
+
+import os
+import sys
+import time
+import queue
+import tempfile
+from concurrent.futures import Future
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'web' / 'backend'))
+
+from batcher import DynamicBatcher  # noqa: E402
+from coordinator import Coordinator  # noqa: E402
+from jobs import Job, JobManager, QueueFullError  # noqa: E402
+
+
+class FakePool:
+    """Records submitted work; the test resolves the returned futures."""
+
+    max_instances = 1
+
+    def __init__(self):
+        self.events = queue.Queue()
+        self.submitted = []
+
+    def submit(self, model_size, fn, *args, on_start=None):
+        future = Future()
+        future.set_running_or_notify_cancel()
+        self.submitted.append((model_size, args, future))
+        return future
+
+    def work_for(self, job, timeout=5.0):
+        """The pool future of a job (its args start with the job id)."""
+        deadline = time.monotonic() + timeout
+        while True:
+            for _, args, future in list(self.submitted):
+                if args[0] == job.id:
+                    return future
+            assert time.monotonic() < deadline, "work never reached the pool"
+            time.sleep(0.01)
+
+    def warm(self, model_size):
+        pass
+
+    def shutdown(self):
+        pass
+
+
+def make_manager(**kwargs):
+    pool = FakePool()
+    manager = JobManager(
+        pool=pool,
+        batcher=DynamicBatcher(pool, max_batch=1),
+        coordinator=Coordinator(nodes=[]),
+        **kwargs
+    )
+    return manager, pool
+
+
+def upload(directory, name='clip.wav'):
+    path = Path(directory) / name
+    path.write_bytes(b'media')
+    return str(path)
+
+
+def result(text=' Hello.'):
+    return {'text': text, 'language': 'en', 'segments': [{'start': 0.0, 'end': 1.0, 'text': text}], 'duration': 1.0}
+
+
+def wait_done(job, timeout=5.0):
+    job.future.result(timeout=timeout)
+    deadline = time.monotonic() + timeout
+    while not job.done:
+        assert time.monotonic() < deadline, "job never finished"
+        time.sleep(0.01)
+
+
+def setup_function(_=None):
+    global _CACHE_DIR
+    _CACHE_DIR = tempfile.TemporaryDirectory()
+    os.environ['FONIXFLOW_RESULT_CACHE_DIR'] = _CACHE_DIR.name
+
+
+def teardown_function(_=None):
+    os.environ.pop('FONIXFLOW_RESULT_CACHE_DIR', None)
+    _CACHE_DIR.cleanup()
+
+
+def test_submit_rejected_when_queue_is_full():
+    manager, pool = make_manager(max_queue=1)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            jobs = [manager.submit(upload(tmp, f'{i}.wav'), f'{i}.wav', 'base')[0] for i in range(2)]
+            try:
+                manager.submit(upload(tmp, 'extra.wav'), 'extra.wav', 'base')
+                assert False, "third job should not fit"
+            except QueueFullError:
+                pass
+
+            pool.work_for(jobs[0]).set_result(result())
+            wait_done(jobs[0])
+            job, deduplicated = manager.submit(upload(tmp, 'later.wav'), 'later.wav', 'base')
+            assert not deduplicated and manager.active_count() == 2
+    finally:
+        manager.shutdown()
+
+
+def test_identical_uploads_join_one_job():
+    manager, pool = make_manager()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            first, joined = manager.submit(upload(tmp, 'a.wav'), 'a.wav', 'base', content_hash='abc')
+            second_path = upload(tmp, 'b.wav')
+            second, joined = manager.submit(second_path, 'b.wav', 'base', content_hash='abc')
+            assert joined and second is first
+            assert first.requests == 2 and manager.stats()['deduplicated'] == 1
+            assert not os.path.exists(second_path)
+
+            other, joined = manager.submit(upload(tmp, 'c.wav'), 'c.wav', 'small', content_hash='abc')
+            assert not joined and other is not first
+
+            pool.work_for(first).set_result(result())
+            wait_done(first)
+            assert first.status == Job.COMPLETED and first.result['text'] == ' Hello.'
+    finally:
+        manager.shutdown()
+
+
+def test_finished_jobs_expire_after_ttl():
+    manager, pool = make_manager(result_ttl=0.05)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            job, _ = manager.submit(upload(tmp), 'clip.wav', 'base', content_hash='ttl')
+            pool.work_for(job).set_result(result())
+            wait_done(job)
+            assert manager.get(job.id) is job
+            time.sleep(0.1)
+            assert manager.get(job.id) is None
+            assert manager.progress.history(job.id) == []
+
+            # The expired job is no longer joined
+            again, joined = manager.submit(upload(tmp), 'clip.wav', 'base', content_hash='ttl')
+            assert not joined and again is not job
+    finally:
+        manager.shutdown()
+
+
+def test_cached_result_skips_the_model():
+    manager, pool = make_manager(result_ttl=0)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            job, _ = manager.submit(upload(tmp), 'clip.wav', 'base', content_hash='cached')
+            pool.work_for(job).set_result(result(' From the model.'))
+            wait_done(job)
+            cache, key = manager._result_cache_key(job)
+            deadline = time.monotonic() + 5
+            while cache.get(key) is None:
+                assert time.monotonic() < deadline, "result was never cached"
+                time.sleep(0.01)
+
+            again, joined = manager.submit(upload(tmp), 'clip.wav', 'base', content_hash='cached')
+            wait_done(again)
+            assert not joined and again.cached
+            assert again.result['text'] == ' From the model.'
+            assert len(pool.submitted) == 1 and manager.stats()['cache_hits'] == 1
+    finally:
+        manager.shutdown()
+
+
+if __name__ == "__main__":
+    for name, test in sorted(globals().items()):
+        if name.startswith("test_") and callable(test):
+            setup_function()
+            try:
+                test()
+            finally:
+                teardown_function()
+            print(f"{name}: OK")
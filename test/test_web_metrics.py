@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Tests for the web backend's Prometheus metrics.
+
+A small FastAPI app with the MetricsMiddleware and a /metrics route is driven
+through Starlette's TestClient, and the exposition is parsed line by line.
+Checks that every line is valid text format, that histogram buckets are
+cumulative and end in +Inf, that _sum and _count match what was observed,
+that requests are labelled with their route template and status (500 for a
+handler that raises), and that label values are escaped.
+
+Usage:
+    python -m pytest test/test_web_metrics.py
+    python test/test_web_metrics.py
+"""
+
+import re
+import sys
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from fastapi.testclient import TestClient
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'web' / 'backend'))
+
+from metrics import Counter, Histogram, Metrics, MetricsMiddleware  # noqa: E402
+
+# name{labels} value, with label values quoted and \\, \" and \n escaped
+SAMPLE_LINE = re.compile(
+    r'^([a-zA-Z_:][a-zA-Z0-9_:]*)'
+    r'(\{(?:[a-zA-Z_][a-zA-Z0-9_]*="(?:[^"\\\n]|\\[\\"n])*",?)*\})?'
+    r' (\S+)$'
+)
+LABEL = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"')
+
+
+def parse(text):
+    """Check the exposition's syntax and return {(name, ((label, value), ...)): value}."""
+    assert text.endswith('\n')
+    samples = {}
+    declared = set()
+    for line in text.splitlines():
+        if line.startswith('# '):
+            kind, name = line.split(' ')[1:3]
+            assert kind in ('HELP', 'TYPE')
+            declared.add(name)
+            continue
+        match = SAMPLE_LINE.match(line)
+        assert match, f"not a valid sample line: {line!r}"
+        name, labels, value = match.groups()
+        assert re.sub(r'_(bucket|sum|count)$', '', name) in declared, f"{name} has no HELP/TYPE"
+        key = (name, tuple(LABEL.findall(labels or '')))
+        assert key not in samples, f"duplicate sample: {line!r}"
+        samples[key] = float(value)
+    return samples
+
+
+def make_client():
+    metrics = Metrics()
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware, metrics=metrics)
+
+    @app.get("/jobs/{job_id}")
+    def get_job(job_id: str):
+        return {"job_id": job_id}
+
+    @app.get("/broken")
+    def broken():
+        raise RuntimeError("handler failed")
+
+    @app.get("/metrics", response_class=PlainTextResponse)
+    def metrics_export():
+        return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+    return TestClient(app, raise_server_exceptions=False), metrics
+
+
+def test_requests_are_counted_per_route_template():
+    client, _ = make_client()
+    for job_id in ('a1', 'b2', 'c3'):
+        assert client.get(f"/jobs/{job_id}").status_code == 200
+    assert client.get("/broken").status_code == 500
+    assert client.get("/nowhere").status_code == 404
+
+    response = client.get("/metrics")
+    assert response.headers['content-type'].startswith('text/plain; version=0.0.4')
+    samples = parse(response.text)
+    requests = {labels: value for (name, labels), value in samples.items() if name == 'fonixflow_http_requests_total'}
+    assert requests == {
+        (('method', 'GET'), ('route', '/jobs/{job_id}'), ('status', '200')): 3,
+        (('method', 'GET'), ('route', '/broken'), ('status', '500')): 1,
+        (('method', 'GET'), ('route', 'unmatched'), ('status', '404')): 1,
+    }
+    assert ('fonixflow_uptime_seconds', ()) in samples
+
+
+def test_latency_buckets_are_cumulative():
+    client, metrics = make_client()
+    for job_id in range(5):
+        client.get(f"/jobs/{job_id}")
+    # Observations with known latencies on a second route
+    for seconds in (0.003, 0.2, 0.2, 7.0, 900.0):
+        metrics.request_latency.observe(seconds, 'POST', '/transcribe')
+
+    samples = parse(client.get("/metrics").text)
+    name = 'fonixflow_http_request_duration_seconds'
+    route = (('method', 'POST'), ('route', '/transcribe'))
+    buckets = [(labels[-1][1], value) for (sample, labels), value in samples.items()
+               if sample == name + '_bucket' and labels[:-1] == route]
+    assert [le for le, _ in buckets][-1] == '+Inf'
+    assert [float(le) for le, _ in buckets[:-1]] == sorted(float(le) for le, _ in buckets[:-1])
+    counts = dict(buckets)
+    assert (counts['0.005'], counts['0.1'], counts['0.25'], counts['5'], counts['10'], counts['600']) == (1, 1, 3, 3, 4, 4)
+    assert counts['+Inf'] == 5
+    assert samples[(name + '_count', route)] == 5
+    assert abs(samples[(name + '_sum', route)] - 907.403) < 1e-9
+
+    # The test client's own requests: every bucket count is a running total
+    served = (('method', 'GET'), ('route', '/jobs/{job_id}'))
+    running = [value for (sample, labels), value in samples.items()
+               if sample == name + '_bucket' and labels[:-1] == served]
+    assert running == sorted(running) and running[-1] == samples[(name + '_count', served)] == 5
+
+
+def test_bucket_bounds_are_inclusive():
+    histogram = Histogram('stage_seconds', 'Stage time.', buckets=(1, 2.5))
+    for seconds in (1, 2.5, 2.6):
+        histogram.observe(seconds)
+    samples = parse('\n'.join(histogram.render()) + '\n')
+    assert samples[('stage_seconds_bucket', (('le', '1'),))] == 1
+    assert samples[('stage_seconds_bucket', (('le', '2.5'),))] == 2
+    assert samples[('stage_seconds_bucket', (('le', '+Inf'),))] == 3
+    assert samples[('stage_seconds_sum', ())] == 6.1 and samples[('stage_seconds_count', ())] == 3
+
+
+def test_label_values_are_escaped():
+    counter = Counter('uploads_total', 'Uploads by file name.', ('filename',))
+    counter.inc('say "hi"\\now\nplease.wav')
+    counter.inc('plain.wav', amount=2.5)
+    text = '\n'.join(counter.render()) + '\n'
+
+    assert 'uploads_total{filename="say \\"hi\\"\\\\now\\nplease.wav"} 1\n' in text
+    assert 'uploads_total{filename="plain.wav"} 2.5\n' in text
+    samples = parse(text)
+    assert len(samples) == 2 and text.count('\n') == 4
+
+
+def test_job_metrics_render_as_counters_and_gauges():
+    client, metrics = make_client()
+    metrics.observe_job('base', 'completed', {'transcribe_seconds': 5.0, 'extract_seconds': 0.4,
+                                              'extract_cached': False, 'result_cache_hit': False}, audio_seconds=20.0)
+    metrics.observe_job('base', 'failed', {'result_cache_hit': True})
+
+    samples = parse(client.get("/metrics").text)
+    assert samples[('fonixflow_jobs_total', (('model_size', 'base'), ('status', 'completed')))] == 1
+    assert samples[('fonixflow_jobs_total', (('model_size', 'base'), ('status', 'failed')))] == 1
+    assert samples[('fonixflow_result_cache_lookups_total', (('result', 'hit'),))] == 1
+    assert samples[('fonixflow_extraction_cache_lookups_total', (('result', 'miss'),))] == 1
+    assert samples[('fonixflow_extract_duration_seconds_count', ())] == 1
+    assert samples[('fonixflow_real_time_factor', (('model_size', 'base'),))] == 0.25
+
+
+if __name__ == "__main__":
+    for name, test in sorted(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"{name}: OK")
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Tests for the web backend's model pool.
+
+Pool instances run on threads instead of worker processes and load no model;
+the work functions only record what ran. Checks FIFO order within a model
+size, LRU eviction of idle instances of other sizes, and that an instance
+whose process died is replaced.
+
+Usage:
+    python -m pytest test/test_web_model_pool.py
+    python test/test_web_model_pool.py
+"""
+
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'web' / 'backend'))
+
+import model_pool  # noqa: E402
+from model_pool import ModelPool  # noqa: E402
+
+_PROCESS_POOL = model_pool.ProcessPoolExecutor
+
+
+def thread_executor(max_workers, mp_context=None, initializer=None, initargs=()):
+    """Stands in for an instance's worker process (no model is loaded)."""
+    return ThreadPoolExecutor(max_workers=max_workers)
+
+
+def setup_function(_=None):
+    model_pool.ProcessPoolExecutor = thread_executor
+
+
+def teardown_function(_=None):
+    model_pool.ProcessPoolExecutor = _PROCESS_POOL
+
+
+def record(log, item):
+    log.append(item)
+    return item
+
+
+def block(gate, item):
+    gate.wait(5)
+    return item
+
+
+def crash():
+    raise BrokenProcessPool("worker died")
+
+
+def test_same_size_runs_in_submission_order():
+    pool = ModelPool(max_instances=1, budget_mb=0)
+    try:
+        gate, log = threading.Event(), []
+        first = pool.submit('base', block, gate, 'first')
+        queued = [pool.submit('base', record, log, i) for i in range(5)]
+        assert pool.waiting() == 5
+        gate.set()
+        assert first.result(timeout=5) == 'first'
+        assert [future.result(timeout=5) for future in queued] == list(range(5))
+        assert log == list(range(5))
+        assert pool.stats()['models']['base']['loads'] == 1
+    finally:
+        pool.shutdown()
+
+
+def test_idle_instance_of_least_recently_used_size_is_evicted():
+    pool = ModelPool(max_instances=2, budget_mb=0)
+    try:
+        log = []
+        pool.submit('tiny', record, log, 'tiny').result(timeout=5)
+        pool.submit('base', record, log, 'base').result(timeout=5)
+        pool.submit('tiny', record, log, 'tiny again').result(timeout=5)
+
+        pool.submit('small', record, log, 'small').result(timeout=5)
+        stats = pool.stats()
+        assert sorted(size for size, info in stats['models'].items() if info['instances']) == ['small', 'tiny']
+        assert stats['models']['base']['evictions'] == 1
+        assert stats['models']['tiny']['evictions'] == 0
+    finally:
+        pool.shutdown()
+
+
+def test_busy_instances_are_not_evicted():
+    pool = ModelPool(max_instances=1, budget_mb=0)
+    try:
+        gate, log = threading.Event(), []
+        busy = pool.submit('base', block, gate, 'base')
+        other = pool.submit('small', record, log, 'small')
+        assert not other.done() and pool.stats()['models']['base']['evictions'] == 0
+        gate.set()
+        assert busy.result(timeout=5) == 'base'
+        assert other.result(timeout=5) == 'small'
+        assert pool.stats()['models']['base']['evictions'] == 1
+    finally:
+        pool.shutdown()
+
+
+def test_broken_instance_is_replaced():
+    pool = ModelPool(max_instances=1, budget_mb=0)
+    try:
+        failed = pool.submit('base', crash)
+        assert isinstance(failed.exception(timeout=5), BrokenProcessPool)
+        assert pool.stats()['instances'] == 0
+
+        log = []
+        assert pool.submit('base', record, log, 'after').result(timeout=5) == 'after'
+        stats = pool.stats()
+        assert stats['instances'] == 1 and stats['models']['base']['loads'] == 2
+    finally:
+        pool.shutdown()
+
+
+if __name__ == "__main__":
+    for name, test in sorted(globals().items()):
+        if name.startswith("test_") and callable(test):
+            setup_function()
+            try:
+                test()
+            finally:
+                teardown_function()
+            print(f"{name}: OK")
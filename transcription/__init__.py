@@ -3,6 +3,8 @@ Transcription package for enhanced multi-language transcription.
 """
 
 from transcription.enhanced import EnhancedTranscriber
+from transcription.parallel import ParallelTranscriber
+from transcription.live import LiveTranscriber
 
-__all__ = ['EnhancedTranscriber']
+__all__ = ['EnhancedTranscriber', 'ParallelTranscriber', 'LiveTranscriber']
 
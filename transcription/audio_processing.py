@@ -196,7 +196,7 @@ def load_audio_to_memory(audio_path: str, sample_rate: int = 16000) -> Tuple[Opt
     try:
         # Load audio at 16kHz mono (Whisper's expected format)
         logger.debug(f"Loading audio into memory: {audio_path}")
-        audio_data, sr = librosa.load(audio_path, sr=sample_rate, mono=True)
+        audio_data, sr = librosa.load(audio_path, sr=sample_rate, mono=True, dtype=np.float32)
         total_duration = len(audio_data) / sr
         logger.debug(f"Audio loaded: {total_duration:.1f}s, {len(audio_data)} samples")
         return audio_data, total_duration
@@ -210,11 +210,12 @@ def extract_audio_chunk_from_memory(
     start: float,
     end: float,
     sample_rate: int = 16000
-) -> Tuple[str, float]:
+) -> Tuple[np.ndarray, float]:
     """
-    Extract audio chunk from in-memory data and save to temp file.
+    Extract audio chunk from in-memory data.
 
-    OPTIMIZATION: Slicing in-memory array is much faster than ffmpeg extraction.
+    OPTIMIZATION: Returns a view into audio_data (no copy, no temp file) that
+    Transcriber.transcribe() accepts directly.
 
     Args:
         audio_data: Audio data as numpy array
@@ -223,22 +224,14 @@ def extract_audio_chunk_from_memory(
         sample_rate: Sample rate of audio data
 
     Returns:
-        Tuple of (temp_file_path, chunk_duration)
+        Tuple of (chunk view, chunk_duration)
     """
-    import soundfile as sf
-
-    start_sample = int(start * sample_rate)
-    end_sample = int(end * sample_rate)
+    start_sample = max(0, int(start * sample_rate))
+    end_sample = max(start_sample, int(end * sample_rate))
     chunk_data = audio_data[start_sample:end_sample]
-
-    # Write to temp file for Whisper
-    with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_audio:
-        temp_path = temp_audio.name
-
-    sf.write(temp_path, chunk_data, sample_rate)
     duration = len(chunk_data) / sample_rate
 
-    return temp_path, duration
+    return chunk_data, duration
 
 
 def process_chunk_sequential(
@@ -337,45 +330,32 @@ def process_chunk_from_memory(
         Segment dict or None if failed
     """
     try:
-        import soundfile as sf
-    except ImportError:
-        logger.warning("soundfile not available, cannot use in-memory processing")
-        return None
-
-    try:
-        # Extract chunk from memory
-        temp_path, chunk_duration = extract_audio_chunk_from_memory(
+        # Slice chunk from memory (zero-copy view, fed straight to Whisper)
+        chunk_data, chunk_duration = extract_audio_chunk_from_memory(
             audio_data, chunk_start, chunk_end, sample_rate
         )
 
         if chunk_duration < 0.1:
             return None
 
-        try:
-            # Transcribe this chunk
-            chunk_result = transcriber.transcribe(
-                temp_path,
-                language=None,
-                progress_callback=None
-            )
-
-            detected_lang = chunk_result.get('language', 'unknown')
-            transcribed_text = chunk_result.get('text', '').strip()
-
-            # Only include if language is in allowed list and has text
-            if (not allowed_languages or detected_lang in allowed_languages) and transcribed_text:
-                return {
-                    'language': detected_lang,
-                    'start': chunk_start,
-                    'end': chunk_end,
-                    'text': transcribed_text
-                }
-        finally:
-            if os.path.exists(temp_path):
-                try:
-                    os.unlink(temp_path)
-                except Exception:
-                    pass
+        # Transcribe this chunk
+        chunk_result = transcriber.transcribe(
+            chunk_data,
+            language=None,
+            progress_callback=None
+        )
+
+        detected_lang = chunk_result.get('language', 'unknown')
+        transcribed_text = chunk_result.get('text', '').strip()
+
+        # Only include if language is in allowed list and has text
+        if (not allowed_languages or detected_lang in allowed_languages) and transcribed_text:
+            return {
+                'language': detected_lang,
+                'start': chunk_start,
+                'end': chunk_end,
+                'text': transcribed_text
+            }
     except Exception as e:
         logger.warning(f"Failed to process chunk from memory [{chunk_start:.1f}-{chunk_end:.1f}s]: {e}", exc_info=True)
 
@@ -0,0 +1,482 @@
+"""
+Batch transcription from the command line.
+
+Transcribes a directory tree, a list of files, or a manifest of media files
+without the GUI, writing SRT, VTT and JSON next to each other in an output
+directory. Work runs as a two-stage pipeline: a pool of extraction threads
+decodes media to 16kHz PCM with ffmpeg (and optionally applies the GUI's noise
+gate and compressor) while a pool of model worker processes, each holding a
+warm Whisper model, transcribes what has already been decoded. Only a bounded
+number of files is decoded ahead of the model workers, so memory stays flat on
+large archives.
+
+Every finished file is appended to a JSON Lines run manifest in the output
+directory. Running the same command again after an interruption skips files
+whose outputs are already recorded and retries the ones that failed.
+
+Usage:
+    python -m transcription.cli /archive/interviews -o transcripts --model small
+    python -m transcription.cli files.txt -o transcripts --formats srt,json
+    python -m transcription.cli transcripts/batch-manifest.jsonl -o transcripts
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import multiprocessing
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+OUTPUT_FORMATS = ('srt', 'vtt', 'json')
+MANIFEST_NAME = 'batch-manifest.jsonl'
+
+# Transcriber owned by a model worker process (set up by _init_model_worker)
+_WORKER_ENGINE = None
+
+
+def _init_model_worker(model_size: str, num_threads: Optional[int]):
+    """Load the model once in a model worker process, optionally pinning its torch thread count."""
+    global _WORKER_ENGINE
+    if num_threads:
+        import torch
+        torch.set_num_threads(num_threads)
+    from app.transcriber import Transcriber
+
+    _WORKER_ENGINE = Transcriber(model_size=model_size)
+    _WORKER_ENGINE.load_model()
+
+
+def _transcribe_audio(audio: np.ndarray, language: Optional[str]) -> Dict[str, Any]:
+    """Transcribe decoded audio in a model worker process."""
+    started = time.monotonic()
+    result = _WORKER_ENGINE.transcribe(audio, language=language)
+    return {
+        'text': result.get('text', ''),
+        'language': result.get('language'),
+        'segments': result.get('segments', []),
+        'seconds': time.monotonic() - started
+    }
+
+
+def _is_recording(path: Path) -> bool:
+    """Recordings made by the app already have the filters applied."""
+    return path.name.startswith('recording_') and path.suffix in ('.ogg', '.wav')
+
+
+def _format_hours(seconds: float) -> str:
+    hours, rest = divmod(int(seconds), 3600)
+    return f"{hours}:{rest // 60:02d}:{rest % 60:02d}"
+
+
+class BatchItem:
+    """A media file and where its outputs go (output base path without extension)."""
+
+    def __init__(self, path: Path, output_base: Path):
+        self.path = path
+        self.output_base = output_base
+
+    def output_path(self, fmt: str) -> Path:
+        return self.output_base.with_name(f"{self.output_base.name}.{fmt}")
+
+
+def _supported_formats() -> set:
+    from app.audio_extractor import AudioExtractor
+    return AudioExtractor.SUPPORTED_FORMATS
+
+
+def _read_list(list_path: Path) -> List[Tuple[Path, Path]]:
+    """
+    Media paths from a list file: one path per line ('#' comments allowed), or a run manifest.
+
+    Relative paths are relative to the list file. Manifest records keep the
+    output location they were given in the original run.
+
+    Returns:
+        List of (media path, output-relative path without extension)
+    """
+    entries = []
+    for line in list_path.read_text(encoding='utf-8').splitlines():
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        output = None
+        if line.startswith('{'):
+            try:
+                record = json.loads(line)
+                line, output = record['path'], record.get('output')
+            except (ValueError, KeyError, TypeError):
+                continue
+        path = Path(line).expanduser()
+        path = path if path.is_absolute() else list_path.parent / path
+        entries.append((path, Path(output) if output else Path(path.stem)))
+    return entries
+
+
+def collect_inputs(sources: Sequence[str], output_dir: Path) -> List[BatchItem]:
+    """
+    Expand directories, media files and list files into batch items.
+
+    Files found under a directory keep their relative path below output_dir;
+    other files go to output_dir under their own name. Media whose outputs would
+    collide (same name, different extension) keep the extension in the output name.
+
+    Args:
+        sources: Directories, media files, or list files / run manifests
+        output_dir: Directory receiving the outputs
+
+    Returns:
+        Batch items in a stable order, each media file once
+    """
+    formats = _supported_formats()
+    found = []  # (media path, output-relative path without extension)
+    for source in sources:
+        source = Path(source).expanduser()
+        if source.is_dir():
+            for path in sorted(source.rglob('*')):
+                if path.is_file() and path.suffix.lower() in formats:
+                    found.append((path, path.relative_to(source).with_suffix('')))
+        elif source.suffix.lower() in formats:
+            found.append((source, Path(source.stem)))
+        elif source.is_file():
+            found.extend(_read_list(source))
+        else:
+            logger.warning(f"Skipping {source}: not a directory, media file or list file")
+
+    items, seen, bases = [], set(), {}
+    for path, relative in found:
+        resolved = path.resolve()
+        if resolved in seen:
+            continue
+        seen.add(resolved)
+        base = output_dir / relative
+        if base in bases:
+            base = base.with_name(path.name)
+        bases[base] = resolved
+        items.append(BatchItem(resolved, base))
+    return items
+
+
+class BatchManifest:
+    """Append-only JSON Lines record of finished files, used to resume an interrupted run."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """Latest record per media path (a torn last line from a crash is ignored)."""
+        records = {}
+        if not self.path.exists():
+            return records
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(record, dict) and 'path' in record:
+                    records[record['path']] = record
+        return records
+
+    def record(self, **record):
+        """Append one record and flush it to disk."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    @staticmethod
+    def is_done(record: Optional[Dict[str, Any]], item: BatchItem, formats: Iterable[str]) -> bool:
+        """True if the record says the item finished and every requested output is on disk."""
+        return (
+            record is not None and record.get('status') == 'done'
+            and all(item.output_path(fmt).exists() for fmt in formats)
+        )
+
+
+class BatchTranscriber:
+    """Pipelined batch transcription: extraction threads feeding model worker processes."""
+
+    def __init__(
+        self,
+        output_dir,
+        model_size: str = 'base',
+        language: Optional[str] = None,
+        formats: Sequence[str] = OUTPUT_FORMATS,
+        extract_workers: int = 2,
+        model_workers: int = 1,
+        threads_per_worker: Optional[int] = None,
+        filters: bool = False,
+        manifest_path=None
+    ):
+        """
+        Initialize the batch transcriber.
+
+        Args:
+            output_dir: Directory receiving the outputs
+            model_size: Whisper model size
+            language: Language code, or None to detect per file
+            formats: Output formats ('srt', 'vtt', 'json')
+            extract_workers: Files decoded at once (each runs ffmpeg)
+            model_workers: Model worker processes (each loads its own model)
+            threads_per_worker: torch threads per model worker
+                                (None = cores / model_workers when there are several)
+            filters: Apply the noise gate and compressor before transcription
+            manifest_path: Run manifest (None = batch-manifest.jsonl in output_dir)
+        """
+        unknown = set(formats) - set(OUTPUT_FORMATS)
+        if unknown:
+            raise ValueError(f"Unknown output format(s): {', '.join(sorted(unknown))}")
+        self.output_dir = Path(output_dir)
+        self.model_size = model_size
+        self.language = language
+        self.formats = tuple(formats)
+        self.extract_workers = max(1, extract_workers)
+        self.model_workers = max(1, model_workers)
+        if threads_per_worker is None and self.model_workers > 1:
+            threads_per_worker = max(1, (os.cpu_count() or 1) // self.model_workers)
+        self.threads_per_worker = threads_per_worker
+        self.filters = filters
+        self.manifest = BatchManifest(manifest_path or self.output_dir / MANIFEST_NAME)
+
+    def run(self, items: Sequence[BatchItem]) -> Dict[str, Any]:
+        """
+        Transcribe the items not yet recorded as done in the manifest.
+
+        Args:
+            items: Batch items (see collect_inputs)
+
+        Returns:
+            dict: Counts ('done', 'failed', 'skipped'), 'audio_seconds', 'wall_seconds'
+                  and 'throughput' (audio-hours per wall-hour)
+        """
+        records = self.manifest.load()
+        pending = deque(item for item in items
+                        if not BatchManifest.is_done(records.get(str(item.path)), item, self.formats))
+        total = len(pending)
+        summary = {'done': 0, 'failed': 0, 'skipped': len(items) - total, 'audio_seconds': 0.0}
+        print(f"{len(items)} file(s): {summary['skipped']} already done, {total} to transcribe "
+              f"(model={self.model_size}, {self.extract_workers} extract / {self.model_workers} model workers)")
+
+        if total:
+            from app.audio_extractor import AudioExtractor
+            AudioExtractor.configure_ffmpeg_converter()
+
+        # Each model worker gets one decoded file waiting for it; more would only hold memory
+        max_in_flight = self.extract_workers + 2 * self.model_workers
+        extract_pool = ThreadPoolExecutor(max_workers=self.extract_workers, thread_name_prefix='batch-extract')
+        model_pool = self._model_executor() if total else None
+        running = {}  # Future -> (stage, item, details: None while extracting, else (info, seconds, pool))
+        started = time.monotonic()
+        try:
+            while pending or running:
+                while pending and len(running) < max_in_flight:
+                    item = pending.popleft()
+                    running[extract_pool.submit(self._extract, item.path)] = ('extract', item, None)
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, item, details = running.pop(future)
+                    error = future.exception()
+                    if error is not None:
+                        if isinstance(error, BrokenProcessPool) and details[2] is model_pool:
+                            # A model worker died (e.g. out of memory); later files get fresh workers
+                            model_pool.shutdown(wait=False, cancel_futures=True)
+                            model_pool = self._model_executor()
+                        self._record_failure(item, stage, error, summary, total)
+                        continue
+                    if stage == 'extract':
+                        audio, info, extract_seconds = future.result()
+                        work = model_pool.submit(_transcribe_audio, audio, self.language)
+                        running[work] = ('transcribe', item, (info, extract_seconds, model_pool))
+                        continue
+                    info, extract_seconds, _ = details
+                    try:
+                        self._record_success(item, future.result(), info, extract_seconds, summary, total)
+                    except OSError as e:
+                        self._record_failure(item, 'write', e, summary, total)
+        except KeyboardInterrupt:
+            print("\nInterrupted - finished files are recorded; run the same command again to resume")
+            raise
+        finally:
+            extract_pool.shutdown(wait=False, cancel_futures=True)
+            if model_pool is not None:
+                model_pool.shutdown(wait=False, cancel_futures=True)
+
+        summary['wall_seconds'] = time.monotonic() - started
+        summary['throughput'] = (summary['audio_seconds'] / summary['wall_seconds']
+                                 if summary['wall_seconds'] > 0 else 0.0)
+        print(
+            f"Finished: {summary['done']} transcribed, {summary['failed']} failed, {summary['skipped']} skipped; "
+            f"{summary['audio_seconds'] / 3600:.2f}h of audio in {summary['wall_seconds'] / 3600:.2f}h "
+            f"({summary['throughput']:.2f} audio-hours per wall-hour)"
+        )
+        return summary
+
+    def _model_executor(self):
+        """Pool of model worker processes, each loading the model once."""
+        logger.info(f"Starting {self.model_workers} model worker process(es) ({self.model_size})")
+        # spawn, not fork: extraction threads may already be running in this process
+        return ProcessPoolExecutor(
+            max_workers=self.model_workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_model_worker,
+            initargs=(self.model_size, self.threads_per_worker)
+        )
+
+    def _extract(self, path: Path) -> Tuple[np.ndarray, Dict[str, Any], float]:
+        """Decode one file to PCM and apply the filters (extraction thread)."""
+        from app.audio_extractor import AudioExtractor
+
+        started = time.monotonic()
+        audio, info = AudioExtractor().extract_audio_array(str(path))
+        if self.filters and not _is_recording(path):
+            # app.audio_filters, not gui.audio_filters: the gui package imports Qt
+            from app.audio_filters import (
+                COMPRESSOR_SETTINGS, NOISE_GATE_SETTINGS, EnhancedCompressor, NoiseGate
+            )
+
+            noise_gate = NoiseGate(**NOISE_GATE_SETTINGS, sample_rate=SAMPLE_RATE)
+            compressor = EnhancedCompressor(**COMPRESSOR_SETTINGS, sample_rate=SAMPLE_RATE)
+            audio = compressor.process(noise_gate.process(audio))
+        return np.ascontiguousarray(audio, dtype=np.float32), info, time.monotonic() - started
+
+    def _record_success(self, item: BatchItem, result: Dict[str, Any], info: Dict[str, Any],
+                        extract_seconds: float, summary: Dict[str, Any], total: int):
+        duration = info.get('duration') or 0.0
+        outputs = self.write_outputs(item, result, duration)
+        self.manifest.record(
+            path=str(item.path), output=self._relative_output(item), status='done',
+            outputs=[str(path) for path in outputs],
+            model_size=self.model_size, language=result['language'], duration=duration,
+            extract_seconds=round(extract_seconds, 2), transcribe_seconds=round(result['seconds'], 2),
+            finished_at=time.time()
+        )
+        summary['done'] += 1
+        summary['audio_seconds'] += duration
+        print(
+            f"[{summary['done'] + summary['failed']}/{total}] {item.path.name}: {_format_hours(duration)} audio, "
+            f"extract {extract_seconds:.1f}s, transcribe {result['seconds']:.1f}s ({result['language']})"
+        )
+
+    def _record_failure(self, item: BatchItem, stage: str, error: BaseException,
+                        summary: Dict[str, Any], total: int):
+        logger.error(f"{stage.capitalize()} failed for {item.path}: {error}")
+        self.manifest.record(path=str(item.path), output=self._relative_output(item), status='failed',
+                             stage=stage, error=str(error), finished_at=time.time())
+        summary['failed'] += 1
+        print(f"[{summary['done'] + summary['failed']}/{total}] {item.path.name}: FAILED ({stage}: {error})")
+
+    def _relative_output(self, item: BatchItem) -> str:
+        """Output base below output_dir as recorded in the manifest (so a manifest run writes to the same place)."""
+        try:
+            return str(item.output_base.relative_to(self.output_dir))
+        except ValueError:
+            return str(item.output_base)
+
+    def write_outputs(self, item: BatchItem, result: Dict[str, Any], duration: float) -> List[Path]:
+        """Write the requested formats for one file (each written whole, then renamed into place)."""
+        from transcription.formatters import format_as_srt, format_as_vtt
+
+        segments = [
+            {'id': i, 'start': float(seg['start']), 'end': float(seg['end']), 'text': seg['text'].strip()}
+            for i, seg in enumerate(result['segments'])
+        ]
+        contents = {
+            'srt': lambda: format_as_srt({'segments': segments}),
+            'vtt': lambda: format_as_vtt({'segments': segments}),
+            'json': lambda: json.dumps({
+                'source': str(item.path),
+                'model_size': self.model_size,
+                'language': result['language'],
+                'duration': duration,
+                'text': result['text'].strip(),
+                'segments': segments
+            }, ensure_ascii=False, indent=2)
+        }
+
+        outputs = []
+        item.output_base.parent.mkdir(parents=True, exist_ok=True)
+        for fmt in self.formats:
+            path = item.output_path(fmt)
+            partial = path.with_name(path.name + '.partial')
+            partial.write_text(contents[fmt](), encoding='utf-8')
+            os.replace(partial, path)
+            outputs.append(path)
+        return outputs
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='python -m transcription.cli',
+        description='FonixFlow - batch transcription of media files without the GUI'
+    )
+    parser.add_argument('inputs', nargs='+',
+                        help='Directories, media files, or list files (one path per line, or a run manifest)')
+    parser.add_argument('-o', '--output-dir', default='transcripts', help='Output directory (default: transcripts)')
+    parser.add_argument('-m', '--model', default='base', help='Whisper model size (default: base)')
+    parser.add_argument('-l', '--language', default=None, help='Language code (default: detect per file)')
+    parser.add_argument('-f', '--formats', default=','.join(OUTPUT_FORMATS),
+                        help='Comma-separated output formats: srt, vtt, json (default: all)')
+    parser.add_argument('--extract-workers', type=int, default=2, help='Files decoded at once (default: 2)')
+    parser.add_argument('--model-workers', type=int, default=1,
+                        help='Model worker processes, each with its own model (default: 1)')
+    parser.add_argument('--threads', type=int, default=None,
+                        help='torch threads per model worker (default: cores / model workers)')
+    parser.add_argument('--filters', action='store_true', help='Apply the noise gate and compressor')
+    parser.add_argument('--manifest', default=None,
+                        help=f'Run manifest for resuming (default: OUTPUT_DIR/{MANIFEST_NAME})')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Log progress details')
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format='%(asctime)s %(levelname)s %(name)s: %(message)s'
+    )
+
+    output_dir = Path(args.output_dir)
+    formats = [fmt.strip().lower() for fmt in args.formats.split(',') if fmt.strip()]
+    try:
+        batch = BatchTranscriber(
+            output_dir,
+            model_size=args.model,
+            language=args.language,
+            formats=formats,
+            extract_workers=args.extract_workers,
+            model_workers=args.model_workers,
+            threads_per_worker=args.threads,
+            filters=args.filters,
+            manifest_path=args.manifest
+        )
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    items = collect_inputs(args.inputs, output_dir)
+    if not items:
+        print("No media files found", file=sys.stderr)
+        return 1
+    try:
+        summary = batch.run(items)
+    except KeyboardInterrupt:
+        return 130
+    return 1 if summary['failed'] else 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -61,11 +61,13 @@ import os
 import logging
 import tempfile
 import time
-import threading
-import queue
 from typing import Dict, List, Optional, Any, Tuple
 from app.transcriber import Transcriber
-from transcription.processors import FormatConverter, DiagnosticsLogger, AudioProcessor
+from transcription.processors import (
+    FormatConverter, DiagnosticsLogger, AudioProcessor, LanguageIdentifier, SegmentWorkerPool,
+    MelFeatureStore, audio_fingerprint, array_fingerprint
+)
+from transcription import vad
 import numpy as np
 
 logger = logging.getLogger(__name__)
@@ -106,18 +108,25 @@ class EnhancedTranscriber(Transcriber):
         'unknown': 'Unknown'
     }
 
+    # Pass 1 batched language identification: chunks per encoder forward pass, and the
+    # top-language probability below which the chunk text is decoded for a heuristic check
+    LANGUAGE_ID_BATCH_SIZE = 16
+    LANGUAGE_ID_TEXT_CHECK_THRESHOLD = 0.7
+
     # CLASS-LEVEL model cache is now handled in the base Transcriber class
     # This ensures ALL instances share the same loaded models automatically
 
-    def __init__(self, model_size='base', enable_diagnostics=True):
+    def __init__(self, model_size='base', enable_diagnostics=True, use_result_cache=False):
         """
         Initialize the Enhanced Transcriber.
 
         Args:
             model_size: Size of the Whisper model to use
             enable_diagnostics: If True, save detailed diagnostic info to JSON
+            use_result_cache: If True, transcribe()/transcribe_multilang() check the
+                              on-disk result cache before loading any model
         """
-        super().__init__(model_size)
+        super().__init__(model_size, use_result_cache=use_result_cache)
         self.language_segments = []
         self.cancel_requested = False  # User cancellation flag
         self._audio_fallback_model = None  # Cached model for audio fallback (performance optimization)
@@ -128,6 +137,9 @@ class EnhancedTranscriber(Transcriber):
         # Initialize processors
         self.diagnostics_logger = DiagnosticsLogger(enable_diagnostics)
         self.audio_processor = AudioProcessor(sample_rate=16000)
+        self._mel_stores = {}  # (audio_path, n_mels) -> MelFeatureStore for the current file
+        self._speech_regions = {}  # audio_path -> VAD speech regions for the current file
+        self._supplied_audio_path = None  # audio_path whose samples the caller passed in (audio_data)
 
         # Backward compatibility properties
         self.enable_diagnostics = enable_diagnostics
@@ -146,7 +158,8 @@ class EnhancedTranscriber(Transcriber):
         skip_sampling: bool = False,
         fast_text_language: bool = True,
         allowed_languages: Optional[List[str]] = None,
-        force_allowed_only: bool = True
+        force_allowed_only: bool = True,
+        audio_data: Optional[np.ndarray] = None
     ) -> Dict[str, Any]:
         """
         Transcribe audio with multi-language detection using word-level analysis.
@@ -164,10 +177,76 @@ class EnhancedTranscriber(Transcriber):
             use_segment_retranscription: If True, use word-level language detection
             detection_model: Deprecated (kept for compatibility)
             transcription_model: Model to use (default: "medium")
+            audio_data: Already decoded 16kHz mono float32 audio of audio_path (e.g. from
+                        AudioExtractor.extract_audio_array()); every pass then slices it
+                        instead of decoding audio_path again
 
         Returns:
             dict: Enhanced transcription result with language information
         """
+        if audio_data is not None or self._supplied_audio_path is not None:
+            # Per-file state derived from caller-supplied samples isn't valid for a new
+            # array (or the file's own decode), even under the same path
+            self._reset_file_state()
+        if audio_data is not None:
+            self._load_audio_to_memory(audio_path, audio_data=audio_data)
+            self._supplied_audio_path = audio_path
+
+        cache, cache_key = self._result_cache_key(
+            audio_data if audio_data is not None else audio_path, mode='multilang', detect_language_changes=detect_language_changes,
+            initial_prompt=initial_prompt, use_segment_retranscription=use_segment_retranscription,
+            detection_model=detection_model, transcription_model=transcription_model,
+            skip_fast_single=skip_fast_single, skip_sampling=skip_sampling,
+            deep_scan=not fast_text_language,
+            allowed_languages=sorted(allowed_languages) if allowed_languages else None,
+            force_allowed_only=force_allowed_only
+        )
+        if cache is not None:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                self.language_segments = cached.get('language_segments', [])
+                if progress_callback:
+                    progress_callback("Loaded cached transcription")
+                return cached
+
+        # Nested transcribe() calls are intermediate steps - don't cache them
+        self._result_cache_bypass = True
+        try:
+            result = self._transcribe_multilang_uncached(
+                audio_path, detect_language_changes, initial_prompt, progress_callback,
+                use_segment_retranscription, detection_model, transcription_model,
+                skip_fast_single, skip_sampling, fast_text_language, allowed_languages,
+                force_allowed_only
+            )
+        finally:
+            self._result_cache_bypass = False
+
+        if cache is not None and result:
+            cache.put(
+                cache_key, result, source=audio_path,
+                settings={
+                    'mode': 'multilang', 'model_size': self.model_size,
+                    'deep_scan': not fast_text_language, 'allowed_languages': allowed_languages
+                }
+            )
+        return result
+
+    def _transcribe_multilang_uncached(
+        self,
+        audio_path: str,
+        detect_language_changes: bool = True,
+        initial_prompt: Optional[str] = None,
+        progress_callback=None,
+        use_segment_retranscription: bool = True,
+        detection_model: str = "base",
+        transcription_model: str = "medium",
+        skip_fast_single: bool = False,
+        skip_sampling: bool = False,
+        fast_text_language: bool = True,
+        allowed_languages: Optional[List[str]] = None,
+        force_allowed_only: bool = True
+    ) -> Dict[str, Any]:
+        """Run multi-language transcription (see transcribe_multilang())."""
         if detect_language_changes and use_segment_retranscription:
             # Fast path: user forced multi-language, skip sampling classification entirely
             if skip_sampling:
@@ -190,21 +269,15 @@ class EnhancedTranscriber(Transcriber):
                         progress_callback("Segmenting audio file for comprehensive multi-language detection...")
                     
                     # Get total audio duration
-                    import subprocess
                     try:
-                        ffprobe_cmd = [
-                            'ffprobe', '-v', 'error', '-show_entries', 'format=duration',
-                            '-of', 'default=noprint_wrappers=1:nokey=1', audio_path
-                        ]
-                        duration_output = subprocess.check_output(ffprobe_cmd, stderr=subprocess.STDOUT)
-                        total_duration = float(duration_output.decode().strip())
+                        total_duration = self._get_audio_duration(audio_path)
                     except Exception as e:
                         logger.warning(f"Could not get audio duration: {e}, doing initial transcription first")
                         # Fallback: do initial transcription to get duration
                         if progress_callback:
                             progress_callback("Getting audio duration...")
                         result = self.transcribe(
-                            audio_path,
+                            self._audio_input(audio_path),
                             language=None,
                             initial_prompt=initial_prompt,
                             word_timestamps=False,
@@ -238,7 +311,7 @@ class EnhancedTranscriber(Transcriber):
                             progress_callback("Two-pass detection failed, falling back to standard transcription...")
                         
                         fallback_result = self.transcribe(
-                            audio_path,
+                            self._audio_input(audio_path),
                             language=None,
                             initial_prompt=initial_prompt,
                             progress_callback=progress_callback
@@ -281,7 +354,7 @@ class EnhancedTranscriber(Transcriber):
                 if progress_callback:
                     progress_callback("Full word-level transcription (sampling skipped)...")
                 result = self.transcribe(
-                    audio_path,
+                    self._audio_input(audio_path),
                     language=None,
                     initial_prompt=initial_prompt,
                     word_timestamps=True,
@@ -325,14 +398,8 @@ class EnhancedTranscriber(Transcriber):
                     logger.info("Multiple languages expected but only one detected - segmenting entire audio file for comprehensive detection...")
                     
                     # Get total audio duration
-                    import subprocess
                     try:
-                        ffprobe_cmd = [
-                            'ffprobe', '-v', 'error', '-show_entries', 'format=duration',
-                            '-of', 'default=noprint_wrappers=1:nokey=1', audio_path
-                        ]
-                        duration_output = subprocess.check_output(ffprobe_cmd, stderr=subprocess.STDOUT)
-                        total_duration = float(duration_output.decode().strip())
+                        total_duration = self._get_audio_duration(audio_path)
                     except Exception as e:
                         logger.warning(f"Could not get audio duration: {e}, using segments end time")
                         total_duration = initial_segments[-1].get('end', 0) if initial_segments else 0
@@ -379,7 +446,7 @@ class EnhancedTranscriber(Transcriber):
                 if progress_callback:
                     progress_callback(f"Single language detected ({classification['primary_language']}). Fast transcription...")
                 result = self.transcribe(
-                    audio_path,
+                    self._audio_input(audio_path),
                     language=classification['primary_language'],
                     initial_prompt=initial_prompt,
                     word_timestamps=False,
@@ -411,7 +478,7 @@ class EnhancedTranscriber(Transcriber):
             # The base transcribe() method will automatically retry without word_timestamps if this error occurs
             try:
                 result = self.transcribe(
-                    audio_path,
+                    self._audio_input(audio_path),
                     language=None,  # Auto-detect all languages
                     initial_prompt=initial_prompt,
                     word_timestamps=True,  # Enable word-level timestamps (will auto-disable on error)
@@ -423,7 +490,7 @@ class EnhancedTranscriber(Transcriber):
                 if "kv_cache" in str(e) or "Linear" in str(e):
                     logger.warning("kv_cache error detected, retrying without word_timestamps...")
                     result = self.transcribe(
-                        audio_path,
+                        self._audio_input(audio_path),
                         language=None,
                         initial_prompt=initial_prompt,
                         word_timestamps=False,  # Disable word timestamps
@@ -469,7 +536,7 @@ class EnhancedTranscriber(Transcriber):
                 progress_callback("Transcribing...")
 
             result = self.transcribe(
-                audio_path,
+                self._audio_input(audio_path),
                 language=None,  # Auto-detect
                 initial_prompt=initial_prompt,
                 progress_callback=progress_callback
@@ -694,29 +761,21 @@ class EnhancedTranscriber(Transcriber):
         OPTIMIZED: Reuses cached model instance instead of loading a new one each time.
         This saves 8-10 seconds per call (model loading time).
 
-        Extracts the audio slice [start, end] and runs a fast transcription to infer language.
+        Slices the window [start, end] out of the in-memory audio (loaded once per file)
+        and runs a fast transcription to infer language.
         Returns a language code or None if detection fails.
         """
-        import subprocess, tempfile, os
-
-        duration = max(0.1, end - start)
-        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_audio:
-            temp_path = temp_audio.name
         try:
-            ffmpeg_cmd = [
-                self.ffmpeg_bin,'-y','-i',audio_path,
-                '-ss',str(start),
-                '-t',str(duration),
-                '-ar','16000','-ac','1', temp_path
-            ]
-            subprocess.run(ffmpeg_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
-
             # OPTIMIZATION: Reuse cached model instance
             if self._audio_fallback_model is None:
                 logger.debug(f"Initializing cached audio fallback model ({model_name})")
                 self._audio_fallback_model = Transcriber(model_size=model_name)
 
-            r = self._audio_fallback_model.transcribe(temp_path, language=None, word_timestamps=False)
+            audio_data, _ = self._load_audio_to_memory(audio_path)
+            r = self._transcribe_audio_window(
+                self._audio_fallback_model, audio_path, audio_data, start, end,
+                language=None, word_timestamps=False
+            )
             lang = r.get('language', 'unknown')
             if allowed_languages:
                 # If result not in allowed, keep unknown to avoid leaking other langs
@@ -726,12 +785,59 @@ class EnhancedTranscriber(Transcriber):
         except Exception as e:
             logger.debug(f"Window audio classification failed: {e}")
             return None
+
+    def _transcribe_audio_window(
+        self,
+        engine: Transcriber,
+        audio_path: str,
+        audio_data: Optional[np.ndarray],
+        start: float,
+        end: float,
+        **transcribe_kwargs
+    ) -> Dict[str, Any]:
+        """Transcribe the [start, end] window of a file with the given engine.
+
+        OPTIMIZATION: When the file is held in memory, a zero-copy view of the array is
+        passed straight to Whisper (no temp file, no ffmpeg subprocess). Otherwise the
+        window is extracted with ffmpeg into a temp WAV as before.
+
+        Args:
+            engine: Transcriber instance to run
+            audio_path: Path to the full audio file (used for ffmpeg fallback)
+            audio_data: In-memory 16kHz audio for audio_path, or None
+            start: Start time in seconds
+            end: End time in seconds
+            **transcribe_kwargs: Forwarded to engine.transcribe()
+
+        Returns:
+            Whisper result dict
+        """
+        transcribe_kwargs.setdefault('progress_callback', None)
+
+        if audio_data is not None:
+            chunk_data, _ = self._extract_audio_chunk_from_memory(audio_data, start, end)
+            return engine.transcribe(chunk_data, **transcribe_kwargs)
+
+        import subprocess
+
+        duration = max(0.1, end - start)
+        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_audio:
+            temp_path = temp_audio.name
+        try:
+            subprocess.run([
+                self.ffmpeg_bin, '-y', '-i', audio_path,
+                '-ss', str(start),
+                '-t', str(duration),
+                '-ar', '16000', '-ac', '1',
+                temp_path
+            ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True, timeout=30)
+            return engine.transcribe(temp_path, **transcribe_kwargs)
         finally:
-            try:
-                if os.path.exists(temp_path):
+            if os.path.exists(temp_path):
+                try:
                     os.unlink(temp_path)
-            except Exception:
-                pass
+                except Exception as cleanup_error:
+                    logger.warning(f"Failed to cleanup temp file {temp_path}: {cleanup_error}")
 
     def _retranscribe_segments(
         self,
@@ -754,13 +860,14 @@ class EnhancedTranscriber(Transcriber):
         Returns:
             List of language segments with accurate per-segment language detection
         """
-        import subprocess
-
         language_segments = []
         total_segments = len(segments)
 
         logger.info(f"Re-transcribing {total_segments} segments for accurate language detection")
 
+        # Slice segments out of memory instead of extracting each one with ffmpeg
+        audio_data, _ = self._load_audio_to_memory(audio_path)
+
         for i, segment in enumerate(segments):
             start_time = segment.get('start', 0)
             end_time = segment.get('end', 0)
@@ -773,27 +880,11 @@ class EnhancedTranscriber(Transcriber):
             if progress_callback and i % 5 == 0:  # Update every 5 segments
                 progress_callback(f"Language detection: {i+1}/{total_segments} segments")
 
-            # Extract audio segment using ffmpeg
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_audio:
-                temp_path = temp_audio.name
-
             try:
-                # Use ffmpeg to extract the specific time range
-                subprocess.run([
-                    self.ffmpeg_bin, '-i', audio_path,
-                    '-ss', str(start_time),
-                    '-t', str(duration),
-                    '-ar', '16000',  # Whisper expects 16kHz
-                    '-ac', '1',       # Mono
-                    '-y',             # Overwrite
-                    temp_path
-                ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
-
                 # Transcribe this segment alone to detect its language
-                segment_result = self.transcribe(
-                    temp_path,
-                    language=None,  # Auto-detect for THIS segment
-                    progress_callback=None  # Don't spam progress for each segment
+                segment_result = self._transcribe_audio_window(
+                    self, audio_path, audio_data, start_time, end_time,
+                    language=None  # Auto-detect for THIS segment
                 )
 
                 detected_lang = segment_result.get('language', 'unknown')
@@ -818,13 +909,6 @@ class EnhancedTranscriber(Transcriber):
                     'end': end_time,
                     'text': segment.get('text', '').strip()
                 })
-            finally:
-                # Always clean up temp file
-                if os.path.exists(temp_path):
-                    try:
-                        os.unlink(temp_path)
-                    except Exception as cleanup_error:
-                        logger.warning(f"Failed to cleanup temp file {temp_path}: {cleanup_error}")
 
         # DIAGNOSTIC: Log raw segments before any merging
         if hasattr(self, '_log_segment_diagnostics'):
@@ -929,8 +1013,6 @@ class EnhancedTranscriber(Transcriber):
         Returns:
             List of language segments with accurate per-segment transcription
         """
-        import subprocess
-
         language_segments = []
         total_segments = len(segments)
 
@@ -939,6 +1021,9 @@ class EnhancedTranscriber(Transcriber):
         # Create a transcriber with the specified model
         transcriber = Transcriber(model_size=model_name)
 
+        # Slice segments out of memory instead of extracting each one with ffmpeg
+        audio_data, _ = self._load_audio_to_memory(audio_path)
+
         for i, segment in enumerate(segments):
             start_time = segment.get('start', 0)
             end_time = segment.get('end', 0)
@@ -951,27 +1036,11 @@ class EnhancedTranscriber(Transcriber):
             if progress_callback and i % 5 == 0:  # Update every 5 segments
                 progress_callback(f"Transcribing: {i+1}/{total_segments} segments ({model_name} model)")
 
-            # Extract audio segment using ffmpeg
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_audio:
-                temp_path = temp_audio.name
-
             try:
-                # Use ffmpeg to extract the specific time range
-                subprocess.run([
-                    self.ffmpeg_bin, '-i', audio_path,
-                    '-ss', str(start_time),
-                    '-t', str(duration),
-                    '-ar', '16000',  # Whisper expects 16kHz
-                    '-ac', '1',       # Mono
-                    '-y',             # Overwrite
-                    temp_path
-                ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
-
                 # Transcribe this segment alone to detect its language
-                segment_result = transcriber.transcribe(
-                    temp_path,
-                    language=None,  # Auto-detect for THIS segment
-                    progress_callback=None  # Don't spam progress for each segment
+                segment_result = self._transcribe_audio_window(
+                    transcriber, audio_path, audio_data, start_time, end_time,
+                    language=None  # Auto-detect for THIS segment
                 )
 
                 detected_lang = segment_result.get('language', 'unknown')
@@ -996,13 +1065,6 @@ class EnhancedTranscriber(Transcriber):
                     'end': end_time,
                     'text': segment.get('text', '').strip()
                 })
-            finally:
-                # Always clean up temp file
-                if os.path.exists(temp_path):
-                    try:
-                        os.unlink(temp_path)
-                    except Exception as cleanup_error:
-                        logger.warning(f"Failed to cleanup temp file {temp_path}: {cleanup_error}")
 
         # DIAGNOSTIC: Log raw segments before any merging
         if hasattr(self, '_log_segment_diagnostics'):
@@ -1149,12 +1211,7 @@ class EnhancedTranscriber(Transcriber):
         import subprocess, math, tempfile, os
         # Get total duration
         try:
-            ffprobe_cmd = [
-                'ffprobe', '-v', 'error', '-show_entries', 'format=duration',
-                '-of', 'default=noprint_wrappers=1:nokey=1', audio_path
-            ]
-            duration_output = subprocess.check_output(ffprobe_cmd, stderr=subprocess.STDOUT)
-            total_duration = float(duration_output.decode().strip())
+            total_duration = self._get_audio_duration(audio_path)
         except Exception as e:
             logger.warning(f"Duration probe failed: {e}; falling back to single sample")
             total_duration = 0
@@ -1182,27 +1239,51 @@ class EnhancedTranscriber(Transcriber):
             points = [0]  # Fallback to start
 
         sample_records = []
-        import tempfile, os
+        # Only 3 short probes: reuse the in-memory audio if this file is already loaded,
+        # otherwise seek with ffmpeg rather than decoding the whole file up front
+        audio_data = self.audio_processor.get_cached_audio(audio_path)
+
+        # Move probes that land in silence/music to the nearest speech
+        speech_regions = self._get_speech_regions(audio_path, audio_data)
+        if speech_regions:
+            points = sorted({
+                min(adjusted, max(0.0, total_duration - sample_window))
+                for adjusted in (vad.nearest_speech_window(p, sample_window, speech_regions) for p in points)
+                if adjusted is not None
+            }) or points
+
+        # Only the language is needed: with precomputed features (cached from an earlier
+        # run, or built from in-memory audio) run the language-token pass alone
+        try:
+            n_mels = self.load_model().dims.n_mels
+            mel_store = self._get_mel_store(audio_path, n_mels, audio_data)
+            if mel_store is not None:
+                if progress_callback:
+                    progress_callback(f"Language sampling {len(points)} points from cached features")
+                identifier = LanguageIdentifier(self, mel_store=mel_store)
+                predictions = identifier.identify_windows([(p, p + sample_window) for p in points])
+                sample_records = [
+                    {'time': start_time, 'language': lang}
+                    for start_time, (lang, _) in zip(points, predictions)
+                ]
+                logger.info(f"Optimized sampling complete: {len(sample_records)} samples from mel store")
+                return sample_records, total_duration
+        except Exception as e:
+            logger.debug(f"Mel-store sampling unavailable ({e}); decoding probes")
+
         for idx, start_time in enumerate(points):
-            temp_sample = tempfile.NamedTemporaryFile(delete=False, suffix='.wav'); temp_sample.close()
             try:
-                ffmpeg_cmd = [
-                    self.ffmpeg_bin,'-y','-i',audio_path,
-                    '-ss',str(start_time),
-                    '-t',str(sample_window),
-                    '-ar','16000','-ac','1',temp_sample.name
-                ]
-                subprocess.run(ffmpeg_cmd, capture_output=True, check=True)
                 if progress_callback:
                     progress_callback(f"Language sampling {idx+1}/{len(points)} @ {start_time:.0f}s")
-                r = self.transcribe(temp_sample.name, language=None, word_timestamps=False)
+                r = self._transcribe_audio_window(
+                    self, audio_path, audio_data, start_time, start_time + sample_window,
+                    language=None, word_timestamps=False
+                )
                 lang = r.get('language','unknown')
                 sample_records.append({'time': start_time, 'language': lang})
                 logger.debug(f"Sample {idx+1}: t={start_time:.1f}s lang={lang}")
             except Exception as e:
                 logger.warning(f"Sample failed at {start_time:.1f}s: {e}")
-            finally:
-                if os.path.exists(temp_sample.name): os.unlink(temp_sample.name)
 
         logger.info(f"Optimized sampling complete: {len(sample_records)} samples (reduced from up to 25)")
         return sample_records, total_duration
@@ -1521,67 +1602,159 @@ class EnhancedTranscriber(Transcriber):
 
         return language_segments
 
-    def _load_audio_to_memory(self, audio_path: str) -> Tuple[np.ndarray, float]:
-        """Load audio file into memory for faster chunk extraction.
+    def _load_audio_to_memory(self, audio_path: str, audio_data: Optional[np.ndarray] = None) -> Tuple[Optional[np.ndarray], float]:
+        """Load audio file into memory for faster chunk extraction (delegated to AudioProcessor).
 
         OPTIMIZATION: Loading audio once and slicing in memory is much faster than
-        extracting each chunk with ffmpeg (eliminates file I/O overhead).
+        extracting each chunk with ffmpeg (eliminates file I/O overhead). The array is
+        cached, so repeated calls for the same file return it without decoding again.
 
         Args:
             audio_path: Path to audio file
+            audio_data: Already decoded 16kHz mono float32 audio of audio_path, if the
+                        caller has it (cached as-is, nothing is decoded)
 
         Returns:
-            Tuple of (audio_data as numpy array, total_duration in seconds)
+            Tuple of (audio_data as float32 numpy array or None, total_duration in seconds)
         """
-        try:
-            import librosa
-        except ImportError:
-            logger.warning("librosa not available, falling back to ffmpeg extraction")
-            return None, 0.0
+        if audio_data is not None:
+            return self.audio_processor.load_audio_to_memory(audio_path, audio_data=audio_data)
+        cached = self.audio_processor.get_cached_audio(audio_path)
+        if cached is not None:
+            return cached, len(cached) / self.audio_processor.sample_rate
+        return self.audio_processor.load_audio_to_memory(audio_path)
+
+    def _reset_file_state(self):
+        """Drop the in-memory audio, feature stores and speech regions of the current file."""
+        self.audio_processor.clear_cache()
+        for store in self._mel_stores.values():
+            store.close()
+        self._mel_stores.clear()
+        self._speech_regions.clear()
+        self._supplied_audio_path = None
+
+    def _audio_input(self, audio_path: str):
+        """Return the in-memory audio for audio_path if it is loaded, else the path itself.
+
+        OPTIMIZATION: Whole-file transcribe() calls take the decoded array, so Whisper
+        doesn't run ffmpeg over the file again.
+        """
+        cached = self.audio_processor.get_cached_audio(audio_path)
+        return cached if cached is not None else audio_path
 
-        try:
-            # Load audio at 16kHz mono (Whisper's expected format)
-            logger.debug(f"Loading audio into memory: {audio_path}")
-            audio_data, sr = librosa.load(audio_path, sr=self._audio_sample_rate, mono=True)
-            total_duration = len(audio_data) / sr
-            logger.debug(f"Audio loaded: {total_duration:.1f}s, {len(audio_data)} samples")
+    def _get_audio_duration(self, audio_path: str) -> float:
+        """Duration of audio_path in seconds: from the in-memory audio if loaded, else ffprobe.
 
-            # Cache for reuse
-            self._audio_cache = audio_data
-            self._audio_cache_path = audio_path
+        Raises:
+            subprocess.CalledProcessError, ValueError: If ffprobe can't determine it
+        """
+        cached = self.audio_processor.get_cached_audio(audio_path)
+        if cached is not None:
+            return len(cached) / self.audio_processor.sample_rate
 
-            return audio_data, total_duration
+        import subprocess
+        ffprobe_cmd = [
+            'ffprobe', '-v', 'error', '-show_entries', 'format=duration',
+            '-of', 'default=noprint_wrappers=1:nokey=1', audio_path
+        ]
+        duration_output = subprocess.check_output(ffprobe_cmd, stderr=subprocess.STDOUT)
+        return float(duration_output.decode().strip())
+
+    def _get_mel_store(self, audio_path: str, n_mels: int, audio_data: Optional[np.ndarray] = None) -> Optional[MelFeatureStore]:
+        """Get the whole-file log-mel feature store for audio_path.
+
+        OPTIMIZATION: Sampling probes and Pass 1 batches slice their model input out of
+        one precomputed spectrogram instead of recomputing the mel per window. Features
+        are cached on disk by audio content hash (disable with FONIXFLOW_MEL_CACHE=0, cap
+        with FONIXFLOW_MEL_CACHE_MB), so re-running a file - e.g. with another model
+        size - skips extraction entirely.
+
+        Args:
+            audio_path: Path to audio file
+            n_mels: Mel bins the model expects (80, or 128 for large-v3)
+            audio_data: In-memory audio, needed to build the store on a cache miss
+
+        Returns:
+            MelFeatureStore, or None if not cached and no audio is available
+        """
+        key = (audio_path, n_mels)
+        if key in self._mel_stores:
+            return self._mel_stores[key]
+
+        use_disk = os.environ.get('FONIXFLOW_MEL_CACHE', '1').strip() != '0'
+        audio_hash = None
+        store = None
+        try:
+            if use_disk and audio_path == self._supplied_audio_path and audio_data is not None:
+                # Caller-decoded (possibly filtered) samples: key by what is analyzed
+                audio_hash = array_fingerprint(audio_data)
+                store = MelFeatureStore.open_cached(audio_hash, n_mels)
+            elif use_disk and os.path.isfile(audio_path):
+                audio_hash = audio_fingerprint(audio_path)
+                store = MelFeatureStore.open_cached(audio_hash, n_mels)
+            if store is None and audio_data is not None:
+                store = MelFeatureStore.build(audio_data, n_mels, audio_hash=audio_hash)
         except Exception as e:
-            logger.warning(f"Failed to load audio into memory: {e}, falling back to ffmpeg")
-            return None, 0.0
+            logger.warning(f"Log-mel feature store unavailable: {e}")
+            return None
+
+        if store is not None:
+            # One file at a time, like the in-memory audio cache
+            for old_key in [k for k in self._mel_stores if k[0] != audio_path]:
+                self._mel_stores.pop(old_key).close()
+            self._mel_stores[key] = store
+        return store
 
-    def _extract_audio_chunk_from_memory(self, audio_data: np.ndarray, start: float, end: float) -> Tuple[str, float]:
-        """Extract audio chunk from in-memory data and save to temp file.
+    def _get_speech_regions(self, audio_path: str, audio_data: Optional[np.ndarray]) -> Optional[List[Tuple[float, float]]]:
+        """Get VAD speech regions for audio_path (computed once per file).
 
-        OPTIMIZATION: Slicing in-memory array is much faster than ffmpeg extraction.
+        OPTIMIZATION: Chunk generation, language sampling and Pass 2 skip silence and
+        music instead of running model inference on them. The skipped share of the file
+        is stored in diagnostics under 'vad'. Disable with FONIXFLOW_VAD=0.
 
         Args:
-            audio_data: Audio data as numpy array
-            start: Start time in seconds
-            end: End time in seconds
+            audio_path: Path to audio file
+            audio_data: In-memory audio for audio_path, or None
 
         Returns:
-            Tuple of (temp_file_path, chunk_duration)
+            List of (start, end) speech regions, or None if VAD is disabled/unavailable
         """
-        import soundfile as sf
+        if audio_path in self._speech_regions:
+            return self._speech_regions[audio_path]
+        if audio_data is None or not vad.vad_enabled():
+            return None
 
-        start_sample = int(start * self._audio_sample_rate)
-        end_sample = int(end * self._audio_sample_rate)
-        chunk_data = audio_data[start_sample:end_sample]
+        sample_rate = self.audio_processor.sample_rate
+        regions = vad.detect_speech_regions(audio_data, sample_rate=sample_rate)
+        total_duration = len(audio_data) / sample_rate
+        stats = vad.speech_stats(regions, total_duration)
+        if not regions:
+            # Nothing looked like speech (e.g. very quiet recording) - don't skip anything
+            logger.info("VAD found no speech regions; processing the whole file")
+            regions = [(0.0, total_duration)]
 
-        # Write to temp file for Whisper
-        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_audio:
-            temp_path = temp_audio.name
+        logger.info(
+            f"VAD: {stats['region_count']} speech regions, skipping {stats['skipped_seconds']:.1f}s "
+            f"of {total_duration:.1f}s ({stats['skipped_ratio'] * 100:.0f}%)"
+        )
+        self.diagnostics_logger.store_diagnostic_data('vad', stats)
+        self._speech_regions = {audio_path: regions}
+        return regions
+
+    def _extract_audio_chunk_from_memory(self, audio_data: np.ndarray, start: float, end: float) -> Tuple[np.ndarray, float]:
+        """Extract audio chunk from in-memory data (delegated to AudioProcessor).
 
-        sf.write(temp_path, chunk_data, self._audio_sample_rate)
-        duration = len(chunk_data) / self._audio_sample_rate
+        OPTIMIZATION: Returns a view into the in-memory array - no copy, no temp file.
 
-        return temp_path, duration
+        Args:
+            audio_data: Audio data as numpy array
+            start: Start time in seconds
+            end: End time in seconds
+
+        Returns:
+            Tuple of (chunk view, chunk_duration)
+        """
+        return self.audio_processor.extract_audio_chunk_from_memory(audio_data, start, end)
 
     def _process_chunk_sequential(
         self,
@@ -1665,7 +1838,9 @@ class EnhancedTranscriber(Transcriber):
         chunk_size: float = 3.0,
         detection_model: str = 'base',
         transcription_model: str = 'medium',
-        progress_callback=None
+        progress_callback=None,
+        pass2_workers: Optional[int] = None,
+        pass2_mode: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """Two-pass comprehensive audio segmentation with PIPELINED execution for maximum speed.
 
@@ -1677,7 +1852,8 @@ class EnhancedTranscriber(Transcriber):
         - Pass 1 and Pass 2 run CONCURRENTLY using separate model instances
         - As soon as Pass 1 completes a merged segment, Pass 2 starts transcribing it
         - Both passes overlap, dramatically reducing total time
-        - Thread-safe because each pass uses its own dedicated model instance
+        - Pass 2 runs on a SegmentWorkerPool (several workers on multi-core CPUs), each
+          with its own model instance; results are reassembled in timestamp order
 
         WHY BASE MODEL (not tiny):
         - Tiny model is fast BUT drops words and misses short language switches
@@ -1699,134 +1875,88 @@ class EnhancedTranscriber(Transcriber):
             detection_model: Fast model for language detection (default: 'base')
             transcription_model: Accurate model for transcription (default: 'medium')
             progress_callback: Optional progress callback
+            pass2_workers: Number of Pass 2 workers (None = FONIXFLOW_PASS2_WORKERS or
+                           auto-sized to the CPU/memory budget; 1 on GPU)
+            pass2_mode: 'thread' or 'process' (None = FONIXFLOW_PASS2_MODE or 'thread')
 
         Returns:
             List of language segments with accurate transcription
         """
-        import subprocess
         import time
 
         logger.info(f"Starting PIPELINED TWO-PASS audio segmentation (detection={detection_model}, transcription={transcription_model})")
         overall_start = time.time()
 
-        # Create a queue to pass segments from Pass 1 to Pass 2
-        segment_queue = queue.Queue(maxsize=10)  # Buffer up to 10 segments
-        final_segments = []
-        pass2_error = None  # To capture errors from Pass 2 thread
-
         # Create transcription model (Pass 2)
         # The base Transcriber class now handles global caching of the heavy model object,
         # so we can safely instantiate a new Transcriber here without performance penalty.
         transcription_engine = Transcriber(model_size=transcription_model)
 
-        # CRITICAL: Preload the transcription model BEFORE starting Pass 2 thread
+        # CRITICAL: Preload the transcription model BEFORE starting Pass 2 workers
         # This prevents ~20 second delay when Pass 2 receives its first segment
-        logger.info(f"Preloading {transcription_model} model before starting Pass 2 thread...")
+        logger.info(f"Preloading {transcription_model} model before starting Pass 2 workers...")
         transcription_engine.load_model()
         logger.info(f"✓ {transcription_model} model preloaded and ready for Pass 2 (using device: {transcription_engine.device})")
 
-        # PASS 2: Transcription worker (runs in background thread)
-        # =========================================================
-        def transcription_worker():
-            """Worker thread for Pass 2: transcribe segments as they arrive from Pass 1."""
-            nonlocal pass2_error
-            pass2_start = time.time()
-            transcribed_count = 0
-
-            try:
-                logger.info(f"PASS 2 worker started: Ready to transcribe segments using {transcription_model} model")
-
-                while True:
-                    if self.cancel_requested:
-                        logger.info("PASS 2: Cancellation requested, exiting transcription loop.")
-                        break
-                    # Get next segment from queue (blocks until available)
-                    segment = segment_queue.get()
-
-                    # Check for sentinel value (Pass 1 is done)
-                    if segment is None:
-                        logger.info("PASS 2 received completion signal from Pass 1")
-                        break
-
-                    try:
-                        start_time = segment['start']
-                        end_time = segment['end']
-                        language = segment['language']
-                        duration = end_time - start_time
-
-                        if duration < 0.1:
-                            continue
-
-                        # Extract audio segment
-                        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_audio:
-                            temp_path = temp_audio.name
-
-                        try:
-                            # Extract with ffmpeg
-                            subprocess.run([
-                                self.ffmpeg_bin, '-y', '-i', audio_path,
-                                '-ss', str(start_time),
-                                '-t', str(duration),
-                                '-ar', '16000', '-ac', '1',
-                                temp_path
-                            ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True, timeout=30)
-
-                            # Transcribe with ACCURATE model and SPECIFIED language
-                            if transcription_engine == self:
-                                segment_result = self.transcribe(
-                                    temp_path,
-                                    language=language,
-                                    progress_callback=None
-                                )
-                            else:
-                                segment_result = transcription_engine.transcribe(
-                                    temp_path,
-                                    language=language,
-                                    progress_callback=None
-                                )
-
-                            transcribed_text = segment_result.get('text', '').strip()
-
-                            # CORRECT: Use text heuristics to fix language label if model was wrong (Pass 2)
-                            # This was missing! It blindly trusted Pass 1 language.
-                            detected_lang = self._correct_language_from_text(
-                                transcribed_text, language, allowed_languages
-                            )
-
-                            if transcribed_text:
-                                final_segments.append({
-                                    'language': detected_lang,  # Use corrected language
-                                    'start': start_time,
-                                    'end': end_time,
-                                    'text': transcribed_text
-                                })
-                                transcribed_count += 1
-                                logger.debug(f"PASS 2: Transcribed segment {transcribed_count}: {language} [{start_time:.1f}-{end_time:.1f}s]")
-
-                        finally:
-                            if os.path.exists(temp_path):
-                                try:
-                                    os.unlink(temp_path)
-                                except Exception:
-                                    pass
-
-                    except Exception as e:
-                        logger.error(f"PASS 2 failed to transcribe segment [{start_time:.1f}-{end_time:.1f}s]: {e}", exc_info=True)
-                    finally:
-                        segment_queue.task_done()
+        # Load audio into memory once, before Pass 2 starts, so both passes slice
+        # zero-copy views out of the same array instead of spawning ffmpeg per chunk
+        audio_data, _ = self._load_audio_to_memory(audio_path)
+        use_memory = audio_data is not None
 
-                pass2_elapsed = time.time() - pass2_start
-                logger.info(f"PASS 2 complete: Transcribed {transcribed_count} segments in {pass2_elapsed:.1f}s")
+        # PASS 2: Transcription workers (run in background, results reassembled in order)
+        # ===============================================================================
+        def transcribe_segment(engine, segment):
+            """Transcribe one segment with the ACCURATE model and SPECIFIED language."""
+            # (in-memory view when available, ffmpeg extraction otherwise)
+            return self._transcribe_audio_window(
+                engine, audio_path, audio_data, segment['start'], segment['end'],
+                language=segment['language']
+            )
 
-            except Exception as e:
-                pass2_error = e
-                logger.error(f"PASS 2 worker crashed: {e}", exc_info=True)
+        def finish_segment(segment, segment_result):
+            """Build the final segment dict from a Whisper result (None = drop it)."""
+            transcribed_text = segment_result.get('text', '').strip()
+            if not transcribed_text:
+                return None
 
-        # Start Pass 2 worker thread
-        pass2_thread = threading.Thread(target=transcription_worker, name="Pass2-Transcription")
-        pass2_thread.daemon = True
-        pass2_thread.start()
-        logger.info("PASS 2 worker thread started (running in parallel with Pass 1)")
+            # CORRECT: Use text heuristics to fix language label if model was wrong (Pass 2)
+            detected_lang = self._correct_language_from_text(
+                transcribed_text, segment['language'], allowed_languages
+            )
+            logger.debug(f"PASS 2: Transcribed segment: {segment['language']} [{segment['start']:.1f}-{segment['end']:.1f}s]")
+            return {
+                'language': detected_lang,  # Use corrected language
+                'start': segment['start'],
+                'end': segment['end'],
+                'text': transcribed_text
+            }
+
+        pass2_pool = SegmentWorkerPool(
+            transcription_model,
+            transcribe_segment,
+            finish_segment,
+            num_workers=pass2_workers,
+            mode=pass2_mode,
+            audio_data=audio_data,
+            sample_rate=self.audio_processor.sample_rate,
+            queue_size=10,  # Buffer up to 10 segments
+            cancel_check=lambda: self.cancel_requested
+        )
+        pass2_pool.start()
+        pass2_start = time.time()
+
+        def send_to_pass2(segment):
+            """Queue a merged segment for Pass 2 (blocks if the queue is full - backpressure)."""
+            speech_regions = self._speech_regions.get(audio_path)
+            if speech_regions is not None:
+                # Trim leading/trailing non-speech; segments with no speech are skipped
+                window = vad.trim_to_speech(segment['start'], segment['end'], speech_regions)
+                if window is None:
+                    return
+                segment['start'], segment['end'] = window
+            if segment['end'] - segment['start'] < 0.1:
+                return
+            pass2_pool.submit(segment)
 
         # PASS 1: Fast language detection (runs in main thread)
         # ======================================================
@@ -1845,52 +1975,75 @@ class EnhancedTranscriber(Transcriber):
         detection_engine.load_model()
         logger.info(f"✓ {detection_model} model preloaded and ready for Pass 1 (using device: {detection_engine.device})")
 
-        # Try to load audio into memory for faster chunk extraction
-        audio_data, _ = self._load_audio_to_memory(audio_path)
-        use_memory = audio_data is not None
-
         if use_memory:
             logger.info("Using in-memory audio processing for fast chunk extraction")
         else:
             logger.info("Using ffmpeg-based chunk extraction")
 
-        # Generate all chunk specifications
-        chunks = []
-        current_time = 0.0
-        while current_time < total_duration:
-            chunk_start = current_time
-            chunk_end = min(current_time + chunk_size, total_duration)
-            if chunk_end - chunk_start >= 0.1:  # Skip very short chunks
-                chunks.append((chunk_start, chunk_end))
-            current_time += chunk_size
+        # Generate all chunk specifications (speech regions only when VAD is available)
+        speech_regions = self._get_speech_regions(audio_path, audio_data)
+        if speech_regions is not None:
+            chunks = vad.speech_chunks(speech_regions, chunk_size)
+        else:
+            chunks = []
+            current_time = 0.0
+            while current_time < total_duration:
+                chunk_start = current_time
+                chunk_end = min(current_time + chunk_size, total_duration)
+                if chunk_end - chunk_start >= 0.1:  # Skip very short chunks
+                    chunks.append((chunk_start, chunk_end))
+                current_time += chunk_size
 
         total_chunks = len(chunks)
         logger.info(f"Processing {total_chunks} chunks for language detection...")
 
+        # Batched language identification: one encoder + language-token forward pass
+        # per batch of chunks instead of a full decode per chunk (needs in-memory audio)
+        language_identifier = None
+        if use_memory:
+            try:
+                language_identifier = LanguageIdentifier(
+                    detection_engine,
+                    allowed_languages=allowed_languages,
+                    batch_size=self.LANGUAGE_ID_BATCH_SIZE
+                )
+                language_identifier.mel_store = self._get_mel_store(
+                    audio_path, language_identifier.model.dims.n_mels, audio_data
+                )
+                logger.info(
+                    f"PASS 1: Using batched language identification (batch_size={language_identifier.batch_size}, "
+                    f"mel store={'yes' if language_identifier.mel_store else 'no'})"
+                )
+            except Exception as e:
+                logger.warning(f"Batched language identification unavailable ({e}), decoding chunks individually")
+        batch_size = language_identifier.batch_size if language_identifier else 1
+
         # Process chunks and merge on-the-fly, sending completed segments to Pass 2
         detected_chunks = []
         processed_count = 0
+        last_progress_count = 0
         pass1_start = time.time()
         segments_sent = 0
 
         # Track current segment being built
         current_segment = None
 
-        for chunk_start, chunk_end in chunks:
+        for batch_start in range(0, total_chunks, batch_size):
             if self.cancel_requested:
                 logger.info("PASS 1: Cancellation requested, exiting chunk processing loop.")
                 break
+            batch = chunks[batch_start:batch_start + batch_size]
             try:
-                # Process this chunk with FAST model
-                if use_memory:
-                    result = self._process_chunk_from_memory_with_model(
-                        audio_data, chunk_start, chunk_end, allowed_languages, detection_engine
-                    )
-                else:
-                    result = self._process_chunk_sequential_with_model(
-                        audio_path, chunk_start, chunk_end, allowed_languages, detection_engine
-                    )
+                # Process this batch with FAST model
+                batch_results = self._detect_chunk_languages(
+                    batch, audio_path, audio_data, allowed_languages,
+                    detection_engine, language_identifier
+                )
+            except Exception as e:
+                logger.error(f"Failed to detect language in chunks [{batch[0][0]:.1f}-{batch[-1][1]:.1f}s]: {e}", exc_info=True)
+                batch_results = [None] * len(batch)
 
+            for result in batch_results:
                 if result:
                     detected_chunks.append(result)
 
@@ -1912,8 +2065,8 @@ class EnhancedTranscriber(Transcriber):
                         current_segment['text'] = ' '.join(current_segment['_texts'])
                         del current_segment['_texts']
 
-                        # Send to Pass 2 queue (blocks if queue is full - backpressure)
-                        segment_queue.put(current_segment)
+                        # Send to Pass 2 pool (blocks if queue is full - backpressure)
+                        send_to_pass2(current_segment)
                         segments_sent += 1
                         logger.debug(f"PASS 1: Sent segment {segments_sent} to Pass 2: {current_segment['language']} [{current_segment['start']:.1f}-{current_segment['end']:.1f}s]")
 
@@ -1927,49 +2080,60 @@ class EnhancedTranscriber(Transcriber):
 
                 processed_count += 1
 
-                # Progress update every 10 chunks
-                if progress_callback and processed_count % 10 == 0:
-                    elapsed = time.time() - pass1_start
-                    rate = processed_count / elapsed if elapsed > 0 else 0
-                    remaining = (total_chunks - processed_count) / rate if rate > 0 else 0
-                    progress_callback(
-                        f"Pass 1/2: Detecting {processed_count}/{total_chunks} chunks "
-                        f"({segments_sent} segments → Pass 2, ~{int(remaining)}s remaining)"
-                    )
-
-            except Exception as e:
-                logger.error(f"Failed to detect language in chunk [{chunk_start:.1f}-{chunk_end:.1f}s]: {e}", exc_info=True)
-                processed_count += 1
+            # Progress update every 10 chunks
+            if progress_callback and processed_count - last_progress_count >= 10:
+                last_progress_count = processed_count
+                elapsed = time.time() - pass1_start
+                rate = processed_count / elapsed if elapsed > 0 else 0
+                remaining = (total_chunks - processed_count) / rate if rate > 0 else 0
+                progress_callback(
+                    f"Pass 1/2: Detecting {processed_count}/{total_chunks} chunks "
+                    f"({segments_sent} segments → Pass 2, ~{int(remaining)}s remaining) | "
+                    f"Pass 2: {pass2_pool.completed_count}/{pass2_pool.submitted_count} done "
+                    f"[{pass2_pool.format_throughput()}]"
+                )
 
         # Finalize and send last segment
         if current_segment is not None:
             current_segment['text'] = ' '.join(current_segment['_texts'])
             del current_segment['_texts']
-            segment_queue.put(current_segment)
+            send_to_pass2(current_segment)
             segments_sent += 1
             logger.debug(f"PASS 1: Sent final segment {segments_sent} to Pass 2")
 
         pass1_elapsed = time.time() - pass1_start
         logger.info(f"PASS 1 complete: Detected {len(detected_chunks)} chunks in {pass1_elapsed:.1f}s, sent {segments_sent} segments to Pass 2")
 
-        # Send sentinel value to signal Pass 2 that we're done
-        segment_queue.put(None)
+        # Signal Pass 2 that we're done
+        pass2_pool.close()
         logger.info("PASS 1 sent completion signal to Pass 2")
 
-        # Wait for Pass 2 to finish processing all segments
-        if progress_callback:
-            progress_callback("Waiting for Pass 2 to complete transcription...")
-
-        logger.info("Waiting for Pass 2 worker to complete...")
-        pass2_thread.join()
+        # Wait for Pass 2 to finish processing all segments, reporting worker throughput
+        logger.info(f"Waiting for {pass2_pool.num_workers} Pass 2 worker(s) to complete...")
+        while not pass2_pool.wait(timeout=2.0):
+            if progress_callback:
+                progress_callback(
+                    f"Waiting for Pass 2 to complete transcription "
+                    f"({pass2_pool.completed_count}/{pass2_pool.submitted_count} segments, "
+                    f"{pass2_pool.num_workers} workers: {pass2_pool.format_throughput()})..."
+                )
+        # Results come back in submission (timestamp) order from the reorder buffer
+        final_segments = pass2_pool.join()
+
+        pass2_elapsed = time.time() - pass2_start
+        logger.info(f"PASS 2 complete: Transcribed {len(final_segments)} segments in {pass2_elapsed:.1f}s")
+        for worker_name, stats in sorted(pass2_pool.get_stats().items()):
+            busy = stats['busy_seconds']
+            logger.info(
+                f"PASS 2 {worker_name}: {int(stats['segments'])} segments, "
+                f"{stats['audio_seconds']:.1f}s audio in {busy:.1f}s "
+                f"({stats['audio_seconds'] / busy if busy > 0 else 0:.1f}x real-time)"
+            )
 
         # Check if Pass 2 had any errors
-        if pass2_error:
-            logger.error(f"Pass 2 encountered an error: {pass2_error}")
-            raise pass2_error
-
-        # Sort final segments by start time (should already be in order, but just to be safe)
-        final_segments.sort(key=lambda s: s['start'])
+        if pass2_pool.error:
+            logger.error(f"Pass 2 encountered an error: {pass2_pool.error}")
+            raise pass2_pool.error
 
         total_elapsed = time.time() - overall_start
         logger.info(
@@ -1979,6 +2143,90 @@ class EnhancedTranscriber(Transcriber):
 
         return final_segments
 
+    def _detect_chunk_languages(
+        self,
+        chunk_specs: List[Tuple[float, float]],
+        audio_path: str,
+        audio_data: Optional[np.ndarray],
+        allowed_languages: Optional[List[str]],
+        detection_engine: Transcriber,
+        language_identifier: Optional[LanguageIdentifier] = None
+    ) -> List[Optional[Dict[str, Any]]]:
+        """Detect the language of a batch of Pass 1 chunks.
+
+        With a LanguageIdentifier, all chunks go through a single batched encoder pass and
+        the language comes from the (allowed-language masked) language-token logits. Text is
+        only decoded for chunks whose top probability is below
+        LANGUAGE_ID_TEXT_CHECK_THRESHOLD, so _correct_language_from_text() can fix the label.
+        Without one, each chunk is fully transcribed as before.
+
+        Args:
+            chunk_specs: List of (start, end) times in seconds
+            audio_path: Path to audio file
+            audio_data: In-memory audio for audio_path, or None
+            allowed_languages: List of allowed language codes
+            detection_engine: Transcriber instance for the detection model
+            language_identifier: Optional batched identifier built on detection_engine
+
+        Returns:
+            List of segment dicts (or None for failed/filtered chunks), in input order
+        """
+        if language_identifier is None or audio_data is None:
+            if audio_data is not None:
+                return [
+                    self._process_chunk_from_memory_with_model(
+                        audio_data, chunk_start, chunk_end, allowed_languages, detection_engine
+                    )
+                    for chunk_start, chunk_end in chunk_specs
+                ]
+            return [
+                self._process_chunk_sequential_with_model(
+                    audio_path, chunk_start, chunk_end, allowed_languages, detection_engine
+                )
+                for chunk_start, chunk_end in chunk_specs
+            ]
+
+        if language_identifier.mel_store is not None:
+            # Slice the precomputed whole-file spectrogram (no per-chunk mel)
+            predictions = language_identifier.identify_windows(chunk_specs)
+        else:
+            predictions = language_identifier.identify([
+                self._extract_audio_chunk_from_memory(audio_data, chunk_start, chunk_end)[0]
+                for chunk_start, chunk_end in chunk_specs
+            ])
+
+        results = []
+        for (chunk_start, chunk_end), (detected_lang, probability) in zip(chunk_specs, predictions):
+            transcribed_text = ''
+            if probability < self.LANGUAGE_ID_TEXT_CHECK_THRESHOLD:
+                # Low confidence (typical for very short chunks): decode the text so the
+                # stopword/diacritic heuristic can correct the label
+                try:
+                    chunk_data, _ = self._extract_audio_chunk_from_memory(audio_data, chunk_start, chunk_end)
+                    chunk_result = detection_engine.transcribe(
+                        chunk_data,
+                        language=None,
+                        progress_callback=None
+                    )
+                    transcribed_text = chunk_result.get('text', '').strip()
+                    detected_lang = self._correct_language_from_text(
+                        transcribed_text, detected_lang, allowed_languages
+                    )
+                except Exception as e:
+                    logger.debug(f"Text check failed for chunk [{chunk_start:.1f}-{chunk_end:.1f}s]: {e}")
+
+            if (not allowed_languages or detected_lang in allowed_languages):
+                results.append({
+                    'language': detected_lang,
+                    'start': chunk_start,
+                    'end': chunk_end,
+                    'text': transcribed_text
+                })
+            else:
+                results.append(None)
+
+        return results
+
     def _process_chunk_from_memory(
         self,
         audio_data: np.ndarray,
@@ -2012,51 +2260,38 @@ class EnhancedTranscriber(Transcriber):
             Segment dict or None if failed
         """
         try:
-            import soundfile as sf
-        except ImportError:
-            logger.warning("soundfile not available, cannot use in-memory processing")
-            return None
-
-        try:
-            # Extract chunk from memory
-            temp_path, chunk_duration = self._extract_audio_chunk_from_memory(
+            # Slice chunk from memory (zero-copy view, fed straight to Whisper)
+            chunk_data, chunk_duration = self._extract_audio_chunk_from_memory(
                 audio_data, chunk_start, chunk_end
             )
 
             if chunk_duration < 0.1:
                 return None
 
-            try:
-                # Transcribe this chunk (no lock needed - sequential processing)
-                chunk_result = model_instance.transcribe(
-                    temp_path,
-                    language=None,
-                    progress_callback=None
-                )
+            # Transcribe this chunk (no lock needed - sequential processing)
+            chunk_result = model_instance.transcribe(
+                chunk_data,
+                language=None,
+                progress_callback=None
+            )
 
-                detected_lang = chunk_result.get('language', 'unknown')
-                transcribed_text = chunk_result.get('text', '').strip()
+            detected_lang = chunk_result.get('language', 'unknown')
+            transcribed_text = chunk_result.get('text', '').strip()
 
-                # CORRECT: Use text heuristics to fix language label if model was wrong
-                # This is critical for short chunks (1.0s) where audio detection fails
-                detected_lang = self._correct_language_from_text(
-                    transcribed_text, detected_lang, allowed_languages
-                )
+            # CORRECT: Use text heuristics to fix language label if model was wrong
+            # This is critical for short chunks (1.0s) where audio detection fails
+            detected_lang = self._correct_language_from_text(
+                transcribed_text, detected_lang, allowed_languages
+            )
 
-                # Only include if language is in allowed list (even if text is empty, Pass 2 might find it)
-                if (not allowed_languages or detected_lang in allowed_languages):
-                    return {
-                        'language': detected_lang,
-                        'start': chunk_start,
-                        'end': chunk_end,
-                        'text': transcribed_text
-                    }
-            finally:
-                if os.path.exists(temp_path):
-                    try:
-                        os.unlink(temp_path)
-                    except Exception:
-                        pass
+            # Only include if language is in allowed list (even if text is empty, Pass 2 might find it)
+            if (not allowed_languages or detected_lang in allowed_languages):
+                return {
+                    'language': detected_lang,
+                    'start': chunk_start,
+                    'end': chunk_end,
+                    'text': transcribed_text
+                }
         except Exception as e:
             logger.warning(f"Failed to process chunk from memory [{chunk_start:.1f}-{chunk_end:.1f}s]: {e}", exc_info=True)
 
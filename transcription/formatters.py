@@ -47,6 +47,19 @@ def format_vtt_timestamp(seconds: float) -> str:
     return f"{hours:02d}:{minutes:02d}:{secs:02d}.{millis:03d}"
 
 
+def format_srt_timestamp(seconds: float) -> str:
+    """
+    Format seconds as SRT timestamp (HH:MM:SS,mmm).
+
+    Args:
+        seconds: Time in seconds
+
+    Returns:
+        Formatted SRT timestamp
+    """
+    return format_vtt_timestamp(seconds).replace('.', ',')
+
+
 def create_language_timeline(language_segments: List[Dict[str, Any]]) -> str:
     """
     Create a human-readable language timeline.
@@ -94,6 +107,29 @@ def format_as_vtt(transcription_result: Dict[str, Any]) -> str:
     return "\n".join(vtt_content)
 
 
+def format_as_srt(transcription_result: Dict[str, Any]) -> str:
+    """
+    Format transcription result as SRT subtitle file.
+
+    Args:
+        transcription_result: Result dictionary from transcribe()
+
+    Returns:
+        SRT formatted subtitle content
+    """
+    segments = transcription_result.get('segments', [])
+    srt_content = []
+
+    for i, segment in enumerate(segments, start=1):
+        start_time = format_srt_timestamp(segment['start'])
+        end_time = format_srt_timestamp(segment['end'])
+        text = segment['text'].strip()
+
+        srt_content.append(f"{i}\n{start_time} --> {end_time}\n{text}\n")
+
+    return "\n".join(srt_content)
+
+
 def format_multilang_report(result: Dict[str, Any]) -> str:
     """
     Format a detailed multi-language transcription report.
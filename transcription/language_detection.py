@@ -10,6 +10,7 @@ import tempfile
 import os
 import subprocess
 from typing import Dict, List, Optional, Any
+import numpy as np
 from app.transcriber import Transcriber
 from tools.resource_locator import get_ffmpeg_path
 
@@ -126,7 +127,8 @@ def detect_language_from_transcript(
     chunk_size: float = 2.0,
     audio_path: Optional[str] = None,
     allowed_languages: Optional[List[str]] = None,
-    audio_fallback_model: Optional[Any] = None
+    audio_fallback_model: Optional[Any] = None,
+    audio_data: Optional[np.ndarray] = None
 ) -> List[Dict[str, Any]]:
     """
     Heuristic segmentation using existing segment text (no extra audio passes).
@@ -139,6 +141,8 @@ def detect_language_from_transcript(
         audio_path: Optional path to audio file for fallback detection
         allowed_languages: Optional list of allowed language codes
         audio_fallback_model: Optional cached model for audio fallback
+        audio_data: Optional in-memory 16kHz audio for audio_path (fallback windows
+                    are sliced from it instead of extracted with ffmpeg)
 
     Returns:
         List of language segments with detected languages
@@ -229,7 +233,8 @@ def detect_language_from_transcript(
                 detected = classify_language_window_audio(
                     audio_path, ws, we,
                     allowed_languages if allowed_languages else list(LANGUAGE_NAMES.keys()),
-                    audio_fallback_model
+                    audio_fallback_model,
+                    audio_data=audio_data
                 )
                 if detected:
                     logger.debug(f"Window [{ws:.1f}-{we:.1f}s] audio fallback detected: {detected} (heuristic was: {best_lang})")
@@ -271,7 +276,9 @@ def classify_language_window_audio(
     end: float,
     allowed_languages: Optional[List[str]] = None,
     model_instance: Optional[Any] = None,
-    model_name: str = 'tiny'
+    model_name: str = 'tiny',
+    audio_data: Optional[np.ndarray] = None,
+    sample_rate: int = 16000
 ) -> Optional[str]:
     """
     Classify a window's language via a quick audio-based check.
@@ -283,29 +290,39 @@ def classify_language_window_audio(
         allowed_languages: Optional list of allowed language codes
         model_instance: Optional cached model instance
         model_name: Model size to use if no instance provided
+        audio_data: Optional in-memory audio for audio_path. When given, the window
+                    is passed to Whisper as a view (no temp file, no ffmpeg)
+        sample_rate: Sample rate of audio_data
 
     Returns:
         Language code or None if detection fails
     """
-    duration = max(0.1, end - start)
-    with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_audio:
-        temp_path = temp_audio.name
-
+    temp_path = None
     try:
-        ffmpeg_path = get_ffmpeg_path()
-        ffmpeg_cmd = [
-            ffmpeg_path, '-y', '-i', audio_path,
-            '-ss', str(start),
-            '-t', str(duration),
-            '-ar', '16000', '-ac', '1', temp_path
-        ]
-        subprocess.run(ffmpeg_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        if audio_data is not None:
+            start_sample = max(0, int(start * sample_rate))
+            end_sample = max(start_sample, int(end * sample_rate))
+            audio_input = audio_data[start_sample:end_sample]
+        else:
+            duration = max(0.1, end - start)
+            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_audio:
+                temp_path = temp_audio.name
+
+            ffmpeg_path = get_ffmpeg_path()
+            ffmpeg_cmd = [
+                ffmpeg_path, '-y', '-i', audio_path,
+                '-ss', str(start),
+                '-t', str(duration),
+                '-ar', '16000', '-ac', '1', temp_path
+            ]
+            subprocess.run(ffmpeg_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+            audio_input = temp_path
 
         if model_instance:
-            r = model_instance.transcribe(temp_path, language=None, word_timestamps=False)
+            r = model_instance.transcribe(audio_input, language=None, word_timestamps=False)
         else:
             transcriber = Transcriber(model_size=model_name)
-            r = transcriber.transcribe(temp_path, language=None, word_timestamps=False)
+            r = transcriber.transcribe(audio_input, language=None, word_timestamps=False)
 
         lang = r.get('language', 'unknown')
         if allowed_languages:
@@ -317,7 +334,7 @@ def classify_language_window_audio(
         return None
     finally:
         try:
-            if os.path.exists(temp_path):
+            if temp_path and os.path.exists(temp_path):
                 os.unlink(temp_path)
         except Exception:
             pass
@@ -0,0 +1,235 @@
+"""
+Live (rolling-window) transcription while a recording is in progress.
+
+Audio arrives in small blocks from the recorder. Once enough has accumulated,
+the uncommitted audio (10-30s) is decoded as one window; it is decoded again
+every few seconds as it grows, so consecutive windows overlap. A segment is
+committed once two consecutive decodes agree on it and it ends clear of the
+window's edge, where words may still be cut off. Committed audio is dropped
+from the window and the text so far becomes the prompt for the next one;
+everything after the last committed segment is the tail, which is revised by
+every decode. When the recording stops only that tail is left to transcribe.
+If decoding can't keep up with the recording, the uncommitted audio is capped
+and live transcription stops with LiveBacklogError rather than buffering
+without limit.
+"""
+
+import re
+import logging
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+
+
+class LiveBacklogError(RuntimeError):
+    """Decoding fell too far behind the recording (see LiveTranscriber.MAX_BACKLOG_SECONDS)."""
+
+
+def _normalize_text(text: str) -> str:
+    """Lowercase words only, so punctuation or casing changes still count as agreement."""
+    return ' '.join(re.findall(r"\w+", text.lower()))
+
+
+class LiveTranscriber:
+    """Transcribes a growing audio stream in overlapping windows, committing stable segments."""
+
+    # Audio buffered before the first decode of a window
+    MIN_WINDOW_SECONDS = 10.0
+    # Longest window decoded; a full window commits its stable part unconditionally
+    MAX_WINDOW_SECONDS = 30.0
+    # New audio required before the window is decoded again
+    STEP_SECONDS = 5.0
+    # Segments ending this close to the window's end are never committed
+    HOLDBACK_SECONDS = 3.0
+    # Start times of matching segments in consecutive decodes may differ by this much
+    AGREEMENT_TOLERANCE_SECONDS = 1.0
+    # Committed text passed as the prompt for the next window
+    PROMPT_CHARS = 200
+    # Uncommitted audio allowed to pile up while decoding runs slower than real time
+    MAX_BACKLOG_SECONDS = 120.0
+
+    def __init__(self, transcriber, language: Optional[str] = None, sample_rate: int = SAMPLE_RATE):
+        """
+        Initialize the live transcriber.
+
+        Args:
+            transcriber: Object with Transcriber.transcribe()'s signature (e.g. app.transcriber.Transcriber)
+            language: Language code (None = detect on the first window and keep it)
+            sample_rate: Rate of the audio passed to add_audio()
+        """
+        self.transcriber = transcriber
+        self.language = language
+        self.sample_rate = sample_rate
+
+        # The uncommitted window is _buffer[_start:_end]: blocks are appended into
+        # preallocated space and committed audio is dropped by moving _start
+        self._buffer = np.empty(int(2 * (self.MAX_WINDOW_SECONDS + self.STEP_SECONDS) * sample_rate),
+                                dtype=np.float32)
+        self._start = 0
+        self._end = 0
+        self._offset = 0.0  # Recording time of the window's first sample
+        self._decoded_frames = 0  # Window length at the last decode
+        self._hypothesis: List[Dict[str, Any]] = []  # Uncommitted segments of the last decode
+        self.committed: List[Dict[str, Any]] = []
+        self.windows_decoded = 0
+
+    @property
+    def _window(self) -> np.ndarray:
+        return self._buffer[self._start:self._end]
+
+    def add_audio(self, samples: np.ndarray):
+        """
+        Append mono float32 samples at sample_rate.
+
+        Raises:
+            LiveBacklogError: If more than MAX_BACKLOG_SECONDS of audio would be waiting
+        """
+        samples = np.asarray(samples, dtype=np.float32).reshape(-1)
+        count = len(samples)
+        if not count:
+            return
+        pending = self._end - self._start
+        if pending + count > self.MAX_BACKLOG_SECONDS * self.sample_rate:
+            raise LiveBacklogError(f"Decoding fell {pending / self.sample_rate:.0f}s "
+                                   f"behind the recording")
+        if self._end + count > len(self._buffer):
+            # Move the window to the front, doubling the buffer while it would be more
+            # than half full, so the copies stay proportional to the audio appended
+            size = len(self._buffer)
+            while pending + count > size // 2:
+                size *= 2
+            buffer = self._buffer if size == len(self._buffer) else np.empty(size, dtype=np.float32)
+            buffer[:pending] = self._buffer[self._start:self._end]
+            self._buffer, self._start, self._end = buffer, 0, pending
+        self._buffer[self._end:self._end + count] = samples
+        self._end += count
+
+    @property
+    def buffered_seconds(self) -> float:
+        """Uncommitted audio waiting in the window."""
+        return len(self._window) / self.sample_rate
+
+    @property
+    def tail_text(self) -> str:
+        """Latest (still revisable) text after the committed segments."""
+        return ' '.join(seg['text'] for seg in self._hypothesis)
+
+    def ready(self) -> bool:
+        """True if enough new audio has arrived to decode the window again."""
+        frames = len(self._window)
+        return (frames >= self.MIN_WINDOW_SECONDS * self.sample_rate and
+                frames - self._decoded_frames >= self.STEP_SECONDS * self.sample_rate)
+
+    def process(self) -> List[Dict[str, Any]]:
+        """
+        Decode the current window if ready() and commit what has become stable.
+
+        Returns:
+            Newly committed segments (recording-relative times); the revised tail
+            is available as tail_text
+        """
+        if not self.ready():
+            return []
+
+        max_frames = int(self.MAX_WINDOW_SECONDS * self.sample_rate)
+        window = self._window[:max_frames]
+        full = len(self._window) >= max_frames
+        window_seconds = len(window) / self.sample_rate
+        segments = self._decode(window)
+        self._decoded_frames = len(window)
+
+        stable_end = window_seconds - self.HOLDBACK_SECONDS
+        commit_count = 0
+        for i, seg in enumerate(segments):
+            if seg['end'] > stable_end:
+                break
+            previous = self._hypothesis[i] if i < len(self._hypothesis) else None
+            agreed = (previous is not None and
+                      _normalize_text(previous['text']) == _normalize_text(seg['text']) and
+                      abs(previous['start'] - seg['start']) <= self.AGREEMENT_TOLERANCE_SECONDS)
+            if not (agreed or full):
+                break
+            commit_count = i + 1
+
+        if full and commit_count == 0:
+            # One segment spans the whole window; commit all but the tail to keep moving
+            commit_count = max(len(segments) - 1, 1) if segments else 0
+
+        if commit_count:
+            cut = segments[commit_count - 1]['end']
+        elif not segments and len(window) >= self.MIN_WINDOW_SECONDS * self.sample_rate:
+            # Nothing but silence so far; drop it (except the holdback) so the window stays short
+            cut = max(stable_end, 0.0)
+        else:
+            cut = 0.0
+
+        committed = self._commit(segments[:commit_count])
+        self._hypothesis = [
+            {'start': seg['start'] - cut, 'end': seg['end'] - cut, 'text': seg['text']}
+            for seg in segments[commit_count:]
+        ]
+        self._advance(cut)
+        return committed
+
+    def finish(self) -> Dict[str, Any]:
+        """
+        Transcribe whatever remains after the last committed segment.
+
+        Returns:
+            Whisper-style result dict ('text', 'segments', 'language') for the whole stream
+        """
+        if len(self._window):
+            segments = self._decode(self._window)
+            self._commit(segments)
+            self._advance(len(self._window) / self.sample_rate)
+        self._hypothesis = []
+        logger.info(f"Live transcription finished: {len(self.committed)} segments "
+                    f"from {self.windows_decoded} windows")
+        return {
+            'text': ' '.join(seg['text'] for seg in self.committed).strip(),
+            'segments': list(self.committed),
+            'language': self.language or 'unknown'
+        }
+
+    def _decode(self, audio: np.ndarray) -> List[Dict[str, Any]]:
+        """Transcribe one window; segment times are relative to the window start."""
+        prompt = ' '.join(seg['text'] for seg in self.committed)[-self.PROMPT_CHARS:].strip() or None
+        result = self.transcriber.transcribe(audio, language=self.language, initial_prompt=prompt)
+        self.windows_decoded += 1
+        if self.language is None and result.get('language'):
+            self.language = result['language']
+            logger.info(f"Live transcription language: {self.language}")
+        window_seconds = len(audio) / self.sample_rate
+        segments = []
+        for seg in result.get('segments', []):
+            text = seg.get('text', '').strip()
+            if text:
+                start = min(float(seg.get('start', 0.0)), window_seconds)
+                end = min(max(float(seg.get('end', start)), start), window_seconds)
+                segments.append({'start': start, 'end': end, 'text': text})
+        return segments
+
+    def _commit(self, segments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        committed = []
+        for seg in segments:
+            committed.append({
+                'id': len(self.committed),
+                'start': self._offset + seg['start'],
+                'end': self._offset + seg['end'],
+                'text': seg['text']
+            })
+            self.committed.append(committed[-1])
+        return committed
+
+    def _advance(self, seconds: float):
+        """Drop the first seconds of the window."""
+        frames = min(int(round(seconds * self.sample_rate)), len(self._window))
+        if frames <= 0:
+            return
+        self._start += frames
+        self._offset += frames / self.sample_rate
+        self._decoded_frames = max(self._decoded_frames - frames, 0)
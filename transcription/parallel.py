@@ -0,0 +1,345 @@
+"""
+Parallel (sharded) transcription for long files on many-core CPUs.
+
+PyTorch's intra-op parallelism saturates at a handful of threads for the
+base/small models, so a single Whisper decode leaves most cores of a large CPU
+idle. ParallelTranscriber splits the audio at silence boundaries into shards,
+transcribes each shard in its own process (each holding its own model and a
+pinned torch thread count), then stitches the segments back into the standard
+Whisper result dict.
+
+The GUI uses it for single-language files when the
+enable_parallel_transcription setting is on (off by default: every worker
+holds its own copy of the model).
+"""
+
+import os
+import re
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import torch
+
+from app.transcriber import Transcriber, get_available_memory_mb
+from transcription.processors import AudioProcessor
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+# Shard boundaries are moved to the quietest frame within this distance of the even split
+BOUNDARY_SEARCH_SECONDS = 10.0
+# Audio shared between neighbouring shards so words at a cut are heard in full
+OVERLAP_SECONDS = 1.0
+# Frame length for the boundary energy analysis
+ENERGY_FRAME_SECONDS = 0.03
+
+# Transcriber owned by a shard worker process (set up by _init_shard_worker)
+_SHARD_ENGINE = None
+
+
+def _init_shard_worker(model_size: str, num_threads: int):
+    """Load a private model in a worker process and pin its intra-op thread count."""
+    global _SHARD_ENGINE
+    torch.set_num_threads(num_threads)
+    os.environ['FONIXFLOW_DEVICE'] = 'cpu'
+    _SHARD_ENGINE = Transcriber(model_size=model_size)
+    _SHARD_ENGINE.load_model()
+
+
+def _detect_shard_language(audio: np.ndarray) -> str:
+    """Detect the spoken language of a (<= 30s) audio excerpt in a worker process."""
+    import whisper
+
+    model = _SHARD_ENGINE.model
+    mel = whisper.log_mel_spectrogram(whisper.pad_or_trim(audio), n_mels=model.dims.n_mels).to(model.device)
+    _, probs = model.detect_language(mel)
+    return max(probs, key=probs.get)
+
+
+def _transcribe_shard(audio: np.ndarray, transcribe_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Transcribe one shard in a worker process (timestamps relative to the shard)."""
+    result = _SHARD_ENGINE.transcribe(audio, **transcribe_kwargs)
+    return {
+        'text': result.get('text', ''),
+        'segments': result.get('segments', []),
+        'language': result.get('language')
+    }
+
+
+def find_shard_boundaries(audio: np.ndarray, num_shards: int,
+                          sample_rate: int = SAMPLE_RATE) -> List[Tuple[float, float]]:
+    """
+    Split audio into num_shards ranges, cutting at the quietest point near each even split.
+
+    Args:
+        audio: 1-D float32 mono audio
+        num_shards: Number of shards
+        sample_rate: Sample rate of audio
+
+    Returns:
+        List of (start, end) times in seconds covering the whole file without gaps
+    """
+    duration = len(audio) / sample_rate
+    if num_shards <= 1:
+        return [(0.0, duration)]
+
+    # Frame RMS energy (vectorized over non-overlapping frames)
+    frame_len = max(1, int(ENERGY_FRAME_SECONDS * sample_rate))
+    n_frames = len(audio) // frame_len
+    frames = audio[:n_frames * frame_len].reshape(n_frames, frame_len)
+    energy = np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1))
+
+    search = int(BOUNDARY_SEARCH_SECONDS / ENERGY_FRAME_SECONDS)
+    cuts = [0.0]
+    for k in range(1, num_shards):
+        target = int(n_frames * k / num_shards)
+        lo = max(target - search, 1)
+        hi = min(target + search, n_frames - 1)
+        best = lo + int(np.argmin(energy[lo:hi])) if hi > lo else target
+        cut = best * frame_len / sample_rate + ENERGY_FRAME_SECONDS / 2
+        if cut > cuts[-1]:
+            cuts.append(cut)
+    cuts.append(duration)
+
+    return list(zip(cuts[:-1], cuts[1:]))
+
+
+def stitch_shards(shards, shard_results, language) -> Dict[str, Any]:
+    """
+    Merge shard results into one Whisper-style result dict.
+
+    Each shard owns the time range between its cuts; a segment from the overlap
+    region is kept only by the shard whose range contains its midpoint. Adjacent
+    segments repeating the same text across a cut are dropped as duplicates.
+
+    Args:
+        shards: (start, end) time range each shard owns (see find_shard_boundaries())
+        shard_results: (offset, result) per shard - offset is the start of the audio the
+                       shard was transcribed from (its range plus overlap), result
+                       has segment times relative to it
+        language: Language reported for the whole result
+
+    Returns:
+        dict: Whisper-style result with 'text', 'segments' and 'language'
+    """
+    segments = []
+    for (own_start, own_end), (offset, result) in zip(shards, shard_results):
+        is_last = own_end == shards[-1][1]
+        for seg in result['segments']:
+            seg = dict(seg)
+            seg['start'] += offset
+            seg['end'] += offset
+            if 'seek' in seg:
+                seg['seek'] += int(offset * 100)  # mel frames (10ms hop)
+            if seg.get('words'):
+                seg['words'] = [
+                    dict(w, start=w['start'] + offset, end=w['end'] + offset) for w in seg['words']
+                ]
+
+            midpoint = (seg['start'] + seg['end']) / 2
+            if midpoint < own_start or (midpoint >= own_end and not is_last):
+                continue
+            if segments and _is_edge_duplicate(segments[-1], seg):
+                continue
+            segments.append(seg)
+
+    for i, seg in enumerate(segments):
+        seg['id'] = i
+
+    return {
+        'text': ''.join(seg['text'] for seg in segments),
+        'segments': segments,
+        'language': language
+    }
+
+
+def _is_edge_duplicate(previous: Dict[str, Any], current: Dict[str, Any]) -> bool:
+    """True if current repeats previous's text and overlaps it in time."""
+    def normalize(text):
+        return re.sub(r'[^\w]+', ' ', text.lower()).strip()
+
+    return current['start'] < previous['end'] and normalize(current['text']) == normalize(previous['text'])
+
+
+class ParallelTranscriber(Transcriber):
+    """Transcriber that shards one long file across a pool of CPU worker processes."""
+
+    # Shards shorter than this are not worth a model copy
+    MIN_SHARD_SECONDS = 60.0
+    # Fewer intra-op threads than this per worker makes each decode too slow
+    MIN_THREADS_PER_WORKER = 2
+
+    def __init__(self, model_size='base', num_shards=None, threads_per_worker=None, use_result_cache=False):
+        """
+        Initialize the parallel transcriber.
+
+        Args:
+            model_size: Whisper model size
+            num_shards: Number of shards/worker processes (None = sized to CPU and memory)
+            threads_per_worker: torch threads pinned per worker (None = cores / shards)
+            use_result_cache: Check/store results in the on-disk result cache
+        """
+        super().__init__(model_size=model_size, use_result_cache=use_result_cache)
+        self.num_shards = num_shards
+        self.threads_per_worker = threads_per_worker
+        self.audio_processor = AudioProcessor(sample_rate=self.SAMPLE_RATE)
+        self._executor = None
+        self._executor_key = None
+
+    def plan_shards(self, duration: float) -> Tuple[int, int]:
+        """
+        Decide how many shards to cut and how many torch threads each worker gets.
+
+        Args:
+            duration: Audio duration in seconds
+
+        Returns:
+            Tuple of (num_shards, threads_per_worker)
+        """
+        cpu_count = os.cpu_count() or 1
+        by_duration = max(1, int(duration // self.MIN_SHARD_SECONDS))
+
+        if self.num_shards:
+            shards = self.num_shards
+        else:
+            shards = max(1, cpu_count // self.MIN_THREADS_PER_WORKER)
+
+        base_name = self.model_size.replace('.en', '')
+        model_mb = self.MODEL_MEMORY_MB.get(base_name, 1000)
+        available_mb = get_available_memory_mb()
+        by_memory = shards if available_mb is None else max(1, int(available_mb * 0.8 // model_mb))
+
+        shards = max(1, min(shards, by_duration, by_memory))
+        threads = self.threads_per_worker or max(1, cpu_count // shards)
+
+        logger.info(
+            f"Parallel plan: {shards} shard(s) x {threads} threads "
+            f"(cpu={cpu_count}, duration={duration:.0f}s, memory_budget={by_memory})"
+        )
+        return shards, threads
+
+    def _transcribe_uncached(self, audio_path, language=None, initial_prompt=None, progress_callback=None, word_timestamps=False):
+        """
+        Transcribe audio, sharding long CPU workloads across worker processes.
+
+        Called by Transcriber.transcribe() after input validation and the result
+        cache lookup. Short files, non-CPU devices and environments without in-memory
+        loading fall back to single-process transcription.
+
+        Args:
+            audio_path: Path to the audio file, or a 1-D float32 numpy array at 16kHz
+            language: Language code. If None, detected once and applied to every shard.
+            initial_prompt: Optional initial prompt (applied to every shard)
+            progress_callback: Optional callback function for progress updates
+            word_timestamps: If True, include word-level timestamps in segments
+
+        Returns:
+            dict: Transcription result with keys: 'text', 'segments', 'language'
+        """
+        if self.device != 'cpu':
+            logger.info(f"Parallel sharding is CPU-only; using single-process transcription on {self.device}")
+            return super()._transcribe_uncached(audio_path, language, initial_prompt, progress_callback, word_timestamps)
+
+        if isinstance(audio_path, np.ndarray):
+            audio = self._prepare_audio_array(audio_path)
+        else:
+            if not os.path.exists(audio_path):
+                raise FileNotFoundError(f"Audio file not found: {audio_path}")
+            audio, _ = self.audio_processor.load_audio_to_memory(audio_path)
+            self.audio_processor.clear_cache()
+            if audio is None or len(audio) == 0:
+                return super()._transcribe_uncached(audio_path, language, initial_prompt, progress_callback, word_timestamps)
+
+        duration = len(audio) / self.SAMPLE_RATE
+        num_shards, threads = self.plan_shards(duration)
+        if num_shards <= 1:
+            return super()._transcribe_uncached(audio, language, initial_prompt, progress_callback, word_timestamps)
+
+        shards = find_shard_boundaries(audio, num_shards, self.SAMPLE_RATE)
+        executor = self._get_executor(len(shards), threads)
+        self._report(progress_callback, f"Transcribing {len(shards)} shards in parallel...", 5)
+
+        try:
+            if language is None:
+                # Detect once so every shard decodes in the same language, as a
+                # single pass over the file would
+                excerpt = audio[:30 * self.SAMPLE_RATE]
+                language = executor.submit(_detect_shard_language, excerpt).result()
+                logger.info(f"Detected language for all shards: {language}")
+
+            transcribe_kwargs = {
+                'language': language,
+                'initial_prompt': initial_prompt,
+                'word_timestamps': word_timestamps
+            }
+
+            futures = {}
+            for index, (start, end) in enumerate(shards):
+                padded_start = max(0.0, start - OVERLAP_SECONDS)
+                padded_end = min(duration, end + OVERLAP_SECONDS)
+                shard_audio = audio[int(padded_start * self.SAMPLE_RATE):int(padded_end * self.SAMPLE_RATE)]
+                future = executor.submit(_transcribe_shard, shard_audio, transcribe_kwargs)
+                futures[future] = (index, padded_start)
+
+            shard_results = [None] * len(shards)
+            for done, future in enumerate(as_completed(futures), start=1):
+                index, offset = futures[future]
+                shard_results[index] = (offset, future.result())
+                self._report(
+                    progress_callback,
+                    f"Transcribed shard {done}/{len(shards)}",
+                    5 + int(90 * done / len(shards))
+                )
+        except Exception as e:
+            logger.error(f"Parallel transcription failed: {e}")
+            self.shutdown()
+            raise RuntimeError(f"Transcription failed: {e}")
+
+        result = stitch_shards(shards, shard_results, language)
+        self._report(progress_callback, "Transcription completed", 95)
+        logger.info(f"Parallel transcription completed: {len(result['segments'])} segments from {len(shards)} shards")
+        return result
+
+    def _get_executor(self, num_workers: int, threads: int) -> ProcessPoolExecutor:
+        """Return the worker pool, (re)creating it if its shape changed."""
+        key = (self.model_size, num_workers, threads)
+        if self._executor is None or self._executor_key != key:
+            self.shutdown()
+            logger.info(f"Starting {num_workers} transcription worker processes ({threads} threads each)")
+            # spawn, not fork: the parent already runs torch/OpenMP threads, which a
+            # forked worker inherits as held locks and can deadlock on
+            self._executor = ProcessPoolExecutor(
+                max_workers=num_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_shard_worker,
+                initargs=(self.model_size, threads)
+            )
+            self._executor_key = key
+        return self._executor
+
+    def shutdown(self):
+        """Stop the worker processes (models are loaded again on the next call)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+            self._executor_key = None
+
+    @staticmethod
+    def _report(progress_callback, message, percent):
+        """Send a progress update to callbacks that may or may not accept a percent."""
+        if not progress_callback:
+            return
+        try:
+            progress_callback(message, percent)
+        except TypeError:
+            progress_callback(message)
+
+    def get_model_info(self):
+        """Get information about the current model and worker pool."""
+        info = super().get_model_info()
+        info['parallel_workers'] = self._executor_key[1] if self._executor_key else 0
+        info['threads_per_worker'] = self._executor_key[2] if self._executor_key else None
+        return info
@@ -6,5 +6,9 @@ Contains specialized processors for formatting, diagnostics, and audio processin
 from .format_converter import FormatConverter
 from .diagnostics_logger import DiagnosticsLogger
 from .audio_processor import AudioProcessor
+from .language_identifier import LanguageIdentifier
+from .segment_worker_pool import SegmentWorkerPool
+from .mel_store import MelFeatureStore, audio_fingerprint, array_fingerprint
 
-__all__ = ['FormatConverter', 'DiagnosticsLogger', 'AudioProcessor']
+__all__ = ['FormatConverter', 'DiagnosticsLogger', 'AudioProcessor', 'LanguageIdentifier', 'SegmentWorkerPool',
+           'MelFeatureStore', 'audio_fingerprint', 'array_fingerprint']
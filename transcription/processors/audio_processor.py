@@ -3,8 +3,8 @@ Audio Processor for enhanced transcription.
 Handles in-memory audio loading and chunk extraction for faster processing.
 """
 
+import os
 import logging
-import tempfile
 from typing import Tuple, Optional
 import numpy as np
 
@@ -25,51 +25,86 @@ class AudioProcessor:
         self._audio_cache = None
         self._audio_cache_path = None
 
-    def load_audio_to_memory(self, audio_path: str) -> Tuple[Optional[np.ndarray], float]:
+    def load_audio_to_memory(self, audio_path: str, audio_data: Optional[np.ndarray] = None) -> Tuple[Optional[np.ndarray], float]:
         """
         Load audio file into memory for faster chunk extraction.
 
         OPTIMIZATION: Loading audio once and slicing in memory is much faster than
-        extracting each chunk with ffmpeg (eliminates file I/O overhead).
+        extracting each chunk with ffmpeg (eliminates file I/O overhead). Callers that
+        already hold the decoded audio (AudioExtractor.extract_audio_array()) pass it
+        as audio_data and nothing is decoded; otherwise ffmpeg's float32 output is
+        piped straight into memory, with librosa as a fallback.
 
         Args:
-            audio_path: Path to audio file
+            audio_path: Path to audio file (also the cache key for audio_data)
+            audio_data: Already decoded 1-D float32 audio at self.sample_rate
 
         Returns:
-            Tuple of (audio_data as numpy array or None, total_duration in seconds)
+            Tuple of (audio_data as float32 numpy array or None, total_duration in seconds)
         """
+        if audio_data is None:
+            audio_data = self._decode_with_ffmpeg(audio_path)
+        if audio_data is None:
+            audio_data = self._decode_with_librosa(audio_path)
+        if audio_data is None:
+            return None, 0.0
+
+        audio_data = np.ascontiguousarray(audio_data, dtype=np.float32).reshape(-1)
+        total_duration = len(audio_data) / self.sample_rate
+        logger.debug(f"Audio loaded: {total_duration:.1f}s, {len(audio_data)} samples")
+
+        # Cache for reuse
+        self._audio_cache = audio_data
+        self._audio_cache_path = audio_path
+
+        return audio_data, total_duration
+
+    def _decode_with_ffmpeg(self, audio_path: str) -> Optional[np.ndarray]:
+        """Decode via an ffmpeg f32le pipe, or return None if ffmpeg is unavailable or fails."""
+        try:
+            from app.audio_extractor import decode_to_array
+            from tools.resource_locator import get_ffmpeg_path
+            ffmpeg_path = os.environ.get('FFMPEG_BINARY') or get_ffmpeg_path()
+        except (ImportError, RuntimeError) as e:
+            logger.debug(f"ffmpeg pipe decoding unavailable: {e}")
+            return None
+
+        try:
+            logger.debug(f"Decoding audio into memory with ffmpeg: {audio_path}")
+            audio_data = decode_to_array(ffmpeg_path, audio_path, self.sample_rate)
+            return audio_data if len(audio_data) else None
+        except (OSError, RuntimeError) as e:
+            logger.warning(f"ffmpeg could not decode {audio_path}: {e}, trying librosa")
+            return None
+
+    def _decode_with_librosa(self, audio_path: str) -> Optional[np.ndarray]:
+        """Decode with librosa, or return None if it is unavailable or fails."""
         try:
             import librosa
         except ImportError:
             logger.warning("librosa not available, falling back to ffmpeg extraction")
-            return None, 0.0
+            return None
 
         try:
             # Load audio at 16kHz mono (Whisper's expected format)
             logger.debug(f"Loading audio into memory: {audio_path}")
-            audio_data, sr = librosa.load(audio_path, sr=self.sample_rate, mono=True)
-            total_duration = len(audio_data) / sr
-            logger.debug(f"Audio loaded: {total_duration:.1f}s, {len(audio_data)} samples")
-
-            # Cache for reuse
-            self._audio_cache = audio_data
-            self._audio_cache_path = audio_path
-
-            return audio_data, total_duration
+            audio_data, _ = librosa.load(audio_path, sr=self.sample_rate, mono=True, dtype=np.float32)
+            return audio_data
         except Exception as e:
             logger.warning(f"Failed to load audio into memory: {e}, falling back to ffmpeg")
-            return None, 0.0
+            return None
 
     def extract_audio_chunk_from_memory(
         self,
         audio_data: np.ndarray,
         start: float,
         end: float
-    ) -> Tuple[Optional[str], float]:
+    ) -> Tuple[np.ndarray, float]:
         """
-        Extract audio chunk from in-memory data and save to temp file.
+        Extract audio chunk from in-memory data.
 
-        OPTIMIZATION: Slicing in-memory array is much faster than ffmpeg extraction.
+        OPTIMIZATION: Returns a view into audio_data (no copy, no temp file) that
+        Transcriber.transcribe() accepts directly.
 
         Args:
             audio_data: Audio data as numpy array
@@ -77,30 +112,14 @@ class AudioProcessor:
             end: End time in seconds
 
         Returns:
-            Tuple of (temp_file_path or None, chunk_duration)
+            Tuple of (chunk view, chunk_duration)
         """
-        try:
-            import soundfile as sf
-        except ImportError:
-            logger.warning("soundfile not available, cannot extract from memory")
-            return None, 0.0
-
-        try:
-            start_sample = int(start * self.sample_rate)
-            end_sample = int(end * self.sample_rate)
-            chunk_data = audio_data[start_sample:end_sample]
-
-            # Write to temp file for Whisper
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_audio:
-                temp_path = temp_audio.name
-
-            sf.write(temp_path, chunk_data, self.sample_rate)
-            duration = len(chunk_data) / self.sample_rate
+        start_sample = max(0, int(start * self.sample_rate))
+        end_sample = max(start_sample, int(end * self.sample_rate))
+        chunk_data = audio_data[start_sample:end_sample]
+        duration = len(chunk_data) / self.sample_rate
 
-            return temp_path, duration
-        except Exception as e:
-            logger.warning(f"Failed to extract chunk from memory: {e}")
-            return None, 0.0
+        return chunk_data, duration
 
     def get_cached_audio(self, audio_path: str) -> Optional[np.ndarray]:
         """
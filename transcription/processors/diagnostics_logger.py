@@ -115,7 +115,8 @@ class DiagnosticsLogger:
                     "languages_detected": list(merged_lang_stats.keys()),
                     "language_breakdown": merged_lang_stats,
                     "segments_merged": len(raw_segments) - len(merged_segments)
-                }
+                },
+                "voice_activity": self.diagnostics.get('vad')
             },
             "raw_segments": raw_segments,
             "merged_segments": merged_segments
@@ -0,0 +1,140 @@
+"""
+Batched spoken-language identification for enhanced transcription.
+Runs Whisper's encoder + language-token forward pass over many chunks at once,
+without decoding any text.
+"""
+
+import logging
+from typing import List, Optional, Tuple
+
+import numpy as np
+import torch
+import whisper
+from whisper.tokenizer import get_tokenizer
+
+logger = logging.getLogger(__name__)
+
+
+class LanguageIdentifier:
+    """Identifies the language of short audio chunks in batches using a Whisper model."""
+
+    def __init__(self, transcriber, allowed_languages: Optional[List[str]] = None, batch_size: int = 16,
+                 mel_store=None):
+        """
+        Initialize the language identifier.
+
+        Args:
+            transcriber: Transcriber instance whose (already cached) model is used
+            allowed_languages: Optional list of language codes. Logits of every other
+                               language are masked out before the softmax.
+            batch_size: Number of chunks per encoder forward pass
+            mel_store: Optional MelFeatureStore for the file; identify_windows() then
+                       slices precomputed features instead of recomputing the mel
+        """
+        self.transcriber = transcriber
+        self.allowed_languages = allowed_languages
+        self.batch_size = max(1, batch_size)
+        self.mel_store = mel_store
+
+        self.model = transcriber.load_model()
+        self.multilingual = self.model.is_multilingual
+        self._language_tokens = None
+        self._language_codes = None
+        self._sot = None
+        self._logit_mask = None
+
+        if self.multilingual:
+            tokenizer = get_tokenizer(True, num_languages=self.model.num_languages)
+            codes = list(tokenizer.all_language_codes)
+            tokens = list(tokenizer.all_language_tokens)
+            if allowed_languages:
+                keep = [i for i, code in enumerate(codes) if code in allowed_languages]
+                if keep:
+                    codes = [codes[i] for i in keep]
+                    tokens = [tokens[i] for i in keep]
+                else:
+                    logger.warning(f"None of {allowed_languages} are Whisper language codes; not masking")
+            self._language_codes = codes
+            self._language_tokens = tokens
+            self._sot = tokenizer.sot
+
+            # Suppress every vocabulary entry except the (allowed) language tokens
+            self._logit_mask = torch.ones(self.model.dims.n_vocab, dtype=torch.bool)
+            self._logit_mask[tokens] = False
+
+    def identify(self, chunks: List[np.ndarray]) -> List[Tuple[str, float]]:
+        """
+        Identify the language of each chunk.
+
+        Args:
+            chunks: List of 1-D float32 arrays of 16kHz audio (views are fine)
+
+        Returns:
+            List of (language_code, probability) tuples, one per chunk, in input order
+        """
+        if not chunks:
+            return []
+
+        if not self.multilingual:
+            # English-only models have no language tokens
+            return [('en', 1.0) for _ in chunks]
+
+        n_mels = self.model.dims.n_mels
+        results = []
+        for batch_start in range(0, len(chunks), self.batch_size):
+            batch = chunks[batch_start:batch_start + self.batch_size]
+            # log_mel_spectrogram normalises against the per-input maximum, so compute
+            # each chunk separately to match what transcribe() would see, then stack
+            mels = [
+                whisper.log_mel_spectrogram(
+                    whisper.pad_or_trim(np.ascontiguousarray(chunk, dtype=np.float32)),
+                    n_mels=n_mels
+                )
+                for chunk in batch
+            ]
+            results.extend(self._identify_batch(mels))
+        return results
+
+    def identify_windows(self, windows: List[Tuple[float, float]]) -> List[Tuple[str, float]]:
+        """
+        Identify the language of time windows using the precomputed mel store.
+
+        Args:
+            windows: List of (start, end) times in seconds
+
+        Returns:
+            List of (language_code, probability) tuples, one per window, in input order
+        """
+        if self.mel_store is None:
+            raise ValueError("identify_windows() requires a mel_store")
+        if not windows:
+            return []
+
+        if not self.multilingual:
+            return [('en', 1.0) for _ in windows]
+
+        results = []
+        for batch_start in range(0, len(windows), self.batch_size):
+            batch = windows[batch_start:batch_start + self.batch_size]
+            mels = [self.mel_store.window(start, end) for start, end in batch]
+            results.extend(self._identify_batch(mels))
+        return results
+
+    def _identify_batch(self, mels: List[torch.Tensor]) -> List[Tuple[str, float]]:
+        """Run one encoder + language-token forward pass over a stacked mel batch."""
+        mel_batch = torch.stack(mels).to(self.model.device)
+
+        with torch.no_grad():
+            audio_features = self.model.embed_audio(mel_batch)
+            tokens = torch.tensor([[self._sot]] * len(mels)).to(self.model.device)
+            logits = self.model.logits(tokens, audio_features)[:, 0]
+            logits = logits.float().cpu()
+            logits[:, self._logit_mask[:logits.shape[-1]]] = -np.inf
+            probs = logits.softmax(dim=-1)[:, self._language_tokens]
+
+        best = probs.argmax(dim=-1)
+        return [
+            (self._language_codes[int(best[i])], float(probs[i, best[i]]))
+            for i in range(len(mels))
+        ]
+
@@ -0,0 +1,284 @@
+"""
+Log-mel feature store for enhanced transcription.
+Computes Whisper's log-mel spectrogram once over a whole file into a memory-mapped
+float16 array that every detection pass slices by time. An optional on-disk
+cache keyed by the audio's content hash lets later runs skip feature extraction;
+it is evicted least-recently-used once it exceeds its disk quota.
+"""
+
+import os
+import time
+import hashlib
+import logging
+import tempfile
+from typing import Optional
+
+import numpy as np
+import torch
+from whisper.audio import HOP_LENGTH, N_FFT, N_FRAMES, SAMPLE_RATE, mel_filters
+
+logger = logging.getLogger(__name__)
+
+# Raw log10 value of silent (zero-padded) frames: log10(clamp(0, min=1e-10))
+SILENCE_LOG_MEL = -10.0
+
+
+# (path, size, mtime_ns) -> digest, so a file is hashed once per session
+_FINGERPRINT_MEMO = {}
+
+
+def audio_fingerprint(audio_path: str, block_size: int = 1024 * 1024) -> str:
+    """
+    Return a content hash (sha1 hex) of an audio file.
+
+    The digest is memoized per (path, size, mtime), so repeated lookups for an
+    unchanged file don't re-read it.
+
+    Args:
+        audio_path: Path to audio file
+        block_size: Read size in bytes
+
+    Returns:
+        str: Hex digest identifying the file contents
+    """
+    st = os.stat(audio_path)
+    memo_key = (os.path.abspath(audio_path), st.st_size, st.st_mtime_ns)
+    cached = _FINGERPRINT_MEMO.get(memo_key)
+    if cached is not None:
+        return cached
+
+    digest = hashlib.sha1()
+    with open(audio_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    _FINGERPRINT_MEMO[memo_key] = digest.hexdigest()
+    return _FINGERPRINT_MEMO[memo_key]
+
+
+def array_fingerprint(audio: np.ndarray) -> str:
+    """
+    Return a content hash (sha1 hex) of in-memory audio samples.
+
+    Used instead of audio_fingerprint() when the audio didn't come straight from a
+    file (e.g. decoded and filtered in memory), so the hash matches what is analyzed.
+
+    Args:
+        audio: Audio samples
+
+    Returns:
+        str: Hex digest identifying the samples
+    """
+    return hashlib.sha1(np.ascontiguousarray(audio).tobytes()).hexdigest()
+
+
+class MelFeatureStore:
+    """Whole-file log-mel features, sliced per window and normalized like Whisper."""
+
+    # Frames computed per STFT call; bounds peak memory for long files
+    BLOCK_FRAMES = 60000  # 10 minutes at 100 frames/s
+    FRAMES_PER_SECOND = SAMPLE_RATE // HOP_LENGTH
+    # On-disk cache quota: ~58MB per hour of audio at 80 bins, so roughly 35 hours
+    DEFAULT_CACHE_MAX_MB = 2048
+    # Entries used this recently are never evicted - another run may have them mapped
+    IN_USE_GRACE_SECONDS = 15 * 60
+
+    def __init__(self, features: np.ndarray, n_mels: int, path: Optional[str] = None, persistent: bool = False):
+        """
+        Wrap precomputed raw log10 mel features (use build() or open_cached()).
+
+        Args:
+            features: (n_frames, n_mels) float16 array (usually a np.memmap)
+            n_mels: Number of mel bins (80, or 128 for large-v3)
+            path: Backing file of the memmap, if any
+            persistent: True if path lives in the on-disk cache (kept on close())
+        """
+        self.features = features
+        self.n_mels = n_mels
+        self.path = path
+        self.persistent = persistent
+
+    @property
+    def duration(self) -> float:
+        return len(self.features) / self.FRAMES_PER_SECOND
+
+    @staticmethod
+    def default_cache_dir() -> str:
+        """On-disk cache location (override with FONIXFLOW_MEL_CACHE_DIR)."""
+        return os.environ.get(
+            'FONIXFLOW_MEL_CACHE_DIR',
+            os.path.join(os.path.expanduser("~"), ".cache", "fonixflow", "mel")
+        )
+
+    @classmethod
+    def default_cache_max_bytes(cls) -> int:
+        """On-disk cache quota (override with FONIXFLOW_MEL_CACHE_MB)."""
+        try:
+            max_mb = float(os.environ.get('FONIXFLOW_MEL_CACHE_MB', cls.DEFAULT_CACHE_MAX_MB))
+        except ValueError:
+            max_mb = cls.DEFAULT_CACHE_MAX_MB
+        return int(max_mb * 1024 * 1024)
+
+    @classmethod
+    def cache_path(cls, audio_hash: str, n_mels: int, cache_dir: Optional[str] = None) -> str:
+        return os.path.join(cache_dir or cls.default_cache_dir(), f"{audio_hash}_{n_mels}.f16")
+
+    @classmethod
+    def evict_cache(cls, cache_dir: Optional[str] = None, max_bytes: Optional[int] = None) -> int:
+        """
+        Delete least-recently-used cached features until the cache fits its quota.
+
+        Args:
+            cache_dir: Cache directory (None = default_cache_dir())
+            max_bytes: Quota (None = default_cache_max_bytes())
+
+        Returns:
+            int: Number of entries removed
+        """
+        cache_dir = cache_dir or cls.default_cache_dir()
+        max_bytes = cls.default_cache_max_bytes() if max_bytes is None else max_bytes
+        entries = []
+        try:
+            names = os.listdir(cache_dir)
+        except FileNotFoundError:
+            return 0
+        for name in names:
+            if not name.endswith('.f16'):
+                continue  # skips .f16.tmp files still being written
+            path = os.path.join(cache_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        entries.sort(reverse=True)
+
+        total = sum(size for _, size, _ in entries)
+        cutoff = time.time() - cls.IN_USE_GRACE_SECONDS
+        removed = 0
+        while entries and total > max_bytes:
+            accessed, size, path = entries.pop()
+            if accessed >= cutoff:
+                # Everything left was used recently; stay over quota for now
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue  # still mapped by another process (Windows)
+            total -= size
+            removed += 1
+        if removed:
+            logger.info(f"Mel cache: evicted {removed} entries (now {total / 1024 / 1024:.1f}MB)")
+        return removed
+
+    @classmethod
+    def open_cached(cls, audio_hash: str, n_mels: int, cache_dir: Optional[str] = None) -> Optional['MelFeatureStore']:
+        """
+        Open features computed by an earlier run, or return None if not cached.
+
+        Args:
+            audio_hash: Content hash from audio_fingerprint()
+            n_mels: Number of mel bins the model expects
+            cache_dir: Cache directory (None = default_cache_dir())
+        """
+        path = cls.cache_path(audio_hash, n_mels, cache_dir)
+        if not os.path.exists(path):
+            return None
+        try:
+            features = np.memmap(path, dtype=np.float16, mode='r').reshape(-1, n_mels)
+            os.utime(path, None)  # LRU order for evict_cache()
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable mel cache {path}: {e}")
+            return None
+        logger.info(f"Reusing cached log-mel features: {path} ({len(features)} frames)")
+        return cls(features, n_mels, path, persistent=True)
+
+    @classmethod
+    def build(cls, audio: np.ndarray, n_mels: int, audio_hash: Optional[str] = None,
+              cache_dir: Optional[str] = None) -> 'MelFeatureStore':
+        """
+        Compute raw log10 mel features for a whole file into a float16 memmap.
+
+        Args:
+            audio: 1-D float32 audio at 16kHz
+            n_mels: Number of mel bins the model expects
+            audio_hash: Content hash; when given, features are written to the on-disk
+                        cache (atomically, then evict_cache() enforces the quota) so
+                        later runs can open_cached() them
+            cache_dir: Cache directory (None = default_cache_dir())
+        """
+        n_frames = len(audio) // HOP_LENGTH
+        if audio_hash:
+            final_path = cls.cache_path(audio_hash, n_mels, cache_dir)
+            os.makedirs(os.path.dirname(final_path), exist_ok=True)
+            fd, path = tempfile.mkstemp(suffix='.f16.tmp', dir=os.path.dirname(final_path))
+        else:
+            final_path = None
+            fd, path = tempfile.mkstemp(suffix='.f16')
+        os.close(fd)
+
+        try:
+            features = np.memmap(path, dtype=np.float16, mode='w+', shape=(max(n_frames, 1), n_mels))
+            filters = mel_filters('cpu', n_mels)
+            window = torch.hann_window(N_FFT)
+            half = N_FFT // 2
+
+            # Reflect-pad the file ends like whisper's center=True STFT, then compute
+            # frame blocks with half a window of context so block edges are seamless
+            padded = np.pad(audio, (half, half), mode='reflect') if len(audio) > half else np.pad(audio, (half, half))
+            for f0 in range(0, n_frames, cls.BLOCK_FRAMES):
+                f1 = min(f0 + cls.BLOCK_FRAMES, n_frames)
+                block = torch.from_numpy(np.ascontiguousarray(padded[f0 * HOP_LENGTH:(f1 - 1) * HOP_LENGTH + N_FFT]))
+                stft = torch.stft(block, N_FFT, HOP_LENGTH, window=window, center=False, return_complex=True)
+                magnitudes = stft.abs() ** 2
+                mel_spec = filters @ magnitudes
+                log_spec = torch.clamp(mel_spec, min=1e-10).log10()
+                features[f0:f1] = log_spec.T.numpy().astype(np.float16)
+            features.flush()
+            del features
+
+            if final_path:
+                os.replace(path, final_path)
+                path = final_path
+        except Exception:
+            if os.path.exists(path):
+                os.unlink(path)
+            raise
+        if final_path:
+            cls.evict_cache(cache_dir)
+
+        logger.info(f"Computed log-mel features: {n_frames} frames x {n_mels} bins ({n_frames / cls.FRAMES_PER_SECOND:.1f}s)")
+        features = np.memmap(path, dtype=np.float16, mode='r').reshape(-1, n_mels)
+        return cls(features, n_mels, path, persistent=bool(final_path))
+
+    def window(self, start: float, end: float) -> torch.Tensor:
+        """
+        Return the Whisper model input for an audio window.
+
+        Matches log_mel_spectrogram(pad_or_trim(audio[start:end])): frames are
+        padded with silence (or trimmed) to 30s, then clamped to 8 below the window
+        maximum and scaled, i.e. normalized per window rather than per file.
+
+        Args:
+            start: Window start in seconds
+            end: Window end in seconds
+
+        Returns:
+            (n_mels, 3000) float32 tensor
+        """
+        f0 = max(0, int(start * self.FRAMES_PER_SECOND))
+        f1 = min(len(self.features), max(f0, int(end * self.FRAMES_PER_SECOND)), f0 + N_FRAMES)
+        mel = np.full((self.n_mels, N_FRAMES), SILENCE_LOG_MEL, dtype=np.float32)
+        mel[:, :f1 - f0] = self.features[f0:f1].T
+        log_spec = torch.from_numpy(mel)
+        log_spec = torch.maximum(log_spec, log_spec.max() - 8.0)
+        return (log_spec + 4.0) / 4.0
+
+    def close(self):
+        """Release the memmap; temporary (non-cached) backing files are deleted."""
+        self.features = None
+        if self.path and not self.persistent and os.path.exists(self.path):
+            try:
+                os.unlink(self.path)
+            except OSError as e:
+                logger.debug(f"Could not remove mel store {self.path}: {e}")
+        self.path = None
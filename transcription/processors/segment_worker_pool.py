@@ -0,0 +1,390 @@
+"""
+Segment worker pool for enhanced transcription.
+Transcribes Pass 2 segments concurrently (threads or processes) and hands the
+results back in submission (timestamp) order through a reorder buffer.
+"""
+
+import os
+import queue
+import logging
+import threading
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import torch
+
+from app.transcriber import Transcriber, get_available_memory_mb
+
+logger = logging.getLogger(__name__)
+
+# Transcriber owned by a process-mode worker (set up by _init_process_worker)
+_PROCESS_ENGINE = None
+
+
+def _init_process_worker(model_size: str, device: str, num_threads: int):
+    """Load a private model in a pool process and pin its intra-op thread count."""
+    global _PROCESS_ENGINE
+    torch.set_num_threads(num_threads)
+    os.environ['FONIXFLOW_DEVICE'] = device
+    _PROCESS_ENGINE = Transcriber(model_size=model_size)
+    _PROCESS_ENGINE.load_model()
+
+
+def _transcribe_in_process(audio: np.ndarray, language: Optional[str]) -> Dict[str, Any]:
+    """Transcribe one segment in a pool process (only picklable fields are returned)."""
+    result = _PROCESS_ENGINE.transcribe(audio, language=language, progress_callback=None)
+    return {
+        'text': result.get('text', ''),
+        'language': result.get('language', language),
+        'worker': f"pid{os.getpid()}"
+    }
+
+
+class SegmentWorkerPool:
+    """Runs Pass 2 segment transcription on several workers with ordered reassembly."""
+
+    MODES = ('thread', 'process')
+    MAX_WORKERS = 8
+    # Below this many intra-op threads per worker, adding workers stops paying off
+    MIN_THREADS_PER_WORKER = 2
+
+    def __init__(
+        self,
+        model_size: str,
+        transcribe_segment: Callable[[Transcriber, Dict[str, Any]], Dict[str, Any]],
+        finish_segment: Callable[[Dict[str, Any], Dict[str, Any]], Optional[Dict[str, Any]]],
+        num_workers: Optional[int] = None,
+        mode: Optional[str] = None,
+        audio_data: Optional[np.ndarray] = None,
+        sample_rate: int = 16000,
+        queue_size: int = 10,
+        cancel_check: Optional[Callable[[], bool]] = None
+    ):
+        """
+        Initialize the worker pool (call start() to launch workers).
+
+        Args:
+            model_size: Whisper model size each worker runs
+            transcribe_segment: Thread mode: (engine, segment) -> Whisper result dict
+            finish_segment: (segment, whisper_result) -> final segment dict or None
+            num_workers: Requested worker count (None = FONIXFLOW_PASS2_WORKERS or auto)
+            mode: 'thread' or 'process' (None = FONIXFLOW_PASS2_MODE or 'thread')
+            audio_data: In-memory audio; required for process mode (segments are sliced
+                        and shipped to the worker processes)
+            sample_rate: Sample rate of audio_data
+            queue_size: Max segments buffered between Pass 1 and the workers
+            cancel_check: Optional callable returning True when work should be skipped
+        """
+        self.model_size = model_size
+        self.transcribe_segment = transcribe_segment
+        self.finish_segment = finish_segment
+        self.audio_data = audio_data
+        self.sample_rate = sample_rate
+        self.cancel_check = cancel_check or (lambda: False)
+
+        mode = (mode or os.environ.get('FONIXFLOW_PASS2_MODE', 'thread')).strip().lower()
+        if mode not in self.MODES:
+            logger.warning(f"Unknown Pass 2 worker mode '{mode}', using threads")
+            mode = 'thread'
+        if mode == 'process' and audio_data is None:
+            logger.info("Process workers need in-memory audio; using threads")
+            mode = 'thread'
+        self.mode = mode
+
+        self.device = Transcriber(model_size=model_size).device
+        self.num_workers, self.threads_per_worker = self.plan_workers(
+            model_size, self.device, num_workers, mode
+        )
+
+        self.segment_queue = queue.Queue(maxsize=queue_size)
+        self.results: List[Dict[str, Any]] = []
+        self.error: Optional[Exception] = None
+
+        # Reorder buffer: completed results keyed by submission sequence number
+        self._pending: Dict[int, Optional[Dict[str, Any]]] = {}
+        self._next_seq = 0
+        self._submitted = 0
+        self._completed = 0
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._sealed = False
+
+        # Per-worker throughput: name -> {'segments', 'audio_seconds', 'busy_seconds'}
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+        self._threads: List[threading.Thread] = []
+        self._executor = None
+        self._original_num_threads = None
+
+    @classmethod
+    def plan_workers(
+        cls,
+        model_size: str,
+        device: Optional[str],
+        requested: Optional[int] = None,
+        mode: str = 'thread'
+    ) -> Tuple[int, int]:
+        """
+        Decide how many workers fit the CPU and memory budget.
+
+        One CPU thread is reserved for Pass 1, which runs concurrently. The remaining
+        cores are split so workers x intra-op threads never exceeds the core count.
+
+        Args:
+            model_size: Whisper model size
+            device: 'cpu', 'cuda' or 'mps' (None = unknown, treated as CPU)
+            requested: Requested worker count (None = FONIXFLOW_PASS2_WORKERS or auto)
+            mode: 'thread' (worker 0 reuses the shared model) or 'process'
+
+        Returns:
+            Tuple of (num_workers, torch threads per worker)
+        """
+        cpu_count = os.cpu_count() or 1
+        usable_threads = max(1, cpu_count - 1)
+
+        if requested is None:
+            env_workers = os.environ.get('FONIXFLOW_PASS2_WORKERS', '').strip()
+            if env_workers.isdigit() and int(env_workers) > 0:
+                requested = int(env_workers)
+        if requested is None and device in ('cuda', 'mps'):
+            # A single model already keeps the GPU busy; extra copies only cost VRAM
+            requested = 1
+
+        cpu_budget = max(1, usable_threads // cls.MIN_THREADS_PER_WORKER)
+
+        base_name = model_size.replace('.en', '')
+        model_mb = Transcriber.MODEL_MEMORY_MB.get(base_name, 1000)
+        available_mb = get_available_memory_mb()
+        if available_mb is None:
+            memory_budget = cls.MAX_WORKERS
+        else:
+            # Keep 20% headroom; in thread mode worker 0 shares the already loaded model
+            memory_budget = int(available_mb * 0.8 // model_mb) + (1 if mode == 'thread' else 0)
+            memory_budget = max(1, memory_budget)
+
+        workers = requested if requested else cpu_budget
+        workers = max(1, min(workers, cpu_budget, memory_budget, cls.MAX_WORKERS))
+        threads_per_worker = max(1, usable_threads // workers)
+
+        logger.info(
+            f"Pass 2 worker budget: {workers} {mode} worker(s) x {threads_per_worker} threads "
+            f"(cpu={cpu_count}, cpu_budget={cpu_budget}, memory_budget={memory_budget}, "
+            f"model~{model_mb}MB, available={'unknown' if available_mb is None else f'{available_mb:.0f}MB'})"
+        )
+        return workers, threads_per_worker
+
+    def start(self):
+        """Launch the workers."""
+        if self.mode == 'process':
+            # spawn, not fork: the parent runs threads and may hold CUDA or Qt state
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.num_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_process_worker,
+                initargs=(self.model_size, self.device or 'cpu', self.threads_per_worker)
+            )
+            dispatcher = threading.Thread(target=self._dispatch_to_processes, name="Pass2-Dispatcher", daemon=True)
+            self._threads.append(dispatcher)
+            dispatcher.start()
+        else:
+            if self.num_workers > 1:
+                # Threads share torch's intra-op pool; shrink it so they don't oversubscribe
+                self._original_num_threads = torch.get_num_threads()
+                torch.set_num_threads(self.threads_per_worker)
+            for worker_id in range(self.num_workers):
+                worker = threading.Thread(
+                    target=self._thread_worker, args=(worker_id,),
+                    name=f"Pass2-Transcription-{worker_id + 1}", daemon=True
+                )
+                self._threads.append(worker)
+                worker.start()
+
+        logger.info(f"PASS 2 pool started: {self.num_workers} {self.mode} worker(s) using {self.model_size} model")
+
+    def submit(self, segment: Dict[str, Any]):
+        """Queue a segment for transcription (blocks when the queue is full - backpressure)."""
+        with self._lock:
+            seq = self._submitted
+            self._submitted += 1
+        self.segment_queue.put((seq, segment))
+
+    def close(self):
+        """Signal that no more segments will be submitted."""
+        sentinel_count = 1 if self.mode == 'process' else self.num_workers
+        for _ in range(sentinel_count):
+            self.segment_queue.put(None)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every submitted segment is reassembled. Returns True when done."""
+        return self._done.wait(timeout)
+
+    def join(self) -> List[Dict[str, Any]]:
+        """
+        Wait for all workers to finish and release resources.
+
+        Returns:
+            Transcribed segments in submission order
+        """
+        for worker in self._threads:
+            worker.join()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._original_num_threads is not None:
+            torch.set_num_threads(self._original_num_threads)
+            self._original_num_threads = None
+        return self.results
+
+    @property
+    def submitted_count(self) -> int:
+        return self._submitted
+
+    @property
+    def completed_count(self) -> int:
+        return self._completed
+
+    def format_throughput(self) -> str:
+        """Per-worker real-time factor, e.g. 'W1 12.3x, W2 9.8x'."""
+        with self._lock:
+            stats = sorted(self._stats.items())
+        if not stats:
+            return "starting"
+        parts = []
+        for idx, (_, s) in enumerate(stats, start=1):
+            rtf = s['audio_seconds'] / s['busy_seconds'] if s['busy_seconds'] > 0 else 0.0
+            parts.append(f"W{idx} {rtf:.1f}x")
+        return ', '.join(parts)
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """Return a copy of the per-worker statistics."""
+        with self._lock:
+            return {name: dict(s) for name, s in self._stats.items()}
+
+    def _record(self, worker: str, segment: Dict[str, Any], busy_seconds: float):
+        """Accumulate throughput statistics for a worker (caller holds the lock)."""
+        s = self._stats.setdefault(worker, {'segments': 0, 'audio_seconds': 0.0, 'busy_seconds': 0.0})
+        s['segments'] += 1
+        s['audio_seconds'] += segment['end'] - segment['start']
+        s['busy_seconds'] += busy_seconds
+
+    def _complete(self, seq: int, result: Optional[Dict[str, Any]], worker: Optional[str] = None,
+                  segment: Optional[Dict[str, Any]] = None, busy_seconds: float = 0.0):
+        """Store a finished segment and release every result that is now in order."""
+        with self._lock:
+            if worker is not None and segment is not None:
+                self._record(worker, segment, busy_seconds)
+            self._pending[seq] = result
+            while self._next_seq in self._pending:
+                ready = self._pending.pop(self._next_seq)
+                if ready:
+                    self.results.append(ready)
+                self._next_seq += 1
+            self._completed += 1
+            if self._closed_and_drained():
+                self._done.set()
+
+    def _set_error(self, error: Exception):
+        """Record a worker failure for the caller; the first one wins."""
+        with self._lock:
+            if self.error is None:
+                self.error = error
+
+    def _closed_and_drained(self) -> bool:
+        return self._sealed and self._next_seq == self._submitted
+
+    def _seal(self):
+        """Mark the input side finished (called once the sentinel has been seen)."""
+        with self._lock:
+            self._sealed = True
+            if self._closed_and_drained():
+                self._done.set()
+
+    def _thread_worker(self, worker_id: int):
+        """Thread-mode worker: owns one Transcriber and drains the shared queue."""
+        name = f"worker-{worker_id + 1}"
+        engine = None
+        try:
+            # Worker 0 reuses the shared (cached) model; the others need private copies
+            # because Whisper installs kv-cache hooks on the model object per decode
+            engine = Transcriber(model_size=self.model_size, shared_model=(worker_id == 0))
+            engine.load_model()
+            if worker_id == 0 and self.num_workers > 1:
+                logger.info(f"PASS 2 {name}: using shared {self.model_size} model")
+        except Exception as e:
+            if worker_id != 0:
+                # Remaining workers pick up the load; leftover sentinels are harmless
+                logger.warning(f"PASS 2 {name}: could not load private model ({e}); worker exits")
+                return
+            # Worker 0 keeps draining (with empty results) so Pass 1 never blocks
+            logger.error(f"PASS 2 {name}: could not load model: {e}")
+            self._set_error(e)
+            engine = None
+
+        while True:
+            item = self.segment_queue.get()
+            try:
+                if item is None:
+                    self._seal()
+                    break
+                seq, segment = item
+                if engine is None or self.cancel_check():
+                    self._complete(seq, None)
+                    continue
+                started = time.time()
+                result = None
+                try:
+                    whisper_result = self.transcribe_segment(engine, segment)
+                    result = self.finish_segment(segment, whisper_result)
+                except Exception as e:
+                    logger.error(f"PASS 2 {name} failed to transcribe segment [{segment['start']:.1f}-{segment['end']:.1f}s]: {e}", exc_info=True)
+                self._complete(seq, result, name, segment, time.time() - started)
+            finally:
+                self.segment_queue.task_done()
+
+    def _dispatch_to_processes(self):
+        """Process-mode dispatcher: slices segments and submits them to the executor."""
+        in_flight = threading.BoundedSemaphore(self.num_workers * 2)
+        while True:
+            item = self.segment_queue.get()
+            try:
+                if item is None:
+                    self._seal()
+                    break
+                seq, segment = item
+                if self.cancel_check():
+                    self._complete(seq, None)
+                    continue
+                start_sample = max(0, int(segment['start'] * self.sample_rate))
+                end_sample = max(start_sample, int(segment['end'] * self.sample_rate))
+                chunk = self.audio_data[start_sample:end_sample]
+                in_flight.acquire()
+                submitted_at = time.time()
+                try:
+                    future = self._executor.submit(_transcribe_in_process, chunk, segment['language'])
+                except Exception as e:
+                    in_flight.release()
+                    logger.error(f"PASS 2 could not submit segment to process pool: {e}")
+                    self._set_error(e)
+                    self._complete(seq, None)
+                    continue
+                future.add_done_callback(
+                    lambda f, seq=seq, segment=segment, t0=submitted_at: self._on_process_done(f, seq, segment, t0, in_flight)
+                )
+            finally:
+                self.segment_queue.task_done()
+
+    def _on_process_done(self, future, seq: int, segment: Dict[str, Any], submitted_at: float, in_flight):
+        """Collect a process-mode result (runs in the executor's callback thread)."""
+        in_flight.release()
+        result = None
+        worker = None
+        try:
+            whisper_result = future.result()
+            worker = whisper_result.pop('worker', None)
+            result = self.finish_segment(segment, whisper_result)
+        except Exception as e:
+            logger.error(f"PASS 2 process worker failed on segment [{segment['start']:.1f}-{segment['end']:.1f}s]: {e}", exc_info=True)
+        self._complete(seq, result, worker, segment, time.time() - submitted_at)
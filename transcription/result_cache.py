@@ -0,0 +1,305 @@
+"""
+Transcription Result Cache Module
+
+Content-addressed on-disk cache of finished transcription results. Entries are
+keyed by the audio content hash plus every setting that changes the output
+(model size, language options, deep-scan flag, filter settings, Whisper
+version), stored as compressed compact JSON and evicted least-recently-used
+once the cache exceeds its size cap.
+
+Usage:
+    python -m transcription.result_cache stats
+    python -m transcription.result_cache list
+    python -m transcription.result_cache purge [--older-than DAYS]
+"""
+
+import os
+import sys
+import gzip
+import json
+import time
+import hashlib
+import logging
+import argparse
+import tempfile
+import threading
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Bump when the stored layout or key composition changes
+CACHE_FORMAT_VERSION = 1
+ENTRY_SUFFIX = '.json.gz'
+
+
+def result_cache_enabled() -> bool:
+    """The result cache is on unless FONIXFLOW_RESULT_CACHE=0."""
+    return os.environ.get('FONIXFLOW_RESULT_CACHE', '1').strip() != '0'
+
+
+def _whisper_version() -> str:
+    try:
+        import whisper
+        return getattr(whisper, '__version__', 'unknown')
+    except ImportError:
+        return 'unavailable'
+
+
+def _json_default(value):
+    """Serialize numpy scalars/arrays that Whisper leaves in its results."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class ResultCache:
+    """Size-capped, LRU-evicted store of transcription results keyed by content hash."""
+
+    DEFAULT_MAX_MB = 256
+
+    def __init__(self, cache_dir: Optional[str] = None, max_mb: Optional[float] = None):
+        """
+        Initialize the result cache.
+
+        Args:
+            cache_dir: Directory for entries (None = FONIXFLOW_RESULT_CACHE_DIR or
+                       ~/.cache/fonixflow/results)
+            max_mb: Size cap (None = FONIXFLOW_RESULT_CACHE_MB or DEFAULT_MAX_MB)
+        """
+        self.cache_dir = cache_dir or os.environ.get(
+            'FONIXFLOW_RESULT_CACHE_DIR',
+            os.path.join(os.path.expanduser("~"), ".cache", "fonixflow", "results")
+        )
+        if max_mb is None:
+            try:
+                max_mb = float(os.environ.get('FONIXFLOW_RESULT_CACHE_MB', self.DEFAULT_MAX_MB))
+            except ValueError:
+                max_mb = self.DEFAULT_MAX_MB
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(audio, **settings) -> str:
+        """
+        Build the cache key for an audio input and the settings that affect the result.
+
+        Args:
+            audio: Path to the audio/media file, or an in-memory float32 array
+            **settings: Output-affecting options (model size, language, ...);
+                        the Whisper version and cache format are added automatically
+
+        Returns:
+            str: Hex digest key
+        """
+        from transcription.processors.mel_store import array_fingerprint, audio_fingerprint
+        if isinstance(audio, np.ndarray):
+            audio_hash = array_fingerprint(audio)
+        else:
+            audio_hash = audio_fingerprint(audio)
+        return ResultCache.key_for_hash(audio_hash, **settings)
+
+    @staticmethod
+    def key_for_hash(audio_hash: str, **settings) -> str:
+        """
+        Build the cache key from an already computed content hash (see make_key()).
+
+        Lets callers that hashed the media while receiving it (e.g. web uploads)
+        skip reading it again.
+        """
+        fields = dict(settings)
+        fields['audio_hash'] = audio_hash
+        fields['whisper_version'] = _whisper_version()
+        fields['format'] = CACHE_FORMAT_VERSION
+        payload = json.dumps(fields, sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + ENTRY_SUFFIX)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached result for key, or None on a miss.
+
+        A hit refreshes the entry's access time for LRU eviction.
+        """
+        path = self._path(key)
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, EOFError) as e:
+            logger.warning(f"Discarding unreadable result cache entry {path}: {e}")
+            self._remove(path)
+            return None
+
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        logger.info(f"Result cache hit: {key[:12]} ({entry.get('source', '?')})")
+        return entry.get('result')
+
+    def put(self, key: str, result: Dict[str, Any], source: Optional[str] = None,
+            settings: Optional[Dict[str, Any]] = None):
+        """
+        Store a result (atomically) and evict old entries beyond the size cap.
+
+        Args:
+            key: Key from make_key()
+            result: Transcription result dict (incl. language_segments, if any)
+            source: Human-readable origin shown by the CLI (e.g. the media path)
+            settings: Settings the key was built from, kept for inspection
+        """
+        entry = {
+            'created': time.time(),
+            'source': source,
+            'settings': settings or {},
+            'result': result
+        }
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            data = json.dumps(entry, separators=(',', ':'), ensure_ascii=False, default=_json_default)
+            fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=self.cache_dir)
+            try:
+                with os.fdopen(fd, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=6) as f:
+                    f.write(data.encode('utf-8'))
+                os.replace(tmp_path, self._path(key))
+            except Exception:
+                self._remove(tmp_path)
+                raise
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not store transcription result in cache: {e}")
+            return
+
+        logger.info(f"Result cached: {key[:12]} ({source or 'unknown source'})")
+        self.evict()
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """List entries (key, size, last access), most recently used first."""
+        found = []
+        try:
+            names = os.listdir(self.cache_dir)
+        except FileNotFoundError:
+            return []
+        for name in names:
+            if not name.endswith(ENTRY_SUFFIX):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            found.append({
+                'key': name[:-len(ENTRY_SUFFIX)],
+                'path': path,
+                'bytes': st.st_size,
+                'accessed': st.st_mtime
+            })
+        found.sort(key=lambda e: e['accessed'], reverse=True)
+        return found
+
+    def evict(self) -> int:
+        """Delete least-recently-used entries until the cache fits its cap. Returns count."""
+        with self._lock:
+            entries = self.entries()
+            total = sum(e['bytes'] for e in entries)
+            removed = 0
+            while entries and total > self.max_bytes:
+                oldest = entries.pop()
+                if self._remove(oldest['path']):
+                    total -= oldest['bytes']
+                    removed += 1
+            if removed:
+                logger.info(f"Result cache: evicted {removed} entries (now {total / 1024 / 1024:.1f}MB)")
+            return removed
+
+    def purge(self, older_than_days: Optional[float] = None) -> int:
+        """
+        Delete entries (all, or those not used for older_than_days). Returns count.
+        """
+        cutoff = time.time() - older_than_days * 86400 if older_than_days is not None else None
+        removed = 0
+        for entry in self.entries():
+            if cutoff is None or entry['accessed'] < cutoff:
+                removed += int(self._remove(entry['path']))
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry count and size against the cap."""
+        entries = self.entries()
+        total = sum(e['bytes'] for e in entries)
+        return {
+            'cache_dir': self.cache_dir,
+            'entries': len(entries),
+            'size_mb': round(total / 1024 / 1024, 2),
+            'max_mb': round(self.max_bytes / 1024 / 1024, 2)
+        }
+
+    def describe(self, key: str) -> Dict[str, Any]:
+        """Return an entry's metadata (source, settings, created) without the result body."""
+        with gzip.open(self._path(key), 'rt', encoding='utf-8') as f:
+            entry = json.load(f)
+        result = entry.get('result') or {}
+        return {
+            'source': entry.get('source'),
+            'created': entry.get('created'),
+            'settings': entry.get('settings'),
+            'language': result.get('language'),
+            'segments': len(result.get('segments') or []),
+            'language_segments': len(result.get('language_segments') or [])
+        }
+
+    @staticmethod
+    def _remove(path: str) -> bool:
+        try:
+            os.unlink(path)
+            return True
+        except OSError:
+            return False
+
+
+def main(argv=None):
+    """Command-line entry point to inspect and purge the result cache."""
+    parser = argparse.ArgumentParser(
+        prog='python -m transcription.result_cache',
+        description='Inspect or purge the FonixFlow transcription result cache'
+    )
+    parser.add_argument('--dir', help='Cache directory (default: FONIXFLOW_RESULT_CACHE_DIR or ~/.cache/fonixflow/results)')
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('stats', help='Show entry count and size')
+    list_parser = sub.add_parser('list', help='List entries, most recently used first')
+    list_parser.add_argument('-v', '--verbose', action='store_true', help='Show source and settings of each entry')
+    purge_parser = sub.add_parser('purge', help='Delete entries')
+    purge_parser.add_argument('--older-than', type=float, metavar='DAYS', help='Only entries unused for DAYS days')
+    args = parser.parse_args(argv)
+
+    cache = ResultCache(cache_dir=args.dir)
+    if args.command == 'stats':
+        stats = cache.stats()
+        print(f"Cache dir: {stats['cache_dir']}")
+        print(f"Entries:   {stats['entries']}")
+        print(f"Size:      {stats['size_mb']:.2f} MB of {stats['max_mb']:.0f} MB")
+    elif args.command == 'list':
+        for entry in cache.entries():
+            accessed = time.strftime('%Y-%m-%d %H:%M', time.localtime(entry['accessed']))
+            line = f"{entry['key'][:12]}  {entry['bytes'] / 1024:8.1f} KB  {accessed}"
+            if args.verbose:
+                try:
+                    info = cache.describe(entry['key'])
+                    line += f"  {info['source']}  lang={info['language']}  segments={info['segments']}  {info['settings']}"
+                except (OSError, ValueError) as e:
+                    line += f"  <unreadable: {e}>"
+            print(line)
+    elif args.command == 'purge':
+        removed = cache.purge(older_than_days=args.older_than)
+        print(f"Removed {removed} entries")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,254 @@
+"""
+Voice Activity Detection Module
+
+This module contains a pure-NumPy voice-activity detector (frame energy plus
+spectral flux) that finds speech regions, so detection and transcription passes
+can skip silence, music beds and other dead air.
+"""
+
+import os
+import logging
+from typing import Dict, List, Optional, Tuple, Any
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Frames quieter than this (dBFS) are never speech, whatever the noise floor
+ABSOLUTE_SILENCE_DB = -55.0
+# Smoothed spectral flux below this is never speech. Relative gating alone passes
+# steady material (tones, pads, sustained music) when nothing else is loud; syllables
+# keep the flux of the normalized spectrum around 0.35-0.5, held notes below ~0.2
+MIN_SPEECH_FLUX = 0.25
+# Frames processed per FFT block (bounds memory on long files)
+FFT_BLOCK_FRAMES = 20000
+
+
+def vad_enabled() -> bool:
+    """Voice-activity skipping is on unless FONIXFLOW_VAD=0."""
+    return os.environ.get('FONIXFLOW_VAD', '1').strip() != '0'
+
+
+def detect_speech_regions(
+    audio: np.ndarray,
+    sample_rate: int = 16000,
+    frame_seconds: float = 0.03,
+    energy_margin_db: float = 12.0,
+    flux_ratio: float = 0.35,
+    min_flux: float = MIN_SPEECH_FLUX,
+    min_speech_seconds: float = 0.25,
+    min_silence_seconds: float = 0.5,
+    padding_seconds: float = 0.2
+) -> List[Tuple[float, float]]:
+    """
+    Find speech regions using frame energy and spectral flux.
+
+    A frame is speech when its energy is energy_margin_db above the recording's noise
+    floor (10th percentile) AND its smoothed spectral flux - the frame-to-frame change
+    of the loudness-normalized spectrum - is not far below that of typical loud frames
+    and above an absolute floor (MIN_SPEECH_FLUX). Speech changes spectral shape
+    several times a second; hum, tones and sustained music mostly don't. The frame
+    mask is then cleaned up: short gaps are bridged, blips are dropped and regions
+    are padded so word edges aren't clipped.
+
+    Args:
+        audio: 1-D float32 audio
+        sample_rate: Sample rate of audio
+        frame_seconds: Analysis frame length
+        energy_margin_db: Required energy above the noise floor
+        flux_ratio: Minimum smoothed flux, relative to the median of loud frames
+        min_flux: Minimum smoothed flux, absolute
+        min_speech_seconds: Shorter speech regions are dropped
+        min_silence_seconds: Shorter gaps between speech regions are bridged
+        padding_seconds: Padding added to both sides of each region
+
+    Returns:
+        Sorted, non-overlapping list of (start, end) times in seconds
+    """
+    frame_len = max(1, int(frame_seconds * sample_rate))
+    n_frames = len(audio) // frame_len
+    if n_frames == 0:
+        return []
+    frames = audio[:n_frames * frame_len].reshape(n_frames, frame_len)
+    frame_time = frame_len / sample_rate
+
+    # Energy in dBFS per frame
+    energy_db = 10.0 * np.log10(np.mean(np.square(frames, dtype=np.float32), axis=1) + 1e-10)
+    noise_floor = float(np.percentile(energy_db, 10))
+    loud = energy_db > max(noise_floor + energy_margin_db, ABSOLUTE_SILENCE_DB)
+    if not loud.any():
+        return []
+
+    # Spectral flux of the sum-normalized magnitude spectrum (half-wave rectified)
+    window = np.hanning(frame_len).astype(np.float32)
+    flux = np.zeros(n_frames, dtype=np.float32)
+    previous = None
+    for b0 in range(0, n_frames, FFT_BLOCK_FRAMES):
+        block = frames[b0:b0 + FFT_BLOCK_FRAMES] * window
+        spectrum = np.abs(np.fft.rfft(block, axis=1)).astype(np.float32)
+        spectrum /= spectrum.sum(axis=1, keepdims=True) + 1e-10
+        if previous is not None:
+            spectrum_with_prev = np.vstack([previous, spectrum])
+        else:
+            spectrum_with_prev = np.vstack([spectrum[:1], spectrum])
+        diff = np.diff(spectrum_with_prev, axis=0)
+        flux[b0:b0 + len(block)] = np.maximum(diff, 0.0).sum(axis=1)
+        previous = spectrum[-1:]
+
+    # Smooth over ~0.3s - syllable rate - so pauses inside words don't gate out
+    smooth = max(1, int(round(0.3 / frame_time)))
+    flux = np.convolve(flux, np.ones(smooth, dtype=np.float32) / smooth, mode='same')
+    flux_gate = flux >= max(flux_ratio * float(np.median(flux[loud])), min_flux)
+
+    speech = loud & flux_gate
+    return _mask_to_regions(
+        speech, frame_time, len(audio) / sample_rate,
+        min_speech_seconds, min_silence_seconds, padding_seconds
+    )
+
+
+def _mask_to_regions(
+    mask: np.ndarray,
+    frame_time: float,
+    total_duration: float,
+    min_speech_seconds: float,
+    min_silence_seconds: float,
+    padding_seconds: float
+) -> List[Tuple[float, float]]:
+    """Turn a per-frame speech mask into cleaned-up (start, end) regions."""
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1) * frame_time
+    ends = np.flatnonzero(edges == -1) * frame_time
+    if len(starts) == 0:
+        return []
+
+    # Bridge short gaps, then drop blips
+    regions = [[starts[0], ends[0]]]
+    for start, end in zip(starts[1:], ends[1:]):
+        if start - regions[-1][1] < min_silence_seconds:
+            regions[-1][1] = end
+        else:
+            regions.append([start, end])
+    regions = [r for r in regions if r[1] - r[0] >= min_speech_seconds]
+
+    # Pad and re-merge anything the padding made overlap
+    padded = []
+    for start, end in regions:
+        start = max(0.0, start - padding_seconds)
+        end = min(total_duration, end + padding_seconds)
+        if padded and start <= padded[-1][1]:
+            padded[-1] = (padded[-1][0], max(padded[-1][1], end))
+        else:
+            padded.append((float(start), float(end)))
+    return padded
+
+
+def merge_close_regions(regions: List[Tuple[float, float]], max_gap: float) -> List[Tuple[float, float]]:
+    """
+    Merge regions separated by less than max_gap seconds.
+
+    Args:
+        regions: Sorted (start, end) regions
+        max_gap: Gaps shorter than this are bridged
+
+    Returns:
+        Merged regions
+    """
+    merged = []
+    for start, end in regions:
+        if merged and start - merged[-1][1] < max_gap:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def speech_chunks(
+    regions: List[Tuple[float, float]],
+    chunk_size: float,
+    min_chunk: float = 0.1
+) -> List[Tuple[float, float]]:
+    """
+    Cut speech regions into fixed-size chunks (non-speech is skipped).
+
+    Args:
+        regions: Speech regions
+        chunk_size: Chunk length in seconds
+        min_chunk: Shorter remainders are dropped
+
+    Returns:
+        List of (start, end) chunks
+    """
+    chunks = []
+    for region_start, region_end in regions:
+        current = region_start
+        while current < region_end:
+            chunk_end = min(current + chunk_size, region_end)
+            if chunk_end - current >= min_chunk:
+                chunks.append((current, chunk_end))
+            current += chunk_size
+    return chunks
+
+
+def trim_to_speech(start: float, end: float, regions: List[Tuple[float, float]]) -> Optional[Tuple[float, float]]:
+    """
+    Shrink a window to the speech it contains.
+
+    Args:
+        start: Window start in seconds
+        end: Window end in seconds
+        regions: Speech regions
+
+    Returns:
+        (first speech start, last speech end) inside the window, or None if it holds no speech
+    """
+    inside = [(max(start, s), min(end, e)) for s, e in regions if s < end and e > start]
+    if not inside:
+        return None
+    return inside[0][0], inside[-1][1]
+
+
+def nearest_speech_window(time_point: float, window: float, regions: List[Tuple[float, float]]) -> Optional[float]:
+    """
+    Move a probe start time into the nearest speech region.
+
+    Args:
+        time_point: Desired probe start in seconds
+        window: Probe length in seconds
+        regions: Speech regions
+
+    Returns:
+        Adjusted start time, or None if there is no speech at all
+    """
+    if not regions:
+        return None
+    best = None
+    best_distance = None
+    for start, end in regions:
+        if start <= time_point < end:
+            return time_point
+        candidate = start if start > time_point else max(start, end - window)
+        distance = abs(candidate - time_point)
+        if best_distance is None or distance < best_distance:
+            best, best_distance = candidate, distance
+    return best
+
+
+def speech_stats(regions: List[Tuple[float, float]], total_duration: float) -> Dict[str, Any]:
+    """
+    Summarize how much audio the detector lets through.
+
+    Args:
+        regions: Speech regions
+        total_duration: Audio duration in seconds
+
+    Returns:
+        Dict with speech_seconds, skipped_seconds, skipped_ratio and region_count
+    """
+    speech_seconds = sum(end - start for start, end in regions)
+    skipped_seconds = max(0.0, total_duration - speech_seconds)
+    return {
+        'speech_seconds': round(speech_seconds, 2),
+        'skipped_seconds': round(skipped_seconds, 2),
+        'skipped_ratio': round(skipped_seconds / total_duration, 4) if total_duration > 0 else 0.0,
+        'region_count': len(regions)
+    }
@@ -0,0 +1,263 @@
+"""
+Dynamic request batching for short clips.
+
+Short uploads (up to one 30s Whisper window) for the same model size and
+language are collected for a few milliseconds and decoded together: one encoder
+pass and one batched decode over the stacked log-mel features, instead of one
+batch-size-1 transcribe() per clip. Results are fanned back out to each
+request's future.
+
+Configuration (environment):
+    FONIXFLOW_WEB_BATCH_SIZE     Clips per batch (default: 8; 1 disables batching)
+    FONIXFLOW_WEB_BATCH_WAIT_MS  Time a batch waits to fill up (default: 50)
+"""
+
+import time
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from model_pool import ModelPool, get_instance_engine, _env_number
+
+logger = logging.getLogger("fonixflow-web")
+
+SAMPLE_RATE = 16000
+# Longest clip that fits one Whisper window
+MAX_CLIP_SECONDS = 30.0
+# Same fallback thresholds as whisper.transcribe()
+COMPRESSION_RATIO_THRESHOLD = 2.4
+LOGPROB_THRESHOLD = -1.0
+NO_SPEECH_THRESHOLD = 0.6
+
+
+def _segments_from_tokens(tokens: List[int], tokenizer, duration: float) -> List[Dict[str, Any]]:
+    """Split a decoded token sequence into timestamped segments."""
+    timestamp_begin = tokenizer.timestamp_begin
+    segments = []
+    start, text_tokens = None, []
+    for token in tokens:
+        if token >= timestamp_begin:
+            time_s = (token - timestamp_begin) * 0.02  # 20ms per timestamp token
+            if start is None:
+                start = time_s
+            elif text_tokens:
+                segments.append((start, time_s, text_tokens))
+                start, text_tokens = None, []
+            else:
+                start = time_s
+        elif token < tokenizer.eot:
+            text_tokens.append(token)
+    if text_tokens:
+        segments.append((start or 0.0, duration, text_tokens))
+
+    return [
+        {
+            'id': i,
+            'seek': 0,
+            'start': round(min(seg_start, duration), 2),
+            'end': round(min(seg_end, duration), 2),
+            'text': tokenizer.decode(seg_tokens),
+            'tokens': seg_tokens
+        }
+        for i, (seg_start, seg_end, seg_tokens) in enumerate(segments)
+    ]
+
+
+def _transcribe_batch(clips: List[np.ndarray], language: Optional[str]) -> List[Dict[str, Any]]:
+    """
+    Transcribe short clips with one batched encode/decode in a pool instance process.
+
+    Clips whose batched decode fails Whisper's quality thresholds (repetitive or
+    low-confidence text) are transcribed again on their own, with temperature
+    fallback.
+    """
+    import torch
+    import whisper
+    from whisper.tokenizer import get_tokenizer
+
+    engine = get_instance_engine()
+    model = engine.model
+    n_mels = model.dims.n_mels
+    mels = torch.stack([
+        whisper.log_mel_spectrogram(whisper.pad_or_trim(clip), n_mels=n_mels)
+        for clip in clips
+    ]).to(model.device)
+
+    if language is None and not model.is_multilingual:
+        # English-only models have no language tokens to detect with (as in whisper.transcribe)
+        language = 'en'
+    options = whisper.DecodingOptions(
+        task='transcribe',
+        language=language,
+        fp16=(engine.device == 'cuda')
+    )
+    with torch.no_grad():
+        decoded = whisper.decode(model, mels, options)
+
+    results = []
+    for clip, result in zip(clips, decoded):
+        duration = len(clip) / SAMPLE_RATE
+        retry = (
+            result.compression_ratio > COMPRESSION_RATIO_THRESHOLD
+            or (result.avg_logprob < LOGPROB_THRESHOLD and result.no_speech_prob <= NO_SPEECH_THRESHOLD)
+        )
+        if retry:
+            single = engine.transcribe(clip, language=language)
+            results.append({
+                'text': single['text'],
+                'language': single['language'],
+                'segments': single['segments'],
+                'duration': duration
+            })
+            continue
+
+        if result.no_speech_prob > NO_SPEECH_THRESHOLD and result.avg_logprob < LOGPROB_THRESHOLD:
+            segments = []
+        else:
+            tokenizer = get_tokenizer(
+                model.is_multilingual, num_languages=model.num_languages,
+                language=result.language, task='transcribe'
+            )
+            segments = _segments_from_tokens(result.tokens, tokenizer, duration)
+        results.append({
+            'text': ''.join(seg['text'] for seg in segments),
+            'language': result.language,
+            'segments': segments,
+            'duration': duration
+        })
+    return results
+
+
+class DynamicBatcher:
+    """Groups short clips by model size and language into batched decodes on a ModelPool."""
+
+    # Per-batch records kept for stats()
+    HISTORY = 100
+
+    def __init__(self, pool: ModelPool, max_batch: Optional[int] = None, max_wait_ms: Optional[float] = None):
+        """
+        Initialize the batcher.
+
+        Args:
+            pool: Model pool running the batches
+            max_batch: Clips per batch (None = FONIXFLOW_WEB_BATCH_SIZE or 8)
+            max_wait_ms: Longest time the first clip of a batch waits for more
+                         (None = FONIXFLOW_WEB_BATCH_WAIT_MS or 50)
+        """
+        self.pool = pool
+        self.max_batch = max(1, max_batch or _env_number('FONIXFLOW_WEB_BATCH_SIZE', 8))
+        self.max_wait = (max_wait_ms if max_wait_ms is not None
+                         else _env_number('FONIXFLOW_WEB_BATCH_WAIT_MS', 50.0, float)) / 1000.0
+        self._pending = {}  # (model_size, language) -> list of (clip, Future)
+        self._timers = {}
+        self._lock = threading.RLock()  # pool callbacks may run in the flushing thread
+        self._history = deque(maxlen=self.HISTORY)
+        self.batches = 0
+        self.clips = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_batch > 1
+
+    @staticmethod
+    def accepts(duration: float) -> bool:
+        """True if a clip of this length fits one batched window."""
+        return 0 < duration <= MAX_CLIP_SECONDS
+
+    def submit(self, model_size: str, language: Optional[str], clip: np.ndarray) -> Future:
+        """
+        Queue a clip for the next batch of its model size and language.
+
+        Args:
+            model_size: Whisper model size
+            language: Language code, or None to detect per clip
+            clip: 1-D float32 16kHz audio, at most MAX_CLIP_SECONDS long
+
+        Returns:
+            Future resolving to the clip's result dict
+        """
+        key = (model_size, language)
+        future = Future()
+        with self._lock:
+            batch = self._pending.setdefault(key, [])
+            batch.append((np.ascontiguousarray(clip, dtype=np.float32), future))
+            if len(batch) >= self.max_batch:
+                self._flush_locked(key)
+            elif len(batch) == 1:
+                timer = threading.Timer(self.max_wait, self._flush, args=(key,))
+                timer.daemon = True
+                self._timers[key] = timer
+                timer.start()
+        return future
+
+    def _flush(self, key: Tuple[str, Optional[str]]):
+        with self._lock:
+            self._flush_locked(key)
+
+    def _flush_locked(self, key: Tuple[str, Optional[str]]):
+        """Send the pending clips for key to the pool (caller holds the lock)."""
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(key, None)
+        batch = [(clip, future) for clip, future in (batch or []) if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        model_size, language = key
+        clips = [clip for clip, _ in batch]
+        futures = [future for _, future in batch]
+        submitted_at = time.monotonic()
+        work = self.pool.submit(model_size, _transcribe_batch, clips, language)
+        work.add_done_callback(lambda done: self._fan_out(key, clips, futures, submitted_at, done))
+
+    def _fan_out(self, key, clips, futures, submitted_at, done: Future):
+        """Hand each clip's result to its future and record the batch's metrics."""
+        latency = time.monotonic() - submitted_at
+        audio_seconds = sum(len(clip) for clip in clips) / SAMPLE_RATE
+        with self._lock:
+            self.batches += 1
+            self.clips += len(clips)
+            self._history.append({
+                'model_size': key[0],
+                'language': key[1],
+                'size': len(clips),
+                'audio_seconds': round(audio_seconds, 2),
+                'latency_seconds': round(latency, 3),
+                'throughput': round(audio_seconds / latency, 2) if latency > 0 else None,
+                'failed': done.exception() is not None
+            })
+
+        if done.exception() is not None:
+            for future in futures:
+                future.set_exception(done.exception())
+            return
+        for future, result in zip(futures, done.result()):
+            future.set_result(result)
+        logger.info(
+            f"Batch of {len(clips)} clip(s) ({key[0]}, {key[1] or 'auto'}): "
+            f"{audio_seconds:.1f}s audio in {latency:.2f}s"
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Batch counters and per-batch latency/throughput of recent batches."""
+        with self._lock:
+            history = list(self._history)
+            pending = sum(len(batch) for batch in self._pending.values())
+        latencies = [record['latency_seconds'] for record in history]
+        audio = sum(record['audio_seconds'] for record in history)
+        return {
+            'max_batch': self.max_batch,
+            'max_wait_ms': round(self.max_wait * 1000, 1),
+            'batches': self.batches,
+            'clips': self.clips,
+            'pending': pending,
+            'avg_batch_size': round(self.clips / self.batches, 2) if self.batches else 0.0,
+            'avg_latency_seconds': round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+            'throughput': round(audio / sum(latencies), 2) if latencies and sum(latencies) > 0 else None,
+            'recent': history
+        }
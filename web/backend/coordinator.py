@@ -0,0 +1,337 @@
+"""
+Distributed fan-out of long transcriptions across backend worker nodes.
+
+In coordinator mode the backend decodes a long upload to PCM, cuts it into
+shards at the quietest point near each even split (the same boundary search
+and overlap as local sharding in transcription.parallel), and posts each
+shard to a worker node's POST /shards endpoint. Worker nodes are ordinary
+backend processes, e.g. local ones started on other ports. Each node runs a
+limited number of shards at a time; a shard that fails (error, timeout, 429)
+is retried on a different node. The shard results are stitched back into one
+result with timestamp offsets and boundary deduplication.
+
+Configuration (environment):
+    FONIXFLOW_WEB_WORKER_NODES       Comma-separated worker base URLs; enables
+                                     coordinator mode (default: unset)
+    FONIXFLOW_WEB_FANOUT_MIN_SECONDS Shortest media fanned out (default: 600)
+    FONIXFLOW_WEB_SHARD_SECONDS      Target shard length (default: 300)
+    FONIXFLOW_WEB_SHARDS_PER_NODE    Concurrent shards per node (default: 1)
+    FONIXFLOW_WEB_SHARD_ATTEMPTS     Attempts per shard (default: 3)
+    FONIXFLOW_WEB_SHARD_TIMEOUT      Seconds to wait for one shard (default: 3600)
+"""
+
+import os
+import math
+import time
+import logging
+import threading
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from model_pool import get_instance_engine, _env_number
+from progress import EXTRACT_PERCENT_RANGE, stage_percent
+
+logger = logging.getLogger("fonixflow-web")
+
+SAMPLE_RATE = 16000
+
+
+def transcribe_pcm(audio: np.ndarray, language: Optional[str]) -> Dict[str, Any]:
+    """Transcribe one shard of PCM in a pool instance process (worker node side)."""
+    result = get_instance_engine().transcribe(audio, language=language)
+    return {
+        'text': result['text'],
+        'language': result['language'],
+        'segments': result['segments']
+    }
+
+
+def parse_nodes(value: Optional[str]) -> List[str]:
+    """Split a comma-separated list of worker base URLs."""
+    return [node.strip().rstrip('/') for node in (value or '').split(',') if node.strip()]
+
+
+class WorkerNode:
+    """A worker endpoint and its shard accounting."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.busy = 0
+        self.shards = 0
+        self.failures = 0
+        self.audio_seconds = 0.0
+        self.busy_seconds = 0.0
+        self.last_error = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'url': self.url,
+            'busy': self.busy,
+            'shards': self.shards,
+            'failures': self.failures,
+            'audio_seconds': round(self.audio_seconds, 1),
+            'busy_seconds': round(self.busy_seconds, 1),
+            # Seconds of audio transcribed per second of shard round trip
+            'throughput': round(self.audio_seconds / self.busy_seconds, 2) if self.busy_seconds else None,
+            'last_error': self.last_error
+        }
+
+
+class ShardFailedError(RuntimeError):
+    """Raised when a shard failed on every attempt."""
+
+
+class Coordinator:
+    """Fans long transcriptions out to worker nodes over HTTP."""
+
+    def __init__(
+        self,
+        nodes: Optional[List[str]] = None,
+        min_seconds: Optional[float] = None,
+        shard_seconds: Optional[float] = None,
+        shards_per_node: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+        timeout: Optional[float] = None
+    ):
+        """
+        Initialize the coordinator.
+
+        Args:
+            nodes: Worker base URLs (None = FONIXFLOW_WEB_WORKER_NODES)
+            min_seconds: Shortest media fanned out (None = FONIXFLOW_WEB_FANOUT_MIN_SECONDS or 600)
+            shard_seconds: Target shard length (None = FONIXFLOW_WEB_SHARD_SECONDS or 300)
+            shards_per_node: Concurrent shards per node (None = FONIXFLOW_WEB_SHARDS_PER_NODE or 1)
+            max_attempts: Attempts per shard (None = FONIXFLOW_WEB_SHARD_ATTEMPTS or 3)
+            timeout: Seconds to wait for one shard (None = FONIXFLOW_WEB_SHARD_TIMEOUT or 3600)
+        """
+        urls = nodes if nodes is not None else parse_nodes(os.environ.get('FONIXFLOW_WEB_WORKER_NODES'))
+        self.nodes = [WorkerNode(url) for url in urls]
+        self.min_seconds = min_seconds if min_seconds is not None else _env_number('FONIXFLOW_WEB_FANOUT_MIN_SECONDS', 600.0, float)
+        self.shard_seconds = shard_seconds or _env_number('FONIXFLOW_WEB_SHARD_SECONDS', 300.0, float)
+        self.shards_per_node = max(1, shards_per_node or _env_number('FONIXFLOW_WEB_SHARDS_PER_NODE', 1))
+        self.max_attempts = max(1, max_attempts or _env_number('FONIXFLOW_WEB_SHARD_ATTEMPTS', 3))
+        self.timeout = timeout or _env_number('FONIXFLOW_WEB_SHARD_TIMEOUT', 3600.0, float)
+        self._lock = threading.Lock()
+        self._jobs_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='fanout')
+        self._shard_executor = ThreadPoolExecutor(
+            max_workers=max(1, len(self.nodes) * self.shards_per_node), thread_name_prefix='fanout-shard'
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.nodes)
+
+    def accepts(self, duration: Optional[float]) -> bool:
+        """True if media of this length should be fanned out."""
+        return self.enabled and bool(duration) and duration >= self.min_seconds
+
+    def submit(self, media_path: str, model_size: str, language: Optional[str],
+               progress_callback: Optional[Callable] = None) -> Future:
+        """
+        Decode media_path and fan it out in a background thread.
+
+        Args:
+            media_path: Uploaded media file
+            model_size: Whisper model size used on every node
+            language: Language code, or None to detect per shard
+            progress_callback: Optional callback(stage, message, percent) with stage
+                               'extract' or 'transcribe' and percent 0-100 within it
+
+        Returns:
+            Future resolving to the result dict (see transcribe())
+        """
+        return self._jobs_executor.submit(self._run, media_path, model_size, language, progress_callback)
+
+    def _run(self, media_path, model_size, language, progress_callback) -> Dict[str, Any]:
+        from app.audio_extractor import AudioExtractor
+
+        def on_extract(message, percent=None):
+            progress_callback('extract', message, stage_percent(percent, EXTRACT_PERCENT_RANGE))
+
+        def on_transcribe(message, percent=None):
+            progress_callback('transcribe', message, percent)
+
+        extract_started = time.monotonic()
+        extractor = AudioExtractor()
+        AudioExtractor.configure_ffmpeg_converter()
+        audio, info = extractor.extract_audio_array(
+            media_path, progress_callback=on_extract if progress_callback else None
+        )
+        transcribe_started = time.monotonic()
+        result = self.transcribe(audio, model_size, language, on_transcribe if progress_callback else None)
+        result['duration'] = info['duration']
+        result['timings'] = {
+            'extract_seconds': transcribe_started - extract_started,
+            'extract_cached': info.get('cached', False),
+            'transcribe_seconds': time.monotonic() - transcribe_started
+        }
+        return result
+
+    def transcribe(self, audio: np.ndarray, model_size: str, language: Optional[str] = None,
+                   progress_callback: Optional[Callable] = None) -> Dict[str, Any]:
+        """
+        Transcribe 16kHz mono audio by sharding it across the worker nodes.
+
+        Args:
+            audio: 1-D float32 audio
+            model_size: Whisper model size used on every node
+            language: Language code; if None each shard detects its own and the
+                      result reports the language of most of the audio
+            progress_callback: Optional callback(message, percent), percent being the
+                               share of shards finished (0-100)
+
+        Returns:
+            dict: Whisper-style result with 'text', 'segments', 'language' and 'nodes'
+                  (per-node shard counts for this call)
+
+        Raises:
+            ShardFailedError: If a shard failed max_attempts times
+        """
+        from transcription.parallel import OVERLAP_SECONDS, find_shard_boundaries, stitch_shards
+
+        duration = len(audio) / SAMPLE_RATE
+        num_shards = max(len(self.nodes), math.ceil(duration / self.shard_seconds))
+        shards = find_shard_boundaries(audio, num_shards, SAMPLE_RATE)
+        logger.info(f"Fanning out {duration:.0f}s of audio as {len(shards)} shards to {len(self.nodes)} node(s)")
+
+        pending = deque(range(len(shards)))
+        attempts = Counter()
+        tried = {index: set() for index in range(len(shards))}
+        results = [None] * len(shards)
+        used = Counter()
+        running = {}  # Future -> (shard index, node, padded start)
+
+        while pending or running:
+            while pending:
+                index = pending[0]
+                node = self._pick_node(tried[index])
+                if node is None:
+                    break
+                pending.popleft()
+                start, end = shards[index]
+                padded_start = max(0.0, start - OVERLAP_SECONDS)
+                padded_end = min(duration, end + OVERLAP_SECONDS)
+                pcm = audio[int(padded_start * SAMPLE_RATE):int(padded_end * SAMPLE_RATE)]
+                running[self._start_shard(node, pcm, model_size, language)] = (index, node, padded_start)
+
+            if not running:
+                # Every node is busy with shards of other jobs
+                time.sleep(0.2)
+                continue
+
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                index, node, offset = running.pop(future)
+                if future.exception() is None:
+                    results[index] = (offset, future.result())
+                    used[node.url] += 1
+                    finished = sum(1 for result in results if result is not None)
+                    if progress_callback:
+                        progress_callback(f"Transcribed shard {finished}/{len(shards)}",
+                                          int(100 * finished / len(shards)))
+                    continue
+
+                attempts[index] += 1
+                tried[index].add(node.url)
+                logger.warning(f"Shard {index} failed on {node.url} (attempt {attempts[index]}): {future.exception()}")
+                if attempts[index] >= self.max_attempts:
+                    for other in running:
+                        other.cancel()
+                    raise ShardFailedError(
+                        f"Shard {index + 1}/{len(shards)} failed {attempts[index]} times: {future.exception()}"
+                    )
+                pending.appendleft(index)
+
+        if language is None:
+            # Language of most of the audio, weighted by shard length
+            weights = Counter()
+            for (start, end), (_, result) in zip(shards, results):
+                weights[result.get('language')] += end - start
+            language = weights.most_common(1)[0][0]
+
+        result = stitch_shards(shards, results, language)
+        result['nodes'] = dict(used)
+        logger.info(f"Fan-out completed: {len(result['segments'])} segments from {len(shards)} shards ({dict(used)})")
+        return result
+
+    def _pick_node(self, tried: set) -> Optional[WorkerNode]:
+        """Least busy node with a free slot, preferring nodes this shard hasn't failed on."""
+        with self._lock:
+            free = [node for node in self.nodes if node.busy < self.shards_per_node]
+        if not free:
+            return None
+        fresh = [node for node in free if node.url not in tried]
+        if not fresh and len(tried) < len(self.nodes):
+            return None  # wait for an untried node to free up
+        return min(fresh or free, key=lambda node: (node.busy, node.failures))
+
+    def _start_shard(self, node: WorkerNode, pcm: np.ndarray, model_size: str, language: Optional[str]) -> Future:
+        """Post a shard to node in the background, keeping the node's accounting."""
+        with self._lock:
+            node.busy += 1
+
+        def post():
+            started_at = time.monotonic()
+            try:
+                result = self._post_shard(node, pcm, model_size, language)
+            except Exception as e:
+                with self._lock:
+                    node.failures += 1
+                    node.last_error = str(e)
+                raise
+            else:
+                with self._lock:
+                    node.shards += 1
+                    node.audio_seconds += len(pcm) / SAMPLE_RATE
+                return result
+            finally:
+                with self._lock:
+                    node.busy -= 1
+                    node.busy_seconds += time.monotonic() - started_at
+
+        future = self._shard_executor.submit(post)
+
+        def release_if_cancelled(done):
+            if done.cancelled():
+                with self._lock:
+                    node.busy -= 1
+
+        future.add_done_callback(release_if_cancelled)
+        return future
+
+    def _post_shard(self, node: WorkerNode, pcm: np.ndarray, model_size: str,
+                    language: Optional[str]) -> Dict[str, Any]:
+        """Send one shard to a worker node and return its result (timestamps relative to the shard)."""
+        import requests
+
+        params = {'model_size': model_size}
+        if language:
+            params['language'] = language
+        response = requests.post(
+            f"{node.url}/shards",
+            params=params,
+            data=np.ascontiguousarray(pcm, dtype='<f4').tobytes(),
+            headers={'Content-Type': 'application/octet-stream'},
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def shutdown(self):
+        self._jobs_executor.shutdown(wait=False, cancel_futures=True)
+        self._shard_executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Configuration and per-node shard counts and throughput."""
+        with self._lock:
+            nodes = [node.stats() for node in self.nodes]
+        return {
+            'enabled': self.enabled,
+            'min_seconds': self.min_seconds,
+            'shard_seconds': self.shard_seconds,
+            'shards_per_node': self.shards_per_node,
+            'nodes': nodes
+        }
@@ -0,0 +1,122 @@
+"""
+Streaming upload ingestion for the web backend.
+
+Upload bodies are written chunk by chunk into uniquely named spool files while
+a content hash is computed over the same bytes, so an upload is never held in
+memory, never collides with another upload of the same name, and never has to
+be read again to be identified. The hash (sha1, the same digest as
+transcription.processors.mel_store.audio_fingerprint) keys deduplication of
+identical uploads.
+
+Configuration (environment):
+    FONIXFLOW_WEB_SPOOL_DIR     Directory for spooled uploads (default: temp_uploads)
+"""
+
+import os
+import time
+import hashlib
+import logging
+import tempfile
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+logger = logging.getLogger("fonixflow-web")
+
+# Bytes read from the request per step
+CHUNK_SIZE = 1024 * 1024
+
+
+def spool_dir() -> Path:
+    """Directory holding spooled uploads (created on demand)."""
+    path = Path(os.environ.get('FONIXFLOW_WEB_SPOOL_DIR', 'temp_uploads'))
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+class UploadSpool:
+    """A uniquely named spool file that hashes everything written to it."""
+
+    def __init__(self, filename: Optional[str] = None, directory: Optional[Path] = None):
+        """
+        Create the spool file.
+
+        Args:
+            filename: Client-side file name; only its extension is kept, so media
+                      type detection still works
+            directory: Spool directory (None = spool_dir())
+        """
+        suffix = Path(filename or '').suffix
+        fd, path = tempfile.mkstemp(dir=directory or spool_dir(), prefix='upload-', suffix=suffix)
+        self.path = Path(path)
+        self._file = os.fdopen(fd, 'wb')
+        self._hash = hashlib.sha1()
+        self.size = 0
+        self.started_at = time.monotonic()
+        self.finished_at = None
+
+    def write(self, chunk: bytes):
+        self._file.write(chunk)
+        self._hash.update(chunk)
+        self.size += len(chunk)
+
+    def close(self) -> str:
+        """Finish the file and return the content hash."""
+        self._file.close()
+        self.finished_at = time.monotonic()
+        return self._hash.hexdigest()
+
+    @property
+    def content_hash(self) -> str:
+        return self._hash.hexdigest()
+
+    @property
+    def seconds(self) -> float:
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    def discard(self):
+        """Close and delete the spool file."""
+        if not self._file.closed:
+            self._file.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+async def spool_stream(chunks: AsyncIterator[bytes], filename: Optional[str] = None) -> UploadSpool:
+    """
+    Write an async stream of byte chunks into a new spool file, hashing as it goes.
+
+    Disk writes and hashing run in the thread pool, so the event loop only waits
+    on the network. The spool is deleted if the stream fails.
+
+    Args:
+        chunks: Async iterator of body chunks (e.g. request.stream())
+        filename: Client-side file name (for the extension)
+
+    Returns:
+        The closed UploadSpool
+    """
+    spool = await run_in_threadpool(UploadSpool, filename)
+    try:
+        async for chunk in chunks:
+            if chunk:
+                await run_in_threadpool(spool.write, chunk)
+        await run_in_threadpool(spool.close)
+    except BaseException:
+        await run_in_threadpool(spool.discard)
+        raise
+    logger.info(f"Spooled upload {filename or spool.path.name}: {spool.size / 1024 / 1024:.1f}MB "
+                f"in {spool.seconds:.1f}s (sha1 {spool.content_hash[:12]})")
+    return spool
+
+
+async def iter_upload(file, chunk_size: int = CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """Read a FastAPI UploadFile in chunks."""
+    while True:
+        chunk = await file.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
@@ -0,0 +1,479 @@
+"""
+Background transcription jobs for the web backend.
+
+Uploads are queued as jobs and run on a bounded pool of worker processes, each
+holding a warm Whisper model (see model_pool), so a long transcription never
+blocks the event loop serving other requests. Short clips are decoded in the
+backend process and batched with other clips for the same model and language
+(see batcher); longer media is decoded by the worker itself, unless worker
+nodes are configured and it is long enough to be fanned out across them (see
+coordinator). Finished jobs keep
+their result for a configurable time-to-live, then are dropped.
+
+Uploads carry the content hash computed while they were received (see ingest).
+A second upload of the same bytes for the same model and language joins the
+job already running or retained for it, and results are stored in the on-disk
+result cache under that hash, so a later identical upload skips extraction and
+transcription altogether.
+
+Configuration (environment):
+    FONIXFLOW_WEB_MAX_QUEUE     Jobs allowed to wait for a worker (default: 8)
+    FONIXFLOW_WEB_RESULT_TTL    Seconds a finished job is kept (default: 3600)
+    FONIXFLOW_WEB_MODEL         Model warmed up at start (default: base)
+"""
+
+import os
+import time
+import uuid
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from batcher import DynamicBatcher
+from coordinator import Coordinator
+from metrics import Metrics
+from model_pool import ModelPool, get_instance_engine, publish_event, _env_number
+from progress import (
+    EXTRACT_PERCENT_RANGE, TRANSCRIBE_PERCENT_RANGE, ProgressHub, SegmentInterceptor, stage_percent
+)
+
+logger = logging.getLogger("fonixflow-web")
+
+
+def _run_job(job_id: str, media_path: str, language: Optional[str]) -> Dict[str, Any]:
+    """Extract and transcribe one upload in a model pool instance process, publishing progress."""
+    import sys
+    from app.audio_extractor import AudioExtractor
+
+    publish_event(job_id, 'stage', stage='extract')
+    extract_started = time.monotonic()
+    extractor = AudioExtractor()
+    AudioExtractor.configure_ffmpeg_converter()
+    audio, info = extractor.extract_audio_array(
+        media_path,
+        progress_callback=lambda message, percent: publish_event(
+            job_id, 'progress', stage='extract',
+            percent=stage_percent(percent, EXTRACT_PERCENT_RANGE), message=message
+        )
+    )
+    duration = info['duration']
+    extract_seconds = time.monotonic() - extract_started
+
+    def on_progress(message, percent=None):
+        publish_event(
+            job_id, 'progress', stage='transcribe',
+            percent=stage_percent(percent, TRANSCRIBE_PERCENT_RANGE), message=message
+        )
+
+    def on_segment(start, end, text):
+        # Whisper prints a window's segments once they are committed
+        publish_event(job_id, 'segment', start=start, end=end, text=text)
+        publish_event(
+            job_id, 'progress', stage='transcribe',
+            percent=min(100, int(100 * end / duration)) if duration else None,
+            message=f"Transcribed {end:.0f}s of {duration:.0f}s"
+        )
+
+    publish_event(job_id, 'stage', stage='transcribe')
+    original_stdout = sys.stdout
+    sys.stdout = SegmentInterceptor(original_stdout, on_segment)
+    transcribe_started = time.monotonic()
+    try:
+        result = get_instance_engine().transcribe(audio, language=language, progress_callback=on_progress)
+    finally:
+        sys.stdout = original_stdout
+    return {
+        'text': result['text'],
+        'language': result['language'],
+        'segments': result['segments'],
+        'duration': info['duration'],
+        'timings': {
+            'extract_seconds': extract_seconds,
+            'extract_cached': info.get('cached', False),
+            'transcribe_seconds': time.monotonic() - transcribe_started
+        }
+    }
+
+
+class QueueFullError(RuntimeError):
+    """Raised when a job is submitted while the queue is at its depth limit."""
+
+
+class Job:
+    """State of one transcription job."""
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    COMPLETED = 'completed'
+    FAILED = 'failed'
+
+    def __init__(self, job_id: str, filename: str, model_size: str, language: Optional[str],
+                 content_hash: Optional[str] = None):
+        self.id = job_id
+        self.filename = filename
+        self.model_size = model_size
+        self.language = language
+        self.content_hash = content_hash
+        self.requests = 1  # uploads served by this job (identical uploads are coalesced)
+        self.cached = False
+        self.status = self.QUEUED
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.future = None
+        self.work_future = None  # pool or batch future, once the job is dispatched
+        self.timings = {}  # stage durations and cache outcomes, for metrics
+
+    @property
+    def done(self) -> bool:
+        return self.status in (self.COMPLETED, self.FAILED)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable view for the API."""
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'filename': self.filename,
+            'model_size': self.model_size,
+            'language': self.language,
+            'content_hash': self.content_hash,
+            'requests': self.requests,
+            'cached': self.cached,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'result': self.result,
+            'error': self.error
+        }
+
+
+class JobManager:
+    """Queues transcription jobs on a pool of warm worker processes."""
+
+    def __init__(
+        self,
+        pool: Optional[ModelPool] = None,
+        batcher: Optional[DynamicBatcher] = None,
+        progress: Optional[ProgressHub] = None,
+        coordinator: Optional[Coordinator] = None,
+        metrics: Optional[Metrics] = None,
+        max_queue: Optional[int] = None,
+        result_ttl: Optional[float] = None,
+        default_model: Optional[str] = None
+    ):
+        """
+        Initialize the job manager (the default model is warmed by start()).
+
+        Args:
+            pool: Model pool running the jobs (None = a ModelPool configured from the environment)
+            batcher: Batcher for short clips (None = a DynamicBatcher on pool configured
+                     from the environment)
+            progress: Hub receiving the jobs' progress events (None = a new ProgressHub)
+            coordinator: Fan-out to worker nodes for long media (None = a Coordinator
+                         configured from the environment; inactive without nodes)
+            metrics: Registry recording finished jobs (None = a new Metrics)
+            max_queue: Jobs allowed to wait beyond the running ones
+                       (None = FONIXFLOW_WEB_MAX_QUEUE or 8)
+            result_ttl: Seconds finished jobs are kept (None = FONIXFLOW_WEB_RESULT_TTL or 3600)
+            default_model: Model warmed up at start (None = FONIXFLOW_WEB_MODEL or 'base')
+        """
+        self.pool = pool or ModelPool()
+        self.batcher = batcher or DynamicBatcher(self.pool)
+        self.progress = progress or ProgressHub()
+        self.coordinator = coordinator or Coordinator()
+        self.metrics = metrics or Metrics()
+        self.max_queue = max(0, max_queue if max_queue is not None else _env_number('FONIXFLOW_WEB_MAX_QUEUE', 8))
+        self.result_ttl = result_ttl if result_ttl is not None else _env_number('FONIXFLOW_WEB_RESULT_TTL', 3600.0, float)
+        self.default_model = default_model or os.environ.get('FONIXFLOW_WEB_MODEL', 'base')
+        self._jobs = {}  # job_id -> Job, in submission order
+        self._by_content = {}  # (content_hash, model_size, language) -> Job
+        self.deduplicated = 0
+        self.cache_hits = 0
+        self._lock = threading.Lock()
+        # Probes and short-clip decodes run here, off the event loop
+        self._prepare_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='job-prepare')
+
+    def start(self):
+        """Warm up an instance of the default model and start forwarding worker progress."""
+        self.progress.attach(self.pool.events)
+        logger.info(
+            f"Starting job manager (model={self.default_model}, max_queue={self.max_queue}, "
+            f"result_ttl={self.result_ttl:.0f}s)"
+        )
+        self.pool.warm(self.default_model)
+
+    def shutdown(self):
+        """Stop the worker processes, failing jobs that have not finished."""
+        self._prepare_executor.shutdown(wait=False, cancel_futures=True)
+        self.coordinator.shutdown()
+        self.pool.shutdown()
+
+    @property
+    def capacity(self) -> int:
+        """Jobs that may be in flight at once (running plus waiting)."""
+        return self.pool.max_instances + self.max_queue
+
+    def active_count(self) -> int:
+        """Jobs queued or running."""
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if not job.done)
+
+    def submit(self, media_path: str, filename: str, model_size: str, language: Optional[str] = None,
+               cleanup_path: bool = True, upload_info: Optional[Dict[str, Any]] = None,
+               content_hash: Optional[str] = None) -> Tuple[Job, bool]:
+        """
+        Queue a transcription job, or join an identical one.
+
+        If a job for the same content hash, model size and language is in flight
+        or retained (and did not fail), that job is returned instead of a new one
+        and media_path is deleted (when cleanup_path is set).
+
+        Args:
+            media_path: Uploaded media file on disk
+            filename: Client-side file name (informational)
+            model_size: Whisper model size
+            language: Language code, or None to auto-detect
+            cleanup_path: Delete media_path once the job finishes
+            upload_info: Details of the finished upload (e.g. 'bytes', 'seconds'),
+                         recorded as the job's first progress event
+            content_hash: Hash of the media bytes, enabling deduplication
+
+        Returns:
+            Tuple of (Job, deduplicated) - deduplicated is True if an existing job was joined
+
+        Raises:
+            QueueFullError: If capacity jobs are already in flight
+        """
+        content_key = (content_hash, model_size, language) if content_hash else None
+        with self._lock:
+            self._purge_expired()
+            existing = self._by_content.get(content_key) if content_key else None
+            if existing is not None and existing.status != Job.FAILED:
+                existing.requests += 1
+                self.deduplicated += 1
+            else:
+                existing = None
+                active = sum(1 for job in self._jobs.values() if not job.done)
+                if active >= self.capacity:
+                    raise QueueFullError(f"Transcription queue is full ({active} jobs in flight)")
+                job = Job(uuid.uuid4().hex, filename, model_size, language, content_hash)
+                self._jobs[job.id] = job
+                if content_key:
+                    self._by_content[content_key] = job
+
+        if existing is not None:
+            logger.info(f"Upload {filename} joins identical job {existing.id} ({existing.status})")
+            if cleanup_path:
+                try:
+                    os.remove(media_path)
+                except OSError:
+                    pass
+            return existing, True
+
+        self.progress.publish(job.id, 'stage', stage='upload', **(upload_info or {}))
+        self.progress.publish(job.id, 'stage', stage='queued')
+        job.future = Future()
+        job.future.add_done_callback(lambda future: self._finish(job, future, media_path if cleanup_path else None))
+        self._prepare_executor.submit(self._prepare, job, media_path)
+        logger.info(f"Queued job {job.id}: {filename} (model={model_size}, in flight={active + 1})")
+        return job, False
+
+    def _prepare(self, job: Job, media_path: str):
+        """Dispatch a job to the batcher or the pool and chain its result to job.future."""
+        if not job.future.set_running_or_notify_cancel():
+            return
+        cache, cache_key = self._result_cache_key(job)
+        if cache is not None:
+            cached = cache.get(cache_key)
+            job.timings['result_cache_hit'] = cached is not None
+            if cached is not None:
+                job.cached = True
+                with self._lock:
+                    self.cache_hits += 1
+                self.progress.publish(job.id, 'stage', stage='cached')
+                job.future.set_result(cached)
+                return
+        try:
+            job.work_future = self._dispatch(job, media_path)
+        except Exception as e:
+            job.future.set_exception(e)
+            return
+
+        def chain(done):
+            if done.cancelled():
+                job.future.set_exception(RuntimeError('Job was cancelled'))
+            elif done.exception() is not None:
+                job.future.set_exception(done.exception())
+            else:
+                job.future.set_result(done.result())
+
+        job.work_future.add_done_callback(chain)
+
+    @staticmethod
+    def _result_cache_key(job: Job):
+        """Result cache and key for a job's upload, or (None, None) if caching doesn't apply."""
+        if not job.content_hash:
+            return None, None
+        try:
+            from transcription.result_cache import ResultCache, result_cache_enabled
+            from transcription.vad import vad_enabled
+            if not result_cache_enabled():
+                return None, None
+            cache = ResultCache()
+            key = cache.key_for_hash(
+                job.content_hash, mode='web_upload', model_size=job.model_size,
+                language=job.language, vad=vad_enabled()
+            )
+            return cache, key
+        except Exception as e:
+            logger.warning(f"Result cache unavailable: {e}")
+            return None, None
+
+    def _store_result(self, job: Job):
+        """Keep a finished upload's result in the on-disk result cache."""
+        cache, cache_key = self._result_cache_key(job)
+        if cache is not None:
+            cache.put(
+                cache_key, job.result, source=f"web upload {job.filename}",
+                settings={'model_size': job.model_size, 'language': job.language}
+            )
+
+    def _dispatch(self, job: Job, media_path: str) -> Future:
+        """
+        Start a job's transcription.
+
+        Clips short enough for one Whisper window are decoded here and batched with
+        other clips for the same model and language; long media is fanned out to
+        worker nodes when they are configured; everything else is decoded and
+        transcribed by a pool instance.
+        """
+        if self.batcher.enabled or self.coordinator.enabled:
+            from app.audio_extractor import AudioExtractor
+
+            extractor = AudioExtractor()
+            duration = extractor.get_media_duration(media_path)
+            if self.coordinator.accepts(duration):
+                self.progress.publish(job.id, 'stage', stage='extract')
+                current = ['extract']
+
+                def on_progress(stage, message, percent=None):
+                    if stage != current[0]:
+                        current[0] = stage
+                        self.progress.publish(job.id, 'stage', stage=stage)
+                    self.progress.publish(job.id, 'progress', stage=stage, percent=percent, message=message)
+
+                return self.coordinator.submit(media_path, job.model_size, job.language, on_progress)
+            if self.batcher.enabled and duration and self.batcher.accepts(duration):
+                self.progress.publish(job.id, 'stage', stage='extract')
+                extract_started = time.monotonic()
+                AudioExtractor.configure_ffmpeg_converter()
+                audio, info = extractor.extract_audio_array(media_path)
+                job.timings['extract_seconds'] = time.monotonic() - extract_started
+                job.timings['extract_cached'] = info.get('cached', False)
+                if self.batcher.accepts(info['duration']):
+                    self.progress.publish(job.id, 'stage', stage='transcribe')
+                    job.timings['transcribe_started'] = time.monotonic()
+                    return self.batcher.submit(job.model_size, job.language, np.array(audio, dtype=np.float32))
+
+        def on_start(instance):
+            if not instance.loaded:
+                self.progress.publish(job.id, 'stage', stage='load_model', model_size=job.model_size)
+
+        return self.pool.submit(job.model_size, _run_job, job.id, media_path, job.language, on_start=on_start)
+
+    def _finish(self, job: Job, future, cleanup_path: Optional[str]):
+        """Record a finished job's outcome (runs on the thread that resolved job.future)."""
+        with self._lock:
+            job.finished_at = time.time()
+            if future.cancelled():
+                job.status = Job.FAILED
+                job.error = 'Job was cancelled'
+            elif future.exception() is not None:
+                job.status = Job.FAILED
+                job.error = str(future.exception())
+                logger.error(f"Job {job.id} failed: {job.error}")
+            else:
+                job.status = Job.COMPLETED
+                job.result = dict(future.result())
+                job.timings.update(job.result.pop('timings', None) or {})
+                if 'transcribe_started' in job.timings and 'transcribe_seconds' not in job.timings:
+                    # Batched clips: time from joining a batch to its results
+                    job.timings['transcribe_seconds'] = time.monotonic() - job.timings['transcribe_started']
+                logger.info(f"Job {job.id} completed in {job.finished_at - job.created_at:.1f}s")
+
+        self.metrics.observe_job(
+            job.model_size, job.status, job.timings,
+            audio_seconds=job.result.get('duration') if job.result and not job.cached else None
+        )
+        if job.status == Job.COMPLETED and not job.cached and job.content_hash:
+            try:
+                self._prepare_executor.submit(self._store_result, job)
+            except RuntimeError:
+                pass  # shutting down
+        if job.status == Job.COMPLETED:
+            self.progress.publish(
+                job.id, 'completed', language=job.result['language'],
+                duration=job.result.get('duration'), segments=job.result['segments']
+            )
+        else:
+            self.progress.publish(job.id, 'failed', error=job.error)
+        if cleanup_path:
+            try:
+                os.remove(cleanup_path)
+            except OSError:
+                pass
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Return the job, or None if unknown or expired."""
+        with self._lock:
+            self._purge_expired()
+            job = self._jobs.get(job_id)
+            if job is not None:
+                self._refresh(job)
+            return job
+
+    def list_jobs(self) -> List[Job]:
+        """All retained jobs, oldest first."""
+        with self._lock:
+            self._purge_expired()
+            for job in self._jobs.values():
+                self._refresh(job)
+            return list(self._jobs.values())
+
+    @staticmethod
+    def _refresh(job: Job):
+        """Mark a queued job running once a worker has picked it up (caller holds the lock)."""
+        if job.status == Job.QUEUED and job.work_future is not None and job.work_future.running():
+            job.status = Job.RUNNING
+            job.started_at = time.time()
+
+    def _purge_expired(self):
+        """Drop finished jobs older than the TTL (caller holds the lock)."""
+        cutoff = time.time() - self.result_ttl
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.done and job.finished_at < cutoff]:
+            job = self._jobs.pop(job_id)
+            self.progress.discard(job_id)
+            content_key = (job.content_hash, job.model_size, job.language)
+            if self._by_content.get(content_key) is job:
+                del self._by_content[content_key]
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and job counters for the health endpoint."""
+        with self._lock:
+            counts = {}
+            for job in self._jobs.values():
+                self._refresh(job)
+                counts[job.status] = counts.get(job.status, 0) + 1
+        return {
+            'workers': self.pool.max_instances,
+            'max_queue': self.max_queue,
+            'in_flight': counts.get(Job.QUEUED, 0) + counts.get(Job.RUNNING, 0),
+            'jobs': counts,
+            'deduplicated': self.deduplicated,
+            'cache_hits': self.cache_hits
+        }
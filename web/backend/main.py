@@ -1,21 +1,31 @@
 import os
 import sys
-import shutil
+import asyncio
 import logging
 from pathlib import Path
 from typing import Optional, List
 
-from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks, Form
+from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks, Form, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, FileResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 
-# Add project root to sys.path to allow importing app and transcription modules
+# Add project root to sys.path to allow importing app and transcription modules,
+# and this directory for the backend's own modules. Both go first: the backend's
+# modules have generic names (progress, metrics, jobs) that installed packages
+# would otherwise shadow
 PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
-sys.path.append(str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
 
 from app.transcriber import Transcriber
-from app.audio_extractor import AudioExtractor
+import numpy as np
+
+from coordinator import transcribe_pcm
+from jobs import JobManager, QueueFullError
+from ingest import iter_upload, spool_stream
+from metrics import Metrics, MetricsMiddleware
+from progress import format_sse
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -32,16 +42,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Global Transcriber instance (lazy loaded)
-transcriber_instance = None
+# Request counts and latencies per route, exported with job metrics on /metrics
+metrics = Metrics()
+app.add_middleware(MetricsMiddleware, metrics=metrics)
+
+# Transcription jobs run on worker processes so the event loop stays responsive
+job_manager = JobManager(metrics=metrics)
+
+@app.on_event("startup")
+def start_workers():
+    job_manager.start()
 
-def get_transcriber(model_size: str = "base"):
-    global transcriber_instance
-    # Reload if model size changes (simple implementation)
-    if transcriber_instance is None or transcriber_instance.model_size != model_size:
-        logger.info(f"Loading Transcriber with model: {model_size}")
-        transcriber_instance = Transcriber(model_size=model_size)
-    return transcriber_instance
+@app.on_event("shutdown")
+def stop_workers():
+    job_manager.shutdown()
 
 class TranscriptionResponse(BaseModel):
     text: str
@@ -58,6 +72,106 @@ def get_available_models():
     """Return available Whisper models and their descriptions."""
     return Transcriber.get_model_description("base") # Just return base desc structure or list all
 
+async def enqueue_upload(chunks, filename: Optional[str], model_size: str, language: Optional[str]):
+    """
+    Spool an upload to disk while hashing it (off the event loop) and queue its job.
+
+    Returns:
+        Tuple of (Job, deduplicated)
+    """
+    spool = await spool_stream(chunks, filename)
+    upload_info = {"bytes": spool.size, "seconds": round(spool.seconds, 3)}
+    try:
+        return job_manager.submit(
+            str(spool.path), filename, model_size, language,
+            upload_info=upload_info, content_hash=spool.content_hash
+        )
+    except QueueFullError as e:
+        spool.discard()
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
+
+@app.post("/jobs", status_code=202)
+async def create_job(
+    file: UploadFile = File(...),
+    model_size: str = Form("base"),
+    language: Optional[str] = Form(None)
+):
+    """
+    Queue an audio/video upload for transcription.
+    Returns the job id to poll with GET /jobs/{job_id}; 429 when the queue is full.
+    An upload identical to one already queued or finished returns that job.
+    """
+    logger.info(f"Received job request: {file.filename} (Model: {model_size})")
+    job, deduplicated = await enqueue_upload(iter_upload(file), file.filename, model_size, language)
+    return {"job_id": job.id, "status": job.status, "deduplicated": deduplicated}
+
+@app.post("/jobs/stream", status_code=202)
+async def create_job_from_stream(
+    request: Request,
+    filename: str,
+    model_size: str = "base",
+    language: Optional[str] = None
+):
+    """
+    Queue a transcription for media sent as the raw request body.
+    The body is spooled and hashed as it arrives, without multipart buffering.
+    """
+    logger.info(f"Received streamed job request: {filename} (Model: {model_size})")
+    job, deduplicated = await enqueue_upload(request.stream(), filename, model_size, language)
+    return {"job_id": job.id, "status": job.status, "deduplicated": deduplicated}
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    """Return a job's status, and its result once completed."""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return job.to_dict()
+
+@app.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: str):
+    """
+    Stream a job's progress as server-sent events.
+    Replays past events, then sends stage, progress and segment events as they
+    happen, ending with a 'completed' or 'failed' event.
+    """
+    if job_manager.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+
+    async def event_stream():
+        async for event in job_manager.progress.subscribe(job_id):
+            yield format_sse(event)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.post("/shards")
+async def transcribe_shard(
+    request: Request,
+    model_size: str = "base",
+    language: Optional[str] = None
+):
+    """
+    Transcribe a shard of raw float32 16kHz mono PCM for a coordinator node.
+    Timestamps are relative to the shard; 429 when this node's queue is full.
+    """
+    body = await request.body()
+    if not body or len(body) % 4:
+        raise HTTPException(status_code=400, detail="Body must be little-endian float32 PCM")
+    if job_manager.pool.waiting() >= job_manager.max_queue:
+        raise HTTPException(status_code=429, detail="Worker queue is full", headers={"Retry-After": "30"})
+
+    audio = np.frombuffer(body, dtype="<f4")
+    logger.info(f"Received shard: {len(audio) / 16000:.1f}s (Model: {model_size})")
+    try:
+        return await asyncio.wrap_future(job_manager.pool.submit(model_size, transcribe_pcm, audio, language))
+    except Exception as e:
+        logger.error(f"Shard transcription failed: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.post("/transcribe")
 async def transcribe_audio(
     file: UploadFile = File(...),
@@ -66,66 +180,47 @@ async def transcribe_audio(
 ):
     """
     Handle audio/video upload and transcription.
+    Runs as a queued job and waits for its result without blocking other requests.
     """
     logger.info(f"Received transcription request: {file.filename} (Model: {model_size})")
-    
-    # Create temp file
-    temp_dir = Path("temp_uploads")
-    temp_dir.mkdir(exist_ok=True)
-    
-    temp_file_path = temp_dir / file.filename
-    
+    job, _ = await enqueue_upload(iter_upload(file), file.filename, model_size, language)
+
     try:
-        # Save uploaded file
-        with open(temp_file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-            
-        # Check if conversion is needed using AudioExtractor
-        extractor = AudioExtractor()
-        audio_path = temp_file_path
-        
-        if extractor.is_video_file(temp_file_path) or not extractor.is_audio_file(temp_file_path):
-            logger.info("Extracting audio from video...")
-            # Ensure ffmpeg is configured
-            AudioExtractor.configure_ffmpeg_converter()
-            audio_path = extractor.extract_audio(temp_file_path)
-            
-        # Transcribe
-        transcriber = get_transcriber(model_size)
-        
-        # Define a progress callback (just logs for now, could be websocket)
-        def progress_cb(msg, pct=None):
-            logger.info(f"Progress: {msg} ({pct}%)")
-
-        result = transcriber.transcribe(
-            str(audio_path),
-            language=language,
-            progress_callback=progress_cb
-        )
-        
-        # Cleanup temp audio if it was extracted
-        if audio_path != temp_file_path:
-            os.remove(audio_path)
-            
-        return {
-            "text": result["text"],
-            "language": result["language"],
-            "segments": result["segments"]
-        }
-        
+        result = await asyncio.wrap_future(job.future)
     except Exception as e:
         logger.error(f"Transcription failed: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
-        
-    finally:
-        # Cleanup uploaded file
-        if temp_file_path.exists():
-            os.remove(temp_file_path)
+
+    return {
+        "text": result["text"],
+        "language": result["language"],
+        "segments": result["segments"]
+    }
+
+@app.get("/admin/pool")
+def pool_status():
+    """Model pool occupancy, queue wait times and model load counts per model size."""
+    return job_manager.pool.stats()
+
+@app.get("/admin/batching")
+def batching_status():
+    """Dynamic batching settings, counters and per-batch latency/throughput."""
+    return job_manager.batcher.stats()
+
+@app.get("/admin/nodes")
+def nodes_status():
+    """Coordinator mode settings and per-worker-node shard counts and throughput."""
+    return job_manager.coordinator.stats()
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics_export():
+    """Request, queue, pool, model load, throughput and cache metrics in Prometheus text format."""
+    return PlainTextResponse(metrics.render(job_manager), media_type="text/plain; version=0.0.4; charset=utf-8")
 
 @app.get("/health")
 def health_check():
-    return {"status": "ok"}
+    return {"status": "ok", "jobs": job_manager.stats()}
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(app, host="0.0.0.0", port=int(os.environ.get("FONIXFLOW_WEB_PORT", 8000)))
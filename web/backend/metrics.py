@@ -0,0 +1,262 @@
+"""
+Prometheus text-format metrics for the web backend.
+
+Counters and histograms are plain dicts behind a lock; recording one request
+or job is a dict update and a bisect, so the hot paths pay next to nothing.
+Queue, pool, batching and fan-out state is not tracked continuously but read
+from the components when /metrics is scraped.
+"""
+
+import time
+import bisect
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Request latency buckets (seconds): fast API calls up to long synchronous transcriptions
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+# Job stage duration buckets (seconds)
+STAGE_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800, 3600)
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[Any, ...], extra: str = '') -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter with labels."""
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount: float = 1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = dict(self._values)
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for label_values, value in sorted(values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labels, label_values)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram with labels."""
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = (), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        self._series = {}  # label values -> [bucket counts..., +Inf count], sum
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            series = {key: (list(counts), total) for key, (counts, total) in self._series.items()}
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for label_values, (counts, total) in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, label_values, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, label_values)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, label_values)} {cumulative}")
+        return lines
+
+
+def _gauge(name: str, help_text: str, samples: Iterable[Tuple[Dict[str, Any], float]],
+           metric_type: str = 'gauge') -> List[str]:
+    """Render a family whose values are read at scrape time."""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}"]
+    for labels, value in samples:
+        if value is None:
+            continue
+        names = tuple(labels)
+        lines.append(f"{name}{_format_labels(names, tuple(labels[n] for n in names))} {_format_value(value)}")
+    return lines
+
+
+class Metrics:
+    """Metrics registry of the web backend."""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.requests = Counter(
+            'fonixflow_http_requests_total', 'HTTP requests by route and status.', ('method', 'route', 'status')
+        )
+        self.request_latency = Histogram(
+            'fonixflow_http_request_duration_seconds', 'Time to the end of the response by route.',
+            ('method', 'route')
+        )
+        self.jobs = Counter('fonixflow_jobs_total', 'Finished transcription jobs by outcome.', ('model_size', 'status'))
+        self.audio_seconds = Counter(
+            'fonixflow_audio_seconds_total', 'Seconds of audio transcribed.', ('model_size',)
+        )
+        self.transcribe_seconds = Counter(
+            'fonixflow_transcribe_seconds_total', 'Wall time spent transcribing.', ('model_size',)
+        )
+        self.extract_duration = Histogram(
+            'fonixflow_extract_duration_seconds', 'Time to decode uploaded media to PCM.', (), STAGE_BUCKETS
+        )
+        self.extraction_cache = Counter(
+            'fonixflow_extraction_cache_lookups_total', 'Extraction cache lookups by result.', ('result',)
+        )
+        self.result_cache = Counter(
+            'fonixflow_result_cache_lookups_total', 'Upload result cache lookups by result.', ('result',)
+        )
+        self._rtf_lock = threading.Lock()
+        self._rtf = {}  # model_size -> (audio seconds, transcribe seconds)
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float):
+        self.requests.inc(method, route, status)
+        self.request_latency.observe(seconds, method, route)
+
+    def observe_job(self, model_size: str, status: str, timings: Optional[Dict[str, Any]] = None,
+                    audio_seconds: Optional[float] = None):
+        """Record a finished job (timings as collected by JobManager)."""
+        self.jobs.inc(model_size, status)
+        timings = timings or {}
+        if 'result_cache_hit' in timings:
+            self.result_cache.inc('hit' if timings['result_cache_hit'] else 'miss')
+        if 'extract_seconds' in timings:
+            self.extract_duration.observe(timings['extract_seconds'])
+        if 'extract_cached' in timings:
+            self.extraction_cache.inc('hit' if timings['extract_cached'] else 'miss')
+        transcribe_seconds = timings.get('transcribe_seconds')
+        if status == 'completed' and audio_seconds and transcribe_seconds:
+            self.audio_seconds.inc(model_size, amount=audio_seconds)
+            self.transcribe_seconds.inc(model_size, amount=transcribe_seconds)
+            with self._rtf_lock:
+                audio_total, transcribe_total = self._rtf.get(model_size, (0.0, 0.0))
+                self._rtf[model_size] = (audio_total + audio_seconds, transcribe_total + transcribe_seconds)
+
+    def render(self, job_manager=None) -> str:
+        """The full exposition in Prometheus text format."""
+        lines = []
+        for metric in (self.requests, self.request_latency, self.jobs, self.audio_seconds,
+                       self.transcribe_seconds, self.extract_duration, self.extraction_cache, self.result_cache):
+            lines.extend(metric.render())
+
+        with self._rtf_lock:
+            rtf = dict(self._rtf)
+        lines.extend(_gauge(
+            'fonixflow_real_time_factor', 'Transcription time per second of audio, by model size.',
+            (({'model_size': size}, transcribe / audio) for size, (audio, transcribe) in sorted(rtf.items()) if audio)
+        ))
+        lines.extend(_gauge('fonixflow_uptime_seconds', 'Seconds since the backend started.',
+                            [({}, round(time.time() - self.started_at, 1))]))
+        if job_manager is not None:
+            lines.extend(self._collect(job_manager))
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _collect(job_manager) -> List[str]:
+        """Scrape-time state of the job queue, model pool, batcher and coordinator."""
+        jobs = job_manager.stats()
+        pool = job_manager.pool.stats()
+        batching = job_manager.batcher.stats()
+        nodes = job_manager.coordinator.stats()['nodes']
+        models = pool['models']
+
+        lines = []
+        lines.extend(_gauge('fonixflow_jobs_in_flight', 'Jobs queued or running.', [({}, jobs['in_flight'])]))
+        lines.extend(_gauge('fonixflow_job_queue_capacity', 'Jobs allowed in flight before 429.',
+                            [({}, job_manager.capacity)]))
+        lines.extend(_gauge('fonixflow_jobs_deduplicated_total', 'Uploads that joined an identical job.',
+                            [({}, jobs['deduplicated'])], 'counter'))
+        lines.extend(_gauge('fonixflow_pool_queue_depth', 'Work waiting for a pool instance.', [({}, pool['waiting'])]))
+        lines.extend(_gauge('fonixflow_pool_instances', 'Pool worker processes by model size.',
+                            [({'model_size': size}, stats['instances']) for size, stats in sorted(models.items())]))
+        lines.extend(_gauge(
+            'fonixflow_pool_busy_ratio', 'Share of pool worker processes that are busy.',
+            [({}, pool['busy'] / pool['instances'] if pool['instances'] else 0.0)]
+        ))
+        lines.extend(_gauge('fonixflow_model_loads_total', 'Model loads (instance starts) by model size.',
+                            [({'model_size': size}, stats['loads']) for size, stats in sorted(models.items())],
+                            'counter'))
+        lines.extend(_gauge('fonixflow_model_load_seconds_total', 'Time spent loading models by model size.',
+                            [({'model_size': size}, stats['load_seconds']) for size, stats in sorted(models.items())],
+                            'counter'))
+        lines.extend(_gauge('fonixflow_model_evictions_total', 'Pool instances stopped to make room, by model size.',
+                            [({'model_size': size}, stats['evictions']) for size, stats in sorted(models.items())],
+                            'counter'))
+        lines.extend(_gauge('fonixflow_batches_total', 'Batched decodes run.', [({}, batching['batches'])], 'counter'))
+        lines.extend(_gauge('fonixflow_batch_clips_total', 'Clips decoded in batches.',
+                            [({}, batching['clips'])], 'counter'))
+        lines.extend(_gauge('fonixflow_node_shards_total', 'Shards completed per worker node.',
+                            [({'node': node['url']}, node['shards']) for node in nodes], 'counter'))
+        lines.extend(_gauge('fonixflow_node_failures_total', 'Failed shard attempts per worker node.',
+                            [({'node': node['url']}, node['failures']) for node in nodes], 'counter'))
+        lines.extend(_gauge('fonixflow_node_throughput', 'Audio seconds per second of shard round trip, per node.',
+                            [({'node': node['url']}, node['throughput']) for node in nodes]))
+        return lines
+
+
+class MetricsMiddleware:
+    """ASGI middleware counting requests and timing responses per route template."""
+
+    def __init__(self, app, metrics: Metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = [500]
+
+        async def send_with_status(message):
+            if message['type'] == 'http.response.start':
+                status[0] = message['status']
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.metrics.observe_request(
+                scope.get('method', ''), self._route(scope), status[0], time.perf_counter() - start
+            )
+
+    def _route(self, scope) -> str:
+        """Route template (e.g. /jobs/{job_id}), so ids don't explode label cardinality."""
+        route = scope.get('route')
+        if route is not None:
+            return route.path
+        from starlette.routing import Match
+
+        for candidate in getattr(scope.get('app'), 'routes', ()):
+            match, _ = candidate.matches(scope)
+            if match == Match.FULL:
+                return candidate.path
+        return 'unmatched'
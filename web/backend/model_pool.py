@@ -0,0 +1,382 @@
+"""
+Per-model-size pool of warm transcription worker processes.
+
+Each pool instance is a single worker process holding one loaded Whisper model
+of one size. Work for a size goes to an idle instance of that size; if none is
+idle, a new instance is started while the size is below its instance limit and
+the memory budget allows, evicting idle instances of the least recently used
+other sizes to make room. Otherwise the work waits in one FIFO queue shared by
+all sizes and is dispatched in arrival order as instances free up.
+
+Configuration (environment):
+    FONIXFLOW_WEB_WORKERS             Instances across all sizes (default: 1)
+    FONIXFLOW_WEB_INSTANCES_PER_MODEL Instances per model size (default: all)
+    FONIXFLOW_WEB_POOL_MB             Memory budget for loaded models
+                                      (default: 80% of available memory)
+"""
+
+import os
+import time
+import logging
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+from app.transcriber import Transcriber, get_available_memory_mb
+
+logger = logging.getLogger("fonixflow-web")
+
+# Transcriber owned by a pool instance process (set up by _init_instance)
+_INSTANCE_ENGINE = None
+_INSTANCE_LOAD_SECONDS = 0.0
+# Queue carrying (job_id, event) progress tuples back to the backend process
+_INSTANCE_EVENTS = None
+
+
+def _init_instance(model_size: str, events=None):
+    """Load the instance's model when its process starts."""
+    global _INSTANCE_ENGINE, _INSTANCE_LOAD_SECONDS, _INSTANCE_EVENTS
+    logging.basicConfig(level=logging.INFO)
+    _INSTANCE_EVENTS = events
+    start = time.monotonic()
+    _INSTANCE_ENGINE = Transcriber(model_size=model_size, use_result_cache=True)
+    _INSTANCE_ENGINE.load_model()
+    _INSTANCE_LOAD_SECONDS = time.monotonic() - start
+
+
+def _instance_load_seconds() -> float:
+    """Seconds the instance spent loading its model (first call after start)."""
+    return _INSTANCE_LOAD_SECONDS
+
+
+def get_instance_engine() -> Transcriber:
+    """The Transcriber of the current pool instance process (for work functions)."""
+    return _INSTANCE_ENGINE
+
+
+def publish_event(job_id: Optional[str], event_type: str, **data):
+    """Send a progress event for job_id from a pool instance process (best effort)."""
+    if _INSTANCE_EVENTS is None or job_id is None:
+        return
+    try:
+        _INSTANCE_EVENTS.put((job_id, {'type': event_type, **data}))
+    except (OSError, ValueError) as e:
+        logger.debug(f"Could not publish {event_type} event: {e}")
+
+
+def _env_number(name: str, default, cast=int):
+    """Read a numeric setting from the environment, falling back on bad values."""
+    value = os.environ.get(name, '').strip()
+    if not value:
+        return default
+    try:
+        return cast(value)
+    except ValueError:
+        logger.warning(f"Ignoring invalid {name}={value!r}")
+        return default
+
+
+def model_memory_mb(model_size: str) -> float:
+    """Budgeted resident memory of one instance of model_size."""
+    return Transcriber.MODEL_MEMORY_MB.get(model_size.replace('.en', ''), 1000)
+
+
+class PoolInstance:
+    """One worker process with a warm model of one size."""
+
+    def __init__(self, instance_id: int, model_size: str, events=None):
+        self.id = instance_id
+        self.model_size = model_size
+        self.memory_mb = model_memory_mb(model_size)
+        self.busy = False
+        self.loaded = False
+        self.last_used = time.monotonic()
+        # spawn, not fork: the server process has CUDA state and running threads
+        self.executor = ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_instance,
+            initargs=(model_size, events)
+        )
+
+    def stop(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class _Waiter:
+    """Work waiting for an instance of its model size."""
+
+    __slots__ = ('model_size', 'fn', 'args', 'on_start', 'future', 'enqueued_at')
+
+    def __init__(self, model_size, fn, args, on_start=None):
+        self.model_size = model_size
+        self.fn = fn
+        self.args = args
+        self.on_start = on_start
+        self.future = Future()
+        self.enqueued_at = time.monotonic()
+
+
+class ModelPool:
+    """Routes work to warm per-size worker processes within a memory budget."""
+
+    def __init__(
+        self,
+        max_instances: Optional[int] = None,
+        max_per_model: Optional[int] = None,
+        budget_mb: Optional[float] = None
+    ):
+        """
+        Initialize the pool (instances start on demand or with warm()).
+
+        Args:
+            max_instances: Instances across all sizes (None = FONIXFLOW_WEB_WORKERS or 1)
+            max_per_model: Instances of one size (None = FONIXFLOW_WEB_INSTANCES_PER_MODEL
+                           or max_instances)
+            budget_mb: Memory budget for loaded models (None = FONIXFLOW_WEB_POOL_MB or
+                       80% of available memory; 0 = unbounded)
+        """
+        self.max_instances = max(1, max_instances or _env_number('FONIXFLOW_WEB_WORKERS', 1))
+        self.max_per_model = max(1, max_per_model or _env_number('FONIXFLOW_WEB_INSTANCES_PER_MODEL', self.max_instances))
+        if budget_mb is None:
+            budget_mb = _env_number('FONIXFLOW_WEB_POOL_MB', None, float)
+        if budget_mb is None:
+            available_mb = get_available_memory_mb()
+            budget_mb = available_mb * 0.8 if available_mb else 0
+        self.budget_mb = budget_mb
+        self._instances = []
+        self._waiters = deque()
+        self._lock = threading.RLock()  # done-callbacks may run in the submitting thread
+        self._next_id = 0
+        self._closed = False
+        self._size_stats = {}
+        # Progress events from instance processes (see publish_event)
+        self.events = multiprocessing.get_context('spawn').Queue()
+
+    def _stats_for(self, model_size: str) -> Dict[str, Any]:
+        stats = self._size_stats.get(model_size)
+        if stats is None:
+            stats = self._size_stats[model_size] = {
+                'loads': 0,
+                'load_seconds': 0.0,
+                'evictions': 0,
+                'served': 0,
+                'wait_seconds_total': 0.0,
+                'wait_seconds_max': 0.0
+            }
+        return stats
+
+    def warm(self, model_size: str):
+        """Start one instance of model_size ahead of the first request."""
+        with self._lock:
+            if not any(instance.model_size == model_size for instance in self._instances):
+                if self._make_room(model_size):
+                    self._spawn(model_size)
+
+    def submit(self, model_size: str, fn: Callable, *args, on_start: Optional[Callable] = None) -> Future:
+        """
+        Run fn(*args) on an instance of model_size.
+
+        fn runs in the instance process and reaches the model through
+        get_instance_engine(); it must be a picklable module-level function.
+
+        Args:
+            model_size: Whisper model size
+            fn: Work function
+            *args: Arguments for fn
+            on_start: Optional callback(instance) when the work is handed to an
+                      instance (instance.loaded is False while its model loads)
+
+        Returns:
+            Future resolving to fn's return value
+        """
+        waiter = _Waiter(model_size, fn, args, on_start)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Model pool is shut down")
+            self._waiters.append(waiter)
+            self._dispatch()
+        return waiter.future
+
+    def waiting(self) -> int:
+        """Work items queued for an instance."""
+        with self._lock:
+            return len(self._waiters)
+
+    def _dispatch(self):
+        """Start queued work on instances, oldest first (caller holds the lock)."""
+        blocked_sizes = set()
+        for waiter in list(self._waiters):
+            if waiter not in self._waiters:
+                continue  # dispatched by a nested call from a done-callback
+            if waiter.future.cancelled():
+                self._waiters.remove(waiter)
+                continue
+            if waiter.model_size in blocked_sizes:
+                continue
+            instance = self._find_instance(waiter.model_size)
+            if instance is None:
+                # Later work of this size must not overtake this waiter
+                blocked_sizes.add(waiter.model_size)
+                continue
+            self._waiters.remove(waiter)
+            self._start(instance, waiter)
+
+    def _find_instance(self, model_size: str) -> Optional[PoolInstance]:
+        """An idle instance of model_size, or a newly started one if there is room."""
+        for instance in self._instances:
+            if instance.model_size == model_size and not instance.busy:
+                return instance
+        same_size = sum(1 for instance in self._instances if instance.model_size == model_size)
+        if same_size >= self.max_per_model or not self._make_room(model_size):
+            return None
+        return self._spawn(model_size)
+
+    def _make_room(self, model_size: str) -> bool:
+        """Evict idle instances of other sizes (LRU) until a new model_size instance fits."""
+        needed_mb = model_memory_mb(model_size)
+
+        def fits():
+            if not self._instances:
+                return True  # one instance always runs, even above the budget
+            if len(self._instances) >= self.max_instances:
+                return False
+            if self.budget_mb <= 0:
+                return True
+            return sum(instance.memory_mb for instance in self._instances) + needed_mb <= self.budget_mb
+
+        if fits():
+            return True
+        idle = sorted(
+            (instance for instance in self._instances if not instance.busy and instance.model_size != model_size),
+            key=lambda instance: instance.last_used
+        )
+        # Only evict if that actually makes room
+        kept = [instance for instance in self._instances if instance not in idle]
+        if kept and (len(kept) >= self.max_instances or (
+                self.budget_mb > 0 and sum(instance.memory_mb for instance in kept) + needed_mb > self.budget_mb)):
+            return False
+        for instance in idle:
+            self._evict(instance)
+            if fits():
+                return True
+        return fits()
+
+    def _spawn(self, model_size: str) -> PoolInstance:
+        """Start a new instance process (caller holds the lock)."""
+        self._next_id += 1
+        instance = PoolInstance(self._next_id, model_size, self.events)
+        self._instances.append(instance)
+        stats = self._stats_for(model_size)
+        stats['loads'] += 1
+        logger.info(f"Starting pool instance {instance.id} for model '{model_size}' ({instance.memory_mb:.0f}MB)")
+
+        def on_loaded(future):
+            if future.cancelled() or future.exception() is not None:
+                return
+            with self._lock:
+                instance.loaded = True
+                stats['load_seconds'] += future.result()
+
+        instance.executor.submit(_instance_load_seconds).add_done_callback(on_loaded)
+        return instance
+
+    def _evict(self, instance: PoolInstance):
+        """Stop an idle instance (caller holds the lock)."""
+        self._instances.remove(instance)
+        self._stats_for(instance.model_size)['evictions'] += 1
+        logger.info(f"Evicting idle pool instance {instance.id} (model '{instance.model_size}')")
+        instance.stop()
+
+    def _start(self, instance: PoolInstance, waiter: _Waiter):
+        """Run a waiter's work on an instance (caller holds the lock)."""
+        instance.busy = True
+        instance.last_used = time.monotonic()
+        waited = instance.last_used - waiter.enqueued_at
+        stats = self._stats_for(waiter.model_size)
+        stats['served'] += 1
+        stats['wait_seconds_total'] += waited
+        stats['wait_seconds_max'] = max(stats['wait_seconds_max'], waited)
+
+        if not waiter.future.set_running_or_notify_cancel():
+            instance.busy = False
+            return
+        if waiter.on_start is not None:
+            try:
+                waiter.on_start(instance)
+            except Exception as e:
+                logger.debug(f"on_start callback failed: {e}")
+        try:
+            work = instance.executor.submit(waiter.fn, *waiter.args)
+        except Exception as e:
+            instance.busy = False
+            waiter.future.set_exception(e)
+            return
+        work.add_done_callback(lambda done: self._finish(instance, waiter, done))
+
+    def _finish(self, instance: PoolInstance, waiter: _Waiter, done: Future):
+        """Hand back the result and give the instance to the next waiter."""
+        with self._lock:
+            instance.busy = False
+            instance.last_used = time.monotonic()
+            if done.cancelled() or done.exception() is not None:
+                # A crashed process leaves a broken executor; replace it on next use
+                if done.cancelled() or isinstance(done.exception(), BrokenProcessPool):
+                    if instance in self._instances:
+                        self._instances.remove(instance)
+                        instance.stop()
+            if not self._closed:
+                self._dispatch()
+
+        if done.cancelled():
+            waiter.future.set_exception(RuntimeError("Pool instance stopped"))
+        elif done.exception() is not None:
+            waiter.future.set_exception(done.exception())
+        else:
+            waiter.future.set_result(done.result())
+
+    def shutdown(self):
+        """Stop all instances and fail queued work."""
+        with self._lock:
+            self._closed = True
+            instances, self._instances = self._instances, []
+            waiters, self._waiters = list(self._waiters), deque()
+        for instance in instances:
+            instance.stop()
+        self.events.put(None)  # stops the progress reader
+        for waiter in waiters:
+            if waiter.future.set_running_or_notify_cancel():
+                waiter.future.set_exception(RuntimeError("Model pool is shut down"))
+
+    def stats(self) -> Dict[str, Any]:
+        """Occupancy, queue wait and load counters per model size."""
+        with self._lock:
+            sizes = {}
+            for model_size, stats in self._size_stats.items():
+                instances = [instance for instance in self._instances if instance.model_size == model_size]
+                served = stats['served']
+                sizes[model_size] = {
+                    'instances': len(instances),
+                    'busy': sum(1 for instance in instances if instance.busy),
+                    'loading': sum(1 for instance in instances if not instance.loaded),
+                    'waiting': sum(1 for waiter in self._waiters if waiter.model_size == model_size),
+                    'loads': stats['loads'],
+                    'load_seconds': round(stats['load_seconds'], 2),
+                    'evictions': stats['evictions'],
+                    'served': served,
+                    'wait_seconds_avg': round(stats['wait_seconds_total'] / served, 3) if served else 0.0,
+                    'wait_seconds_max': round(stats['wait_seconds_max'], 3)
+                }
+            return {
+                'max_instances': self.max_instances,
+                'max_per_model': self.max_per_model,
+                'budget_mb': round(self.budget_mb, 1) if self.budget_mb > 0 else None,
+                'used_mb': round(sum(instance.memory_mb for instance in self._instances), 1),
+                'instances': len(self._instances),
+                'busy': sum(1 for instance in self._instances if instance.busy),
+                'waiting': len(self._waiters),
+                'models': sizes
+            }
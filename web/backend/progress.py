@@ -0,0 +1,189 @@
+"""
+Job progress events for the web backend.
+
+Pool instance processes put (job_id, event) tuples on a shared multiprocessing
+queue; a reader thread in the backend process hands them to the ProgressHub,
+which keeps each job's event history and pushes new events to asyncio
+subscribers (the server-sent event stream) with call_soon_threadsafe, so
+nothing on the event loop ever waits on a worker.
+
+Event types:
+    stage      {'stage': 'upload' | 'queued' | 'cached' | 'extract' | 'load_model' | 'transcribe'}
+    progress   {'stage', 'percent', 'message'} - percent is 0-100 within the stage
+    segment    {'start', 'end', 'text'} - a segment committed by the decoder
+    completed  {'language', 'duration', 'segments'} - terminal
+    failed     {'error'} - terminal
+"""
+
+import re
+import json
+import time
+import asyncio
+import logging
+import threading
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("fonixflow-web")
+
+TERMINAL_EVENTS = ('completed', 'failed')
+
+# Whole-run percent ranges reported by the shared extraction and transcription code
+# (AudioExtractor.extract_audio_array() and Transcriber, as used by the GUI)
+EXTRACT_PERCENT_RANGE = (5, 30)
+TRANSCRIBE_PERCENT_RANGE = (50, 95)
+
+# Whisper's verbose segment lines: "[00:01.000 --> 00:04.500] text" (hours optional)
+_SEGMENT_LINE = re.compile(r'^\[((?:\d+:)?\d+:\d+\.\d+) --> ((?:\d+:)?\d+:\d+\.\d+)\] ?(.*)$')
+
+
+def stage_percent(percent: Optional[float], percent_range: Tuple[float, float]) -> Optional[int]:
+    """Rescale a whole-run percent within percent_range to 0-100 of its stage (None stays None)."""
+    if percent is None:
+        return None
+    low, high = percent_range
+    return max(0, min(100, int(round(100 * (percent - low) / (high - low)))))
+
+
+def _parse_timestamp(value: str) -> float:
+    seconds = 0.0
+    for part in value.split(':'):
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
+class SegmentInterceptor:
+    """
+    Intercepts stdout to capture the segments Whisper prints as each window is decoded.
+
+    Transcriber runs Whisper verbosely whenever a progress callback is given;
+    Whisper then prints every segment it commits. Lines are forwarded to the
+    original stream and parsed into on_segment(start, end, text) calls.
+    """
+
+    def __init__(self, original_stdout, on_segment: Callable[[float, float, str], None]):
+        self.original_stdout = original_stdout
+        self.on_segment = on_segment
+        self.buffer = ""
+
+    def write(self, text):
+        if self.original_stdout is not None:
+            self.original_stdout.write(text)
+        self.buffer += text
+        while '\n' in self.buffer:
+            line, self.buffer = self.buffer.split('\n', 1)
+            match = _SEGMENT_LINE.match(line.strip())
+            if match:
+                try:
+                    self.on_segment(_parse_timestamp(match.group(1)), _parse_timestamp(match.group(2)), match.group(3))
+                except Exception as e:
+                    logger.debug(f"Segment callback failed: {e}")
+        return len(text)
+
+    def flush(self):
+        if self.original_stdout is not None:
+            self.original_stdout.flush()
+
+
+class ProgressHub:
+    """Per-job event history with live fan-out to asyncio subscribers."""
+
+    # Seconds between SSE keep-alive comments on an idle stream
+    KEEPALIVE_SECONDS = 15.0
+
+    def __init__(self):
+        self._events = {}  # job_id -> list of event dicts
+        self._subscribers = {}  # job_id -> list of (loop, asyncio.Queue)
+        self._lock = threading.Lock()
+        self._reader = None
+
+    def publish(self, job_id: str, event_type: str, **data):
+        """Record an event and push it to the job's subscribers (any thread)."""
+        event = {'type': event_type, 'time': time.time(), **data}
+        with self._lock:
+            history = self._events.setdefault(job_id, [])
+            if history and history[-1]['type'] in TERMINAL_EVENTS:
+                return  # late worker events after the job finished
+            history.append(event)
+            subscribers = list(self._subscribers.get(job_id, ()))
+        for loop, events in subscribers:
+            try:
+                loop.call_soon_threadsafe(events.put_nowait, event)
+            except RuntimeError:
+                pass  # subscriber's loop has closed
+
+    def history(self, job_id: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._events.get(job_id, ()))
+
+    def discard(self, job_id: str):
+        """Forget a job's events (when the job expires)."""
+        with self._lock:
+            self._events.pop(job_id, None)
+
+    async def subscribe(self, job_id: str) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """
+        Yield the job's past events, then new ones until a terminal event.
+
+        Yields None after KEEPALIVE_SECONDS without events, so the stream can send
+        a keep-alive.
+        """
+        loop = asyncio.get_running_loop()
+        events = asyncio.Queue()
+        with self._lock:
+            past = list(self._events.get(job_id, ()))
+            self._subscribers.setdefault(job_id, []).append((loop, events))
+        try:
+            for event in past:
+                yield event
+                if event['type'] in TERMINAL_EVENTS:
+                    return
+            while True:
+                try:
+                    event = await asyncio.wait_for(events.get(), self.KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                yield event
+                if event['type'] in TERMINAL_EVENTS:
+                    return
+        finally:
+            with self._lock:
+                subscribers = self._subscribers.get(job_id, [])
+                if (loop, events) in subscribers:
+                    subscribers.remove((loop, events))
+                if not subscribers:
+                    self._subscribers.pop(job_id, None)
+
+    def attach(self, event_queue):
+        """Start a daemon thread forwarding (job_id, event) tuples from worker processes."""
+        if self._reader is not None:
+            return
+
+        def read():
+            while True:
+                try:
+                    item = event_queue.get()
+                except (EOFError, OSError, ValueError):
+                    return  # queue closed on shutdown
+                if item is None:
+                    return
+                job_id, event = item
+                event_type = event.pop('type')
+                self.publish(job_id, event_type, **event)
+
+        self._reader = threading.Thread(target=read, name='progress-reader', daemon=True)
+        self._reader.start()
+
+
+def _json_default(value):
+    """Serialize numpy scalars/arrays that Whisper may leave in segments."""
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def format_sse(event: Optional[Dict[str, Any]]) -> str:
+    """Encode an event (or a keep-alive for None) as a server-sent event."""
+    if event is None:
+        return ": keep-alive\n\n"
+    return f"event: {event['type']}\ndata: {json.dumps(event, default=_json_default)}\n\n"
@@ -5,12 +5,24 @@ import axios from 'axios';
 import DropZone from './ui/DropZone';
 import ModernButton from './ui/ModernButton';
 
+const API_URL = 'http://localhost:8000';
+
+const STAGE_LABELS = {
+  upload: 'Uploading',
+  queued: 'Queued',
+  extract: 'Extracting audio',
+  load_model: 'Loading model',
+  transcribe: 'Transcribing',
+};
+
 const UploadArea = ({ onTranscriptionComplete }) => {
   const [file, setFile] = useState(null);
   const [isProcessing, setIsProcessing] = useState(false);
   const [progress, setProgress] = useState(0);
   const [error, setError] = useState(null);
   const [modelSize, setModelSize] = useState('base');
+  const [stage, setStage] = useState(null);
+  const [partialText, setPartialText] = useState('');
 
   const handleFileDropped = (droppedFile) => {
     setFile(droppedFile);
@@ -21,7 +33,9 @@ const UploadArea = ({ onTranscriptionComplete }) => {
     if (!file) return;
 
     setIsProcessing(true);
-    setProgress(10);
+    setProgress(0);
+    setStage('upload');
+    setPartialText('');
     setError(null);
 
     const formData = new FormData();
@@ -29,22 +43,59 @@ const UploadArea = ({ onTranscriptionComplete }) => {
     formData.append('model_size', modelSize);
 
     try {
-      const progressInterval = setInterval(() => {
-        setProgress(prev => Math.min(prev + 5, 90));
-      }, 1000);
-
-      const response = await axios.post('http://localhost:8000/transcribe', formData, {
+      const response = await axios.post(`${API_URL}/jobs`, formData, {
         headers: {
           'Content-Type': 'multipart/form-data',
         },
+        onUploadProgress: (event) => {
+          if (event.total) {
+            setProgress(Math.round((event.loaded / event.total) * 10));
+          }
+        },
       });
 
-      clearInterval(progressInterval);
-      setProgress(100);
+      // Follow the job's progress stream until it completes or fails
+      const events = new EventSource(`${API_URL}/jobs/${response.data.job_id}/events`);
 
-      setTimeout(() => {
-        onTranscriptionComplete(response.data);
-      }, 500);
+      events.addEventListener('stage', (e) => {
+        setStage(JSON.parse(e.data).stage);
+      });
+      events.addEventListener('progress', (e) => {
+        const data = JSON.parse(e.data);
+        if (data.percent != null) {
+          // Events carry 0-100 within their stage: extraction fills 10-30%, transcription 30-100%
+          const base = data.stage === 'extract' ? 10 : 30;
+          const span = data.stage === 'extract' ? 20 : 70;
+          setProgress(Math.round(base + (data.percent / 100) * span));
+        }
+      });
+      events.addEventListener('segment', (e) => {
+        const data = JSON.parse(e.data);
+        setPartialText(prev => prev + data.text);
+      });
+      events.addEventListener('completed', (e) => {
+        events.close();
+        const data = JSON.parse(e.data);
+        setProgress(100);
+        setTimeout(() => {
+          onTranscriptionComplete({
+            text: data.segments.map(segment => segment.text).join(''),
+            language: data.language,
+            segments: data.segments,
+          });
+        }, 500);
+      });
+      events.addEventListener('failed', (e) => {
+        events.close();
+        setError(JSON.parse(e.data).error || "Transcription failed.");
+        setIsProcessing(false);
+      });
+      events.onerror = () => {
+        if (events.readyState === EventSource.CLOSED) {
+          setError("Lost connection to the backend.");
+          setIsProcessing(false);
+        }
+      };
 
     } catch (err) {
       console.error(err);
@@ -78,7 +129,7 @@ const UploadArea = ({ onTranscriptionComplete }) => {
         <div className="bg-sidebar/50 backdrop-blur-md border border-border rounded-2xl p-6 shadow-xl">
           <div className="flex items-center justify-between mb-3">
             <span className="text-text-secondary text-sm font-medium">
-              {isProcessing ? `Processing... ${progress}% ` : "Ready to transcribe"}
+              {isProcessing ? `${STAGE_LABELS[stage] || 'Processing'}... ${progress}% ` : "Ready to transcribe"}
             </span>
             {isProcessing && (
               <Sparkles className="w-5 h-5 text-accent animate-pulse" />
@@ -93,6 +144,12 @@ const UploadArea = ({ onTranscriptionComplete }) => {
               />
             </div>
           )}
+
+          {isProcessing && partialText && (
+            <p className="mt-4 text-text-secondary text-sm leading-relaxed max-h-40 overflow-auto">
+              {partialText}
+            </p>
+          )}
         </div>
       )}
 